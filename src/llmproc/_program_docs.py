@@ -29,6 +29,8 @@ Args:
     region: Region for Vertex AI
     user_prompt: User prompt to execute automatically
     max_iterations: Maximum number of iterations for tool calls
+    max_parallel_tools: Maximum number of ``parallel_safe`` tool calls run concurrently
+    connection_pool: HTTP connection pool limits for the shared provider client
 """
 
 COMPILE_SELF = """Internal method to validate and compile this program.
@@ -245,6 +247,37 @@ Returns:
     A fully initialized LLMProcess ready for execution with properly configured tools
 """
 
+RUN_BATCH = """Run many independent prompts and yield results as they complete.
+
+Processes are started on demand, at most ``concurrency`` of them, and
+reused for later prompts after ``reset_state()``. They share the program's
+process template and provider client. At most ``concurrency`` prompts are in
+flight at once, and ``prompts`` may be a lazy iterable.
+
+```python
+async for item in program.run_batch(prompts, concurrency=16):
+    if item.ok:
+        print(item.index, item.response)
+    else:
+        print(item.index, "failed:", item.error)
+```
+
+Args:
+    prompts: Iterable of user prompts; each runs in a fresh conversation.
+    concurrency: Maximum number of prompts in flight and processes started.
+    max_iterations: Optional per-prompt limit on tool-calling iterations.
+    executor: Optional process executor used by every pooled process instead
+        of the provider default, e.g.
+        :class:`~llmproc.providers.anthropic_batch.AnthropicBatchProcessExecutor`
+        to send the prompts through the Message Batches API.
+
+Returns:
+    An async iterator of :class:`llmproc.process_pool.BatchResult` in
+    completion order. A failing prompt is reported through ``error``; its
+    process is closed instead of reused. All processes are closed when the
+    iterator finishes or is closed.
+"""
+
 START_SYNC = """Synchronously create and initialize a :class:`SyncLLMProcess`.
 
 This method creates a synchronous process that can be used in non-async code.
@@ -42,6 +42,7 @@ Available parameters by event:
 - api_request: api_request, process
 - api_response: response, process
 - run_end: run_result, process
+- process_close: process
 """
 
 from llmproc.plugin.events import CallbackEvent
@@ -33,6 +33,8 @@ class ToolMeta:
     # Behavioural -----------------------------------------------------------
     access: AccessLevel = AccessLevel.WRITE
     requires_context: bool = False
+    # Safe to run concurrently with other calls in the same assistant turn
+    parallel_safe: bool = False
 
     # Extensibility / callbacks --------------------------------------------
     schema_modifier: Callable[[dict, dict], dict] | None = None
@@ -5,10 +5,15 @@ These classes should have minimal dependencies to avoid circular imports.
 """
 
 import json
+import logging
+import os
 import time
-from dataclasses import dataclass, field
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass, field, fields
 from typing import Any
 
+logger = logging.getLogger(__name__)
+
 
 class ToolResult:
     """A standardized result from tool execution.
@@ -133,6 +138,133 @@ def ensure_tool_result(value: Any) -> "ToolResult":
     return ToolResult.from_success(value)
 
 
+def _usage_field(usage: Any, key: str) -> Any:
+    """Return ``key`` from a usage object or dictionary."""
+    if isinstance(usage, dict):
+        return usage.get(key)
+    return getattr(usage, key, None)
+
+
+def _usage_value(usage: Any, key: str) -> int | float:
+    """Return the token count ``key`` from ``usage``, or 0 if it is not a number."""
+    value = _usage_field(usage, key)
+    return value if isinstance(value, int | float) else 0
+
+
+def api_call_cost(model: str | None, usage: Any, batch: bool = False) -> float:
+    """Return the estimated USD cost of one API call.
+
+    Args:
+        model: Model name used for the call
+        usage: Usage object or dictionary reported by the provider
+        batch: Whether the call went through the Message Batches API
+
+    Returns:
+        Cost in USD, or 0.0 for models without known pricing
+    """
+    # Import here to avoid circular dependency
+    from llmproc.providers.pricing import BATCH_PRICE_FACTOR, get_claude_pricing
+
+    pricing = get_claude_pricing(model) if isinstance(model, str) else None
+    if not pricing:
+        return 0.0
+
+    cost = (
+        _usage_value(usage, "input_tokens") * pricing.get("input_tokens", 0)
+        + _usage_value(usage, "output_tokens") * pricing.get("output_tokens", 0)
+        + _usage_value(usage, "cache_creation_input_tokens") * pricing.get("cache_creation_input_tokens", 0)
+        + _usage_value(usage, "cache_read_input_tokens") * pricing.get("cache_read_input_tokens", 0)
+    ) / 1_000_000
+
+    cache_creation = _usage_field(usage, "cache_creation")
+    if isinstance(cache_creation, dict):
+        for ttl_key, tokens in cache_creation.items():
+            price = pricing.get("cache_creation", {}).get(ttl_key)
+            if price is not None:
+                cost += tokens * price / 1_000_000
+
+    # Message Batches API calls are billed at a discount
+    return cost * BATCH_PRICE_FACTOR if batch else cost
+
+
+def default_raw_call_limit() -> int | None:
+    """Return ``LLMPROC_RAW_API_CALLS``: raw requests/responses kept per run.
+
+    ``all`` (or a negative number) keeps every call; the default is ``1``,
+    which is also used when the value is not a number.
+    """
+    value = os.getenv("LLMPROC_RAW_API_CALLS", "1").strip().lower()
+    if value == "all":
+        return None
+    try:
+        limit = int(value)
+    except ValueError:
+        logger.warning("Invalid LLMPROC_RAW_API_CALLS value %r, keeping 1 raw API call", value)
+        return 1
+    return None if limit < 0 else limit
+
+
+@dataclass(slots=True, eq=False)
+class ApiCallRecord(Mapping):
+    """Telemetry for a single API call.
+
+    Records support read-only dictionary access (``record["usage"]``) so
+    code written for the former ``api_call_infos`` dictionaries keeps working.
+    ``request`` and ``response`` are ``None`` once the raw payloads have been
+    released (see :attr:`RunResult.raw_call_limit`). ``error`` holds the
+    message of a call that failed.
+    """
+
+    model: str | None = None
+    usage: Any = None
+    stop_reason: str | None = None
+    id: str | None = None
+    latency_ms: int | None = None
+    batch: bool = False
+    request: Any = None
+    response: Any = None
+    error: str | None = None
+
+    @classmethod
+    def from_info(cls, info: Mapping[str, Any]) -> "ApiCallRecord":
+        """Build a record from an executor's API call dictionary."""
+        if isinstance(info, ApiCallRecord):
+            return info
+        return cls(
+            model=info.get("model"),
+            usage=info.get("usage", {}),
+            stop_reason=info.get("stop_reason"),
+            id=info.get("id"),
+            latency_ms=info.get("latency_ms"),
+            batch=bool(info.get("batch", False)),
+            request=info.get("request"),
+            response=info.get("response"),
+            error=info.get("error"),
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        """Return the field ``key`` as in a dictionary."""
+        if key not in _API_CALL_FIELDS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over field names."""
+        return iter(_API_CALL_FIELDS)
+
+    def __len__(self) -> int:
+        """Return the number of fields."""
+        return len(_API_CALL_FIELDS)
+
+    def release_raw(self) -> None:
+        """Drop the raw request and response."""
+        self.request = None
+        self.response = None
+
+
+_API_CALL_FIELDS = tuple(f.name for f in fields(ApiCallRecord))
+
+
 @dataclass
 class RunResult:
     """Contains metadata about a process run.
@@ -151,7 +283,7 @@ class RunResult:
     last_message: str = ""
 
     # Primary data storage - simplified to just two collections
-    api_call_infos: list[dict[str, Any]] = field(default_factory=list)
+    api_call_infos: list[ApiCallRecord] = field(default_factory=list)
     tool_calls: list[dict[str, Any]] = field(default_factory=list)
 
     # Timing information
@@ -168,6 +300,13 @@ class RunResult:
     # Run outcome information
     stop_reason: str | None = None
 
+    # Number of most recent API calls that keep their raw request and
+    # response; None keeps all of them
+    raw_call_limit: int | None = field(default_factory=default_raw_call_limit)
+
+    # Running cost total, updated as API calls are recorded
+    _usd_cost: float = 0.0
+
     @property
     def api_call_count(self) -> int:
         """Get number of API calls made."""
@@ -183,40 +322,32 @@ class RunResult:
         """Get total number of interactions (API calls + tool calls)."""
         return self.api_call_count + self.tool_call_count
 
-    def add_api_call(self, info: dict[str, Any]) -> "RunResult":
+    def add_api_call(self, info: Mapping[str, Any]) -> "RunResult":
         """Record information about an API call.
 
+        Token and cost totals are updated immediately. Only the last
+        :attr:`raw_call_limit` calls keep their raw request and response, so
+        the memory held by a run does not grow with the conversation history.
+
         Args:
-            info: Dictionary with API call information
+            info: Dictionary (or :class:`ApiCallRecord`) with API call information
 
         Returns:
             self for method chaining
         """
-        self.api_call_infos.append(info)
+        record = ApiCallRecord.from_info(info)
+        self.api_call_infos.append(record)
 
-        # Update token statistics from usage info
-        usage = info.get("usage", {})
+        limit = self.raw_call_limit
+        if limit is not None and len(self.api_call_infos) > limit:
+            self.api_call_infos[len(self.api_call_infos) - limit - 1].release_raw()
 
-        # Handle both dictionary and object access for token counts
-        if hasattr(usage, "input_tokens"):
-            self._input_tokens += getattr(usage, "input_tokens", 0)
-        elif isinstance(usage, dict):
-            self._input_tokens += usage.get("input_tokens", 0)
-
-        if hasattr(usage, "output_tokens"):
-            self._output_tokens += getattr(usage, "output_tokens", 0)
-        elif isinstance(usage, dict):
-            self._output_tokens += usage.get("output_tokens", 0)
-
-        if hasattr(usage, "cache_read_input_tokens"):
-            self._cached_tokens += getattr(usage, "cache_read_input_tokens", 0)
-        elif isinstance(usage, dict):
-            self._cached_tokens += usage.get("cache_read_input_tokens", 0)
-
-        if hasattr(usage, "cache_creation_input_tokens"):
-            self._cache_write_tokens += getattr(usage, "cache_creation_input_tokens", 0)
-        elif isinstance(usage, dict):
-            self._cache_write_tokens += usage.get("cache_creation_input_tokens", 0)
+        usage = record.usage
+        self._input_tokens += _usage_value(usage, "input_tokens")
+        self._output_tokens += _usage_value(usage, "output_tokens")
+        self._cached_tokens += _usage_value(usage, "cache_read_input_tokens")
+        self._cache_write_tokens += _usage_value(usage, "cache_creation_input_tokens")
+        self._usd_cost += api_call_cost(record.model, usage, record.batch)
 
         return self
 
@@ -300,45 +431,7 @@ class RunResult:
     @property
     def usd_cost(self) -> float:
         """Return the estimated cost of the run in USD."""
-
-        def _get_value(obj: Any, key: str) -> int:
-            if hasattr(obj, key):
-                return getattr(obj, key, 0) or 0
-            if isinstance(obj, dict):
-                return obj.get(key, 0) or 0
-            return 0
-
-        total = 0.0
-        for info in self.api_call_infos:
-            model = info.get("model")
-            usage = info.get("usage", {})
-            # Import here to avoid circular dependency
-            from llmproc.providers.pricing import get_claude_pricing
-
-            pricing = get_claude_pricing(model)
-            if not pricing:
-                continue
-
-            total += (
-                _get_value(usage, "input_tokens") * pricing.get("input_tokens", 0)
-                + _get_value(usage, "output_tokens") * pricing.get("output_tokens", 0)
-                + _get_value(usage, "cache_creation_input_tokens") * pricing.get("cache_creation_input_tokens", 0)
-                + _get_value(usage, "cache_read_input_tokens") * pricing.get("cache_read_input_tokens", 0)
-            ) / 1_000_000
-
-            cache_creation = None
-            if hasattr(usage, "cache_creation"):
-                cache_creation = getattr(usage, "cache_creation", None)
-            elif isinstance(usage, dict):
-                cache_creation = usage.get("cache_creation")
-
-            if isinstance(cache_creation, dict):
-                for ttl_key, tokens in cache_creation.items():
-                    price = pricing.get("cache_creation", {}).get(ttl_key)
-                    if price is not None:
-                        total += tokens * price / 1_000_000
-
-        return total
+        return self._usd_cost
 
     def __repr__(self) -> str:
         """Create a string representation of the run result."""
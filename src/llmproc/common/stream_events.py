@@ -0,0 +1,146 @@
+"""Typed events yielded by :meth:`LLMProcess.stream`.
+
+Provider executors emit deltas as the raw provider stream delivers them, so
+consumers see the first token as soon as the API sends it instead of waiting
+for whole content blocks. Every event has a ``type`` string for matching
+without ``isinstance`` checks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any, ClassVar
+
+StreamEmitter = Callable[["StreamEvent"], Awaitable[None]]
+
+
+@dataclass(slots=True)
+class StreamEvent:
+    """Base class for stream events."""
+
+    type: ClassVar[str] = "event"
+
+
+@dataclass(slots=True)
+class TurnStart(StreamEvent):
+    """An API call is about to be made."""
+
+    type: ClassVar[str] = "turn_start"
+    turn: int
+
+
+@dataclass(slots=True)
+class TextDelta(StreamEvent):
+    """A fragment of assistant text."""
+
+    type: ClassVar[str] = "text_delta"
+    text: str
+    index: int = 0
+
+
+@dataclass(slots=True)
+class ThinkingDelta(StreamEvent):
+    """A fragment of extended-thinking output."""
+
+    type: ClassVar[str] = "thinking_delta"
+    thinking: str
+    index: int = 0
+
+
+@dataclass(slots=True)
+class ToolUseStart(StreamEvent):
+    """The model started a tool call; its arguments follow as :class:`InputJsonDelta`."""
+
+    type: ClassVar[str] = "tool_use_start"
+    id: str | None
+    name: str
+    index: int = 0
+
+
+@dataclass(slots=True)
+class InputJsonDelta(StreamEvent):
+    """A fragment of the JSON arguments of the current tool call."""
+
+    type: ClassVar[str] = "input_json_delta"
+    partial_json: str
+    index: int = 0
+
+
+@dataclass(slots=True)
+class ToolResultEvent(StreamEvent):
+    """A tool finished executing."""
+
+    type: ClassVar[str] = "tool_result"
+    tool_name: str
+    result: Any
+
+
+@dataclass(slots=True)
+class TurnEnd(StreamEvent):
+    """An API call and the tools it requested have completed."""
+
+    type: ClassVar[str] = "turn_end"
+    turn: int
+    response: Any = None
+
+
+@dataclass(slots=True)
+class RunEnd(StreamEvent):
+    """The run finished; always the last event of a stream."""
+
+    type: ClassVar[str] = "run_end"
+    run_result: Any
+
+
+def stream_emitter(process: Any) -> StreamEmitter | None:
+    """Return the coroutine that publishes events for ``process``.
+
+    Returns ``None`` unless :meth:`LLMProcess.stream` is consuming the
+    process, in which case executors request a streaming response from the
+    provider and forward deltas through the returned callable.
+    """
+    queue = getattr(process, "_stream_queue", None)
+    return queue.put if isinstance(queue, asyncio.Queue) else None
+
+
+class StreamCollector:
+    """Plugin translating process callbacks into stream events.
+
+    Registered by :meth:`LLMProcess.stream` for the duration of one run. It
+    has no ``fork()`` so forked and spawned children do not inherit it.
+    """
+
+    def __init__(self, emit: StreamEmitter) -> None:
+        self._emit = emit
+        self._turn = 0
+
+    async def turn_start(self) -> None:
+        """Emit :class:`TurnStart`."""
+        self._turn += 1
+        await self._emit(TurnStart(turn=self._turn))
+
+    async def tool_end(self, tool_name: str, result: Any) -> None:
+        """Emit :class:`ToolResultEvent`."""
+        await self._emit(ToolResultEvent(tool_name=tool_name, result=result))
+
+    async def turn_end(self, response: Any) -> None:
+        """Emit :class:`TurnEnd`."""
+        await self._emit(TurnEnd(turn=self._turn, response=response))
+
+
+__all__ = [
+    "StreamEvent",
+    "TurnStart",
+    "TextDelta",
+    "ThinkingDelta",
+    "ToolUseStart",
+    "InputJsonDelta",
+    "ToolResultEvent",
+    "TurnEnd",
+    "RunEnd",
+    "StreamEmitter",
+    "StreamCollector",
+    "stream_emitter",
+]
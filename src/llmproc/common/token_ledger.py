@@ -0,0 +1,123 @@
+"""Incremental, local token accounting for a process's context window.
+
+Counting tokens through a provider endpoint costs a network round-trip and a
+rebuild of the whole request. :class:`TokenLedger` instead starts from the
+prompt size the provider reported for the last API call and adds a local
+estimate for each message appended since, so a count costs O(new messages).
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Sequence
+from typing import Any
+
+# Fixed per-message cost for role markers and separators
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# Conversation roles sent to the model; other entries are executor bookkeeping
+_CONTEXT_ROLES = frozenset({"user", "assistant", "tool", "system"})
+
+
+def estimate_tokens(value: Any) -> int:
+    """Return a rough token estimate of four characters per token."""
+    if not value:
+        return 0
+    text = value if isinstance(value, str) else json.dumps(value, default=str, ensure_ascii=False)
+    return (len(text) + 3) // 4
+
+
+def estimate_message_tokens(message: Any) -> int:
+    """Return the estimated tokens ``message`` adds to the context."""
+    if not isinstance(message, dict):
+        return estimate_tokens(message) + MESSAGE_OVERHEAD_TOKENS
+    if message.get("role") not in _CONTEXT_ROLES:
+        return 0
+    extra = message.get("tool_calls")
+    return estimate_tokens(message.get("content")) + estimate_tokens(extra) + MESSAGE_OVERHEAD_TOKENS
+
+
+def usage_prompt_tokens(usage: Any) -> int | None:
+    """Return the prompt size reported in a provider ``usage`` object.
+
+    Handles Anthropic (``input_tokens`` plus cache reads and writes), OpenAI
+    (``prompt_tokens`` or ``input_tokens``) and Gemini
+    (``prompt_token_count``). Returns ``None`` when nothing usable is found.
+    """
+    if usage is None:
+        return None
+
+    def field(name: str) -> int:
+        value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+        return value if isinstance(value, int) else 0
+
+    for name in ("prompt_tokens", "prompt_token_count"):
+        if field(name):
+            return field(name)
+    total = field("input_tokens") + field("cache_creation_input_tokens") + field("cache_read_input_tokens")
+    return total or None
+
+
+class TokenLedger:
+    """Running count of the tokens a process would send with its next request.
+
+    Executors take a :meth:`checkpoint` of the state before each API call and
+    report the response usage with :meth:`record_usage`. :meth:`count` then
+    adds estimates for messages appended since. When the history was
+    truncated or replaced (``reset_state``, GOTO, fork) the ledger re-estimates
+    the whole context once and continues incrementally from there.
+    """
+
+    __slots__ = ("_tokens", "_length", "_anchor", "estimator")
+
+    def __init__(self, estimator: Callable[[Any], int] = estimate_message_tokens) -> None:
+        self._tokens = 0
+        self._length: int | None = None
+        self._anchor: Any = None
+        self.estimator = estimator
+
+    @staticmethod
+    def checkpoint(state: Sequence[Any]) -> tuple[int, Any]:
+        """Return a marker for the messages about to be sent."""
+        return len(state), state[-1] if state else None
+
+    def record_usage(self, checkpoint: tuple[int, Any], usage: Any) -> None:
+        """Seed the ledger with the prompt size the provider reported.
+
+        Args:
+            checkpoint: Value of :meth:`checkpoint` taken before the request
+            usage: Provider usage object or dict from the response
+        """
+        tokens = usage_prompt_tokens(usage)
+        if tokens is not None:
+            self._tokens = tokens
+            self._length, self._anchor = checkpoint
+
+    def invalidate(self) -> None:
+        """Forget the current count so the next :meth:`count` re-estimates."""
+        self._length = None
+
+    def count(self, process: Any) -> int:
+        """Return the tokens currently in ``process``'s context."""
+        state = process.state
+        length = self._length
+        if length is None or len(state) < length or (length and state[length - 1] is not self._anchor):
+            self._tokens = (
+                estimate_tokens(process.enriched_system_prompt or process.base_system_prompt)
+                + estimate_tokens(process.tools)
+                + sum(map(self.estimator, state))
+            )
+        elif len(state) > length:
+            self._tokens += sum(map(self.estimator, state[length:]))
+        else:
+            return self._tokens
+        self._length, self._anchor = self.checkpoint(state)
+        return self._tokens
+
+
+__all__ = [
+    "TokenLedger",
+    "estimate_tokens",
+    "estimate_message_tokens",
+    "usage_prompt_tokens",
+]
@@ -34,6 +34,9 @@ class MCPServerTools(BaseModel):
     tools: Literal["all"] | list[str | ToolConfig] = "all"
     # Default access applied to plain string tool entries
     default_access: AccessLevel | None = AccessLevel.WRITE
+    # Cache results of every selected tool; ToolConfig.cacheable opts in single tools
+    cacheable: bool = False
+    cache_ttl: float | None = None
 
     # Support both positional and keyword arguments for backward compatibility
     def __init__(self, server=None, tools=None, default_access=None, **kwargs):
@@ -103,6 +106,10 @@ class MCPServerTools(BaseModel):
                 alias=val.get("alias"),
                 description=val.get("description"),
                 param_descriptions=val.get("param_descriptions"),
+                parallel_safe=val.get("parallel_safe", False),
+                input_schema=val.get("input_schema"),
+                cacheable=val.get("cacheable", False),
+                cache_ttl=val.get("cache_ttl"),
             )
 
         access = cls._normalize_access(val)
@@ -167,6 +174,29 @@ class MCPServerTools(BaseModel):
 
         return self.default_access or AccessLevel.WRITE
 
+    def explicit_tools(self) -> list[ToolConfig] | None:
+        """Return the tool configs if every selected tool declares an ``input_schema``.
+
+        Returns:
+            The configs, or ``None`` when the server must be asked for its tools
+        """
+        if self.tools == "all" or not self.tools:
+            return None
+        if not all(isinstance(item, ToolConfig) and item.input_schema is not None for item in self.tools):
+            return None
+        return list(self.tools)
+
+    def result_cache_policy(self, tool_name: str) -> tuple[bool, float | None]:
+        """Return whether results of ``tool_name`` are cached and for how long.
+
+        Returns:
+            ``(cacheable, ttl)``; a ``ttl`` of ``None`` keeps results until evicted
+        """
+        cfg = self._find_tool(tool_name)
+        if cfg is not None and cfg.cacheable:
+            return True, cfg.cache_ttl if cfg.cache_ttl is not None else self.cache_ttl
+        return self.cacheable, self.cache_ttl
+
     def get_tool_names(self) -> list[str]:
         """Get a list of all tool names.
 
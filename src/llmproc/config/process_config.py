@@ -42,6 +42,7 @@ class ProcessConfig:
     mcp_enabled: bool | None = None
     user_prompt: str | None = None
     max_iterations: int = 10
+    max_parallel_tools: int = 1
     plugins: list[Any] = field(default_factory=list)
     loop: asyncio.AbstractEventLoop | None = None
 
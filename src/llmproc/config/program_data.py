@@ -24,3 +24,5 @@ class ProgramConfigData:
     region: str | None = None
     user_prompt: str | None = None
     max_iterations: int = 10
+    max_parallel_tools: int = 1
+    connection_pool: dict[str, Any] | None = None
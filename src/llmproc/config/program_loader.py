@@ -258,4 +258,8 @@ class ProgramLoader:
             region=config.model.region,
             user_prompt=config.prompt.user if hasattr(config.prompt, "user") else None,
             max_iterations=config.model.max_iterations,
+            max_parallel_tools=config.model.max_parallel_tools,
+            connection_pool=(
+                config.model.connection_pool.model_dump(exclude_none=True) if config.model.connection_pool else None
+            ),
         )
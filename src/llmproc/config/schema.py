@@ -17,6 +17,14 @@ from llmproc.config.utils import resolve_path
 from llmproc.plugins.env_info.constants import STANDARD_VAR_NAMES
 
 
+class ConnectionPoolConfig(BaseModel):
+    """HTTP connection pool limits for the shared provider client."""
+
+    max_connections: int | None = Field(default=None, gt=0)
+    max_keepalive_connections: int | None = Field(default=None, ge=0)
+    keepalive_expiry: float | None = Field(default=None, ge=0)
+
+
 class ModelConfig(BaseModel):
     """Model configuration section."""
 
@@ -25,6 +33,8 @@ class ModelConfig(BaseModel):
     project_id: str | None = None
     region: str | None = None
     max_iterations: int = 10
+    max_parallel_tools: int = Field(default=1, ge=1)
+    connection_pool: ConnectionPoolConfig | None = None
 
     @classmethod
     @field_validator("provider")
@@ -169,6 +179,8 @@ class FileDescriptorPluginConfig(BaseModel):
     max_input_chars: int = 8000
     page_user_input: bool = True
     enable_references: bool = False
+    spill_threshold_chars: int | None = Field(default=None, gt=0)
+    max_resident_bytes: int | None = Field(default=None, gt=0)
     tools: list[str | ToolConfig] = Field(default_factory=list)
 
     @classmethod
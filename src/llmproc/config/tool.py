@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+from typing import Any
+
 from pydantic import BaseModel, field_validator
 
 from llmproc.common.access_control import AccessLevel
@@ -13,6 +15,12 @@ class ToolConfig(BaseModel):
     description: str | None = None
     access: AccessLevel = AccessLevel.WRITE
     param_descriptions: dict[str, str] | None = None
+    parallel_safe: bool = False
+    # JSON schema of the tool's input; lets lazy MCP servers register the tool without connecting
+    input_schema: dict[str, Any] | None = None
+    # Reuse results of identical calls; ``cache_ttl`` seconds, ``None`` until evicted
+    cacheable: bool = False
+    cache_ttl: float | None = None
 
     def __init__(
         self,
@@ -45,4 +53,6 @@ class ToolConfig(BaseModel):
         desc_str = f", description='{self.description}'" if self.description else ""
         param_desc_str = f", param_descriptions={self.param_descriptions}" if self.param_descriptions else ""
         access_str = f", access={self.access.value}" if self.access != AccessLevel.WRITE else ""
-        return f"<ToolConfig {self.name}{access_str}{alias_str}{desc_str}{param_desc_str}>"
+        parallel_str = ", parallel_safe=True" if self.parallel_safe else ""
+        cache_str = ", cacheable=True" if self.cacheable else ""
+        return f"<ToolConfig {self.name}{access_str}{alias_str}{desc_str}{param_desc_str}{parallel_str}{cache_str}>"
@@ -2,18 +2,22 @@
 
 import asyncio
 import logging
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable
 from typing import Any, Optional, TypeVar
 
 from llmproc.callbacks import CallbackEvent
 from llmproc.common.results import RunResult, ToolResult
+from llmproc.common.stream_events import RunEnd, StreamCollector, StreamEvent
+from llmproc.common.token_ledger import TokenLedger
 from llmproc.config.process_config import ProcessConfig
 from llmproc.event_loop_mixin import EventLoopMixin
 from llmproc.plugin.plugin_event_runner import PluginEventRunner
 from llmproc.plugin.protocol import PluginProtocol
 from llmproc.plugins.stderr import StderrPlugin
 from llmproc.process_forking import ProcessForkingMixin
+from llmproc.providers.client_registry import provider_clients
 from llmproc.providers.utils import choose_provider_executor
+from llmproc.utils.background import DEFAULT_MAX_QUEUE_SIZE
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -67,11 +71,18 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
         self.state = cfg.state or []
         self.enriched_system_prompt = cfg.enriched_system_prompt
 
+        # Local token accounting seeded from API usage
+        self.token_ledger = TokenLedger()
+
         # Per-iteration buffers managed by executors
         self.iteration_state = None
 
-        # Client
+        # Event queue consumed by stream(); None when not streaming
+        self._stream_queue: asyncio.Queue | None = None
+
+        # Client, and whether aclose() already released this process's reference
         self.client = cfg.client
+        self._client_released = False
 
         # Initialize provider-specific executor
         self.executor = choose_provider_executor(cfg.provider, cfg.model_name)
@@ -95,6 +106,7 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
         # User prompt configuration
         self.user_prompt = cfg.user_prompt
         self.max_iterations = cfg.max_iterations
+        self.max_parallel_tools = cfg.max_parallel_tools
 
         # Unified plugin runner
         self.plugins = PluginEventRunner(self._submit_to_loop, cfg.plugins or [])
@@ -163,6 +175,67 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
             future = self._submit_to_loop(self._async_run(user_input, max_iterations))
             return await asyncio.wrap_future(future)
 
+    async def stream(self, user_input: str, max_iterations: int = None) -> AsyncIterator[StreamEvent]:
+        """Run the process and yield token-level events as they arrive.
+
+        Executors switch to the provider's streaming API for this run and
+        forward text, thinking and tool-input deltas as soon as the provider
+        delivers them. Tool results and turn boundaries are interleaved, and
+        the final event is always :class:`RunEnd` carrying the ``RunResult``.
+        ``API_STREAM_BLOCK`` callbacks still fire for every completed block.
+
+        ```python
+        async for event in process.stream("Hello"):
+            if event.type == "text_delta":
+                print(event.text, end="", flush=True)
+        ```
+
+        Closing the generator early cancels the run. The stream must be
+        consumed on the process's event loop.
+
+        Args:
+            user_input: The user message to process
+            max_iterations: Maximum number of tool-calling iterations
+
+        Yields:
+            StreamEvent instances from :mod:`llmproc.common.stream_events`
+
+        Raises:
+            RuntimeError: If the process is already streaming or is bound to another event loop
+        """
+        if self._stream_queue is not None:
+            raise RuntimeError("LLMProcess is already streaming; wait for the current stream to finish")
+        if self._loop is not None and asyncio.get_running_loop() is not self._loop:
+            raise RuntimeError("LLMProcess.stream() must be consumed on the process's event loop")
+        if max_iterations is None:
+            max_iterations = self.max_iterations
+
+        queue: asyncio.Queue[StreamEvent] = asyncio.Queue(maxsize=DEFAULT_MAX_QUEUE_SIZE)
+        collector = StreamCollector(queue.put)
+        self._stream_queue = queue
+        self.plugins.add(collector)
+        task = asyncio.create_task(self._async_run(user_input, max_iterations))
+        try:
+            while not task.done():
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait((getter, task), return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+            while not queue.empty():
+                yield queue.get_nowait()
+            yield RunEnd(run_result=task.result())
+        finally:
+            if not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+            self.plugins.remove(collector)
+            self._stream_queue = None
+
     async def _async_run(self, user_input: str, max_iterations: int) -> "RunResult":
         """Internal async implementation of run.
 
@@ -213,7 +286,9 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
         This delegates to the ToolManager which provides a consistent interface
         for getting tool schemas across all tool types.
 
-        The ToolManager handles filtering and validation.
+        The ToolManager handles filtering and validation. The schemas are
+        only rebuilt after a tool is registered; the returned list is shared
+        between calls and must not be modified.
 
         Returns:
             List of tool schemas formatted for the LLM provider's API.
@@ -237,12 +312,23 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
             aggregator = getattr(self.tool_manager, "mcp_aggregator", None)
             if aggregator is not None:
                 # Use asyncio.wait_for to apply timeout for MCP client closing
-                await asyncio.wait_for(aggregator.close_clients(), timeout=timeout / 2)
+                await asyncio.wait_for(self.tool_manager.close_mcp_clients(), timeout=timeout / 2)
         except TimeoutError:
             logger.warning(f"Timeout while closing MCP clients after {timeout / 2} seconds")
         except Exception as exc:  # noqa: BLE001 – best-effort
             logger.warning("Error while closing MCP clients: %s", exc)
 
+        # Release this process's reference to the shared provider client once
+        if not self._client_released:
+            self._client_released = True
+            try:
+                await provider_clients.release(self.client)
+            except Exception as exc:  # noqa: BLE001 – best-effort
+                logger.warning("Error while releasing provider client: %s", exc)
+
+        # Let plugins release their resources; callback errors are only logged
+        await self.trigger_event(CallbackEvent.PROCESS_CLOSE)
+
         # Stop private loop if we own it
         if self._own_loop and self._loop is not None:
             self._loop.call_soon_threadsafe(self._loop.stop)
@@ -270,12 +356,21 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
             logger.error(error_msg, exc_info=True)
             return ToolResult.from_error(error_msg)
 
-    async def count_tokens(self):
-        """Count tokens in the current conversation state using the executor.
+    async def count_tokens(self, exact: bool = False):
+        """Count tokens in the current conversation state.
+
+        By default the count comes from :attr:`token_ledger`: the prompt size
+        the provider reported for the last API call plus a local estimate for
+        messages appended since. No request is made, so this is cheap enough
+        to call every turn. Pass ``exact=True`` to ask the provider's
+        executor instead, which may make a token-counting API call.
+
+        Args:
+            exact: Use the executor's token counting instead of the ledger
 
         Returns:
             dict | None: Token count information with provider-specific details
-            or ``None`` if token counting is unsupported. The returned
+            or ``None`` if exact token counting is unsupported. The returned
             dictionary may include:
                 - ``input_tokens``: Number of tokens in conversation
                 - ``context_window``: Max tokens supported by the model
@@ -285,6 +380,16 @@ class LLMProcess(EventLoopMixin, ProcessForkingMixin):
                 - ``note``: Informational message when estimation is used
                 - ``error``: Error message if token counting failed
         """
+        if not exact:
+            tokens = self.token_ledger.count(self)
+            window_size = self.executor.context_window_size(self.model_name)
+            return {
+                "input_tokens": tokens,
+                "context_window": window_size,
+                "percentage": (tokens / window_size * 100) if window_size > 0 else 0,
+                "remaining_tokens": max(0, window_size - tokens),
+            }
+
         # Use the provider-specific executor configured for this process. The
         # executor map is used during initialization, so ``self.executor`` is
         # responsible for implementing ``count_tokens`` when supported.
@@ -413,13 +518,16 @@ class SyncLLMProcess(LLMProcess):
         logger.debug(f"Running SyncLLMProcess with input: {user_input[:50]}...")
         return self._loop.run_until_complete(super().run(user_input, max_iterations))
 
-    def count_tokens(self) -> dict[str, Any]:
+    def count_tokens(self, exact: bool = False) -> dict[str, Any]:
         """Count tokens in the conversation synchronously.
 
+        Args:
+            exact: Use the executor's token counting instead of the ledger
+
         Returns:
             Token count information with provider-specific details
         """
-        return self._loop.run_until_complete(super().count_tokens())
+        return self._loop.run_until_complete(super().count_tokens(exact=exact))
 
     def close(self) -> None:
         """Clean up resources synchronously.
@@ -23,6 +23,7 @@ API_STREAM_BLOCK = "api_stream_block"
 TURN_START = "turn_start"
 TURN_END = "turn_end"
 RUN_END = "run_end"
+PROCESS_CLOSE = "process_close"
 
 
 # ---------------------------------------------------------------------------
@@ -45,6 +46,7 @@ EVENT_CATEGORIES: dict[str | HookEvent, EventCategory] = {
     TURN_START: EventCategory.OBSERVATIONAL,
     TURN_END: EventCategory.OBSERVATIONAL,
     RUN_END: EventCategory.OBSERVATIONAL,
+    PROCESS_CLOSE: EventCategory.OBSERVATIONAL,
     HOOK_USER_INPUT: EventCategory.BEHAVIORAL,
     HOOK_TOOL_CALL: EventCategory.BEHAVIORAL,
     HOOK_TOOL_RESULT: EventCategory.BEHAVIORAL,
@@ -65,6 +67,7 @@ class CallbackEvent(Enum):
     TURN_START = TURN_START
     TURN_END = TURN_END
     RUN_END = RUN_END
+    PROCESS_CLOSE = PROCESS_CLOSE
 
 
 class HookEvent(Enum):
@@ -104,6 +107,7 @@ __all__ = [
     "TURN_START",
     "TURN_END",
     "RUN_END",
+    "PROCESS_CLOSE",
     "HOOK_USER_INPUT",
     "HOOK_TOOL_CALL",
     "HOOK_TOOL_RESULT",
@@ -7,11 +7,6 @@ from typing import TYPE_CHECKING, Any
 
 from llmproc.common.results import ToolResult
 from llmproc.plugin.plugin_runner import PluginRunner
-from llmproc.plugin.plugin_utils import (
-    call_plugin,
-    filter_callback_parameters,
-    has_plugin_method,
-)
 
 if TYPE_CHECKING:  # pragma: no cover - type hints only
     from llmproc.plugin.datatypes import ResponseHookResult, ToolCallHookResult
@@ -30,6 +25,7 @@ class PluginEventRunner(PluginRunner):
 
     def __init__(self, submit, plugins: Iterable[Any] | None = None) -> None:
         super().__init__(submit, plugins)
+        # Read-only view; register plugins with add() so dispatch is rebuilt
         self.plugins = self._plugins
 
     def __iter__(self):
@@ -65,21 +61,25 @@ class PluginEventRunner(PluginRunner):
 
         Asynchronous callback results are awaited synchronously.
         """
-        if not self._plugins:
+        subscribers = self._subscribers(event)
+        if not subscribers:
             return
 
-        event_kwargs = kwargs.copy()
-        event_kwargs["process"] = process
+        kwargs["process"] = process
 
-        for plugin in self._plugins:
-            if not has_plugin_method(plugin, event):
-                continue
+        # Plugins of the same class accept the same parameters; select them once
+        selections: dict[tuple[str, ...] | None, dict[str, Any]] = {}
 
-            method = getattr(plugin, event)
-            filtered = filter_callback_parameters(method, event_kwargs)
+        for subscriber in subscribers:
+            selected = selections.get(subscriber.params)
+            if selected is None:
+                selected = selections[subscriber.params] = subscriber.select(kwargs)
             try:
-                result = method(**filtered)
-                if inspect.isawaitable(result):
+                if subscriber.is_coroutine:
+                    await subscriber.method(**selected)
+                    continue
+                result = subscriber.method(**selected)
+                if result is not None and inspect.isawaitable(result):
                     await result
             except Exception as exc:  # noqa: BLE001
                 logger.warning("Error in %s callback: %s", event, exc)
@@ -89,8 +89,8 @@ class PluginEventRunner(PluginRunner):
     # ------------------------------------------------------------------
     async def user_input(self, user_input: str, process) -> str:
         current = user_input
-        for plugin in self._plugins:
-            result = await self._call_async(plugin, HookEvent.USER_INPUT.value, current, process, propagate=True)
+        for subscriber in self._subscribers(HookEvent.USER_INPUT.value):
+            result = await self._invoke(subscriber, current, process, propagate=True)
             if result is not None:
                 current = result
         return current
@@ -99,10 +99,9 @@ class PluginEventRunner(PluginRunner):
         from llmproc.plugin.datatypes import ToolCallHookResult
 
         current_args = args
-        for plugin in self._plugins:
-            result = await self._call_async(
-                plugin,
-                HookEvent.TOOL_CALL.value,
+        for subscriber in self._subscribers(HookEvent.TOOL_CALL.value):
+            result = await self._invoke(
+                subscriber,
                 tool_name,
                 current_args,
                 process,
@@ -117,10 +116,9 @@ class PluginEventRunner(PluginRunner):
 
     async def tool_result(self, result: ToolResult, process, tool_name: str) -> ToolResult:
         current = result
-        for plugin in self._plugins:
-            modified = await self._call_async(
-                plugin,
-                HookEvent.TOOL_RESULT.value,
+        for subscriber in self._subscribers(HookEvent.TOOL_RESULT.value):
+            modified = await self._invoke(
+                subscriber,
                 tool_name,
                 current,
                 process,
@@ -132,10 +130,9 @@ class PluginEventRunner(PluginRunner):
 
     async def system_prompt(self, prompt: str, process) -> str:
         current = prompt
-        for plugin in self._plugins:
-            modified = await self._call_async(
-                plugin,
-                HookEvent.SYSTEM_PROMPT.value,
+        for subscriber in self._subscribers(HookEvent.SYSTEM_PROMPT.value):
+            modified = await self._invoke(
+                subscriber,
                 current,
                 process,
                 propagate=True,
@@ -148,10 +145,9 @@ class PluginEventRunner(PluginRunner):
         from llmproc.plugin.datatypes import ResponseHookResult
 
         result = None
-        for plugin in self._plugins:
-            hook_result = await self._call_async(
-                plugin,
-                HookEvent.RESPONSE.value,
+        for subscriber in self._subscribers(HookEvent.RESPONSE.value):
+            hook_result = await self._invoke(
+                subscriber,
                 content,
                 process,
                 propagate=True,
@@ -164,10 +160,8 @@ class PluginEventRunner(PluginRunner):
 
     def provide_tools(self) -> list[Callable]:
         tools: list[Callable] = []
-        for plugin in self._plugins:
-            if has_plugin_method(plugin, HookEvent.PROVIDE_TOOLS.value):
-                provided = call_plugin(plugin, HookEvent.PROVIDE_TOOLS.value) or []
-                tools.extend(provided)
+        for subscriber in self._subscribers(HookEvent.PROVIDE_TOOLS.value):
+            tools.extend(subscriber.method() or [])
         return tools
 
 
@@ -3,42 +3,98 @@ from __future__ import annotations
 import inspect
 import logging
 from collections.abc import Callable, Iterable
+from dataclasses import dataclass
 from typing import Any
 
-from .plugin_utils import has_plugin_method
+from .plugin_utils import _get_method_signature, has_plugin_method
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True, frozen=True)
+class Subscriber:
+    """A plugin method subscribed to one event.
+
+    Attributes:
+        plugin: The plugin object
+        method: The bound method handling the event
+        params: Keyword arguments the method accepts, or ``None`` if it takes ``**kwargs``
+        is_coroutine: Whether ``method`` is a coroutine function
+    """
+
+    plugin: Any
+    method: Callable[..., Any]
+    params: tuple[str, ...] | None
+    is_coroutine: bool
+
+    @classmethod
+    def for_method(cls, plugin: Any, method: Callable[..., Any]) -> Subscriber:
+        """Inspect ``method`` once and return its subscriber entry."""
+        has_var_keyword, required, optional = _get_method_signature(method)
+        return cls(
+            plugin=plugin,
+            method=method,
+            params=None if has_var_keyword else required + optional,
+            is_coroutine=inspect.iscoroutinefunction(method),
+        )
+
+    def select(self, available: dict[str, Any]) -> dict[str, Any]:
+        """Return the entries of ``available`` that :attr:`method` accepts."""
+        if self.params is None:
+            return available
+        return {name: available[name] for name in self.params if name in available}
+
+
 class PluginRunner:
-    """Base helper for executing plugin methods."""
+    """Base helper for executing plugin methods.
+
+    Plugin methods are looked up once per event and kept in a dispatch table
+    until a plugin is added or removed, so plugins must be changed through
+    :meth:`add` and :meth:`remove`.
+    """
 
     def __init__(self, submit: Callable[[Any], Any], plugins: Iterable[Any] | None = None) -> None:
         """Initialize with a scheduler function and optional plugins."""
         self._submit = submit
         self._plugins: list[Any] = list(plugins or [])
+        self._dispatch: dict[str, tuple[Subscriber, ...]] = {}
 
     def add(self, plugin: Any) -> None:
         """Register a plugin object."""
         self._plugins.append(plugin)
+        self._dispatch.clear()
 
-    async def _call_async(
-        self, plugin: Any, method_name: str, *args: Any, propagate: bool = False, **kwargs: Any
-    ) -> Any:
-        """Invoke ``method_name`` on ``plugin`` and await the result if needed."""
-        if not has_plugin_method(plugin, method_name):
-            return None
-        method = getattr(plugin, method_name)
+    def remove(self, plugin: Any) -> None:
+        """Unregister a plugin object previously passed to :meth:`add`."""
+        self._plugins.remove(plugin)
+        self._dispatch.clear()
+
+    def _subscribers(self, event: str) -> tuple[Subscriber, ...]:
+        """Return the plugin methods handling ``event`` in registration order."""
+        subscribers = self._dispatch.get(event)
+        if subscribers is None:
+            subscribers = self._dispatch[event] = tuple(
+                Subscriber.for_method(plugin, getattr(plugin, event))
+                for plugin in self._plugins
+                if has_plugin_method(plugin, event)
+            )
+        return subscribers
+
+    async def _invoke(self, subscriber: Subscriber, *args: Any, propagate: bool = False, **kwargs: Any) -> Any:
+        """Invoke ``subscriber`` and await the result if needed."""
         try:
-            result = method(*args, **kwargs)
+            if subscriber.is_coroutine:
+                return await subscriber.method(*args, **kwargs)
+            result = subscriber.method(*args, **kwargs)
             if inspect.isawaitable(result):
                 return await result
             return result
         except Exception as exc:  # pragma: no cover - defensive
-            logger.warning("Error in %s.%s: %s", plugin, method_name, exc)
+            name = getattr(subscriber.method, "__name__", subscriber.method)
+            logger.warning("Error in %s.%s: %s", subscriber.plugin, name, exc)
             if propagate:
                 raise
             return None
 
 
-__all__ = ["PluginRunner"]
+__all__ = ["PluginRunner", "Subscriber"]
@@ -57,6 +57,10 @@ class PluginProtocol(Protocol):
         """Called when ``LLMProcess.run`` completes."""
         ...
 
+    def process_close(self, *, process) -> None:
+        """Called when the process is closed with ``aclose()``; release resources here."""
+        ...
+
     # ------------------------------------------------------------------
     # Behavioral hook methods
     # ------------------------------------------------------------------
@@ -16,6 +16,7 @@ Attributes:
     page_user_input (bool): Whether to automatically page large user inputs
     enable_references (bool): Whether to enable reference ID system
     fd_related_tools (set): Set of tool names that are part of the FD system
+    spill_store (SpillStore): Disk-backed storage tier for large content
 """
 
 # Method docstrings
@@ -27,6 +28,10 @@ Args:
     max_input_chars: Threshold for automatic user input FD creation
     page_user_input: Whether to automatically page large user inputs
     enable_references: Whether to enable the reference ID system
+    spill_threshold_chars: Content at least this long is stored on disk and
+        read through ``mmap`` (``None`` keeps all content in memory)
+    max_resident_bytes: Cap on in-memory content; least recently used
+        descriptors beyond it are spilled to disk (``None`` for no cap)
 """
 
 
@@ -39,6 +39,7 @@ from .references import (
     extract_references,
     format_user_input_reference,
 )
+from .storage import SpillStore, iter_content_chunks
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -54,9 +55,12 @@ class FileDescriptorManager:
         max_input_chars: int = 8000,
         page_user_input: bool = False,
         enable_references: bool = False,
+        spill_threshold_chars: int | None = None,
+        max_resident_bytes: int | None = None,
     ):
         """Initialize the FileDescriptorManager."""
         self.file_descriptors: dict[str, dict[str, Any]] = {}
+        self.spill_store = SpillStore(spill_threshold_chars, max_resident_bytes)
         self.default_page_size = default_page_size
         self.max_direct_output_chars = max_direct_output_chars
         self.max_input_chars = max_input_chars
@@ -149,6 +153,9 @@ class FileDescriptorManager:
         # Update the file descriptor with the calculated number of pages
         self.file_descriptors[fd_id]["total_pages"] = num_pages
 
+        # Large content may be moved to disk once the entry is complete
+        self.spill_store.admit(self.file_descriptors, fd_id)
+
         # Create the file descriptor result
         fd_result = {
             "fd": fd_id,
@@ -201,6 +208,7 @@ class FileDescriptorManager:
             raise KeyError(error_msg)
 
         fd_entry = self.file_descriptors[fd_id]
+        self.spill_store.touch(fd_id)
 
         # Prepare to get content based on read parameters
         content_to_return = None
@@ -217,7 +225,7 @@ class FileDescriptorManager:
             # Read the entire content regardless of other positioning parameters
             total_pages = fd_entry["total_pages"]
 
-            content_to_return = fd_entry["content"]
+            content_to_return = str(fd_entry["content"])
             content_metadata = {
                 "fd": fd_id,
                 "page": "all",
@@ -316,6 +324,7 @@ class FileDescriptorManager:
 
         # Get the content
         content = self.file_descriptors[fd_id]["content"]
+        self.spill_store.touch(fd_id)
 
         # Validate mode parameter
         if mode not in ["write", "append"]:
@@ -348,7 +357,8 @@ class FileDescriptorManager:
 
         # Write the file
         with open(file_path, file_mode, encoding="utf-8") as f:
-            f.write(content)
+            for chunk in iter_content_chunks(content):
+                f.write(chunk)
 
         # Create success message
         success_msg = (
@@ -402,12 +412,15 @@ class FileDescriptorManager:
         if not self.enable_references:
             return []
 
-        return extract_references(
+        references = extract_references(
             assistant_message=assistant_message,
             file_descriptors=self.file_descriptors,
             default_page_size=self.default_page_size,
             index_lines_func=index_lines,
         )
+        for reference in references:
+            self.spill_store.admit(self.file_descriptors, reference["fd_id"])
+        return references
 
     def process_references(self, message: str) -> str:
         """Process references in an assistant message."""
@@ -423,6 +436,10 @@ class FileDescriptorManager:
         # It just stores the references in the FD system
         return message
 
+    def close(self) -> None:
+        """Delete any file descriptor content spilled to disk."""
+        self.spill_store.close()
+
 
 # Apply full docstrings
 FileDescriptorManager.__doc__ = FILEDESCRIPTORMANAGER_CLASS
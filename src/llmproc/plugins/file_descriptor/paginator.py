@@ -2,8 +2,12 @@
 
 This module handles line-aware pagination and content extraction for file descriptors.
 It enables efficient access to large content by page, line, or character position.
+
+Line lookups bisect the sorted line index returned by :func:`index_lines`, so
+locating a position costs O(log lines) instead of a scan over every line.
 """
 
+from bisect import bisect_left, bisect_right
 from typing import Any
 
 
@@ -17,13 +21,27 @@ def index_lines(content: str) -> tuple[list[int], int]:
         Tuple of (list of line start indices, total line count)
     """
     lines = [0]  # First line always starts at index 0
-    for i, char in enumerate(content):
-        if char == "\n" and i + 1 < len(content):
-            lines.append(i + 1)
+    # A trailing newline does not start a new line
+    last = len(content) - 1
+    find = content.find
+    pos = find("\n", 0, last)
+    while pos != -1:
+        lines.append(pos + 1)
+        pos = find("\n", pos + 1, last)
 
     return lines, len(lines)
 
 
+def line_at(lines: list[int], pos: int) -> int:
+    """Return the 1-based number of the line containing character ``pos``."""
+    return bisect_right(lines, pos)
+
+
+def last_line_before(lines: list[int], pos: int) -> int:
+    """Return the 1-based number of the last line starting before ``pos``."""
+    return bisect_left(lines, pos)
+
+
 def get_page_content(content: str, lines: list[int], page_size: int, start_pos: int) -> tuple[str, dict[str, Any]]:
     """Get content for a specific page position with line-aware pagination.
 
@@ -55,28 +73,18 @@ def get_page_content(content: str, lines: list[int], page_size: int, start_pos:
     end_char = min(start_char + page_size, len(content))
 
     # Find line boundaries for better pagination
-    start_line = 1
-    end_line = 1
     continued = False
     truncated = False
 
     # Find the start line (the line containing start_char)
-    for i, line_start in enumerate(lines):
-        if line_start > start_char:
-            start_line = i  # The previous line
-            break
-        start_line = i + 1
+    start_line = line_at(lines, start_char)
 
     # Check if we're continuing from previous page (not starting at line boundary)
     if start_char > 0 and start_line > 1 and start_char != lines[start_line - 1]:
         continued = True
 
-    # Find the end line (the line containing or after end_char)
-    for i, line_start in enumerate(lines):
-        if line_start >= end_char:
-            end_line = i  # The previous line
-            break
-        end_line = i + 1
+    # Find the end line (the last line starting before end_char)
+    end_line = last_line_before(lines, end_char)
 
     # Check if we're truncating (not ending at line boundary)
     next_line_start = len(content)
@@ -103,7 +111,8 @@ def get_page_content(content: str, lines: list[int], page_size: int, start_pos:
 def calculate_total_pages(content: str, lines: list[int], page_size: int) -> int:
     """Calculate the total number of pages in content using line-aware pagination.
 
-    This simulates the line-aware pagination algorithm to get an accurate page count.
+    Each page ends after the last line starting before ``page_size``
+    characters, and the next page begins at the following line start.
 
     Args:
         content: The content to paginate
@@ -113,36 +122,23 @@ def calculate_total_pages(content: str, lines: list[int], page_size: int) -> int
     Returns:
         The total number of pages
     """
+    content_length = len(content)
     # For very small content, just return 1 page
-    if len(content) <= page_size:
+    if content_length <= page_size:
         return 1
 
-    # For larger content, iterate through the pages
+    total_lines = len(lines)
     start_char = 0
-    page_count = 0
-
-    while start_char < len(content):
-        page_count += 1
-
-        # Calculate end of current page
-        end_char = min(start_char + page_size, len(content))
-
-        # Find the end line for this page
-        end_line = 1
-
+    page_count = 1
+    while True:
         # Find the end line for this page
-        for i, line_start in enumerate(lines):
-            if line_start >= end_char:
-                end_line = i  # The previous line
-                break
-            end_line = i + 1
-
-        # Determine the start of the next page
-        if end_line < len(lines):
-            start_char = lines[end_line]
-        else:
+        end_line = last_line_before(lines, min(start_char + page_size, content_length))
+        if end_line >= total_lines:
             # No more lines, we're done
             break
+        # Determine the start of the next page
+        start_char = lines[end_line]
+        page_count += 1
 
     return page_count
 
@@ -205,20 +201,10 @@ def extract_char_content(
     end_char = min(start + count, content_length)
     extracted = content[start:end_char]
 
-    start_line_num = 1
-    for i, line_start in enumerate(lines):
-        if line_start > start:
-            start_line_num = i
-            break
-        start_line_num = i + 1
-
-    end_line_num = start_line_num
-    for i in range(start_line_num - 1, len(lines)):
-        if i + 1 < len(lines) and lines[i + 1] > end_char:
-            end_line_num = i + 1
-            break
-        if i + 1 == len(lines):
-            end_line_num = total_lines
+    start_line_num = line_at(lines, start)
+    end_line_num = line_at(lines, end_char)
+    if end_line_num >= len(lines):
+        end_line_num = total_lines
 
     metadata = {
         "pages": total_pages,
@@ -31,6 +31,8 @@ class FileDescriptorPlugin:
             max_input_chars=config.max_input_chars,
             page_user_input=config.page_user_input,
             enable_references=config.enable_references,
+            spill_threshold_chars=config.spill_threshold_chars,
+            max_resident_bytes=config.max_resident_bytes,
         )
 
     def fork(self) -> FileDescriptorPlugin:
@@ -38,6 +40,10 @@ class FileDescriptorPlugin:
         cloned = FileDescriptorPlugin(cloned_cfg)
         return cloned
 
+    def process_close(self) -> None:
+        """Remove spilled file descriptor content when the process closes."""
+        self.fd_manager.close()
+
     async def hook_user_input(self, user_input: str, process) -> str | None:
         if len(user_input) > self.fd_manager.max_input_chars:
             # The manager now exposes handle_user_input() instead of store().
@@ -10,7 +10,7 @@ import re
 import time
 from typing import Any
 
-from .paginator import calculate_total_pages
+from .paginator import calculate_total_pages, index_lines
 
 # Set up logger
 logger = logging.getLogger(__name__)
@@ -33,18 +33,9 @@ def extract_references(
     Returns:
         A list of dictionaries containing reference information (id, content)
     """
-    # If index_lines_func wasn't provided, use local implementation
+    # If index_lines_func wasn't provided, use the paginator implementation
     if index_lines_func is None:
-
-        def default_index_lines(content: str) -> tuple[list[int], int]:
-            lines = [0]  # First line always starts at index 0
-            for i, char in enumerate(content):
-                if char == "\n" and i + 1 < len(content):
-                    lines.append(i + 1)
-
-            return lines, len(lines)
-
-        index_lines_func = default_index_lines
+        index_lines_func = index_lines
 
     # Use an optimized regex pattern for better performance
     # This pattern is non-greedy and handles attributes more efficiently
@@ -125,7 +116,7 @@ def extract_references(
         # Calculate the total number of pages using the standard pagination function
         # This ensures references use the same pagination logic as regular file descriptors,
         # preserving line boundaries and maintaining consistent page sizes
-        num_pages = calculate_total_pages(content, lines, page_size)
+        total_pages = calculate_total_pages(content, lines, page_size)
 
         # Store or update the file descriptor entry
         file_descriptors[fd_id] = {
@@ -135,7 +126,7 @@ def extract_references(
             "page_size": page_size,
             "creation_time": time.time(),
             "source": "reference",
-            "total_pages": num_pages,
+            "total_pages": total_pages,
         }
 
         # Store information about the reference
@@ -0,0 +1,208 @@
+"""Disk-backed storage tier for file descriptor content.
+
+Large descriptor content can be spilled to a temporary file and read back
+through ``mmap`` slices instead of being kept as a Python string for the life
+of the process. Content is written with a fixed-width encoding (1, 2 or 4
+bytes per character, like CPython's own string storage), so character offsets
+map directly to byte offsets and the paginator can slice spilled content
+exactly as it slices a ``str``.
+"""
+
+import logging
+import mmap
+import shutil
+import sys
+import tempfile
+import weakref
+from array import array
+from collections import OrderedDict
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# (encoding, bytes per character, error handler) in order of preference
+_FIXED_WIDTH_ENCODINGS = (
+    ("latin-1", 1, "strict"),
+    ("utf-16-le", 2, "surrogatepass"),
+    ("utf-32-le", 4, "surrogatepass"),
+)
+
+
+def _encode_fixed_width(content: str) -> tuple[bytes, str, int, str]:
+    """Encode ``content`` with the narrowest encoding that has a fixed width."""
+    for encoding, width, errors in _FIXED_WIDTH_ENCODINGS:
+        try:
+            data = content.encode(encoding, errors)
+        except UnicodeEncodeError:
+            continue
+        # UTF-16 needs surrogate pairs for astral characters
+        if len(data) == width * len(content):
+            return data, encoding, width, errors
+    raise AssertionError("utf-32 always encodes with a fixed width")  # pragma: no cover
+
+
+class SpilledContent:
+    """Read-only, string-like view of descriptor content stored on disk.
+
+    Supports ``len()``, slicing with a step of 1 and ``str()``, which is all
+    the paginator and the FD tools need.
+    """
+
+    __slots__ = ("path", "_mmap", "_encoding", "_width", "_errors", "_length", "__weakref__")
+
+    def __init__(self, content: str, directory: Path) -> None:
+        """Write ``content`` to a new file in ``directory`` and map it."""
+        data, self._encoding, self._width, self._errors = _encode_fixed_width(content)
+        self._length = len(content)
+        with tempfile.NamedTemporaryFile(dir=directory, prefix="fd-", suffix=".bin", delete=False) as f:
+            f.write(data)
+            f.flush()
+            self.path = Path(f.name)
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self) -> int:
+        """Return the length of the content in characters."""
+        return self._length
+
+    def __getitem__(self, key: slice) -> str:
+        """Return the characters selected by ``key`` as a string."""
+        if not isinstance(key, slice):
+            raise TypeError("spilled content only supports slicing")
+        start, stop, step = key.indices(self._length)
+        if step != 1:
+            raise ValueError("spilled content only supports contiguous slices")
+        if stop <= start:
+            return ""
+        width = self._width
+        return self._mmap[start * width : stop * width].decode(self._encoding, self._errors)
+
+    def __str__(self) -> str:
+        """Return the full content."""
+        return self[:]
+
+    def __repr__(self) -> str:
+        """Return a short description without reading the content."""
+        return f"SpilledContent(path={str(self.path)!r}, chars={self._length})"
+
+    def iter_chunks(self, chunk_chars: int = 1 << 20) -> Iterator[str]:
+        """Yield the content in pieces of at most ``chunk_chars`` characters."""
+        for start in range(0, self._length, chunk_chars):
+            yield self[start : start + chunk_chars]
+
+    def close(self) -> None:
+        """Unmap and delete the backing file."""
+        if not self._mmap.closed:
+            self._mmap.close()
+        self.path.unlink(missing_ok=True)
+
+
+def iter_content_chunks(content: Any) -> Iterator[str]:
+    """Yield descriptor content as strings without materializing spilled content."""
+    if isinstance(content, SpilledContent):
+        yield from content.iter_chunks()
+    else:
+        yield content
+
+
+class SpillStore:
+    """Track resident descriptor content and spill it to disk when needed.
+
+    Entries at least ``spill_threshold_chars`` long are spilled as soon as they
+    are admitted. Smaller entries stay in memory until their combined size
+    exceeds ``max_resident_bytes``, at which point the least recently used ones
+    are spilled. Spilled entries keep their line index as a compact
+    ``array('Q')``. Either limit can be ``None`` to disable it.
+    """
+
+    def __init__(
+        self,
+        spill_threshold_chars: int | None = None,
+        max_resident_bytes: int | None = None,
+        directory: str | Path | None = None,
+    ) -> None:
+        self.spill_threshold_chars = spill_threshold_chars
+        self.max_resident_bytes = max_resident_bytes
+        self.directory = Path(directory) if directory is not None else None
+        self.resident_bytes = 0
+        self._resident: OrderedDict[str, int] = OrderedDict()
+        self._spilled: dict[str, SpilledContent] = {}
+        self._tmpdir: Path | None = None
+        self._finalizer: weakref.finalize | None = None
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if any spill limit is configured."""
+        return self.spill_threshold_chars is not None or self.max_resident_bytes is not None
+
+    def is_spilled(self, fd_id: str) -> bool:
+        """Return True if ``fd_id`` is served from disk."""
+        return fd_id in self._spilled
+
+    def admit(self, entries: dict[str, dict[str, Any]], fd_id: str) -> None:
+        """Start tracking the (new or replaced) entry ``fd_id``."""
+        self.release(fd_id)
+        if not self.enabled:
+            return
+        content = entries[fd_id]["content"]
+        if self.spill_threshold_chars is not None and len(content) >= self.spill_threshold_chars:
+            self._spill(fd_id, entries[fd_id])
+            return
+        size = sys.getsizeof(content)
+        self._resident[fd_id] = size
+        self.resident_bytes += size
+        self._enforce_limit(entries)
+
+    def touch(self, fd_id: str) -> None:
+        """Mark ``fd_id`` as recently used."""
+        if fd_id in self._resident:
+            self._resident.move_to_end(fd_id)
+
+    def release(self, fd_id: str) -> None:
+        """Stop tracking ``fd_id`` and delete its spill file, if any."""
+        size = self._resident.pop(fd_id, None)
+        if size is not None:
+            self.resident_bytes -= size
+        spilled = self._spilled.pop(fd_id, None)
+        if spilled is not None:
+            spilled.close()
+
+    def close(self) -> None:
+        """Delete all spill files."""
+        for spilled in self._spilled.values():
+            spilled.close()
+        self._spilled.clear()
+        self._resident.clear()
+        self.resident_bytes = 0
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+            self._tmpdir = None
+
+    def _enforce_limit(self, entries: dict[str, dict[str, Any]]) -> None:
+        if self.max_resident_bytes is None:
+            return
+        while self.resident_bytes > self.max_resident_bytes and self._resident:
+            fd_id, size = self._resident.popitem(last=False)
+            self.resident_bytes -= size
+            entry = entries.get(fd_id)
+            if entry is not None:
+                self._spill(fd_id, entry)
+
+    def _spill(self, fd_id: str, entry: dict[str, Any]) -> None:
+        content = entry["content"]
+        if not isinstance(content, str) or not content:
+            return
+        spilled = SpilledContent(content, self._spill_dir())
+        entry["content"] = spilled
+        entry["lines"] = array("Q", entry["lines"])
+        self._spilled[fd_id] = spilled
+        logger.debug("Spilled %s (%s chars) to %s", fd_id, len(spilled), spilled.path)
+
+    def _spill_dir(self) -> Path:
+        if self._tmpdir is None:
+            self._tmpdir = Path(tempfile.mkdtemp(prefix="llmproc-fd-", dir=self.directory))
+            # Remove the directory even if close() is never called
+            self._finalizer = weakref.finalize(self, shutil.rmtree, self._tmpdir, ignore_errors=True)
+        return self._tmpdir
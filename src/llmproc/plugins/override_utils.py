@@ -17,7 +17,7 @@ def apply_tool_overrides(
     If ``overrides`` is ``None`` or empty, the original ``tools`` list is
     returned unchanged. If any items in ``overrides`` are strings, only those
     named tools are kept. ``ToolConfig`` objects can override descriptions,
-    aliases, parameter help, and access levels.
+    aliases, parameter help, access levels, and ``parallel_safe``.
     """
     if not overrides:
         return tools
@@ -52,6 +52,8 @@ def apply_tool_overrides(
             meta.name = item.alias
         if item.access is not None:
             meta.access = item.access
+        if item.parallel_safe:
+            meta.parallel_safe = True
 
         target = func.__func__ if hasattr(func, "__func__") else func
         attach_meta(target, meta)
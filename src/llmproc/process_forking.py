@@ -3,13 +3,12 @@
 from __future__ import annotations
 
 import asyncio
-import copy
 import logging
 from typing import TYPE_CHECKING
 
 from llmproc.common.access_control import AccessLevel
 from llmproc.plugin.plugin_event_runner import PluginEventRunner
-from llmproc.process_snapshot import ProcessSnapshot
+from llmproc.process_snapshot import FrozenMessage, ProcessSnapshot
 
 if TYPE_CHECKING:  # pragma: no cover - used for type hints only
     # Imported here to avoid circular dependency with llm_process
@@ -26,9 +25,28 @@ class ProcessForkingMixin:
     # ------------------------------------------------------------------
 
     def _create_snapshot(self: LLMProcess) -> ProcessSnapshot:
-        """Return a snapshot of this process's state."""
+        """Return a snapshot of this process's state.
+
+        Messages are frozen and shared instead of deep-copied. Only the
+        snapshot holds the frozen copies; the parent's own messages stay
+        mutable. Frozen copies are remembered and reused by later forks while
+        the parent message is unchanged, so repeated forks of the same history
+        only copy pointers.
+        """
+        previous = getattr(self, "_frozen_messages", {})
+        frozen: dict[int, tuple[dict, FrozenMessage]] = {}
+        state = []
+        for message in self.state:
+            if type(message) is dict:
+                entry = previous.get(id(message))
+                if entry is None or entry[0] is not message or entry[1] != message:
+                    entry = (message, FrozenMessage(message))
+                frozen[id(message)] = entry
+                message = entry[1]
+            state.append(message)
+        self._frozen_messages = frozen
         return ProcessSnapshot(
-            state=copy.deepcopy(self.state),
+            state=state,
             enriched_system_prompt=getattr(self, "enriched_system_prompt", None),
         )
 
@@ -63,7 +81,7 @@ class ProcessForkingMixin:
         if hasattr(forked_process, "_apply_snapshot"):
             forked_process._apply_snapshot(snapshot)
         else:  # pragma: no cover - degraded mode for heavily mocked objects
-            forked_process.state = snapshot.state
+            forked_process.state = list(snapshot.state)
             forked_process.enriched_system_prompt = snapshot.enriched_system_prompt
 
         # Clone plugins using their fork() method when available
@@ -96,6 +114,6 @@ class ProcessForkingMixin:
 
     def _apply_snapshot(self: LLMProcess, snapshot: ProcessSnapshot) -> None:
         """Replace this process's conversation state with ``snapshot``."""
-        self.state = snapshot.state
+        self.state = list(snapshot.state)
         if snapshot.enriched_system_prompt is not None:
             self.enriched_system_prompt = snapshot.enriched_system_prompt
@@ -0,0 +1,183 @@
+"""Pool of warm processes for running many independent prompts.
+
+``LLMProgram.run_batch`` uses :class:`ProcessPool` so that a job with
+thousands of prompts starts at most ``concurrency`` processes. Each process
+is reset and reused for the next prompt. All of them come from the same
+program template and share one provider client.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any
+
+from llmproc.common.results import RunResult
+from llmproc.plugin.events import CallbackEvent
+from llmproc.plugin.plugin_event_runner import PluginEventRunner
+
+if TYPE_CHECKING:  # pragma: no cover - used for type hints only
+    from llmproc.llm_process import LLMProcess
+    from llmproc.program import LLMProgram
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of one prompt from :meth:`LLMProgram.run_batch`.
+
+    Attributes:
+        index: Position of the prompt in the input sequence
+        prompt: The prompt that was run
+        run_result: Run metrics, or ``None`` if the run failed
+        response: Final assistant message of the run
+        error: Exception raised by the run, if any
+    """
+
+    index: int
+    prompt: str
+    run_result: RunResult | None = None
+    response: str = ""
+    error: BaseException | None = None
+
+    @property
+    def ok(self) -> bool:
+        """Return True if the prompt ran without raising."""
+        return self.error is None
+
+
+class ProcessPool:
+    """Warm processes started from one program and reused between prompts.
+
+    At most ``size`` processes are started. Each process gets its own copies
+    of the program's plugins made with their ``fork()`` method; plugins
+    without one are shared. A released process has its state cleared and its
+    plugin copies closed and replaced, so nothing a plugin stored for one
+    prompt is seen by the next. Tools provided by plugins are re-registered
+    on the process so they act on its copies. A process whose run raised is closed rather
+    than reused. When ``executor`` is given it replaces the provider's
+    default executor on every started process.
+    """
+
+    def __init__(self, program: LLMProgram, size: int, executor: Any = None) -> None:
+        self.program = program
+        self.size = size
+        self.executor = executor
+        self._idle: list[LLMProcess] = []
+        self._all: list[LLMProcess] = []
+
+    @property
+    def started(self) -> int:
+        """Return the number of processes currently owned by the pool."""
+        return len(self._all)
+
+    async def acquire(self) -> LLMProcess:
+        """Return an idle process, starting a new one if the pool is not full."""
+        if self._idle:
+            return self._idle.pop()
+        if len(self._all) >= self.size:
+            raise RuntimeError(f"ProcessPool exhausted: all {self.size} processes are in use")
+        process = await self.program.start()
+        if self.executor is not None:
+            process.executor = self.executor
+        self._install_plugin_copies(process)
+        self._all.append(process)
+        return process
+
+    def _install_plugin_copies(self, process: LLMProcess) -> None:
+        """Give ``process`` fresh plugin copies and bind the plugins' tools to them."""
+        process.plugins = PluginEventRunner(process._submit_to_loop, self._plugin_copies())
+        process.tool_manager.rebind_tools(process.plugins.provide_tools())
+
+    def _plugin_copies(self) -> list[Any]:
+        """Return fresh copies of the program's plugins for one process."""
+        plugins = []
+        for plugin in getattr(self.program, "plugins", None) or []:
+            copy = plugin.fork() if hasattr(plugin, "fork") else None
+            plugins.append(plugin if copy is None else copy)
+        return plugins
+
+    async def release(self, process: LLMProcess) -> None:
+        """Reset ``process`` and its plugins and return it to the pool."""
+        shared = {id(plugin) for plugin in getattr(self.program, "plugins", None) or []}
+        owned = [plugin for plugin in process.plugins if id(plugin) not in shared]
+        await PluginEventRunner(process._submit_to_loop, owned).run_event(CallbackEvent.PROCESS_CLOSE.value, process)
+        process.reset_state()
+        self._install_plugin_copies(process)
+        self._idle.append(process)
+
+    async def discard(self, process: LLMProcess) -> None:
+        """Close ``process`` and remove it from the pool."""
+        self._all.remove(process)
+        await process.aclose()
+
+    async def aclose(self) -> None:
+        """Close every process owned by the pool."""
+        processes, self._all, self._idle = self._all, [], []
+        for process in processes:
+            try:
+                await process.aclose()
+            except Exception as exc:  # noqa: BLE001 - best-effort cleanup
+                logger.warning("Error closing pooled process: %s", exc)
+
+
+async def run_batch(
+    program: LLMProgram,
+    prompts: Iterable[str],
+    concurrency: int = 8,
+    max_iterations: int | None = None,
+    executor: Any = None,
+) -> AsyncIterator[BatchResult]:
+    """Run ``prompts`` on pooled processes and yield results as they complete.
+
+    See :meth:`LLMProgram.run_batch`.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    pool = ProcessPool(program, concurrency, executor)
+    pending = enumerate(prompts)
+    results: asyncio.Queue[Any] = asyncio.Queue(maxsize=concurrency)
+    done = object()
+
+    async def worker() -> None:
+        try:
+            # Workers pull from one shared iterator, so at most ``concurrency``
+            # prompts are in flight and ``prompts`` is consumed lazily.
+            for index, prompt in pending:
+                process = await pool.acquire()
+                try:
+                    run_result = await process.run(prompt, max_iterations)
+                except Exception as exc:  # noqa: BLE001 - reported per prompt
+                    await pool.discard(process)
+                    await results.put(BatchResult(index, prompt, error=exc))
+                    continue
+                result = BatchResult(index, prompt, run_result, process.get_last_message())
+                await pool.release(process)
+                await results.put(result)
+        except Exception as exc:  # noqa: BLE001 - e.g. program.start() failed
+            await results.put(exc)
+        await results.put(done)
+
+    workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+    try:
+        remaining = len(workers)
+        while remaining:
+            item = await results.get()
+            if item is done:
+                remaining -= 1
+            elif isinstance(item, Exception):
+                raise item
+            else:
+                yield item
+    finally:
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        await pool.aclose()
+
+
+__all__ = ["BatchResult", "ProcessPool", "run_batch"]
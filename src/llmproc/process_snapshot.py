@@ -8,12 +8,64 @@ Implementation Note:
 This provides a clean, immutable representation of process state that can be used when forking
 processes. It helps ensure proper isolation between parent and child processes
 by providing a frozen snapshot at the fork point.
+
+Snapshots are structurally shared rather than deep-copied: committed messages
+are frozen into read-only :class:`FrozenMessage` dicts, and every process
+forked from the same history references the same message objects. Each child
+only allocates its own list of pointers plus the messages it appends.
 """
 
 from __future__ import annotations
 
+import copy
+from collections.abc import Iterable
 from dataclasses import dataclass, field
-from typing import Any
+from typing import Any, NoReturn
+
+
+class FrozenMessage(dict):
+    """Read-only conversation message shared between forked processes.
+
+    Behaves like a plain ``dict`` for reading, comparison and serialisation.
+    Top-level writes raise ``TypeError``; copies (``copy.copy``/``deepcopy``)
+    are ordinary mutable dicts. Nested content is shared, so it must not be
+    modified in place either.
+    """
+
+    __slots__ = ()
+
+    def _readonly(self, *args: Any, **kwargs: Any) -> NoReturn:
+        raise TypeError("Conversation messages shared by fork are read-only; append a new message instead")
+
+    __setitem__ = __delitem__ = __ior__ = _readonly
+    clear = pop = popitem = setdefault = update = _readonly
+
+    def __copy__(self) -> dict[str, Any]:
+        """Return a mutable shallow copy."""
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        """Return a mutable deep copy."""
+        result: dict[str, Any] = {}
+        memo[id(self)] = result
+        for key, value in self.items():
+            result[key] = copy.deepcopy(value, memo)
+        return result
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        """Pickle without going through the read-only ``__setitem__``."""
+        return (FrozenMessage, (dict(self),))
+
+
+def freeze_state(messages: Iterable[Any]) -> tuple[Any, ...]:
+    """Return ``messages`` as a tuple of frozen, shareable messages.
+
+    Plain ``dict`` messages are wrapped in :class:`FrozenMessage` (a shallow
+    copy, so nested content is shared rather than copied); already frozen
+    messages and non-dict items such as provider content blocks are reused
+    as-is.
+    """
+    return tuple(FrozenMessage(msg) if type(msg) is dict else msg for msg in messages)
 
 
 @dataclass(frozen=True, slots=True)
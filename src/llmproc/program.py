@@ -1,7 +1,7 @@
 """LLMProgram compiler for validating and loading LLM program configurations."""
 
 import logging
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Callable, Iterable
 from pathlib import Path
 from typing import Any, Optional, Union
 
@@ -16,6 +16,7 @@ from llmproc._program_docs import (
     INIT,
     LLMPROGRAM_CLASS,
     REGISTER_TOOLS,
+    RUN_BATCH,
     START,
     START_SYNC,
 )
@@ -51,6 +52,8 @@ class LLMProgram(ProgramConfigMixin):
         region: str | None = None,
         user_prompt: str = None,
         max_iterations: int = 10,
+        max_parallel_tools: int = 1,
+        connection_pool: dict[str, Any] | None = None,
     ):
         """Initialize a program."""
         # Flag to track if this program has been fully compiled
@@ -76,6 +79,8 @@ class LLMProgram(ProgramConfigMixin):
             region=region,
             user_prompt=user_prompt,
             max_iterations=max_iterations,
+            max_parallel_tools=max_parallel_tools,
+            connection_pool=connection_pool,
         )
 
         if linked_programs or linked_program_descriptions:
@@ -145,6 +150,8 @@ class LLMProgram(ProgramConfigMixin):
             region=data.region,
             user_prompt=data.user_prompt,
             max_iterations=data.max_iterations,
+            max_parallel_tools=data.max_parallel_tools,
+            connection_pool=data.connection_pool,
         )
         program.compiled = True
         program.config = data
@@ -256,6 +263,18 @@ class LLMProgram(ProgramConfigMixin):
 
         return await create_process(self, access_level=access_level)
 
+    def run_batch(
+        self,
+        prompts: Iterable[str],
+        concurrency: int = 8,
+        max_iterations: int | None = None,
+        executor: Any = None,
+    ) -> AsyncIterator["BatchResult"]:  # noqa: F821
+        # Delegate to the process pool implementation
+        from llmproc.process_pool import run_batch
+
+        return run_batch(self, prompts, concurrency=concurrency, max_iterations=max_iterations, executor=executor)
+
     def start_sync(self, access_level: Optional[AccessLevel] = None) -> "SyncLLMProcess":  # noqa: F821
         # Import here to avoid circular imports
         from llmproc.program_exec import create_sync_process
@@ -277,3 +296,4 @@ LLMProgram.api_params.__doc__ = API_PARAMS
 LLMProgram.from_dict.__func__.__doc__ = FROM_DICT
 LLMProgram.start.__doc__ = START
 LLMProgram.start_sync.__doc__ = START_SYNC
+LLMProgram.run_batch.__doc__ = RUN_BATCH
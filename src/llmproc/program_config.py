@@ -11,6 +11,7 @@ from collections.abc import Callable
 from typing import TYPE_CHECKING, Any
 
 from llmproc.common.access_control import AccessLevel  # noqa: F401 - used for docs
+from llmproc.config.schema import ConnectionPoolConfig
 from llmproc.config.tool import ToolConfig
 from llmproc.plugin.events import CallbackEvent
 from llmproc.plugin.plugin_utils import call_plugin
@@ -153,6 +154,28 @@ class ProgramConfigMixin:
         self.max_iterations = max_iterations
         return self
 
+    def set_max_parallel_tools(self, max_parallel_tools: int) -> LLMProgram:
+        """Set how many ``parallel_safe`` tool calls may run concurrently in a turn."""
+        if max_parallel_tools <= 0:
+            raise ValueError("max_parallel_tools must be a positive integer")
+        self.max_parallel_tools = max_parallel_tools
+        return self
+
+    def set_connection_pool(
+        self,
+        max_connections: int | None = None,
+        max_keepalive_connections: int | None = None,
+        keepalive_expiry: float | None = None,
+    ) -> LLMProgram:
+        """Set HTTP connection pool limits for the shared provider client."""
+        pool = ConnectionPoolConfig(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry,
+        )
+        self.connection_pool = pool.model_dump(exclude_none=True) or None
+        return self
+
     def configure_mcp(
         self,
         config_path: str | None = None,
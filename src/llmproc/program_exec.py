@@ -6,7 +6,8 @@ into LLMProcess instances, with each step isolated for better testing and mainte
 
 import asyncio
 import logging
-from dataclasses import fields
+import weakref
+from dataclasses import dataclass, field, fields
 from pathlib import Path
 from typing import Any, NamedTuple, Optional, TypedDict, Union
 
@@ -16,7 +17,10 @@ from llmproc.config.process_config import ProcessConfig
 from llmproc.llm_process import LLMProcess, SyncLLMProcess
 from llmproc.program import LLMProgram
 from llmproc.providers import get_provider_client
+from llmproc.providers.client_registry import provider_clients
 from llmproc.tools import ToolManager
+from llmproc.tools.mcp import MCPAggregator
+from llmproc.tools.tool_registry import ToolRegistry
 
 logger = logging.getLogger(__name__)
 
@@ -38,6 +42,7 @@ class CoreAttributes(TypedDict):
     region: Optional[str]
     user_prompt: Optional[str]
     max_iterations: int
+    max_parallel_tools: int
 
 
 class MCPConfig(TypedDict):
@@ -67,6 +72,7 @@ def get_core_attributes(program: LLMProgram) -> CoreAttributes:
         "region": program.region,
         "user_prompt": getattr(program, "user_prompt", None),
         "max_iterations": getattr(program, "max_iterations", 10),
+        "max_parallel_tools": getattr(program, "max_parallel_tools", 1),
     }
 
 
@@ -97,10 +103,12 @@ def prepare_process_state(
     state.update(core_attrs)
     state["state"] = []
     state["enriched_system_prompt"] = None
-    state["client"] = get_provider_client(
+    state["client"] = provider_clients.acquire(
         program.provider,
         project_id=program.project_id,
         region=program.region,
+        connection_pool=getattr(program, "connection_pool", None),
+        factory=get_provider_client,
     )
     state.update(_initialize_mcp_config(program))
     state["access_level"] = access_level or AccessLevel.ADMIN
@@ -124,6 +132,136 @@ def prepare_process_config(
     return ProcessConfig(**cfg_kwargs)
 
 
+# --------------------------------------------------------
+# Process Templates
+# --------------------------------------------------------
+@dataclass(slots=True, eq=False)
+class ProcessTemplate:
+    """Prepared state for stamping out processes of one program.
+
+    Built the first time a program is started and reused by later
+    :func:`create_process` calls for the same program on the same event loop,
+    which makes ``fork`` and ``spawn`` children cheap: they skip provider
+    client creation and tool registration (including MCP server start-up).
+
+    Every process gets its own :class:`ToolManager`, but the ``Tool`` objects,
+    provider client and MCP aggregator are shared. The aggregator's clients
+    are closed when the last process using them is closed; the provider client
+    is reference-counted by :data:`~llmproc.providers.client_registry.provider_clients`.
+    """
+
+    key: tuple
+    core_attributes: CoreAttributes
+    mcp_config: MCPConfig
+    client: Any
+    registry: ToolRegistry
+    mcp_aggregator: MCPAggregator | None = None
+    users: weakref.WeakSet = field(default_factory=weakref.WeakSet)
+
+    def new_tool_manager(self) -> ToolManager:
+        """Return a tool manager with this template's tools registered."""
+        tool_manager = ToolManager()
+        tool_manager.runtime_registry = self.registry.copy()
+        self.adopt(tool_manager)
+        return tool_manager
+
+    def adopt(self, tool_manager: ToolManager) -> None:
+        """Make ``tool_manager`` a user of the shared MCP aggregator."""
+        if self.mcp_aggregator is None:
+            return
+        tool_manager.mcp_aggregator = self.mcp_aggregator
+        tool_manager.mcp_owner = self
+        self.mcp_aggregator.add_tools_listener(tool_manager.replace_mcp_tools)
+        self.users.add(tool_manager)
+
+    async def release(self, tool_manager: ToolManager) -> None:
+        """Drop ``tool_manager`` and close MCP clients once nothing uses them."""
+        if tool_manager not in self.users:
+            return
+        self.users.discard(tool_manager)
+        if not self.users and self.mcp_aggregator is not None:
+            await self.mcp_aggregator.close_clients()
+
+
+def _template_key(program: LLMProgram, tool_config: dict[str, Any]) -> tuple:
+    """Return the values a cached template depends on.
+
+    Tools and plugins are compared by identity; everything else by value.
+    """
+    return (
+        asyncio.get_running_loop(),
+        get_core_attributes(program),
+        _initialize_mcp_config(program),
+        tool_config,
+        tuple(id(tool) for tool in getattr(program, "tools", None) or []),
+        tuple(id(plugin) for plugin in getattr(program, "plugins", None) or []),
+        getattr(program, "connection_pool", None),
+    )
+
+
+def get_process_template(program: LLMProgram) -> ProcessTemplate | None:
+    """Return the program's cached template if it still matches the program.
+
+    A stale template (the program, its tools or plugins changed, or the
+    running event loop differs) is discarded.
+    """
+    template = vars(program).get("_process_template")
+    if template is None:
+        return None
+    program.compile()
+    if template.key == _template_key(program, program.get_tool_configuration()):
+        return template
+    vars(program).pop("_process_template", None)
+    return None
+
+
+def _store_process_template(
+    program: LLMProgram,
+    cfg: ProcessConfig,
+    tool_config: dict[str, Any],
+    tool_manager: ToolManager,
+) -> None:
+    """Cache a template built from a freshly created process's state."""
+    try:
+        key = _template_key(program, tool_config)
+    except AttributeError as exc:
+        logger.debug("Not caching a process template: %s", exc)
+        return
+    template = ProcessTemplate(
+        key=key,
+        core_attributes=key[1],
+        mcp_config=key[2],
+        client=cfg.client,
+        registry=tool_manager.runtime_registry.copy(),
+        mcp_aggregator=tool_manager.mcp_aggregator,
+    )
+    if template.mcp_aggregator is not None:
+        template.mcp_aggregator.add_tools_listener(template.registry.replace_tools)
+    template.adopt(tool_manager)
+    # Bypass LLMProgram's attribute forwarding to config
+    vars(program)["_process_template"] = template
+
+
+def _config_from_template(
+    template: ProcessTemplate,
+    program: LLMProgram,
+    access_level: AccessLevel | None = None,
+) -> ProcessConfig:
+    """Return a ``ProcessConfig`` populated from ``template``."""
+    state: dict[str, Any] = {"program": program}
+    state.update(template.core_attributes)
+    state["api_params"] = dict(state["api_params"])
+    state.update(template.mcp_config)
+    state["enriched_system_prompt"] = state["base_system_prompt"]
+    state["client"] = template.client
+    state["tool_manager"] = template.new_tool_manager()
+    state["access_level"] = access_level or AccessLevel.ADMIN
+    state["plugins"] = list(getattr(program, "plugins", []))
+    state["loop"] = asyncio.get_running_loop()
+    cfg_fields = {f.name for f in fields(ProcessConfig)}
+    return ProcessConfig(**{k: v for k, v in state.items() if k in cfg_fields})
+
+
 # --------------------------------------------------------
 # Core Process Instantiation and Setup
 # --------------------------------------------------------
@@ -170,34 +308,44 @@ async def _create_process_generic(
     process_type = process_class.__name__
     logger.info(f"Starting {process_type} creation for program: {program.model_name}")
 
-    program.compile()
+    template = get_process_template(program)
+    if template is not None and provider_clients.retain(template.client):
+        logger.debug("Creating %s from cached process template", process_type)
+        cfg = _config_from_template(template, program, access_level)
+        if process_kwargs:
+            for key, value in process_kwargs.items():
+                if hasattr(cfg, key):
+                    setattr(cfg, key, value)
+    else:
+        program.compile()
 
-    cfg = prepare_process_config(program, access_level)
+        cfg = prepare_process_config(program, access_level)
 
-    if process_kwargs:
-        for key, value in process_kwargs.items():
-            if hasattr(cfg, key):
-                setattr(cfg, key, value)
+        if process_kwargs:
+            for key, value in process_kwargs.items():
+                if hasattr(cfg, key):
+                    setattr(cfg, key, value)
 
-    config = program.get_tool_configuration()
+        config = program.get_tool_configuration()
 
-    tool_manager = ToolManager()
-    tools_attr = getattr(program, "tools", None)
-    builtin_tools = list(tools_attr or [])
+        tool_manager = ToolManager()
+        tools_attr = getattr(program, "tools", None)
+        builtin_tools = list(tools_attr or [])
 
-    # Collect tools from plugins
-    plugin_tools = []
-    if hasattr(program, "plugins") and program.plugins:
-        from llmproc.plugin.plugin_event_runner import PluginEventRunner
+        # Collect tools from plugins
+        plugin_tools = []
+        if hasattr(program, "plugins") and program.plugins:
+            from llmproc.plugin.plugin_event_runner import PluginEventRunner
 
-        hooks = PluginEventRunner(lambda coro: coro, program.plugins)
-        plugin_tools = hooks.provide_tools()
+            hooks = PluginEventRunner(lambda coro: coro, program.plugins)
+            plugin_tools = hooks.provide_tools()
 
-    # Register both builtin and plugin tools
-    all_tools = builtin_tools + plugin_tools
-    await tool_manager.register_tools(all_tools, config)
+        # Register both builtin and plugin tools
+        all_tools = builtin_tools + plugin_tools
+        await tool_manager.register_tools(all_tools, config)
 
-    cfg.tool_manager = tool_manager
+        cfg.tool_manager = tool_manager
+        _store_process_template(program, cfg, config, tool_manager)
 
     if process_class is LLMProcess:
         process = instantiate_process(cfg)
@@ -1,6 +1,7 @@
 """Providers module for LLMProc."""
 
 # Import from providers.py
+from llmproc.providers.client_registry import ProviderClientRegistry, provider_clients
 from llmproc.providers.providers import (
     AsyncAnthropic,
     AsyncAnthropicVertex,
@@ -68,6 +69,8 @@ if GeminiProcessExecutor is not None:
 
 __all__ = [
     "get_provider_client",
+    "ProviderClientRegistry",
+    "provider_clients",
     "AsyncOpenAI",
     "AsyncAnthropic",
     "AsyncAnthropicVertex",
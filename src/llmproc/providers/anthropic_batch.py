@@ -0,0 +1,239 @@
+"""Anthropic Message Batches execution mode for offline workloads.
+
+:class:`MessageBatcher` collects Messages API requests from many processes
+and submits them together through the Message Batches API, which is billed at
+half the regular price but may take minutes to hours to complete.
+:class:`AnthropicBatchProcessExecutor` runs the normal Anthropic tool loop
+but sends each turn through a batcher, so a fleet of processes advances in
+lockstep: every process waiting on the model joins the next batch.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+from collections.abc import AsyncIterator
+from contextlib import nullcontext
+from dataclasses import dataclass
+from functools import partial
+from typing import TYPE_CHECKING, Any
+
+from llmproc.providers.anthropic_process_executor import AnthropicProcessExecutor
+from llmproc.providers.anthropic_utils import (
+    APIConnectionError,
+    APITimeoutError,
+    OverloadedError,
+    RateLimitError,
+)
+from llmproc.providers.utils import async_retry
+
+if TYPE_CHECKING:  # pragma: no cover - used for type hints only
+    from llmproc.llm_process import LLMProcess
+
+logger = logging.getLogger(__name__)
+
+# Requests collected before a batch is submitted early
+DEFAULT_MAX_BATCH_SIZE = 10_000
+# Seconds to wait for more requests before submitting a batch
+DEFAULT_FLUSH_INTERVAL = 1.0
+# Seconds between batch status checks
+DEFAULT_POLL_INTERVAL = 30.0
+
+_RETRY_EXCEPTIONS = (RateLimitError, OverloadedError, APIConnectionError, APITimeoutError)
+
+# Request keys the Messages API accepts as call options but batches do not
+_CALL_OPTIONS = frozenset({"extra_headers", "extra_query", "extra_body", "timeout", "stream"})
+
+
+def _request_betas(params: dict[str, Any]) -> tuple[str, ...]:
+    """Return the ``anthropic-beta`` features a request enables in its headers."""
+    header = (params.get("extra_headers") or {}).get("anthropic-beta", "")
+    return tuple(sorted({beta.strip() for beta in header.split(",") if beta.strip()}))
+
+
+class MessageBatchError(Exception):
+    """A request in a message batch did not succeed.
+
+    Attributes:
+        custom_id: Identifier of the request within its batch
+        result_type: ``errored``, ``canceled``, ``expired`` or ``missing``
+        error: Error details reported by the API, if any
+    """
+
+    def __init__(self, custom_id: str, result_type: str, error: Any = None) -> None:
+        super().__init__(f"Batch request {custom_id} {result_type}" + (f": {error}" if error else ""))
+        self.custom_id = custom_id
+        self.result_type = result_type
+        self.error = error
+
+
+@dataclass(slots=True)
+class _Pending:
+    custom_id: str
+    params: dict[str, Any]
+    future: asyncio.Future
+
+
+class MessageBatcher:
+    """Submit Messages API requests from many callers as Message Batches.
+
+    Requests are collected for ``flush_interval`` seconds, or until
+    ``max_batch_size`` are waiting, and then submitted as one batch. Each
+    caller of :meth:`create` gets back the ``Message`` for its request once
+    the batch has ended. Requests enabling ``anthropic-beta`` features are
+    submitted through the beta batches API, one batch per set of features.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+        flush_interval: float = DEFAULT_FLUSH_INTERVAL,
+        poll_interval: float = DEFAULT_POLL_INTERVAL,
+    ) -> None:
+        self.client = client
+        self.max_batch_size = max_batch_size
+        self.flush_interval = flush_interval
+        self.poll_interval = poll_interval
+        self._pending: list[_Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+        self._ids = itertools.count()
+
+    @classmethod
+    def for_client(cls, client: Any) -> MessageBatcher:
+        """Return the batcher shared by every process using ``client``."""
+        # Kept on the client so the batcher lives exactly as long as it does
+        batcher = vars(client).get("_llmproc_message_batcher")
+        if batcher is None:
+            batcher = vars(client)["_llmproc_message_batcher"] = cls(client)
+        return batcher
+
+    async def create(self, params: dict[str, Any]) -> Any:
+        """Add a request to the next batch and return its ``Message``.
+
+        Raises:
+            MessageBatchError: If the request errored, expired or was canceled
+        """
+        loop = asyncio.get_running_loop()
+        entry = _Pending(f"req-{next(self._ids)}", params, loop.create_future())
+        self._pending.append(entry)
+        if len(self._pending) >= self.max_batch_size:
+            self.flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.flush_interval, self.flush)
+        return await entry.future
+
+    def flush(self) -> None:
+        """Submit the waiting requests now."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        entries, self._pending = self._pending, []
+        groups: dict[tuple[str, ...], list[_Pending]] = {}
+        for entry in entries:
+            if not entry.future.done():
+                groups.setdefault(_request_betas(entry.params), []).append(entry)
+        for betas, group in groups.items():
+            task = asyncio.get_running_loop().create_task(self._run(group, betas))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def aclose(self) -> None:
+        """Cancel the timer and any batch still being polled."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        for entry in self._pending:
+            entry.future.cancel()
+        self._pending = []
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+
+    async def _run(self, entries: list[_Pending], betas: tuple[str, ...] = ()) -> None:
+        if betas:
+            batches = self.client.beta.messages.batches
+            options: dict[str, Any] = {"betas": list(betas)}
+        else:
+            batches = self.client.messages.batches
+            options = {}
+        requests = [
+            {
+                "custom_id": entry.custom_id,
+                "params": {k: v for k, v in entry.params.items() if k not in _CALL_OPTIONS},
+            }
+            for entry in entries
+        ]
+        try:
+            create = partial(batches.create, requests=requests, **options)
+            batch = await async_retry(create, _RETRY_EXCEPTIONS, "Message batch create", logger)
+            logger.info("Submitted message batch %s with %d requests", batch.id, len(requests))
+            retrieve = partial(batches.retrieve, batch.id, **options)
+            while batch.processing_status != "ended":
+                await asyncio.sleep(self.poll_interval)
+                batch = await async_retry(retrieve, _RETRY_EXCEPTIONS, "Message batch retrieve", logger)
+
+            waiting = {entry.custom_id: entry for entry in entries}
+            async for item in await batches.results(batch.id, **options):
+                entry = waiting.pop(item.custom_id, None)
+                if entry is None or entry.future.done():
+                    continue
+                result = item.result
+                if result.type == "succeeded":
+                    entry.future.set_result(result.message)
+                else:
+                    error = MessageBatchError(item.custom_id, result.type, getattr(result, "error", None))
+                    entry.future.set_exception(error)
+            for entry in waiting.values():
+                if not entry.future.done():
+                    entry.future.set_exception(MessageBatchError(entry.custom_id, "missing"))
+        except BaseException as exc:
+            for entry in entries:
+                if not entry.future.done():
+                    if isinstance(exc, asyncio.CancelledError):
+                        entry.future.cancel()
+                    else:
+                        entry.future.set_exception(exc)
+            if not isinstance(exc, Exception):
+                raise
+
+
+async def _message_blocks(message: Any) -> AsyncIterator[Any]:
+    """Yield a finished message's content blocks followed by the message."""
+    for block in message.content:
+        yield block
+    yield message
+
+
+class AnthropicBatchProcessExecutor(AnthropicProcessExecutor):
+    """Anthropic executor that sends every turn through the Message Batches API.
+
+    Tool calls, hooks and callbacks behave as with
+    :class:`AnthropicProcessExecutor`; only the API call differs. Requests
+    bypass the client-side rate limiter, since batches have separate limits,
+    and API calls are marked ``batch`` so ``RunResult.usd_cost`` applies batch
+    pricing.
+    """
+
+    def __init__(self, batcher: MessageBatcher | None = None) -> None:
+        self.batcher = batcher
+
+    def _rate_limit(self, process: LLMProcess) -> Any:
+        return nullcontext()
+
+    async def _send_request(self, process: LLMProcess, api_request: dict[str, Any]) -> AsyncIterator[Any]:
+        """Submit the request to the next batch and replay the resulting message."""
+        batcher = self.batcher or MessageBatcher.for_client(process.client)
+        return _message_blocks(await batcher.create(api_request))
+
+    def _api_call_info(self, process: LLMProcess, api_request: dict[str, Any], response: Any) -> dict[str, Any]:
+        return {**super()._api_call_info(process, api_request, response), "batch": True}
+
+
+__all__ = [
+    "AnthropicBatchProcessExecutor",
+    "MessageBatchError",
+    "MessageBatcher",
+]
@@ -0,0 +1,237 @@
+"""Prompt cache breakpoint planning for Anthropic requests.
+
+The Messages API allows up to four ``cache_control`` breakpoints per request
+and caches the prompt prefix ending at each of them. A breakpoint only pays
+off when the same prefix is sent again, so :class:`CacheBreakpointPlanner`
+places them on the parts of an agent loop that stay stable:
+
+1. the tool definitions,
+2. the system prompt (including preloaded files),
+3. a conversation anchor that only advances every ``step`` messages, so it
+   keeps being hit when a turn adds more blocks than the API looks back over,
+4. the last message, which writes the prefix the next turn reads.
+
+Tool and system breakpoints are skipped while their prefix is shorter than
+the model's minimum cacheable length; unused slots go to earlier anchors.
+The planner also keeps running totals of the cache usage reported for each
+turn, plus the most recent turns.
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from llmproc.common.token_ledger import estimate_tokens
+
+# Maximum number of cache_control breakpoints the API accepts per request
+MAX_CACHE_BREAKPOINTS = 4
+
+# Messages between positions of the rolling conversation anchor
+DEFAULT_CACHE_STEP = 8
+
+# Most recent turns kept in CacheBreakpointPlanner.turns
+CACHE_TURN_HISTORY = 64
+
+# Supported cache lifetimes; "1h" needs the extended TTL beta
+CACHE_TTLS = ("5m", "1h")
+EXTENDED_CACHE_TTL_BETA = "extended-cache-ttl-2025-04-11"
+
+# Shortest prefix the API will cache, by model family
+_MIN_CACHEABLE_TOKENS = {"claude-3-5-haiku": 2048, "claude-3-haiku": 2048}
+_DEFAULT_MIN_CACHEABLE_TOKENS = 1024
+
+# Content block types that accept cache_control
+_MARKABLE_BLOCKS = frozenset({"text", "tool_result", "tool_use", "image", "document"})
+
+
+def min_cacheable_tokens(model: str | None) -> int:
+    """Return the minimum prompt length ``model`` caches."""
+    for prefix, tokens in _MIN_CACHEABLE_TOKENS.items():
+        if model and model.startswith(prefix):
+            return tokens
+    return _DEFAULT_MIN_CACHEABLE_TOKENS
+
+
+def default_cache_ttl() -> str:
+    """Return the TTL from ``LLMPROC_CACHE_TTL`` (``5m`` or ``1h``)."""
+    ttl = os.getenv("LLMPROC_CACHE_TTL", "5m").lower()
+    if ttl not in CACHE_TTLS:
+        raise ValueError(f"LLMPROC_CACHE_TTL must be one of {CACHE_TTLS}, got {ttl!r}")
+    return ttl
+
+
+def _markable(block: Any) -> bool:
+    if not isinstance(block, dict) or block.get("type") not in _MARKABLE_BLOCKS:
+        return False
+    if block["type"] == "text":
+        return bool(block.get("text", "").strip())
+    if block["type"] == "tool_result":
+        return bool(block.get("content"))
+    return True
+
+
+def _mark_last_block(message: dict[str, Any], cache_control: dict[str, str]) -> dict[str, Any] | None:
+    """Return a copy of ``message`` with its last markable block marked."""
+    content = message.get("content")
+    if not isinstance(content, list):
+        return None
+    for j in range(len(content) - 1, -1, -1):
+        if _markable(content[j]):
+            new_content = list(content)
+            new_content[j] = {**content[j], "cache_control": cache_control}
+            return {**message, "content": new_content}
+    return None
+
+
+@dataclass(slots=True)
+class CacheTurn:
+    """Prompt cache usage reported for one API call."""
+
+    cache_read_tokens: int
+    cache_creation_tokens: int
+    uncached_tokens: int
+    breakpoints: int
+
+    @property
+    def prompt_tokens(self) -> int:
+        """Return the full prompt size of the call."""
+        return self.cache_read_tokens + self.cache_creation_tokens + self.uncached_tokens
+
+
+class CacheBreakpointPlanner:
+    """Place cache breakpoints on stable prefixes and track cache hits.
+
+    Args:
+        ttl: Cache lifetime, ``"5m"`` or ``"1h"``
+        step: Messages between positions of the rolling conversation anchor
+    """
+
+    __slots__ = ("ttl", "step", "turns", "_last_breakpoints", "_prefix_memo", "_prompt_tokens", "_cache_read_tokens")
+
+    def __init__(self, ttl: str | None = None, step: int = DEFAULT_CACHE_STEP) -> None:
+        ttl = ttl or default_cache_ttl()
+        if ttl not in CACHE_TTLS:
+            raise ValueError(f"ttl must be one of {CACHE_TTLS}, got {ttl!r}")
+        if step < 1:
+            raise ValueError("step must be at least 1")
+        self.ttl = ttl
+        self.step = step
+        self.turns: deque[CacheTurn] = deque(maxlen=CACHE_TURN_HISTORY)
+        self._prompt_tokens = 0
+        self._cache_read_tokens = 0
+        self._last_breakpoints = 0
+        self._prefix_memo: tuple[Any, Any, int, int] | None = None
+
+    @property
+    def cache_control(self) -> dict[str, str]:
+        """Return the ``cache_control`` value for a breakpoint."""
+        return {"type": "ephemeral"} if self.ttl == "5m" else {"type": "ephemeral", "ttl": self.ttl}
+
+    def apply(
+        self,
+        messages: list[dict[str, Any]],
+        system: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None,
+        model: str | None = None,
+    ) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]] | None]:
+        """Return ``messages``, ``system`` and ``tools`` with breakpoints added.
+
+        Only marked items are copied; everything else is shared with the
+        inputs, which are never modified.
+        """
+        marker = self.cache_control
+        budget = MAX_CACHE_BREAKPOINTS
+        threshold = min_cacheable_tokens(model)
+
+        tool_tokens, system_tokens = self._prefix_tokens(tools, system)
+        if tools and tool_tokens >= threshold:
+            tools = [*tools[:-1], {**tools[-1], "cache_control": marker}]
+            budget -= 1
+
+        if system:
+            if tool_tokens + system_tokens >= threshold and _markable(system[-1]):
+                system = [*system[:-1], {**system[-1], "cache_control": marker}]
+                budget -= 1
+
+        messages = list(messages)
+        for i in self._message_breakpoints(messages, budget):
+            marked = _mark_last_block(messages[i], marker)
+            if marked is not None:
+                messages[i] = marked
+                budget -= 1
+
+        self._last_breakpoints = MAX_CACHE_BREAKPOINTS - budget
+        return messages, system, tools
+
+    def _prefix_tokens(self, tools: list[dict[str, Any]] | None, system: list[dict[str, Any]]) -> tuple[int, int]:
+        """Return estimated tokens of ``tools`` and ``system``, reused while both are unchanged."""
+        memo = self._prefix_memo
+        if memo is None or memo[0] is not tools or memo[1] is not system:
+            tool_tokens = estimate_tokens(tools) if tools else 0
+            system_tokens = sum(estimate_tokens(block.get("text")) for block in system or [])
+            memo = self._prefix_memo = (tools, system, tool_tokens, system_tokens)
+        return memo[2], memo[3]
+
+    def _message_breakpoints(self, messages: Sequence[dict[str, Any]], budget: int) -> list[int]:
+        """Return message indexes to mark: the last message, then anchors."""
+        if not messages or budget <= 0:
+            return []
+        last = len(messages) - 1
+        chosen = [last] if _mark_last_block(messages[last], {}) is not None else []
+        anchor = (last - 1) // self.step * self.step
+        while anchor >= 0 and len(chosen) < budget:
+            # Use the nearest markable message at or before the anchor position
+            for i in range(anchor, max(anchor - self.step, -1), -1):
+                if i not in chosen and _mark_last_block(messages[i], {}) is not None:
+                    chosen.append(i)
+                    break
+            anchor -= self.step
+        return chosen
+
+    def record(self, usage: Any) -> CacheTurn:
+        """Record the cache usage reported for the last planned request."""
+
+        def field(name: str) -> int:
+            value = usage.get(name) if isinstance(usage, dict) else getattr(usage, name, None)
+            return value if isinstance(value, int) else 0
+
+        turn = CacheTurn(
+            cache_read_tokens=field("cache_read_input_tokens"),
+            cache_creation_tokens=field("cache_creation_input_tokens"),
+            uncached_tokens=field("input_tokens"),
+            breakpoints=self._last_breakpoints,
+        )
+        self.turns.append(turn)
+        self._prompt_tokens += turn.prompt_tokens
+        self._cache_read_tokens += turn.cache_read_tokens
+        return turn
+
+    @property
+    def hit_ratio(self) -> float:
+        """Return the share of all recorded prompt tokens read from the cache."""
+        return self._cache_read_tokens / self._prompt_tokens if self._prompt_tokens else 0.0
+
+
+def get_cache_planner(process: Any) -> CacheBreakpointPlanner:
+    """Return the :class:`CacheBreakpointPlanner` attached to ``process``."""
+    planner = getattr(process, "cache_planner", None)
+    if not isinstance(planner, CacheBreakpointPlanner):
+        planner = CacheBreakpointPlanner()
+        process.cache_planner = planner
+    return planner
+
+
+__all__ = [
+    "CACHE_TTLS",
+    "CACHE_TURN_HISTORY",
+    "CacheBreakpointPlanner",
+    "CacheTurn",
+    "DEFAULT_CACHE_STEP",
+    "MAX_CACHE_BREAKPOINTS",
+    "get_cache_planner",
+    "min_cacheable_tokens",
+]
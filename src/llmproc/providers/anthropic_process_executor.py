@@ -1,8 +1,9 @@
 """Anthropic provider tools implementation for LLMProc."""
 
-import copy
 import logging
+import time
 from dataclasses import dataclass, field
+from functools import partial
 from types import SimpleNamespace
 from typing import TYPE_CHECKING, Any
 
@@ -15,12 +16,17 @@ except ImportError:
 
 from llmproc.callbacks import CallbackEvent
 from llmproc.common.results import RunResult
+from llmproc.common.stream_events import stream_emitter
+from llmproc.providers.anthropic_cache import get_cache_planner
 from llmproc.providers.anthropic_utils import (
     caching_disabled,
+    format_api_message,
     prepare_api_request,
     stream_call_with_retry,
 )
+from llmproc.providers.rate_limit import rate_limited
 from llmproc.providers.utils import get_context_window_size
+from llmproc.tools.tool_scheduler import ToolCallScheduler
 from llmproc.utils.background import AsyncBackgroundIterator
 from llmproc.utils.message_utils import append_message
 
@@ -31,6 +37,10 @@ if TYPE_CHECKING:  # pragma: no cover - used for type hints only
 logger = logging.getLogger(__name__)
 
 
+# Blocks streamed before the final message object
+_CONTENT_BLOCK_TYPES = frozenset({"text", "thinking", "tool_use"})
+
+
 @dataclass
 class IterationState:
     """Mutable values for a single API iteration."""
@@ -40,6 +50,7 @@ class IterationState:
     current_tool: Any | None = None
     execution_aborted: bool = False
     commit_partial: bool = True
+    stream_end: float | None = None
 
 
 class AnthropicProcessExecutor:
@@ -103,22 +114,22 @@ class AnthropicProcessExecutor:
 
             logger.debug(f"Making API call {iterations + 1}/{max_iterations}")
 
+            sent = process.token_ledger.checkpoint(process.state)
             api_request = await self._prepare_request(process)
-            block_gen = await self._send_request(process, api_request)
-
-            tool_invoked, response = await self._stream_blocks(process, block_gen, run_result, state)
+            async with self._rate_limit(process):
+                started = time.monotonic()
+                block_gen = await self._send_request(process, api_request)
+                tool_invoked, response = await self._stream_blocks(process, block_gen, run_result, state)
+                # Tools run while the stream is read; latency ends with the response itself
+                latency_ms = int(((state.stream_end or time.monotonic()) - started) * 1000)
 
             await process.trigger_event(CallbackEvent.API_RESPONSE, response=response)
 
-            api_info = {
-                "model": process.model_name,
-                "usage": getattr(response, "usage", {}),
-                "stop_reason": getattr(response, "stop_reason", None),
-                "id": getattr(response, "id", None),
-                "request": api_request,
-                "response": response,
-            }
+            api_info = {**self._api_call_info(process, api_request, response), "latency_ms": latency_ms}
             run_result.add_api_call(api_info)
+            process.token_ledger.record_usage(sent, api_info["usage"])
+            if not caching_disabled():
+                get_cache_planner(process).record(api_info["usage"])
 
             stop_reason = getattr(response, "stop_reason", None)
 
@@ -152,9 +163,24 @@ class AnthropicProcessExecutor:
         await process.trigger_event(CallbackEvent.API_REQUEST, api_request=api_request)
         return api_request
 
+    def _rate_limit(self, process: "LLMProcess") -> Any:
+        """Return the context manager admitting one API call of ``process``."""
+        return rate_limited(process)
+
+    def _api_call_info(self, process: "LLMProcess", api_request: dict[str, Any], response: Any) -> dict[str, Any]:
+        """Return the entry recorded in ``RunResult.api_call_infos`` for one call."""
+        return {
+            "model": process.model_name,
+            "usage": getattr(response, "usage", {}),
+            "stop_reason": getattr(response, "stop_reason", None),
+            "id": getattr(response, "id", None),
+            "request": api_request,
+            "response": response,
+        }
+
     async def _send_request(self, process: "LLMProcess", api_request: dict[str, Any]):
         """Send request to Anthropic and yield streaming blocks."""
-        return stream_call_with_retry(process.client, api_request)
+        return stream_call_with_retry(process.client, api_request, on_event=stream_emitter(process))
 
     async def _stream_blocks(
         self,
@@ -163,49 +189,77 @@ class AnthropicProcessExecutor:
         run_result: RunResult,
         state: IterationState,
     ) -> tuple[bool, Any]:
-        """Stream content blocks and execute tools."""
+        """Stream content blocks and execute tools.
+
+        Tools marked ``parallel_safe`` are dispatched as soon as their block
+        arrives when ``process.max_parallel_tools`` allows it; their results
+        are still recorded in block order.
+        """
         tool_invoked = False
         response_obj = None
+        scheduler = ToolCallScheduler.for_process(process)
 
         async def _immediate_streaming_callback(block):
             """Execute streaming callbacks immediately when blocks arrive."""
+            if getattr(block, "type", None) not in _CONTENT_BLOCK_TYPES:
+                # The final message arrives when the response stream ends
+                state.stream_end = time.monotonic()
             await process.trigger_event(CallbackEvent.API_STREAM_BLOCK, block=block)
 
-        async with AsyncBackgroundIterator(
-            block_generator,
-            on_item=_immediate_streaming_callback,
-        ) as blocks:
-            async for block in blocks:
-                block_type = getattr(block, "type", None)
-                if block_type == "text":
-                    if not hasattr(block, "text") or not block.text.strip():
+        def _commit(outcome: tuple[dict[str, Any], bool]) -> None:
+            tool_result_content, aborted = outcome
+            state.tool_results_prefix.append(tool_result_content)
+            if aborted:
+                state.execution_aborted = True
+
+        try:
+            async with AsyncBackgroundIterator(
+                block_generator,
+                on_item=_immediate_streaming_callback,
+            ) as blocks:
+                async for block in blocks:
+                    block_type = getattr(block, "type", None)
+                    if block_type == "text":
+                        if not hasattr(block, "text") or not block.text.strip():
+                            continue
+                        hook_res = await process.plugins.response(process, block.text)
+                        if hook_res is not None and getattr(hook_res, "stop", False):
+                            state.commit_partial = getattr(hook_res, "commit_current", True)
+                            if state.commit_partial:
+                                state.msg_prefix.append(block)
+                            else:
+                                state.msg_prefix.clear()
+                            state.execution_aborted = True
+                            break
+                        state.msg_prefix.append(block)
                         continue
-                    hook_res = await process.plugins.response(process, block.text)
-                    if hook_res is not None and getattr(hook_res, "stop", False):
-                        state.commit_partial = getattr(hook_res, "commit_current", True)
-                        if state.commit_partial:
-                            state.msg_prefix.append(block)
-                        else:
-                            state.msg_prefix.clear()
-                        state.execution_aborted = True
+
+                    if block_type == "thinking":
+                        # Handle thinking blocks - add to message prefix but don't treat as final response
+                        state.msg_prefix.append(block)
+                        continue
+
+                    if block_type != "tool_use":
+                        response_obj = block
                         break
                     state.msg_prefix.append(block)
-                    continue
+                    tool_invoked = True
+                    if scheduler.is_parallel(block.name):
+                        await scheduler.submit(
+                            block.name,
+                            partial(self._run_tool, process, block, run_result),
+                            _commit,
+                        )
+                        continue
+                    await scheduler.flush()
+                    _, aborted = await self._execute_tool(process, block, run_result, state)
+                    if aborted:
+                        state.execution_aborted = True
+                        continue
 
-                if block_type == "thinking":
-                    # Handle thinking blocks - add to message prefix but don't treat as final response
-                    state.msg_prefix.append(block)
-                    continue
-
-                if block_type != "tool_use":
-                    response_obj = block
-                    break
-                state.msg_prefix.append(block)
-                invoked, aborted = await self._execute_tool(process, block, run_result, state)
-                tool_invoked = tool_invoked or invoked
-                if aborted:
-                    state.execution_aborted = True
-                    continue
+            await scheduler.flush()
+        finally:
+            scheduler.cancel()
 
         if response_obj is None:
             response_obj = SimpleNamespace(content=[], stop_reason=None, id=None, usage=SimpleNamespace())
@@ -219,6 +273,21 @@ class AnthropicProcessExecutor:
         state: IterationState,
     ) -> tuple[bool, bool]:
         """Execute a single tool_use block."""
+        state.current_tool = block
+        tool_result_content, aborted = await self._run_tool(process, block, run_result)
+        state.current_tool = None
+
+        # Always create tool_result to maintain API protocol compliance
+        state.tool_results_prefix.append(tool_result_content)
+        return True, aborted
+
+    async def _run_tool(
+        self,
+        process: "LLMProcess",
+        block: Any,
+        run_result: RunResult,
+    ) -> tuple[dict[str, Any], bool]:
+        """Call the tool for ``block`` and return its ``tool_result`` block and abort flag."""
         tool_name = block.name
         tool_args = block.input
         tool_id = block.id
@@ -226,27 +295,23 @@ class AnthropicProcessExecutor:
         await process.trigger_event(CallbackEvent.TOOL_START, tool_name=tool_name, tool_args=tool_args)
         run_result.add_tool_call(tool_name=tool_name, tool_args=tool_args)
 
-        state.current_tool = block
         logger.debug(f"Calling tool '{tool_name}' with parameters: {tool_args}")
         result = await process.call_tool(tool_name, tool_args)
-        state.current_tool = None
 
         await process.trigger_event(CallbackEvent.TOOL_END, tool_name=tool_name, result=result)
 
-        # Always create tool_result to maintain API protocol compliance
         tool_result_dict = result.to_dict()
         tool_result_content = {
             "type": "tool_result",
             "tool_use_id": tool_id,
             **tool_result_dict,
         }
-        state.tool_results_prefix.append(tool_result_content)
 
         if hasattr(result, "abort_execution") and result.abort_execution:
             logger.info(f"Tool '{tool_name}' requested execution abort. Stopping tool processing for this response.")
-            return True, True
+            return tool_result_content, True
 
-        return True, False
+        return tool_result_content, False
 
     async def _commit_state(self, process: "LLMProcess", response: Any, state: IterationState) -> None:
         """Commit streamed content and tool results to process state."""
@@ -268,20 +333,23 @@ class AnthropicProcessExecutor:
 
         process.iteration_state = None
 
+    def context_window_size(self, model_name: str) -> int:
+        """Return the context window size of ``model_name``."""
+        return get_context_window_size(model_name, self.CONTEXT_WINDOW_SIZES)
+
     async def count_tokens(self, process: "LLMProcess") -> dict:
         """Count tokens in the current conversation context using Anthropic's API."""
         try:
-            # Create state copy with dummy message and prepare API request
-            process_copy = copy.copy(process)
-            process_copy.state = copy.deepcopy(process.state or []) + [{"role": "user", "content": "Hi"}]
-            api_request = prepare_api_request(process_copy, add_cache=False)
+            # Prepare API request and append a dummy user message
+            api_request = prepare_api_request(process, add_cache=False)
+            messages = api_request["messages"] + [format_api_message({"role": "user", "content": "Hi"})]
 
             # Get token count with inline parameter validation
             system = api_request.get("system")
             tools = api_request.get("tools")
             response = await process.client.messages.count_tokens(
-                model=process_copy.model_name,
-                messages=api_request["messages"],
+                model=process.model_name,
+                messages=messages,
                 **({"system": system} if isinstance(system, list) and system else {}),
                 **({"tools": tools} if isinstance(tools, list) and tools else {}),
             )
@@ -5,7 +5,7 @@ including message formatting, cache control, and general helper functions.
 
 Functions in this module focus on:
 1. Converting internal state to API-compatible format
-2. Applying cache control to API requests
+2. Applying cache control to API requests (see :mod:`anthropic_cache`)
 3. Preparing complete API payloads
 4. Managing token-efficient tools header
 5. Handling API calls with retry logic and streaming support
@@ -15,10 +15,14 @@ import copy
 import json
 import logging
 import os
+from functools import partial
 from types import SimpleNamespace
 from typing import Any
 
+from llmproc.common.stream_events import InputJsonDelta, StreamEmitter, TextDelta, ThinkingDelta, ToolUseStart
+from llmproc.providers.anthropic_cache import EXTENDED_CACHE_TTL_BETA, get_cache_planner
 from llmproc.providers.constants import ANTHROPIC_PROVIDERS, PROVIDER_CLAUDE_CODE
+from llmproc.providers.payload_memo import get_payload_memo
 from llmproc.providers.utils import async_retry
 
 logger = logging.getLogger(__name__)
@@ -85,6 +89,77 @@ def is_cacheable_content(content: Any) -> bool:
     return True
 
 
+def _format_api_content(content: Any) -> Any:
+    """Return ``content`` converted to a list of API content blocks.
+
+    ``content`` is returned unchanged when it cannot be converted.
+    """
+    # Convert string content to a list with a single text block
+    if isinstance(content, str):
+        return [{"type": "text", "text": content}]
+
+    # Convert single content block (not in a list) to a list with one item
+    if isinstance(content, dict):
+        return [content]
+
+    # Handle TextBlock objects and similar
+    if hasattr(content, "type") and hasattr(content, "text"):
+        return [{"type": "text", "text": content.text}]
+
+    # Handle lists of non-dict blocks (convert each to proper format)
+    if isinstance(content, list):
+        formatted_blocks = []
+        for block in content:
+            if isinstance(block, dict):
+                # Already a properly formatted content block
+                formatted_blocks.append(block)
+            elif hasattr(block, "type"):
+                # Convert TextBlock or similar to dict format
+                if block.type == "text" and hasattr(block, "text"):
+                    formatted_blocks.append({"type": "text", "text": block.text})
+                elif (
+                    block.type == "tool_use"
+                    and hasattr(block, "name")
+                    and hasattr(block, "input")
+                    and hasattr(block, "id")
+                ):
+                    formatted_blocks.append(
+                        {"type": "tool_use", "name": block.name, "input": block.input, "id": block.id}
+                    )
+                elif block.type == "thinking" and hasattr(block, "thinking"):
+                    formatted_blocks.append(
+                        {"type": "thinking", "thinking": block.thinking, "signature": getattr(block, "signature", "")}
+                    )
+                elif block.type == "redacted_thinking" and hasattr(block, "data"):
+                    formatted_blocks.append({"type": "redacted_thinking", "data": block.data})
+            elif isinstance(block, str):
+                # Convert string to text block
+                formatted_blocks.append({"type": "text", "text": block})
+
+        # Replace content with properly formatted blocks
+        if formatted_blocks:
+            return formatted_blocks
+
+    return content
+
+
+def format_api_message(message: dict[str, Any]) -> dict[str, Any]:
+    """Convert a single state message to the Anthropic API format.
+
+    The returned message is an independent copy; ``message`` is not modified.
+
+    Args:
+        message: Internal conversation message.
+
+    Returns:
+        Message in API-compatible format.
+    """
+    msg = copy.deepcopy(message)
+    if "content" in msg:
+        msg["content"] = _format_api_content(msg["content"])
+    return msg
+
+
 def format_state_to_api_messages(state: list[dict[str, Any]]) -> list[dict[str, Any]]:
     """Convert internal state to the Anthropic API format.
 
@@ -97,54 +172,84 @@ def format_state_to_api_messages(state: list[dict[str, Any]]) -> list[dict[str,
     if not state:
         return []
 
-    # Deep copy to avoid modifying original state
-    messages = copy.deepcopy(state)
-
-    # Convert all message content to the format expected by the Anthropic API
-    for msg in messages:
-        content = msg.get("content")
-
-        # Convert string content to a list with a single text block
-        if isinstance(content, str):
-            msg["content"] = [{"type": "text", "text": content}]
-
-        # Convert single content block (not in a list) to a list with one item
-        elif isinstance(content, dict):
-            msg["content"] = [content]
-
-        # Handle TextBlock objects and similar
-        elif hasattr(content, "type") and hasattr(content, "text"):
-            msg["content"] = [{"type": "text", "text": content.text}]
-
-        # Handle lists of non-dict blocks (convert each to proper format)
-        elif isinstance(content, list):
-            formatted_blocks = []
-            for block in content:
-                if isinstance(block, dict):
-                    # Already a properly formatted content block
-                    formatted_blocks.append(block)
-                elif hasattr(block, "type"):
-                    # Convert TextBlock or similar to dict format
-                    if block.type == "text" and hasattr(block, "text"):
-                        formatted_blocks.append({"type": "text", "text": block.text})
-                    elif (
-                        block.type == "tool_use"
-                        and hasattr(block, "name")
-                        and hasattr(block, "input")
-                        and hasattr(block, "id")
-                    ):
-                        formatted_blocks.append(
-                            {"type": "tool_use", "name": block.name, "input": block.input, "id": block.id}
-                        )
-                elif isinstance(block, str):
-                    # Convert string to text block
-                    formatted_blocks.append({"type": "text", "text": block})
-
-            # Replace content with properly formatted blocks
-            if formatted_blocks:
-                msg["content"] = formatted_blocks
-
-    return copy.deepcopy(messages)
+    return [format_api_message(msg) for msg in state]
+
+
+def _message_fingerprint(message: dict[str, Any]) -> tuple[int, int, int]:
+    """Return a cheap fingerprint used to detect in-place message edits."""
+    content = message.get("content")
+    return len(message), id(content), len(content) if isinstance(content, list) else -1
+
+
+class FormattedMessageCache:
+    """Incrementally maintained API-formatted copy of a conversation state.
+
+    The cache remembers the state messages it has already converted (by
+    identity) and only formats messages that were appended or replaced since
+    the previous call. Truncation (e.g. GOTO) and full replacement of the state
+    list are detected by comparing the cached prefix against the new state.
+
+    Messages returned by :meth:`format` are shared between calls and must be
+    treated as read-only; the cache breakpoint planner copies only the blocks
+    it marks.
+    """
+
+    __slots__ = ("_sources", "_fingerprints", "_messages")
+
+    def __init__(self) -> None:
+        self._sources: list[dict[str, Any]] = []
+        self._fingerprints: list[tuple[int, int, int]] = []
+        self._messages: list[dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        """Return the number of cached messages."""
+        return len(self._messages)
+
+    def invalidate(self) -> None:
+        """Drop all cached messages."""
+        self._sources.clear()
+        self._fingerprints.clear()
+        self._messages.clear()
+
+    def format(self, state: list[dict[str, Any]]) -> list[dict[str, Any]]:
+        """Return ``state`` in API format, converting only new messages.
+
+        Args:
+            state: Internal conversation state.
+
+        Returns:
+            A new list of API-formatted messages.
+        """
+        sources = self._sources
+        fingerprints = self._fingerprints
+        reused = 0
+        limit = min(len(state), len(sources))
+        while (
+            reused < limit
+            and state[reused] is sources[reused]
+            and _message_fingerprint(state[reused]) == fingerprints[reused]
+        ):
+            reused += 1
+
+        del sources[reused:]
+        del fingerprints[reused:]
+        del self._messages[reused:]
+
+        for msg in state[reused:]:
+            sources.append(msg)
+            fingerprints.append(_message_fingerprint(msg))
+            self._messages.append(format_api_message(msg))
+
+        return list(self._messages)
+
+
+def get_formatted_message_cache(process: Any) -> FormattedMessageCache:
+    """Return the :class:`FormattedMessageCache` attached to ``process``."""
+    cache = getattr(process, "_formatted_message_cache", None)
+    if not isinstance(cache, FormattedMessageCache):
+        cache = FormattedMessageCache()
+        process._formatted_message_cache = cache
+    return cache
 
 
 def format_system_prompt(system_prompt: Any) -> str | list[dict[str, Any]]:
@@ -196,13 +301,18 @@ def is_claude_37_model(model_name: str) -> bool:
 TOKEN_EFFICIENT_VALUE = "token-efficient-tools-2025-02-19"
 
 
-def _append_token_efficient_header(headers: dict[str, str]) -> None:
-    """Append the token-efficient header to ``headers`` in place."""
+def _append_beta_header(headers: dict[str, str], value: str) -> None:
+    """Append ``value`` to the ``anthropic-beta`` header in place."""
     if "anthropic-beta" in headers:
-        if TOKEN_EFFICIENT_VALUE not in headers["anthropic-beta"]:
-            headers["anthropic-beta"] = f"{headers['anthropic-beta']},{TOKEN_EFFICIENT_VALUE}"
+        if value not in headers["anthropic-beta"]:
+            headers["anthropic-beta"] = f"{headers['anthropic-beta']},{value}"
     else:
-        headers["anthropic-beta"] = TOKEN_EFFICIENT_VALUE
+        headers["anthropic-beta"] = value
+
+
+def _append_token_efficient_header(headers: dict[str, str]) -> None:
+    """Append the token-efficient header to ``headers`` in place."""
+    _append_beta_header(headers, TOKEN_EFFICIENT_VALUE)
 
 
 def _token_efficient_requested(process: Any) -> bool:
@@ -239,54 +349,28 @@ def add_token_efficient_header_if_needed(process: Any, extra_headers: dict[str,
     return headers
 
 
-def apply_cache_control(
-    messages: list[dict[str, Any]],
-    system: list[dict[str, Any]],
-    tools: list[dict[str, Any]] | None = None,
-) -> tuple[list[dict[str, Any]], list[dict[str, Any]], list[dict[str, Any]] | None]:
-    """
-    Apply cache control to messages, system prompt, and tools.
+def _system_blocks(system_prompt: Any, provider: str | None) -> list[dict[str, Any]]:
+    """Return ``system_prompt`` as API content blocks for ``provider``."""
+    # Normalize prompt segments before concatenation
+    blocks = format_system_prompt(system_prompt)
 
-    This implements our caching strategy:
-    1. Cache the system prompt
-    2. Cache the last 3 messages
+    # Prepend Claude Code prefix if using claude_code provider
+    if provider == PROVIDER_CLAUDE_CODE:
+        prefix = [{"type": "text", "text": "You are Claude Code, Anthropic's official CLI for Claude."}]
+        blocks = prefix + blocks
 
-    Args:
-        messages: API-formatted messages
-        system: API-formatted system prompt
-        tools: API-formatted tools
+    return format_system_prompt(blocks)
 
-    Returns:
-        Tuple of (messages, system, tools) with cache control applied
-    """
-    # Create copies to avoid modifying originals
-    messages_copy = copy.deepcopy(messages) if messages else []
-    system_copy = copy.deepcopy(system) if system else None
-
-    # Cache system prompt (if present and cacheable)
-    if system_copy and isinstance(system_copy, list) and system_copy:
-        for block in system_copy:
-            if is_cacheable_content(block):
-                block["cache_control"] = {"type": "ephemeral"}
-                break
-
-    # Cache last 3 messages (or fewer if less available)
-    if messages_copy:
-        max_cacheable = min(3, len(messages_copy))
-        for i in range(max_cacheable):
-            msg = messages_copy[-(i + 1)]
-            # Add cache to first eligible content block
-            if isinstance(msg.get("content"), list):
-                for content in msg["content"]:
-                    if isinstance(content, dict) and content.get("type") in ["text", "tool_result"]:
-                        if is_cacheable_content(content):
-                            content["cache_control"] = {"type": "ephemeral"}
-                            break  # Only add to first eligible content
-
-    # We don't cache tools directly
-    # System prompt caching is more efficient than tool caching
-
-    return messages_copy, system_copy, tools
+
+def _system_text(blocks: list[dict[str, Any]]) -> str | None:
+    """Return system prompt ``blocks`` collapsed to a single string."""
+    if len(blocks) == 0:
+        return None
+    if len(blocks) == 1 and blocks[0].get("type") == "text":
+        # Convert single text block to string
+        return blocks[0].get("text", "")
+    # For complex system prompts, convert to string by joining text blocks
+    return " ".join([block.get("text", "") for block in blocks if block.get("type") == "text"])
 
 
 def prepare_api_request(process: Any, add_cache: bool = True) -> dict[str, Any]:
@@ -313,36 +397,29 @@ def prepare_api_request(process: Any, add_cache: bool = True) -> dict[str, Any]:
     # Add token-efficient tools header if needed
     extra_headers = add_token_efficient_header_if_needed(process, extra_headers)
 
-    # Convert state to API format (without caching)
+    # Convert state to API format (without caching), reusing messages
+    # converted on previous turns
     # Note: Message IDs are handled by MessageIDPlugin via user input hooks
-    api_messages = format_state_to_api_messages(process.state)
-
-    # Normalize prompt segments before concatenation
-    system_prompt = format_system_prompt(process.enriched_system_prompt)
-
-    # Prepend Claude Code prefix if using claude_code provider
-    if getattr(process, "provider", None) == PROVIDER_CLAUDE_CODE:
-        prefix = [{"type": "text", "text": "You are Claude Code, Anthropic's official CLI for Claude."}]
-        system_prompt = prefix + system_prompt
+    api_messages = get_formatted_message_cache(process).format(process.state or [])
 
-    api_system = format_system_prompt(system_prompt)
+    # System prompt and tools are converted once and reused until they change
+    memo = get_payload_memo(process)
+    provider = getattr(process, "provider", None)
+    api_system = memo.get(
+        f"anthropic_system:{provider}", process.enriched_system_prompt, partial(_system_blocks, provider=provider)
+    )
     api_tools = process.tools  # No special conversion needed
 
-    # Ensure system is a valid format (string or None, not list for Claude 3.7)
-    if isinstance(api_system, list):
-        if len(api_system) == 0:
-            api_system = None
-        elif len(api_system) == 1 and api_system[0].get("type") == "text":
-            # Convert single text block to string
-            api_system = api_system[0].get("text", "")
-        else:
-            # For complex system prompts, convert to string by joining text blocks
-            api_system = " ".join([block.get("text", "") for block in api_system if block.get("type") == "text"])
-
-    # Apply cache control if enabled and not globally disabled
+    # Place cache breakpoints on tools, system prompt and conversation
     if add_cache and not caching_disabled():
-        api_messages, _, api_tools = apply_cache_control(api_messages, [], api_tools)
-        # Note: We don't apply cache to system anymore since it's a string
+        planner = get_cache_planner(process)
+        api_messages, api_system, api_tools = planner.apply(api_messages, api_system, api_tools, process.model_name)
+        if planner.ttl == "1h":
+            _append_beta_header(extra_headers, EXTENDED_CACHE_TTL_BETA)
+
+    # Send the system prompt as a string unless a block carries a breakpoint
+    if not any("cache_control" in block for block in api_system):
+        api_system = memo.get("anthropic_system_text", api_system, _system_text)
 
     # Build the complete request
     request = {
@@ -475,9 +552,49 @@ async def call_with_retry(client: Any, request: dict[str, Any]) -> Any:
     )
 
 
-async def stream_call_with_retry(client: Any, request: dict[str, Any]):
-    """Yield content blocks from the Anthropic API in real time."""
-    use_streaming = os.getenv("LLMPROC_USE_STREAMING", "").lower() in ("true", "1", "yes")
+def _stream_block(current: dict[str, Any]) -> Any:
+    """Return the content block assembled from stream deltas."""
+    kind = current["type"]
+    if kind == "text":
+        return SimpleNamespace(type="text", text=current["text"])
+    if kind == "thinking":
+        return SimpleNamespace(type="thinking", thinking=current["thinking"], signature=current["signature"])
+    if kind == "redacted_thinking":
+        return SimpleNamespace(type="redacted_thinking", data=current["data"])
+    try:
+        inp = json.loads(current["input_json"] or "{}")
+    except json.JSONDecodeError:
+        logger.warning(f"Failed to parse tool input JSON: {current['input_json']}")
+        inp = {}
+    return SimpleNamespace(type="tool_use", id=current["id"], name=current["name"], input=inp)
+
+
+def _merge_usage(usage: Any, update: Any) -> Any:
+    """Fold the usage reported by ``message_delta`` into ``usage``.
+
+    ``message_start`` carries the input token counts and ``message_delta``
+    the output count, so neither replaces the other.
+    """
+    if usage is None:
+        return update
+    for name in ("input_tokens", "output_tokens", "cache_creation_input_tokens", "cache_read_input_tokens"):
+        value = getattr(update, name, None)
+        if value is not None:
+            setattr(usage, name, value)
+    return usage
+
+
+async def stream_call_with_retry(client: Any, request: dict[str, Any], on_event: StreamEmitter | None = None):
+    """Yield content blocks from the Anthropic API in real time.
+
+    Args:
+        client: The Anthropic client instance
+        request: The API request parameters
+        on_event: Optional coroutine receiving token-level stream events
+            (text, thinking and tool-input deltas) as the API delivers them.
+            Passing it always uses the streaming API.
+    """
+    use_streaming = on_event is not None or os.getenv("LLMPROC_USE_STREAMING", "").lower() in ("true", "1", "yes")
 
     async def _call():
         if use_streaming:
@@ -506,8 +623,9 @@ async def stream_call_with_retry(client: Any, request: dict[str, Any]):
         yield stream
         return
 
-    content_blocks: list[dict[str, Any]] = []
+    final_content: list[Any] = []
     current: dict[str, Any] | None = None
+    index = -1
     stop_reason = None
     model = None
     message_id = None
@@ -516,34 +634,42 @@ async def stream_call_with_retry(client: Any, request: dict[str, Any]):
     async for chunk in stream:
         if chunk.type == "content_block_start":
             if current:
-                content_blocks.append(current)
-                if current["type"] == "text":
-                    yield SimpleNamespace(type="text", text=current["text"])
-                else:
-                    try:
-                        inp = json.loads(current.get("input_json", "{}"))
-                    except json.JSONDecodeError:
-                        inp = {}
-                    yield SimpleNamespace(type="tool_use", id=current["id"], name=current["name"], input=inp)
-            if chunk.content_block.type == "text":
-                current = {"type": "text", "text": ""}
+                block = _stream_block(current)
+                final_content.append(block)
+                yield block
+            index += 1
+            start = chunk.content_block
+            if start.type == "text":
+                current = {"type": "text", "text": getattr(start, "text", None) or ""}
+            elif start.type == "thinking":
+                current = {"type": "thinking", "thinking": "", "signature": ""}
+            elif start.type == "redacted_thinking":
+                current = {"type": "redacted_thinking", "data": getattr(start, "data", "")}
             else:
-                current = {
-                    "type": "tool_use",
-                    "id": chunk.content_block.id,
-                    "name": chunk.content_block.name,
-                    "input_json": "",
-                }
+                current = {"type": "tool_use", "id": start.id, "name": start.name, "input_json": ""}
+                if on_event is not None:
+                    await on_event(ToolUseStart(id=start.id, name=start.name, index=index))
         elif chunk.type == "content_block_delta" and current:
-            if chunk.delta.type == "text_delta":
-                current["text"] += chunk.delta.text
-            elif chunk.delta.type == "input_json_delta":
-                current["input_json"] += chunk.delta.partial_json
+            delta = chunk.delta
+            if delta.type == "text_delta":
+                current["text"] += delta.text
+                if on_event is not None:
+                    await on_event(TextDelta(text=delta.text, index=index))
+            elif delta.type == "thinking_delta":
+                current["thinking"] += delta.thinking
+                if on_event is not None:
+                    await on_event(ThinkingDelta(thinking=delta.thinking, index=index))
+            elif delta.type == "signature_delta":
+                current["signature"] += delta.signature
+            elif delta.type == "input_json_delta":
+                current["input_json"] += delta.partial_json
+                if on_event is not None:
+                    await on_event(InputJsonDelta(partial_json=delta.partial_json, index=index))
         elif chunk.type == "message_delta":
             if hasattr(chunk.delta, "stop_reason"):
                 stop_reason = chunk.delta.stop_reason
             if hasattr(chunk, "usage"):
-                usage = chunk.usage
+                usage = _merge_usage(usage, chunk.usage)
         elif chunk.type == "message_start":
             model = chunk.message.model
             message_id = chunk.message.id
@@ -551,27 +677,9 @@ async def stream_call_with_retry(client: Any, request: dict[str, Any]):
                 usage = chunk.message.usage
 
     if current:
-        content_blocks.append(current)
-        if current["type"] == "text":
-            print(f"text: {current['text']}", flush=True)
-            yield SimpleNamespace(type="text", text=current["text"])
-        else:
-            try:
-                inp = json.loads(current.get("input_json", "{}"))
-            except json.JSONDecodeError:
-                inp = {}
-            yield SimpleNamespace(type="tool_use", id=current["id"], name=current["name"], input=inp)
-
-    final_content = []
-    for block in content_blocks:
-        if block["type"] == "text":
-            final_content.append(SimpleNamespace(type="text", text=block["text"]))
-        else:
-            try:
-                inp = json.loads(block.get("input_json", "{}"))
-            except json.JSONDecodeError:
-                inp = {}
-            final_content.append(SimpleNamespace(type="tool_use", id=block["id"], name=block["name"], input=inp))
+        block = _stream_block(current)
+        final_content.append(block)
+        yield block
 
     if usage is None:
         usage = SimpleNamespace()
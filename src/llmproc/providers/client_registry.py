@@ -0,0 +1,173 @@
+"""Shared, reference-counted provider clients.
+
+Every process used to build its own SDK client, and with it a separate httpx
+connection pool, so forked and spawned children repeated TLS handshakes and
+accumulated sockets. :class:`ProviderClientRegistry` hands out one client per
+(provider, project, region, credentials, pool limits) on each event loop and
+closes it when the last process using it releases it.
+"""
+
+import asyncio
+import hashlib
+import inspect
+import logging
+import os
+import weakref
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from llmproc.providers.constants import (
+    PROVIDER_ANTHROPIC,
+    PROVIDER_ANTHROPIC_VERTEX,
+    PROVIDER_GEMINI,
+    PROVIDER_GEMINI_VERTEX,
+    PROVIDER_OPENAI,
+    PROVIDER_OPENAI_CHAT,
+    PROVIDER_OPENAI_RESPONSE,
+)
+from llmproc.providers.providers import get_provider_client
+
+logger = logging.getLogger(__name__)
+
+# Environment variables each provider reads its credentials from
+_CREDENTIAL_ENV: dict[str, tuple[str, ...]] = {
+    PROVIDER_OPENAI: ("OPENAI_API_KEY",),
+    PROVIDER_OPENAI_CHAT: ("OPENAI_API_KEY",),
+    PROVIDER_OPENAI_RESPONSE: ("OPENAI_API_KEY",),
+    PROVIDER_ANTHROPIC: ("ANTHROPIC_API_KEY",),
+    PROVIDER_ANTHROPIC_VERTEX: ("ANTHROPIC_VERTEX_PROJECT_ID", "CLOUD_ML_REGION"),
+    PROVIDER_GEMINI: ("GEMINI_API_KEY", "GOOGLE_API_KEY"),
+    PROVIDER_GEMINI_VERTEX: ("GOOGLE_CLOUD_PROJECT", "CLOUD_ML_REGION"),
+}
+
+
+def _credentials_fingerprint(provider: str) -> str:
+    """Return a hash of the credentials ``provider`` would be created with."""
+    digest = hashlib.sha256()
+    for name in _CREDENTIAL_ENV.get(provider, ()):
+        digest.update(f"{name}={os.environ.get(name, '')}\0".encode())
+    return digest.hexdigest()
+
+
+async def _close_client(client: Any) -> None:
+    """Close an SDK client.
+
+    Anthropic and OpenAI clients have an async ``close()``; google-genai
+    clients close their async transport through ``client.aio.aclose()``.
+    """
+    close = getattr(client, "close", None)
+    if not inspect.iscoroutinefunction(close):
+        close = getattr(getattr(client, "aio", None), "aclose", None) or close
+    if close is None:
+        return
+    try:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+    except Exception as exc:  # noqa: BLE001 – best-effort
+        logger.warning("Error while closing provider client %r: %s", client, exc)
+
+
+@dataclass(slots=True)
+class _Lease:
+    loop: weakref.ref
+    key: tuple
+    refs: int = 0
+
+
+class ProviderClientRegistry:
+    """Hand out shared provider clients and close them by reference count.
+
+    Clients are only shared between processes running on the same event loop,
+    because httpx connection pools cannot be used across loops. Clients
+    requested outside a running loop are created fresh and not tracked.
+    """
+
+    def __init__(self) -> None:
+        self._clients: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[tuple, Any]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._leases: weakref.WeakKeyDictionary[Any, _Lease] = weakref.WeakKeyDictionary()
+        self._closed: weakref.WeakSet[Any] = weakref.WeakSet()
+
+    def acquire(
+        self,
+        provider: str,
+        project_id: str | None = None,
+        region: str | None = None,
+        connection_pool: dict[str, Any] | None = None,
+        factory: Callable[..., Any] = get_provider_client,
+    ) -> Any:
+        """Return a shared client for these settings and take a reference to it.
+
+        Args:
+            provider: Provider identifier.
+            project_id: Google Cloud project for Vertex providers.
+            region: Google Cloud region for Vertex providers.
+            connection_pool: Optional HTTP connection pool limits.
+            factory: Function used to create a client on a cache miss.
+        """
+        kwargs: dict[str, Any] = {"project_id": project_id, "region": region}
+        if connection_pool:
+            kwargs["connection_pool"] = connection_pool
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return factory(provider, **kwargs)
+
+        provider = provider.lower()
+        key = (
+            provider,
+            project_id,
+            region,
+            _credentials_fingerprint(provider),
+            tuple(sorted((connection_pool or {}).items())),
+        )
+        clients = self._clients.setdefault(loop, {})
+        client = clients.get(key)
+        if client is None:
+            client = factory(provider, **kwargs)
+            clients[key] = client
+            self._leases[client] = _Lease(weakref.ref(loop), key)
+            logger.debug("Created shared %s client", provider)
+        self._leases[client].refs += 1
+        return client
+
+    def retain(self, client: Any) -> bool:
+        """Take another reference to ``client``.
+
+        Returns:
+            False if the registry already closed ``client``; True otherwise,
+            including for clients it does not manage.
+        """
+        lease = self._leases.get(client)
+        if lease is not None:
+            lease.refs += 1
+            return True
+        return client not in self._closed
+
+    async def release(self, client: Any) -> None:
+        """Drop a reference to ``client`` and close it when none remain."""
+        lease = self._leases.get(client)
+        if lease is None:
+            return
+        lease.refs -= 1
+        if lease.refs > 0:
+            return
+        del self._leases[client]
+        loop = lease.loop()
+        clients = self._clients.get(loop) if loop is not None else None
+        if clients is not None and clients.get(lease.key) is client:
+            del clients[lease.key]
+        self._closed.add(client)
+        await _close_client(client)
+
+    def refcount(self, client: Any) -> int:
+        """Return the number of references held on ``client``."""
+        lease = self._leases.get(client)
+        return lease.refs if lease is not None else 0
+
+
+# Process-wide registry used by ``program_exec``
+provider_clients = ProviderClientRegistry()
@@ -5,7 +5,14 @@ in a future release for more comprehensive provider support once Anthropic and c
 functionality are mature enough.
 """
 
+import asyncio
+import inspect
+import json
 import logging
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from types import SimpleNamespace
 
 # Import Google Genai SDK (will be None if not installed)
 try:
@@ -15,12 +22,36 @@ except ImportError:
 
 from llmproc.callbacks import CallbackEvent
 from llmproc.common.results import RunResult
+from llmproc.common.stream_events import InputJsonDelta, TextDelta, ThinkingDelta, ToolUseStart, stream_emitter
 from llmproc.providers.gemini_utils import convert_tools_to_gemini_format, format_tool_result_for_gemini
+from llmproc.providers.payload_memo import get_payload_memo
+from llmproc.providers.rate_limit import rate_limited
+from llmproc.tools.tool_scheduler import ToolCallScheduler
 from llmproc.utils.message_utils import append_message
 
 logger = logging.getLogger(__name__)
 
 
+# Threads available for clients without an async count_tokens
+COUNT_TOKENS_MAX_WORKERS = 4
+_count_tokens_pool: ThreadPoolExecutor | None = None
+
+
+async def _count_tokens_async(client, kwargs):
+    """Call ``count_tokens`` on ``client`` without blocking the event loop."""
+    count = getattr(getattr(getattr(client, "aio", None), "models", None), "count_tokens", None)
+    if inspect.iscoroutinefunction(count):
+        return await count(**kwargs)
+
+    global _count_tokens_pool
+    if _count_tokens_pool is None:
+        _count_tokens_pool = ThreadPoolExecutor(
+            max_workers=COUNT_TOKENS_MAX_WORKERS, thread_name_prefix="llmproc-gemini-count"
+        )
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_count_tokens_pool, partial(client.models.count_tokens, **kwargs))
+
+
 class GeminiProcessExecutor:
     """Process executor for Google Gemini models.
 
@@ -60,7 +91,7 @@ class GeminiProcessExecutor:
         Returns:
             dict: Estimated token count information
         """
-        window_size = self._get_context_window_size(model_name)
+        window_size = self.context_window_size(model_name)
         return {
             "input_tokens": -1,  # Indicates estimation
             "context_window": window_size,
@@ -123,7 +154,7 @@ class GeminiProcessExecutor:
             await process.trigger_event(CallbackEvent.TURN_START, run_result=run_result)
 
             # Prepare tools for API call
-            formatted_tools = convert_tools_to_gemini_format(process.tools)
+            formatted_tools = get_payload_memo(process).tools(process, "gemini_tools", convert_tools_to_gemini_format)
 
             # Prepare messages for the API - convert internal state format to Gemini format
             contents = self.format_state_to_api_messages(process.state)
@@ -148,15 +179,20 @@ class GeminiProcessExecutor:
             await process.trigger_event(CallbackEvent.API_REQUEST, api_request=api_request)
 
             # Make the API call
-            response = await self._make_api_call(
-                client=process.client,
-                model=process.model_name,
-                contents=contents,
-                system_instruction=process.enriched_system_prompt,
-                config=api_params,
-                tools=formatted_tools,
-                tool_config={"function_calling_config": {"mode": "AUTO"}} if formatted_tools else None,
-            )
+            sent = process.token_ledger.checkpoint(process.state)
+            async with rate_limited(process):
+                started = time.monotonic()
+                response = await self._make_api_call(
+                    client=process.client,
+                    model=process.model_name,
+                    contents=contents,
+                    system_instruction=process.enriched_system_prompt,
+                    config=api_params,
+                    tools=formatted_tools,
+                    tool_config={"function_calling_config": {"mode": "AUTO"}} if formatted_tools else None,
+                    on_event=stream_emitter(process),
+                )
+                latency_ms = int((time.monotonic() - started) * 1000)
 
             # Trigger API response event
             await process.trigger_event(CallbackEvent.API_RESPONSE, response=response)
@@ -165,10 +201,12 @@ class GeminiProcessExecutor:
             api_info = {
                 "model": process.model_name,
                 "id": getattr(response, "id", None),
+                "latency_ms": latency_ms,
                 "request": api_request,
                 "response": response,
             }
             run_result.add_api_call(api_info)
+            process.token_ledger.record_usage(sent, getattr(response, "usage_metadata", None))
 
             # Check for tool calls in the response
             tool_calls = []
@@ -185,24 +223,20 @@ class GeminiProcessExecutor:
                 append_message(process, "assistant", [{"tool_calls": tool_calls}])
 
                 tool_results = []
-                for tool_call in tool_calls:
-                    # Trigger tool call event
-                    await process.trigger_event(
-                        CallbackEvent.TOOL_START, tool_name=tool_call.name, tool_args=tool_call.args
-                    )
-                    run_result.add_tool_call(tool_name=tool_call.name, tool_args=tool_call.args)
-
-                    # Execute the tool
-                    tool_result = await process.call_tool(tool_call.name, tool_call.args)
-                    tool_results.append(tool_result)
+                scheduler = ToolCallScheduler.for_process(process)
+                commit = partial(self._commit_tool_result, process, tool_results)
 
-                    # Trigger tool result event
-                    await process.trigger_event(CallbackEvent.TOOL_END, tool_name=tool_call.name, result=tool_result)
+                try:
+                    for tool_call in tool_calls:
+                        await scheduler.submit(
+                            tool_call.name, partial(self._run_tool, process, tool_call, run_result), commit
+                        )
+                    await scheduler.flush()
+                finally:
+                    scheduler.cancel()
 
-                    # Add tool result to state
-                    append_message(process, "tool", tool_result.content)
-                    # Store the tool name for proper formatting later
-                    process.state[-1]["tool_name"] = tool_call.name
+                # Trigger TURN_END event
+                await process.trigger_event(CallbackEvent.TURN_END, response=response, tool_results=tool_results)
 
                 # Continue the conversation with tool results
                 iterations += 1
@@ -238,12 +272,43 @@ class GeminiProcessExecutor:
         # Complete the RunResult and return it
         return run_result.complete()
 
+    async def _run_tool(self, process, tool_call, run_result):
+        """Execute a single function call and return it with its result."""
+        # Trigger tool call event
+        await process.trigger_event(CallbackEvent.TOOL_START, tool_name=tool_call.name, tool_args=tool_call.args)
+        run_result.add_tool_call(tool_name=tool_call.name, tool_args=tool_call.args)
+
+        # Execute the tool
+        tool_result = await process.call_tool(tool_call.name, tool_call.args)
+
+        # Trigger tool result event
+        await process.trigger_event(CallbackEvent.TOOL_END, tool_name=tool_call.name, result=tool_result)
+        return tool_call, tool_result
+
+    def _commit_tool_result(self, process, tool_results, outcome):
+        """Append a function call result to the conversation state."""
+        tool_call, tool_result = outcome
+        tool_results.append(tool_result)
+        # Add tool result to state
+        append_message(process, "tool", tool_result.content)
+        # Store the tool name for proper formatting later
+        process.state[-1]["tool_name"] = tool_call.name
+
     async def _make_api_call(
-        self, client, model, contents, system_instruction=None, config=None, tools=None, tool_config=None
+        self,
+        client,
+        model,
+        contents,
+        system_instruction=None,
+        config=None,
+        tools=None,
+        tool_config=None,
+        on_event=None,
     ):
         """Make a call to the Gemini API using the google-genai SDK.
 
-        Uses the native async API provided by the SDK.
+        Uses the native async API provided by the SDK. When ``on_event`` is
+        given the response is streamed and its deltas forwarded as they arrive.
 
         Args:
             client: The google-genai Client instance
@@ -253,6 +318,7 @@ class GeminiProcessExecutor:
             config: Optional API parameters
             tools: Optional tools in Gemini format
             tool_config: Optional tool configuration
+            on_event: Optional coroutine receiving token-level stream events
 
         Returns:
             Response from the Gemini API
@@ -288,7 +354,10 @@ class GeminiProcessExecutor:
                 call_params["config"] = full_config
 
             # Use the native async API provided by the SDK
-            return await client.aio.models.generate_content(**call_params)
+            if on_event is None:
+                return await client.aio.models.generate_content(**call_params)
+            stream = await client.aio.models.generate_content_stream(**call_params)
+            return await self._collect_stream(stream, on_event)
         except Exception as e:
             # Handle API errors
             error_message = str(e)
@@ -305,6 +374,47 @@ class GeminiProcessExecutor:
                 # General API error
                 raise ValueError(f"Gemini API error: {error_message}")
 
+    async def _collect_stream(self, stream, on_event):
+        """Forward streamed deltas and assemble the chunks into one response.
+
+        The result exposes the attributes ``run`` reads from a regular
+        response: ``candidates[0].content.parts``, ``text`` and
+        ``usage_metadata``. Text is content block ``0`` and function call
+        ``n`` is block ``n + 1``.
+        """
+        parts = []
+        text = []
+        calls = 0
+        usage = None
+        response_id = None
+        async for chunk in stream:
+            usage = getattr(chunk, "usage_metadata", None) or usage
+            response_id = response_id or getattr(chunk, "response_id", None)
+            candidates = getattr(chunk, "candidates", None) or []
+            content = getattr(candidates[0], "content", None) if candidates else None
+            for part in getattr(content, "parts", None) or []:
+                parts.append(part)
+                function_call = getattr(part, "function_call", None)
+                if function_call:
+                    calls += 1
+                    await on_event(
+                        ToolUseStart(id=getattr(function_call, "id", None), name=function_call.name, index=calls)
+                    )
+                    await on_event(InputJsonDelta(partial_json=json.dumps(function_call.args or {}), index=calls))
+                elif getattr(part, "text", None):
+                    if getattr(part, "thought", False):
+                        await on_event(ThinkingDelta(thinking=part.text, index=0))
+                    else:
+                        text.append(part.text)
+                        await on_event(TextDelta(text=part.text, index=0))
+
+        return SimpleNamespace(
+            id=response_id,
+            candidates=[SimpleNamespace(content=SimpleNamespace(role="model", parts=parts))],
+            text="".join(text),
+            usage_metadata=usage,
+        )
+
     def format_state_to_api_messages(self, state):
         """
         Convert internal state to Gemini API format.
@@ -430,6 +540,10 @@ class GeminiProcessExecutor:
     async def count_tokens(self, process):
         """Count tokens in the current conversation context using Gemini's API.
 
+        The request goes through the client's async ``aio`` surface when it
+        has one; otherwise the synchronous call runs on a small shared thread
+        pool so it never blocks the event loop.
+
         Args:
             process: The LLMProcess instance
 
@@ -441,47 +555,19 @@ class GeminiProcessExecutor:
             if not self._supports_token_counting(process.client):
                 return self._get_estimated_token_count(process.model_name)
 
-            # Create a text representation of the conversation for token counting
-            text_content = ""
-
-            # Add system prompt if present
-            if process.enriched_system_prompt:
-                text_content += process.enriched_system_prompt + "\n\n"
-
-            # Add conversation history
-            for message in process.state:
-                if isinstance(message.get("content"), str):
-                    text_content += message.get("content", "") + "\n"
-                elif isinstance(message.get("content"), list):
-                    # Extract text from complex content (for future tool support)
-                    text_parts = []
-                    for item in message.get("content", []):
-                        if isinstance(item, dict):
-                            if "text" in item:
-                                text_parts.append(item["text"])
-                            elif "content" in item:
-                                text_parts.append(item["content"])
-                        else:
-                            text_parts.append(str(item))
-                    text_content += " ".join(text_parts) + "\n"
-
             try:
                 # Convert conversation to Gemini's expected format
-                contents = self.format_state_to_api_messages(process.state)
+                kwargs = {
+                    "model": process.model_name,
+                    "contents": self.format_state_to_api_messages(process.state),
+                }
 
-                # Add system prompt if present (needs to be formatted for the API)
+                # System instructions are handled differently in the count_tokens API
+                # For accurate counting, include it in the config
                 if process.enriched_system_prompt:
-                    # System instructions are handled differently in the count_tokens API
-                    # For accurate counting, include it in the config
-                    config = {"system_instruction": process.enriched_system_prompt}
-                    token_count_response = process.client.models.count_tokens(
-                        model=process.model_name, contents=contents, config=config
-                    )
-                else:
-                    # Call without system instructions
-                    token_count_response = process.client.models.count_tokens(
-                        model=process.model_name, contents=contents
-                    )
+                    kwargs["config"] = {"system_instruction": process.enriched_system_prompt}
+
+                token_count_response = await _count_tokens_async(process.client, kwargs)
 
                 # Get the token count from response
                 token_count = getattr(token_count_response, "total_tokens", 0)
@@ -492,14 +578,14 @@ class GeminiProcessExecutor:
                     logger.debug(f"Cached content tokens: {cached_count}")
 
                 # Get context window size
-                window_size = self._get_context_window_size(process.model_name)
+                window_size = self.context_window_size(process.model_name)
 
                 # Calculate window usage metrics and return
                 return self._calculate_window_usage(token_count, window_size, cached_count)
             except Exception as token_error:
                 # If token counting fails, log it and return an error
                 logger.warning(f"Token counting failed: {str(token_error)}")
-                window_size = self._get_context_window_size(process.model_name)
+                window_size = self.context_window_size(process.model_name)
                 return {
                     "error": f"Token counting failed: {str(token_error)}",
                     "context_window": window_size,
@@ -508,7 +594,7 @@ class GeminiProcessExecutor:
         except Exception as e:
             return {"error": str(e)}
 
-    def _get_context_window_size(self, model_name):
+    def context_window_size(self, model_name):
         """Get the context window size for the given model."""
         # Extract model family
         base_model = model_name
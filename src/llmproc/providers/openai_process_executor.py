@@ -22,18 +22,26 @@ Anthropic implementation.
 
 import json
 import logging
+import time
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from llmproc.callbacks import CallbackEvent
 from llmproc.common.results import RunResult
+from llmproc.common.stream_events import stream_emitter
 from llmproc.providers.openai_utils import (
     CONTEXT_WINDOW_SIZES,
     call_with_retry,
     convert_tools_to_openai_format,
     format_tool_result_for_openai,
-    num_tokens_from_messages,
+    num_tokens_from_message_batches,
+    stream_chat_with_retry,
+    system_message,
 )
+from llmproc.providers.payload_memo import get_payload_memo
+from llmproc.providers.rate_limit import rate_limited
 from llmproc.providers.utils import get_context_window_size
+from llmproc.tools.tool_scheduler import ToolCallScheduler
 from llmproc.utils.message_utils import append_message
 
 if TYPE_CHECKING:  # pragma: no cover - used for type hints only
@@ -128,6 +136,7 @@ class OpenAIProcessExecutor:
             # Trigger TURN_START event
             await process.trigger_event(CallbackEvent.TURN_START, run_result=run_result)
 
+            sent = process.token_ledger.checkpoint(process.state)
             formatted_messages = _format_state_messages(process)
 
             logger.debug(f"Making OpenAI API call with {len(formatted_messages)} messages")
@@ -135,7 +144,9 @@ class OpenAIProcessExecutor:
             try:
                 api_params = _normalize_api_params(process.model_name, process.api_params)
 
-                openai_tools = convert_tools_to_openai_format(process.tools)
+                openai_tools = get_payload_memo(process).tools(
+                    process, "openai_chat_tools", convert_tools_to_openai_format
+                )
 
                 # Build API request payload
                 api_request = {
@@ -158,7 +169,14 @@ class OpenAIProcessExecutor:
                 if openai_tools:
                     call_params["tools"] = openai_tools
 
-                response = await call_with_retry(process.client, "chat", call_params)
+                emit = stream_emitter(process)
+                async with rate_limited(process):
+                    started = time.monotonic()
+                    if emit is None:
+                        response = await call_with_retry(process.client, "chat", call_params)
+                    else:
+                        response = await stream_chat_with_retry(process.client, call_params, emit)
+                    latency_ms = int((time.monotonic() - started) * 1000)
 
                 # Trigger API response event
                 await process.trigger_event(CallbackEvent.API_RESPONSE, response=response)
@@ -170,10 +188,12 @@ class OpenAIProcessExecutor:
                     "model": process.model_name,
                     "usage": getattr(response, "usage", {}),
                     "id": getattr(response, "id", None),
+                    "latency_ms": latency_ms,
                     "request": api_request,
                     "response": response,
                 }
                 run_result.add_api_call(api_info)
+                process.token_ledger.record_usage(sent, api_info["usage"])
 
                 # Extract the response message and any tool calls
                 choice = response.choices[0]
@@ -218,25 +238,16 @@ class OpenAIProcessExecutor:
                         break
 
                 tool_results = []
-                for call in tool_calls:
-                    name = getattr(call.function, "name", "")
-                    args_str = getattr(call.function, "arguments", "{}")
-                    try:
-                        args_dict = json.loads(args_str)
-                    except Exception:  # noqa: BLE001 - fallback on parse errors
-                        args_dict = {}
-
-                    await process.trigger_event(CallbackEvent.TOOL_START, tool_name=name, tool_args=args_dict)
-                    run_result.add_tool_call(tool_name=name, tool_args=args_dict)
-                    result = await process.call_tool(name, args_dict)
-                    await process.trigger_event(CallbackEvent.TOOL_END, tool_name=name, result=result)
-
-                    tool_results.append(result.to_dict())
-                    # OpenAI doesn't support the is_error field like Anthropic,
-                    # so we format errors with "ERROR:" prefix for clear indication
-                    formatted_content = format_tool_result_for_openai(result)
-                    append_message(process, "tool", formatted_content)
-                    process.state[-1]["tool_call_id"] = getattr(call, "id", None)
+                scheduler = ToolCallScheduler.for_process(process)
+                commit = partial(self._commit_tool_result, process, tool_results)
+
+                try:
+                    for call in tool_calls:
+                        name = getattr(call.function, "name", "")
+                        await scheduler.submit(name, partial(self._run_tool, process, call, run_result), commit)
+                    await scheduler.flush()
+                finally:
+                    scheduler.cancel()
 
                 # Trigger TURN_END event
                 await process.trigger_event(CallbackEvent.TURN_END, response=response, tool_results=tool_results)
@@ -263,6 +274,37 @@ class OpenAIProcessExecutor:
         # Complete the RunResult and return it
         return run_result.complete()
 
+    async def _run_tool(self, process: "LLMProcess", call: Any, run_result: RunResult) -> tuple[Any, Any]:
+        """Execute a single tool call and return it with its result."""
+        name = getattr(call.function, "name", "")
+        args_str = getattr(call.function, "arguments", "{}")
+        try:
+            args_dict = json.loads(args_str)
+        except Exception:  # noqa: BLE001 - fallback on parse errors
+            args_dict = {}
+
+        await process.trigger_event(CallbackEvent.TOOL_START, tool_name=name, tool_args=args_dict)
+        run_result.add_tool_call(tool_name=name, tool_args=args_dict)
+        result = await process.call_tool(name, args_dict)
+        await process.trigger_event(CallbackEvent.TOOL_END, tool_name=name, result=result)
+        return call, result
+
+    def _commit_tool_result(
+        self, process: "LLMProcess", tool_results: list[dict[str, Any]], outcome: tuple[Any, Any]
+    ) -> None:
+        """Append a tool result to the conversation state."""
+        call, result = outcome
+        tool_results.append(result.to_dict())
+        # OpenAI doesn't support the is_error field like Anthropic,
+        # so we format errors with "ERROR:" prefix for clear indication
+        formatted_content = format_tool_result_for_openai(result)
+        append_message(process, "tool", formatted_content)
+        process.state[-1]["tool_call_id"] = getattr(call, "id", None)
+
+    def context_window_size(self, model_name: str) -> int:
+        """Return the context window size of ``model_name``."""
+        return get_context_window_size(model_name, CONTEXT_WINDOW_SIZES)
+
     async def count_tokens(self, process: "LLMProcess") -> dict:
         """Count tokens in the current conversation using ``tiktoken``.
 
@@ -272,21 +314,45 @@ class OpenAIProcessExecutor:
         Returns:
             Dictionary containing token usage information.
         """
+        return (await self.count_tokens_batch([process]))[0]
+
+    async def count_tokens_batch(self, processes: list["LLMProcess"]) -> list[dict]:
+        """Count tokens for several processes at once.
+
+        Messages not yet counted are encoded together per model, and history
+        shared between processes (e.g. forks) is only encoded once.
+
+        Args:
+            processes: ``LLMProcess`` instances using the Chat Completions API.
+
+        Returns:
+            Token usage dictionaries in the order of ``processes``.
+        """
         try:
-            messages: list[dict[str, Any]] = []
-            if process.enriched_system_prompt:
-                messages.append({"role": "system", "content": process.enriched_system_prompt})
-            messages.extend(process.state)
-
-            tokens = num_tokens_from_messages(messages, model=process.model_name)
-            window_size = get_context_window_size(process.model_name, CONTEXT_WINDOW_SIZES)
-
-            return {
-                "input_tokens": tokens,
-                "context_window": window_size,
-                "percentage": (tokens / window_size * 100) if window_size > 0 else 0,
-                "remaining_tokens": max(0, window_size - tokens),
-            }
+            by_model: dict[str, list[int]] = {}
+            for index, process in enumerate(processes):
+                by_model.setdefault(process.model_name, []).append(index)
+
+            results: list[dict] = [{} for _ in processes]
+            for model, indexes in by_model.items():
+                batches = []
+                for index in indexes:
+                    process = processes[index]
+                    messages: list[dict[str, Any]] = []
+                    if process.enriched_system_prompt:
+                        messages.append(system_message(process.enriched_system_prompt))
+                    messages.extend(process.state)
+                    batches.append(messages)
+
+                window_size = get_context_window_size(model, CONTEXT_WINDOW_SIZES)
+                for index, tokens in zip(indexes, num_tokens_from_message_batches(batches, model=model), strict=True):
+                    results[index] = {
+                        "input_tokens": tokens,
+                        "context_window": window_size,
+                        "percentage": (tokens / window_size * 100) if window_size > 0 else 0,
+                        "remaining_tokens": max(0, window_size - tokens),
+                    }
+            return results
         except Exception as exc:  # noqa: BLE001
             logger.warning(f"Token counting failed: {exc}")
-            return {"error": str(exc)}
+            return [{"error": str(exc)} for _ in processes]
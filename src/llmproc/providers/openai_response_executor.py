@@ -15,15 +15,20 @@ compatibility with LLMProc's client-side state management.
 import json
 import logging
 import time
+from functools import partial
 from typing import TYPE_CHECKING, Any
 
 from llmproc.callbacks import CallbackEvent
 from llmproc.common.results import RunResult
+from llmproc.common.stream_events import stream_emitter
 from llmproc.providers.openai_utils import (
     call_with_retry,
     convert_tools_to_openai_format,
     format_tool_result_for_openai,
+    stream_responses_with_retry,
 )
+from llmproc.providers.payload_memo import get_payload_memo
+from llmproc.providers.rate_limit import rate_limited
 from llmproc.utils.message_utils import append_message
 
 if TYPE_CHECKING:  # pragma: no cover - used for type hints only
@@ -112,11 +117,14 @@ class OpenAIResponseProcessExecutor:
 
             try:
                 # ── 1. Get conversation state for API call ──────────────────────────
+                sent = process.token_ledger.checkpoint(process.state)
                 last_response_id, messages_since_response = self._get_conversation_payload(process)
 
                 # ── 2. Build API call parameters ────────────────────────────────────
                 api_params = _normalize_responses_params(process.api_params)
-                responses_tools = convert_tools_to_openai_format(process.tools, api_type="responses")
+                responses_tools = get_payload_memo(process).tools(
+                    process, "openai_responses_tools", partial(convert_tools_to_openai_format, api_type="responses")
+                )
 
                 call_params = {
                     "model": process.model_name,
@@ -144,7 +152,14 @@ class OpenAIResponseProcessExecutor:
                 await process.trigger_event(CallbackEvent.API_REQUEST, api_request=api_request)
 
                 # ── 3. Make API call ─────────────────────────────────────────────────
-                response = await call_with_retry(process.client, "responses", call_params)
+                emit = stream_emitter(process)
+                async with rate_limited(process):
+                    started = time.monotonic()
+                    if emit is None:
+                        response = await call_with_retry(process.client, "responses", call_params)
+                    else:
+                        response = await stream_responses_with_retry(process.client, call_params, emit)
+                    latency_ms = int((time.monotonic() - started) * 1000)
 
                 # Trigger API response event
                 await process.trigger_event(CallbackEvent.API_RESPONSE, response=response)
@@ -154,10 +169,12 @@ class OpenAIResponseProcessExecutor:
                     "model": process.model_name,
                     "usage": getattr(response, "usage", {}),
                     "id": getattr(response, "id", None),
+                    "latency_ms": latency_ms,
                     "request": api_request,
                     "response": response,
                 }
                 run_result.add_api_call(api_info)
+                process.token_ledger.record_usage(sent, api_info["usage"])
 
                 # ── 4. Process response and commit to state ──────────────────────────
                 # Store complete response object in conversation state
@@ -346,6 +363,13 @@ class OpenAIResponseProcessExecutor:
         # Return formatted for Responses API
         return format_tool_result_for_openai(result, call_id=call_id, api_type="responses")
 
+    def context_window_size(self, model_name: str) -> int:
+        """Return the context window size of ``model_name``."""
+        from llmproc.providers.openai_utils import CONTEXT_WINDOW_SIZES
+        from llmproc.providers.utils import get_context_window_size
+
+        return get_context_window_size(model_name, CONTEXT_WINDOW_SIZES)
+
     async def count_tokens(self, process: "LLMProcess") -> dict:
         """Count tokens in the current conversation.
 
@@ -357,13 +381,13 @@ class OpenAIResponseProcessExecutor:
         """
         try:
             # Import OpenAI utilities for token counting
-            from llmproc.providers.openai_utils import CONTEXT_WINDOW_SIZES, num_tokens_from_messages
+            from llmproc.providers.openai_utils import CONTEXT_WINDOW_SIZES, num_tokens_from_messages, system_message
             from llmproc.providers.utils import get_context_window_size
 
             # Filter out response_metadata entries for token counting
             messages: list[dict[str, Any]] = []
             if process.enriched_system_prompt:
-                messages.append({"role": "system", "content": process.enriched_system_prompt})
+                messages.append(system_message(process.enriched_system_prompt))
 
             # Filter state to exclude metadata and response objects
             filtered_state = [
@@ -1,13 +1,21 @@
 """Utility functions for OpenAI provider."""
 
+import json
 import logging
+from collections import OrderedDict
+from collections.abc import Iterable
+from functools import lru_cache
+from types import SimpleNamespace
 from typing import Any
 
 import tiktoken
 
 from llmproc.common.results import ToolResult
+from llmproc.common.stream_events import InputJsonDelta, StreamEmitter, TextDelta, ThinkingDelta, ToolUseStart
 from llmproc.providers.utils import async_retry, get_context_window_size
 
+logger = logging.getLogger(__name__)
+
 # Import OpenAI error classes for retry logic
 try:  # pragma: no cover - openai optional
     from openai import (
@@ -42,45 +50,123 @@ CONTEXT_WINDOW_SIZES: dict[str, int] = {
 }
 
 
-def num_tokens_from_messages(messages: list[dict[str, Any]], model: str = "gpt-4o-mini-2024-07-18") -> int:
-    """Return the number of tokens used by a list of messages."""
+# Token overhead of the chat format per message, per ``name`` field and per reply
+TOKENS_PER_MESSAGE = 3
+TOKENS_PER_NAME = 1
+REPLY_PRIMING_TOKENS = 3  # every reply is primed with <|start|>assistant<|message|>
+
+# Messages whose token counts are remembered across calls. Entries hold an
+# object id and a hash rather than message text, so this caps the memo at
+# about a megabyte however large the messages are.
+MESSAGE_TOKEN_MEMO_SIZE = 8192
+
+# Below this many new texts, encoding serially beats tiktoken's thread pool
+_ENCODE_BATCH_MIN = 32
+
+_message_token_memo: OrderedDict[tuple[str, int, int], int] = OrderedDict()
+
+
+@lru_cache(maxsize=64)
+def get_encoding(model: str) -> Any | None:
+    """Return the tiktoken encoding for ``model``, loaded once per model.
+
+    Unknown models use ``o200k_base``. Returns ``None`` when the encoding
+    files cannot be loaded, e.g. in offline environments.
+    """
     try:
-        encoding = tiktoken.encoding_for_model(model)
+        return tiktoken.encoding_for_model(model)
     except KeyError:
-        print("Warning: model not found. Using o200k_base encoding.")
-        encoding = tiktoken.get_encoding("o200k_base")
-    except Exception:
-        # tiktoken may be missing required files in offline environments.
-        # Use a naive approximation based on string length.
-        return sum(len(m.get("content", "")) // 4 for m in messages)
-
-    if model in {
-        "gpt-3.5-turbo-0125",
-        "gpt-4-0314",
-        "gpt-4-32k-0314",
-        "gpt-4-0613",
-        "gpt-4-32k-0613",
-        "gpt-4o-mini-2024-07-18",
-        "gpt-4o-2024-08-06",
-    }:
-        tokens_per_message = 3
-        tokens_per_name = 1
-    elif "gpt-3.5-turbo" in model:
-        ("Warning: gpt-3.5-turbo may update over time. Returning num tokens assuming gpt-3.5-turbo-0125.")
-        return num_tokens_from_messages(messages, model="gpt-3.5-turbo-0125")
-    else:
-        tokens_per_message = 3
-        tokens_per_name = 1
+        logger.warning("Model %s not known to tiktoken; using o200k_base encoding", model)
+        try:
+            return tiktoken.get_encoding("o200k_base")
+        except Exception:  # noqa: BLE001 - offline
+            return None
+    except Exception:  # noqa: BLE001 - offline
+        return None
+
+
+def _field_text(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value, sort_keys=True, default=str)
+
+
+def _message_key(encoding_name: str, message: dict[str, Any]) -> tuple[str, int, int]:
+    """Return the memo key of ``message``: its identity plus a content hash.
+
+    String fields are hashed directly (Python caches string hashes), so
+    re-counting an unchanged history does not serialize its text again. The
+    hash catches messages edited in place and ids reused after collection.
+    """
+    digest = hash(
+        tuple((key, value if isinstance(value, str) else _field_text(value)) for key, value in message.items())
+    )
+    return encoding_name, id(message), digest
+
+
+@lru_cache(maxsize=32)
+def system_message(prompt: str) -> dict[str, Any]:
+    """Return a shared system message for ``prompt``; callers must not modify it.
+
+    Reusing the same object lets the token memo recognize the system prompt
+    across counts.
+    """
+    return {"role": "system", "content": prompt}
+
+
+def num_tokens_from_message_batches(
+    batches: Iterable[Iterable[dict[str, Any]]], model: str = "gpt-4o-mini-2024-07-18"
+) -> list[int]:
+    """Return the number of tokens used by each list of messages in ``batches``.
+
+    Per-message counts are memoized by message identity and content hash, so
+    messages already counted (including history shared by forked processes)
+    are not encoded again.
+    Messages not yet seen across all batches are encoded together.
+    """
+    batches = [list(messages) for messages in batches]
+    encoding = get_encoding(model)
+    if encoding is None:
+        # Naive approximation when tiktoken files are unavailable
+        return [sum(len(str(m.get("content") or "")) // 4 for m in messages) for messages in batches]
+
+    memo = _message_token_memo
+    keyed = [[_message_key(encoding.name, m) for m in messages] for messages in batches]
+
+    counts: dict[tuple[str, int, int], int] = {}
+    missing: list[tuple[tuple[str, int, int], dict[str, Any]]] = []
+    for messages, keys in zip(batches, keyed, strict=True):
+        for message, key in zip(messages, keys, strict=True):
+            if key in counts:
+                continue
+            tokens = memo.get(key)
+            if tokens is None:
+                missing.append((key, message))
+                counts[key] = 0
+            else:
+                memo.move_to_end(key)
+                counts[key] = tokens
+
+    if missing:
+        texts = [_field_text(value) for _, message in missing for value in message.values()]
+        if len(texts) >= _ENCODE_BATCH_MIN:
+            lengths = iter(map(len, encoding.encode_batch(texts, disallowed_special=())))
+        else:
+            lengths = (len(encoding.encode(text, disallowed_special=())) for text in texts)
+        for key, message in missing:
+            tokens = TOKENS_PER_MESSAGE
+            for name in message:
+                tokens += next(lengths)
+                if name == "name":
+                    tokens += TOKENS_PER_NAME
+            counts[key] = memo[key] = tokens
+        while len(memo) > MESSAGE_TOKEN_MEMO_SIZE:
+            memo.popitem(last=False)
+
+    return [sum(counts[key] for key in keys) + REPLY_PRIMING_TOKENS for keys in keyed]
 
-    num_tokens = 0
-    for message in messages:
-        num_tokens += tokens_per_message
-        for key, value in message.items():
-            num_tokens += len(encoding.encode(value))
-            if key == "name":
-                num_tokens += tokens_per_name
-    num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
-    return num_tokens
+
+def num_tokens_from_messages(messages: list[dict[str, Any]], model: str = "gpt-4o-mini-2024-07-18") -> int:
+    """Return the number of tokens used by a list of messages."""
+    return num_tokens_from_message_batches([messages], model)[0]
 
 
 async def call_with_retry(client: Any, api_type: str, params: dict[str, Any]) -> Any:
@@ -116,6 +202,116 @@ async def call_with_retry(client: Any, api_type: str, params: dict[str, Any]) ->
     )
 
 
+async def stream_chat_with_retry(client: Any, params: dict[str, Any], on_event: StreamEmitter) -> Any:
+    """Call the Chat Completions API in streaming mode and assemble the response.
+
+    Text and tool-argument deltas are passed to ``on_event`` as they arrive.
+    The returned object mirrors a non-streaming ``ChatCompletion`` (``id``,
+    ``model``, ``choices[0].message``, ``choices[0].finish_reason`` and
+    ``usage``) so callers can treat both modes alike. Text is content block
+    ``0`` and tool call ``n`` is block ``n + 1``.
+
+    Args:
+        client: OpenAI client instance
+        params: Parameters to pass to ``chat.completions.create``
+        on_event: Coroutine receiving token-level stream events
+
+    Returns:
+        Response object assembled from the stream
+    """
+    stream = await call_with_retry(
+        client, "chat", {**params, "stream": True, "stream_options": {"include_usage": True}}
+    )
+
+    text: list[str] = []
+    calls: dict[int, dict[str, Any]] = {}
+    finish_reason = None
+    response_id = None
+    model = None
+    usage = None
+
+    async for chunk in stream:
+        response_id = response_id or getattr(chunk, "id", None)
+        model = model or getattr(chunk, "model", None)
+        if getattr(chunk, "usage", None) is not None:
+            usage = chunk.usage
+        for choice in getattr(chunk, "choices", None) or []:
+            if choice.finish_reason:
+                finish_reason = choice.finish_reason
+            delta = choice.delta
+            if getattr(delta, "content", None):
+                text.append(delta.content)
+                await on_event(TextDelta(text=delta.content, index=0))
+            for tool_delta in getattr(delta, "tool_calls", None) or []:
+                call = calls.get(tool_delta.index)
+                function = getattr(tool_delta, "function", None)
+                if call is None:
+                    call = calls[tool_delta.index] = {
+                        "id": tool_delta.id,
+                        "name": getattr(function, "name", None) or "",
+                        "arguments": [],
+                    }
+                    await on_event(ToolUseStart(id=call["id"], name=call["name"], index=tool_delta.index + 1))
+                arguments = getattr(function, "arguments", None)
+                if arguments:
+                    call["arguments"].append(arguments)
+                    await on_event(InputJsonDelta(partial_json=arguments, index=tool_delta.index + 1))
+
+    tool_calls = [
+        SimpleNamespace(
+            id=call["id"],
+            type="function",
+            function=SimpleNamespace(name=call["name"], arguments="".join(call["arguments"]) or "{}"),
+        )
+        for _, call in sorted(calls.items())
+    ]
+    message = SimpleNamespace(role="assistant", content="".join(text) or None, tool_calls=tool_calls or None)
+    return SimpleNamespace(
+        id=response_id,
+        model=model,
+        choices=[SimpleNamespace(index=0, message=message, finish_reason=finish_reason)],
+        usage=usage,
+    )
+
+
+async def stream_responses_with_retry(client: Any, params: dict[str, Any], on_event: StreamEmitter) -> Any:
+    """Call the Responses API in streaming mode and return the completed response.
+
+    Text, reasoning-summary and function-argument deltas are passed to
+    ``on_event`` as they arrive; ``index`` is the output item position.
+
+    Args:
+        client: OpenAI client instance
+        params: Parameters to pass to ``responses.create``
+        on_event: Coroutine receiving token-level stream events
+
+    Returns:
+        The ``Response`` carried by the final ``response.completed`` event
+
+    Raises:
+        ValueError: If the stream ends without a completed response
+    """
+    stream = await call_with_retry(client, "responses", {**params, "stream": True})
+
+    response = None
+    async for event in stream:
+        kind = getattr(event, "type", None)
+        if kind == "response.output_text.delta":
+            await on_event(TextDelta(text=event.delta, index=event.output_index))
+        elif kind == "response.reasoning_summary_text.delta":
+            await on_event(ThinkingDelta(thinking=event.delta, index=event.output_index))
+        elif kind == "response.function_call_arguments.delta":
+            await on_event(InputJsonDelta(partial_json=event.delta, index=event.output_index))
+        elif kind == "response.output_item.added" and getattr(event.item, "type", None) == "function_call":
+            await on_event(ToolUseStart(id=event.item.call_id, name=event.item.name, index=event.output_index))
+        elif kind in ("response.completed", "response.incomplete"):
+            response = event.response
+
+    if response is None:
+        raise ValueError("OpenAI Responses stream ended without a completed response")
+    return response
+
+
 def convert_tools_to_openai_format(
     tools: list[dict[str, Any]] | None, api_type: str = "chat"
 ) -> list[dict[str, Any]] | None:
@@ -199,9 +395,14 @@ def format_tool_result_for_openai(
 
 __all__ = [
     "CONTEXT_WINDOW_SIZES",
+    "get_encoding",
     "num_tokens_from_messages",
+    "num_tokens_from_message_batches",
+    "system_message",
     "get_context_window_size",
     "call_with_retry",
+    "stream_chat_with_retry",
+    "stream_responses_with_retry",
     "convert_tools_to_openai_format",
     "format_tool_result_for_openai",
 ]
@@ -0,0 +1,60 @@
+"""Per-process memo of the request fragments that rarely change.
+
+Tool schemas and the system prompt only change when a tool is registered or
+the prompt is replaced, yet every API call used to convert them again for
+the provider. :class:`PayloadMemo` keeps the converted fragment together with
+the object it was built from and rebuilds it only when that object changes.
+``process.tools`` returns the same list until a tool is registered, and the
+system prompt is an immutable string, so an identity check detects changes.
+
+Fragments returned by the memo are shared between calls and must be treated
+as read-only.
+"""
+
+from collections.abc import Callable
+from typing import Any
+
+
+class PayloadMemo:
+    """Converted tool and system prompt fragments keyed by format name."""
+
+    __slots__ = ("_fragments",)
+
+    def __init__(self) -> None:
+        self._fragments: dict[str, tuple[Any, Any]] = {}
+
+    def get(self, key: str, source: Any, build: Callable[[Any], Any]) -> Any:
+        """Return ``build(source)``, reusing the result while ``source`` is unchanged.
+
+        Args:
+            key: Name of the fragment, e.g. ``"openai_chat_tools"``
+            source: Object the fragment is built from
+            build: Function converting ``source`` to the fragment
+
+        Returns:
+            The memoized fragment
+        """
+        entry = self._fragments.get(key)
+        if entry is None or entry[0] is not source:
+            entry = self._fragments[key] = (source, build(source))
+        return entry[1]
+
+    def tools(self, process: Any, key: str, convert: Callable[[Any], Any]) -> Any:
+        """Return ``process.tools`` converted by ``convert``."""
+        return self.get(key, process.tools, convert)
+
+    def invalidate(self) -> None:
+        """Drop all memoized fragments."""
+        self._fragments.clear()
+
+
+def get_payload_memo(process: Any) -> PayloadMemo:
+    """Return the :class:`PayloadMemo` attached to ``process``."""
+    memo = getattr(process, "_payload_memo", None)
+    if not isinstance(memo, PayloadMemo):
+        memo = PayloadMemo()
+        process._payload_memo = memo
+    return memo
+
+
+__all__ = ["PayloadMemo", "get_payload_memo"]
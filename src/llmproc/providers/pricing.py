@@ -1,5 +1,8 @@
 """Pricing tables for provider models used by LLMProc."""
 
+# Message Batches API calls are billed at half the regular token prices
+BATCH_PRICE_FACTOR = 0.5
+
 # USD cost per million tokens for Anthropic models (28 May 2025)
 CLAUDE_PRICING_USD_PER_MTOK = {
     "claude-opus-4": {
@@ -1,5 +1,6 @@
 """Simple provider module for LLMProc to return appropriate API clients."""
 
+import importlib
 import os
 import webbrowser
 from collections.abc import Callable
@@ -17,6 +18,7 @@ from llmproc.providers.constants import (
     PROVIDER_OPENAI_RESPONSE,
     SUPPORTED_PROVIDERS,
 )
+from llmproc.providers.rate_limit import observe_response
 
 # Try importing providers, set to None if packages aren't installed
 try:
@@ -43,17 +45,49 @@ except ImportError:
     genai = None
 
 
-def _openai_client(*_: str, **__: str) -> Any:
+def _connection_limits(connection_pool: dict[str, Any] | None, defaults: Any = None) -> Any:
+    """Return ``httpx.Limits`` for ``connection_pool``, or ``None`` if unset.
+
+    Limits missing from ``connection_pool`` fall back to ``defaults`` (the
+    SDK's own limits) and then to httpx's defaults.
+    """
+    if not connection_pool:
+        return None
+    import httpx
+
+    defaults = defaults or httpx.Limits()
+    return httpx.Limits(
+        max_connections=connection_pool.get("max_connections", defaults.max_connections),
+        max_keepalive_connections=connection_pool.get("max_keepalive_connections", defaults.max_keepalive_connections),
+        keepalive_expiry=connection_pool.get("keepalive_expiry", defaults.keepalive_expiry),
+    )
+
+
+def _sdk_http_client(sdk_name: str, connection_pool: dict[str, Any] | None) -> dict[str, Any]:
+    """Return ``http_client`` kwargs for the ``anthropic`` or ``openai`` SDK client.
+
+    The httpx client reports rate-limit response headers to the shared
+    limiter and applies ``connection_pool`` limits when given.
+    """
+    sdk = importlib.import_module(sdk_name)
+    options: dict[str, Any] = {"event_hooks": {"response": [observe_response]}}
+    limits = _connection_limits(connection_pool, sdk.DEFAULT_CONNECTION_LIMITS)
+    if limits is not None:
+        options["limits"] = limits
+    return {"http_client": sdk.DefaultAsyncHttpxClient(**options)}
+
+
+def _openai_client(*_: str, connection_pool: dict[str, Any] | None = None, **__: str) -> Any:
     """Create OpenAI client."""
     if AsyncOpenAI is None:
         raise ImportError("The 'openai' package is required for OpenAI provider. Install it with 'pip install openai'.")
     api_key = os.getenv("OPENAI_API_KEY")
     if not api_key:
         raise ValueError("OpenAI API key must be provided via OPENAI_API_KEY environment variable")
-    return AsyncOpenAI(api_key=api_key)
+    return AsyncOpenAI(api_key=api_key, **_sdk_http_client("openai", connection_pool))
 
 
-def _anthropic_client(*_: str, **__: str) -> Any:
+def _anthropic_client(*_: str, connection_pool: dict[str, Any] | None = None, **__: str) -> Any:
     """Create Anthropic client."""
     if AsyncAnthropic is None:
         raise ImportError(
@@ -62,10 +96,14 @@ def _anthropic_client(*_: str, **__: str) -> Any:
     api_key = os.getenv("ANTHROPIC_API_KEY")
     if not api_key:
         raise ValueError("Anthropic API key must be provided via ANTHROPIC_API_KEY environment variable")
-    return AsyncAnthropic(api_key=api_key)
+    return AsyncAnthropic(api_key=api_key, **_sdk_http_client("anthropic", connection_pool))
 
 
-def _anthropic_vertex_client(project_id: str | None = None, region: str | None = None) -> Any:
+def _anthropic_vertex_client(
+    project_id: str | None = None,
+    region: str | None = None,
+    connection_pool: dict[str, Any] | None = None,
+) -> Any:
     """Create Anthropic Vertex client."""
     if AsyncAnthropicVertex is None:
         raise ImportError(
@@ -77,10 +115,10 @@ def _anthropic_vertex_client(project_id: str | None = None, region: str | None =
         raise ValueError(
             "Project ID must be provided via project_id parameter or ANTHROPIC_VERTEX_PROJECT_ID environment variable"
         )
-    return AsyncAnthropicVertex(project_id=project, region=reg)
+    return AsyncAnthropicVertex(project_id=project, region=reg, **_sdk_http_client("anthropic", connection_pool))
 
 
-def _claude_code_client(*_: str, **__: str) -> Any:
+def _claude_code_client(*_: str, connection_pool: dict[str, Any] | None = None, **__: str) -> Any:
     """Create Claude Code client using OAuth."""
     if AsyncAnthropic is None or AnthropicOAuth is None:
         raise ImportError("The 'anthropic' package and OAuth helper are required for Claude Code provider.")
@@ -99,10 +137,18 @@ def _claude_code_client(*_: str, **__: str) -> Any:
         if not token:
             raise ValueError("Authentication failed")
     headers = {"anthropic-version": "2023-06-01", "anthropic-beta": "oauth-2025-04-20"}
-    return AsyncAnthropic(auth_token=token, default_headers=headers)
+    return AsyncAnthropic(auth_token=token, default_headers=headers, **_sdk_http_client("anthropic", connection_pool))
+
 
+def _gemini_http_options(connection_pool: dict[str, Any] | None) -> dict[str, Any]:
+    """Return ``http_options`` kwargs applying ``connection_pool`` to the async client."""
+    limits = _connection_limits(connection_pool)
+    if limits is None:
+        return {}
+    return {"http_options": {"async_client_args": {"limits": limits}}}
 
-def _gemini_client(*_: str, **__: str) -> Any:
+
+def _gemini_client(*_: str, connection_pool: dict[str, Any] | None = None, **__: str) -> Any:
     """Create Gemini client."""
     if genai is None:
         raise ImportError(
@@ -111,10 +157,14 @@ def _gemini_client(*_: str, **__: str) -> Any:
     api_key = os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY")
     if not api_key:
         raise ValueError("API key must be provided via GEMINI_API_KEY or GOOGLE_API_KEY environment variable")
-    return genai.Client(api_key=api_key)
+    return genai.Client(api_key=api_key, **_gemini_http_options(connection_pool))
 
 
-def _gemini_vertex_client(project_id: str | None = None, region: str | None = None) -> Any:
+def _gemini_vertex_client(
+    project_id: str | None = None,
+    region: str | None = None,
+    connection_pool: dict[str, Any] | None = None,
+) -> Any:
     """Create Gemini Vertex client."""
     if genai is None:
         raise ImportError(
@@ -126,7 +176,7 @@ def _gemini_vertex_client(project_id: str | None = None, region: str | None = No
         raise ValueError(
             "Project ID must be provided via project_id parameter or GOOGLE_CLOUD_PROJECT environment variable"
         )
-    return genai.Client(vertexai=True, project=project, location=reg)
+    return genai.Client(vertexai=True, project=project, location=reg, **_gemini_http_options(connection_pool))
 
 
 _CLIENT_CREATORS: dict[str, Callable[..., Any]] = {
@@ -145,6 +195,7 @@ def get_provider_client(
     provider: str,
     project_id: str | None = None,
     region: str | None = None,
+    connection_pool: dict[str, Any] | None = None,
 ) -> Any:
     """Return the provider client for ``provider``.
 
@@ -152,6 +203,9 @@ def get_provider_client(
         provider: Provider identifier.
         project_id: Google Cloud project for Vertex providers.
         region: Google Cloud region for Vertex providers.
+        connection_pool: Optional HTTP connection pool limits
+            (``max_connections``, ``max_keepalive_connections``,
+            ``keepalive_expiry``) for the client's httpx pool.
 
     Returns:
         Initialized provider client.
@@ -169,4 +223,6 @@ def get_provider_client(
             f"Provider '{provider}' not implemented. Supported providers: {', '.join(SUPPORTED_PROVIDERS)}"
         )
 
+    if connection_pool:
+        return creator(project_id=project_id, region=region, connection_pool=connection_pool)
     return creator(project_id=project_id, region=region)
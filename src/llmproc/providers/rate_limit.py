@@ -0,0 +1,276 @@
+"""Client-side rate limiting shared by every process in the interpreter.
+
+Retrying only after a ``429`` means a fan-out of forked and spawned processes
+bursts into the limit together and then retries in lockstep. A
+:class:`RateLimiter` per (provider, model) instead keeps two token buckets,
+one for requests per minute and one for input tokens per minute, and admits
+each call by its estimated prompt size before it is sent. Limits come from
+``LLMPROC_RATE_LIMIT_RPM``/``LLMPROC_RATE_LIMIT_TPM``,
+:func:`configure_rate_limit`, or are learned from the provider's rate-limit
+response headers; until a limit is known its bucket admits everything.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import logging
+import os
+import threading
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+# (limit, remaining) header pairs per bucket, first match wins
+_REQUEST_HEADERS = (
+    ("anthropic-ratelimit-requests-limit", "anthropic-ratelimit-requests-remaining"),
+    ("x-ratelimit-limit-requests", "x-ratelimit-remaining-requests"),
+)
+_TOKEN_HEADERS = (
+    ("anthropic-ratelimit-input-tokens-limit", "anthropic-ratelimit-input-tokens-remaining"),
+    ("anthropic-ratelimit-tokens-limit", "anthropic-ratelimit-tokens-remaining"),
+    ("x-ratelimit-limit-tokens", "x-ratelimit-remaining-tokens"),
+)
+
+# Limiter and token cost of the API call running in the current task
+_current: contextvars.ContextVar[tuple[RateLimiter, int] | None] = contextvars.ContextVar(
+    "llmproc_rate_limit", default=None
+)
+
+
+def _header_number(headers: Mapping[str, str], name: str) -> float | None:
+    value = headers.get(name)
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def retry_after_seconds(headers: Mapping[str, str] | None) -> float | None:
+    """Return the delay requested by ``retry-after-ms`` or ``retry-after``.
+
+    ``retry-after`` may be a number of seconds or an HTTP date.
+    """
+    if not headers:
+        return None
+    millis = _header_number(headers, "retry-after-ms")
+    if millis is not None:
+        return max(millis / 1000, 0.0)
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    seconds = _header_number(headers, "retry-after")
+    if seconds is None:
+        try:
+            seconds = parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return max(seconds, 0.0)
+
+
+def error_headers(error: BaseException) -> Mapping[str, str] | None:
+    """Return the HTTP response headers attached to an SDK error, if any."""
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    return headers if isinstance(headers, Mapping) else None
+
+
+class TokenBucket:
+    """Bucket refilled continuously at ``capacity`` units per minute.
+
+    Callers reserve units up front, which may drive the level negative; the
+    returned delay is how long until the debt is repaid. A bucket without a
+    capacity admits everything immediately.
+    """
+
+    __slots__ = ("capacity", "level", "updated")
+
+    def __init__(self, per_minute: float | None, now: float) -> None:
+        self.capacity = per_minute or None
+        self.level = float(per_minute or 0)
+        self.updated = now
+
+    def _refill(self, now: float) -> None:
+        if self.capacity:
+            self.level = min(self.capacity, self.level + (now - self.updated) * self.capacity / 60)
+        self.updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """Take ``amount`` units and return the seconds to wait before using them."""
+        if not self.capacity:
+            return 0.0
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(-self.level * 60 / self.capacity, 0.0)
+
+    def update(self, limit: float | None, remaining: float | None, now: float) -> None:
+        """Apply a limit and remaining count reported by the provider."""
+        self._refill(now)
+        if limit and limit != self.capacity:
+            self.level = min(self.level, limit) if self.capacity else limit
+            self.capacity = limit
+        if remaining is not None and self.capacity:
+            self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    """Requests-per-minute and tokens-per-minute limiter for one model.
+
+    Thread-safe and not bound to an event loop, so a single instance serves
+    every process using the model.
+    """
+
+    def __init__(
+        self,
+        rpm: float | None = None,
+        tpm: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self._clock = clock
+        self._lock = threading.Lock()
+        now = clock()
+        self.requests = TokenBucket(rpm, now)
+        self.tokens = TokenBucket(tpm, now)
+        self._paused_until = 0.0
+
+    @property
+    def limits_tokens(self) -> bool:
+        """Return True once a tokens-per-minute limit is known."""
+        return self.tokens.capacity is not None
+
+    def reserve(self, tokens: int = 0) -> float:
+        """Reserve capacity for one request and return the seconds to wait."""
+        with self._lock:
+            now = self._clock()
+            return max(
+                self.requests.reserve(1, now),
+                self.tokens.reserve(tokens, now),
+                self._paused_until - now,
+            )
+
+    async def acquire(self, tokens: int = 0) -> None:
+        """Wait until a request of ``tokens`` estimated input tokens may be sent."""
+        delay = self.reserve(tokens)
+        if delay > 0:
+            logger.debug("Rate limiter delaying request by %.2fs", delay)
+            await asyncio.sleep(delay)
+
+    def pause(self, seconds: float) -> None:
+        """Hold back every request for ``seconds``, e.g. after a ``retry-after``."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """Learn limits and remaining capacity from rate-limit response headers."""
+        with self._lock:
+            now = self._clock()
+            for bucket, names in ((self.requests, _REQUEST_HEADERS), (self.tokens, _TOKEN_HEADERS)):
+                for limit_name, remaining_name in names:
+                    limit = _header_number(headers, limit_name)
+                    remaining = _header_number(headers, remaining_name)
+                    if limit is not None or remaining is not None:
+                        bucket.update(limit, remaining, now)
+                        break
+
+
+_limiters: dict[tuple[str, str], RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def _env_limit(name: str) -> float | None:
+    value = os.getenv(name)
+    return float(value) if value else None
+
+
+def rate_limiting_enabled() -> bool:
+    """Return False when ``LLMPROC_RATE_LIMIT`` disables client-side limiting."""
+    return os.getenv("LLMPROC_RATE_LIMIT", "true").lower() not in ("false", "0", "no")
+
+
+def get_rate_limiter(provider: str, model: str) -> RateLimiter:
+    """Return the process-wide limiter for ``provider`` and ``model``."""
+    key = (provider, model)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.get(key)
+            if limiter is None:
+                limiter = RateLimiter(_env_limit("LLMPROC_RATE_LIMIT_RPM"), _env_limit("LLMPROC_RATE_LIMIT_TPM"))
+                _limiters[key] = limiter
+    return limiter
+
+
+def configure_rate_limit(provider: str, model: str, rpm: float | None = None, tpm: float | None = None) -> RateLimiter:
+    """Set known requests/min and input tokens/min limits for a model.
+
+    Returns:
+        The shared limiter for ``provider`` and ``model``
+    """
+    limiter = get_rate_limiter(provider, model)
+    with limiter._lock:
+        now = limiter._clock()
+        limiter.requests.update(rpm, None, now)
+        limiter.tokens.update(tpm, None, now)
+    return limiter
+
+
+def reset_rate_limiters() -> None:
+    """Forget every limiter and what it learned."""
+    with _limiters_lock:
+        _limiters.clear()
+
+
+@asynccontextmanager
+async def rate_limited(process: Any) -> AsyncIterator[None]:
+    """Admit one API call of ``process`` through its model's shared limiter.
+
+    Waits for capacity before entering. Inside the block, :func:`async_retry
+    <llmproc.providers.utils.async_retry>` re-admits retries and the SDK HTTP
+    clients report rate-limit headers to the same limiter. The prompt size is
+    taken from the process's token ledger, and only once a tokens-per-minute
+    limit is known.
+    """
+    provider = getattr(process, "provider", None)
+    model = getattr(process, "model_name", None)
+    if not (isinstance(provider, str) and isinstance(model, str)) or not rate_limiting_enabled():
+        yield
+        return
+    limiter = get_rate_limiter(provider, model)
+    ledger = getattr(process, "token_ledger", None)
+    cost = ledger.count(process) if limiter.limits_tokens and ledger is not None else 0
+    await limiter.acquire(cost)
+    token = _current.set((limiter, cost))
+    try:
+        yield
+    finally:
+        _current.reset(token)
+
+
+def current_rate_limit() -> tuple[RateLimiter, int] | None:
+    """Return the limiter and admitted token cost of the call in this task."""
+    return _current.get()
+
+
+async def observe_response(response: Any) -> None:
+    """Response hook for httpx feeding rate-limit headers to the active limiter."""
+    admitted = _current.get()
+    if admitted is not None:
+        admitted[0].observe_headers(response.headers)
+
+
+__all__ = [
+    "RateLimiter",
+    "TokenBucket",
+    "configure_rate_limit",
+    "current_rate_limit",
+    "error_headers",
+    "get_rate_limiter",
+    "observe_response",
+    "rate_limiting_enabled",
+    "rate_limited",
+    "reset_rate_limiters",
+    "retry_after_seconds",
+]
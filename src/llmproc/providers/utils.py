@@ -7,9 +7,11 @@ including general helper functions for API interactions and error handling.
 import asyncio
 import logging
 import os
+import random
 from typing import Any
 
 from llmproc import providers as _providers
+from llmproc.providers.rate_limit import current_rate_limit, error_headers, retry_after_seconds
 
 logger = logging.getLogger(__name__)
 
@@ -119,10 +121,21 @@ def choose_provider_executor(provider: str, model_name: str | None = None) -> "A
     return AnthropicProcessExecutor()
 
 
-async def async_retry(func: Any, exceptions: tuple[type[Exception], ...], name: str, logger: logging.Logger) -> Any:
-    """Execute an async function with exponential backoff retries.
+async def async_retry(
+    func: Any,
+    exceptions: tuple[type[Exception], ...],
+    name: str,
+    logger: logging.Logger,
+) -> Any:
+    """Execute an async function with jittered exponential backoff retries.
 
     Retry behavior is controlled by LLMPROC_RETRY_* environment variables.
+    Each wait is drawn uniformly from the upper half of the current backoff
+    so concurrent callers do not retry in lockstep, and is never shorter than
+    a ``retry-after`` sent with the error. Inside
+    :func:`~llmproc.providers.rate_limit.rate_limited` each retry is admitted
+    by the shared rate limiter, and a ``429`` with ``retry-after`` pauses every
+    caller of the same model.
 
     Args:
         func: Async function to execute.
@@ -137,6 +150,7 @@ async def async_retry(func: Any, exceptions: tuple[type[Exception], ...], name:
     initial_wait = int(os.getenv("LLMPROC_RETRY_INITIAL_WAIT", "1"))
     max_wait = int(os.getenv("LLMPROC_RETRY_MAX_WAIT", "90"))
 
+    admitted = current_rate_limit()
     attempt = 0
     wait = initial_wait
     while True:
@@ -147,6 +161,16 @@ async def async_retry(func: Any, exceptions: tuple[type[Exception], ...], name:
             if attempt >= max_attempts:
                 logger.warning(f"Max retry attempts ({max_attempts}) reached for {name}, giving up: {str(e)}")
                 raise
-            logger.warning(f"{name} error (attempt {attempt}/{max_attempts}), retrying in {wait}s: {str(e)}")
-            await asyncio.sleep(min(wait, max_wait))
+            headers = error_headers(e)
+            retry_after = retry_after_seconds(headers)
+            if admitted is not None and headers is not None:
+                admitted[0].observe_headers(headers)
+                if retry_after and getattr(e, "status_code", None) == 429:
+                    admitted[0].pause(retry_after)
+            delay = random.uniform(wait / 2, wait) if wait else 0.0
+            delay = max(min(delay, max_wait), retry_after or 0.0)
+            logger.warning(f"{name} error (attempt {attempt}/{max_attempts}), retrying in {delay:.1f}s: {str(e)}")
+            await asyncio.sleep(delay)
             wait = min(wait * 2, max_wait)
+            if admitted is not None:
+                await admitted[0].acquire(admitted[1])
@@ -161,6 +161,7 @@ It supports basic arithmetic, mathematical functions, and constants.""",
     # - Always returns the same output for the same input
     # - Does not access external resources
     access=AccessLevel.READ,
+    parallel_safe=True,
 )
 async def calculator(expression: str, precision: int = 6) -> str:
     """Calculate the result of a mathematical expression.
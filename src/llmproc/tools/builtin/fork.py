@@ -6,12 +6,12 @@ interface, and maintains proper causal ordering of messages and tool results.
 """
 
 import asyncio
-import copy
 import logging
 from typing import Any, Optional
 
 from llmproc.common.access_control import AccessLevel
 from llmproc.common.results import ToolResult
+from llmproc.process_snapshot import freeze_state
 from llmproc.tools.function_tools import register_tool
 
 # Set up logger
@@ -116,8 +116,9 @@ async def fork_tool(
     tool_results_prefix = state.tool_results_prefix if state else []
 
     # Create causal prefix by combining msg_prefix and tool_results_prefix
-    # This maintains the correct order of messages and tool results
-    prefix = copy.deepcopy(msg_prefix) + copy.deepcopy(tool_results_prefix)
+    # This maintains the correct order of messages and tool results.
+    # Frozen messages are shared by all children instead of being copied.
+    prefix = freeze_state(msg_prefix) + freeze_state(tool_results_prefix)
 
     if not prefix:
         return ToolResult.from_error("Conversation history prefix is empty – cannot fork")
@@ -133,14 +134,15 @@ async def fork_tool(
         # Use the internal _fork_process method to create a deep copy with WRITE access level
         child = await parent._fork_process(access_level=AccessLevel.WRITE)
 
-        # Inherit history up to fork point (use deep copy to avoid shared references)
-        child.state = copy.deepcopy(prefix)
+        # Inherit history up to fork point; each child owns only its list and new messages
+        child.state = list(prefix)
 
         # Insert stub tool_result recognizing it's a child
         child.state.append(tool_result_stub(tool_id))
 
         # Ensure the child inherits iteration limits from the parent
         child.max_iterations = getattr(parent, "max_iterations", 10)
+        child.max_parallel_tools = getattr(parent, "max_parallel_tools", 1)
 
         # Use standard run() method instead of directly accessing executors
         # This maintains proper encapsulation and allows the process to handle
@@ -21,6 +21,7 @@ logger = logging.getLogger(__name__)
         "detailed": "Whether to show detailed information (size, permissions, modification time) for each item. Defaults to False.",
     },
     access=AccessLevel.READ,
+    parallel_safe=True,
 )
 async def list_dir(directory_path: str = ".", show_hidden: bool = False, detailed: bool = False) -> str:
     """List directory contents with options for showing hidden files and detailed information.
@@ -19,6 +19,7 @@ logger = logging.getLogger(__name__)
         "file_path": "Absolute or relative path to the file to read. For security reasons, certain directories may be inaccessible."
     },
     access=AccessLevel.READ,
+    parallel_safe=True,
 )
 async def read_file(file_path: str) -> str:
     """Read a file and return its contents.
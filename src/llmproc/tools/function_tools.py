@@ -44,6 +44,7 @@ def register_tool(
     requires_context: bool = False,
     schema_modifier: Callable[[dict, dict], dict] = None,
     access: Union[AccessLevel, str] = AccessLevel.WRITE,
+    parallel_safe: bool = False,
 ):
     """Decorator to register a function as a tool with enhanced schema support.
 
@@ -59,6 +60,8 @@ def register_tool(
         requires_context: Whether this tool requires runtime context (process is always provided)
         schema_modifier: Optional function to modify schema with runtime config
         access: Access level for this tool (READ, WRITE, or ADMIN). Defaults to WRITE.
+        parallel_safe: Whether calls may run concurrently with other tool calls
+            from the same assistant turn (see ``max_parallel_tools``).
 
     Returns:
         Decorator function that registers the tool metadata
@@ -93,6 +96,7 @@ def register_tool(
             access=access_level,
             requires_context=requires_context,
             schema_modifier=schema_modifier,
+            parallel_safe=parallel_safe,
         )
 
         attach_meta(func, meta_obj)
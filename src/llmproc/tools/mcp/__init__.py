@@ -13,6 +13,7 @@ from .exceptions import (
 )
 from .namespaced_tool import NamespacedTool
 from .server_registry import MCPServerSettings
+from .session_pool import MCPSessionPool, mcp_sessions
 from .tool_loader import ToolLoader
 
 __all__ = [
@@ -21,6 +22,8 @@ __all__ = [
     "ToolLoader",
     "NamespacedTool",
     "MCPServerSettings",
+    "MCPSessionPool",
+    "mcp_sessions",
     "create_mcp_tool_handler",
     "MCPError",
     "MCPConnectionsDisabledError",
@@ -3,9 +3,11 @@
 from __future__ import annotations
 
 import asyncio
+import inspect
 import json
 import logging
 import os
+import weakref
 from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
 from pathlib import Path
@@ -19,14 +21,17 @@ from mcp.types import (
     ListToolsResult,
     TextContent,
 )
+from mcp.types import Tool as MCPTool
 
 from llmproc.common.metadata import ToolMeta, attach_meta
 from llmproc.common.results import ToolResult
 from llmproc.config.mcp import MCPServerTools
 from llmproc.tools.core import Tool
 from llmproc.tools.function_schemas import create_schema_from_callable
-from llmproc.tools.mcp.connection_manager import ConnectionManager
+from llmproc.tools.mcp.catalog_cache import ToolCatalogCache, same_catalog
+from llmproc.tools.mcp.connection_manager import ConnectionManager, ServerConnectStats
 from llmproc.tools.mcp.constants import (
+    MCP_DEFAULT_TOOL_CACHE_TTL,
     MCP_DEFAULT_TOOL_CALL_TIMEOUT,
     MCP_ERROR_TOOL_CALL_TIMEOUT,
 )
@@ -36,7 +41,7 @@ from llmproc.tools.mcp.exceptions import (
     MCPToolsLoadingError,
 )
 from llmproc.tools.mcp.namespaced_tool import NamespacedTool
-from llmproc.tools.mcp.persistent import _PersistentClient
+from llmproc.tools.mcp.result_cache import ToolResultCache
 from llmproc.tools.mcp.server_registry import MCPServerSettings
 from llmproc.tools.mcp.tool_loader import ToolLoader
 
@@ -142,7 +147,26 @@ class MCPAggregator:
         servers: dict[str, MCPServerSettings],
         tool_filter: dict[str, list[str] | None] | None = None,
         separator: str = "__",
+        tool_cache_ttl: float | None = None,
+        catalog_cache: ToolCatalogCache | None = None,
+        result_cache: ToolResultCache | None = None,
     ) -> None:
+        """Create an aggregator for ``servers``.
+
+        Args:
+            servers: Server settings keyed by server name.
+            tool_filter: Optional per-server list of tools to include or exclude.
+            separator: Separator between server and tool names.
+            tool_cache_ttl: Seconds before a server's cached tool list is
+                refreshed. Defaults to ``LLMPROC_MCP_TOOL_CACHE_TTL``; when
+                unset the list is only refreshed on ``tools/list_changed``
+                notifications or when a called tool is missing from it.
+            catalog_cache: On-disk cache :meth:`initialize` registers tools
+                from. Defaults to ``LLMPROC_MCP_CATALOG_CACHE_DIR`` when set.
+            result_cache: Cache for results of tools configured as
+                ``cacheable``. Forked processes share their parent's
+                aggregator and therefore its cache.
+        """
         self.servers = servers
 
         if tool_filter is not None:
@@ -163,6 +187,11 @@ class MCPAggregator:
         else:
             self.tool_filter = {}
 
+        if tool_cache_ttl is None:
+            env_ttl = os.environ.get("LLMPROC_MCP_TOOL_CACHE_TTL")
+            tool_cache_ttl = float(env_ttl) if env_ttl else MCP_DEFAULT_TOOL_CACHE_TTL
+        self.tool_cache_ttl = tool_cache_ttl
+
         self.separator = separator
         self.connection_manager = ConnectionManager(servers)
         self.loader = ToolLoader(
@@ -172,7 +201,20 @@ class MCPAggregator:
             separator,
             client_factory=self.get_client,
             persistent_client_factory=self._get_or_create_client,
+            cache_ttl=tool_cache_ttl,
         )
+        self.connection_manager.add_tool_list_listener(self.loader.invalidate)
+
+        self.catalog_cache = catalog_cache if catalog_cache is not None else ToolCatalogCache.from_env()
+        self._descriptors: list[MCPServerTools] = []
+        self._tool_config: dict[str, Any] = {}
+        self._server_tool_objs: dict[str, list[Tool]] = {}
+        self._tools_listeners: list[Callable[[], Callable | None]] = []
+        self._revalidation: asyncio.Task | None = None
+        # Lazy servers whose cached catalog is revalidated once they connect
+        self._revalidate_on_connect: set[str] = set()
+        self._background: set[asyncio.Task] = set()
+        self.result_cache = result_cache if result_cache is not None else ToolResultCache()
 
     @property
     def _namespaced_tools(self) -> dict[str, NamespacedTool]:
@@ -215,33 +257,67 @@ class MCPAggregator:
             available = ", ".join(self.servers.keys())
             raise ValueError(f"Servers not found: {', '.join(missing)}. Available servers: {available}")
         filtered = {name: self.servers[name] for name in server_names}
-        return MCPAggregator(filtered, tool_filter=self.tool_filter, separator=self.separator)
+        return MCPAggregator(
+            filtered,
+            tool_filter=self.tool_filter,
+            separator=self.separator,
+            tool_cache_ttl=self.tool_cache_ttl,
+            catalog_cache=self.catalog_cache,
+            result_cache=self.result_cache,
+        )
 
     @asynccontextmanager
-    async def get_client(self, server_name: str) -> AsyncGenerator[ClientSession, None]:
-        async with self.connection_manager.get_client(server_name) as client:
+    async def get_client(self, server_name: str, **kwargs: Any) -> AsyncGenerator[ClientSession, None]:
+        async with self.connection_manager.get_client(server_name, **kwargs) as client:
             yield client
 
     async def _get_or_create_client(self, server_name: str) -> ClientSession:
-        cm_mgr = self.connection_manager
-        if cm_mgr.transient:
-            raise MCPConnectionsDisabledError("Persistent MCP connections disabled; use get_client")
-        if server_name in cm_mgr._client_cms:
-            return await cm_mgr._client_cms[server_name].start()
-
-        cm = self.get_client(server_name)
-        client = _PersistentClient(cm)
-        cm_mgr._client_cms[server_name] = client
-        if cm_mgr._loop is None:
-            cm_mgr._loop = asyncio.get_running_loop()
-        return await client.start()
+        client = await self.connection_manager.get_persistent_client(server_name, connect=self.get_client)
+        if server_name in self._revalidate_on_connect:
+            self._revalidate_on_connect.discard(server_name)
+            self._run_in_background(self._revalidate_catalog(server_name))
+        return client
+
+    def _run_in_background(self, coro: Any) -> asyncio.Task:
+        task = asyncio.create_task(coro)
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+        return task
+
+    @property
+    def server_stats(self) -> dict[str, ServerConnectStats]:
+        """Connect latency and failures of each server connected so far."""
+        return self.connection_manager.server_stats
+
+    def is_lazy(self, server_name: str) -> bool:
+        """Return True if ``server_name`` connects on its first tool call.
+
+        ``MCPServerSettings.lazy`` wins over ``LLMPROC_MCP_LAZY``.
+        """
+        lazy = self.servers[server_name].lazy
+        if lazy is None:
+            return os.environ.get("LLMPROC_MCP_LAZY", "false").lower() in {"1", "true", "yes"}
+        return lazy
 
     async def close_clients(self, client_timeout: float = 1.0) -> None:  # pragma: no cover - API
+        for task in list(self._background):
+            task.cancel()
         await self.connection_manager.close_clients(client_timeout=client_timeout)
 
     async def load_servers(self, specific_servers: list[str] | None = None) -> None:
         await self.loader.load_servers(specific_servers)
 
+    async def _ensure_server_loaded(self, server_name: str, force: bool = False) -> bool:
+        """Load ``server_name``'s tool list unless the cached copy is fresh.
+
+        Returns:
+            True if the tool list was (re)loaded.
+        """
+        if not force and self.loader.is_fresh(server_name):
+            return False
+        await self.load_servers(specific_servers=[server_name])
+        return True
+
     async def list_tools(self) -> ListToolsResult:
         """Return tool definitions from all configured servers."""
         try:
@@ -271,6 +347,20 @@ class MCPAggregator:
         server_name: str,
         tool_name: str,
         arguments: dict | None = None,
+    ) -> CallToolResult:
+        cacheable, ttl = self._result_cache_policy(server_name, tool_name)
+        key = ToolResultCache.key(server_name, tool_name, arguments) if cacheable else None
+        if key is not None:
+            return await self.result_cache.get_or_call(
+                key, lambda: self._call_tool(server_name, tool_name, arguments), ttl=ttl
+            )
+        return await self._call_tool(server_name, tool_name, arguments)
+
+    async def _call_tool(
+        self,
+        server_name: str,
+        tool_name: str,
+        arguments: dict | None = None,
     ) -> CallToolResult:
         actual_server = server_name
         actual_tool = tool_name
@@ -279,14 +369,17 @@ class MCPAggregator:
             available = ", ".join(self.servers.keys())
             return _error_result(f"Server '{actual_server}' not found in registry. Available servers: {available}")
 
+        namespaced_tool_name = f"{actual_server}{self.separator}{actual_tool}"
         try:
-            await self.load_servers(specific_servers=[actual_server])
+            reloaded = await self._ensure_server_loaded(actual_server)
+            if not reloaded and namespaced_tool_name not in self.loader.get_namespaced_tools():
+                # Catalog miss: the server may have added the tool since it was listed
+                await self._ensure_server_loaded(actual_server, force=True)
         except Exception as exc:
             err_msg = f"Error loading server '{actual_server}': {exc}"
             logger.error(err_msg)
             return _error_result(err_msg)
 
-        namespaced_tool_name = f"{actual_server}{self.separator}{actual_tool}"
         if namespaced_tool_name not in self.loader.get_namespaced_tools():
             if (
                 actual_server in self.tool_filter
@@ -313,9 +406,9 @@ class MCPAggregator:
         except TimeoutError:
             cfg = self.servers[actual_server]
             server_info = f"Server type: {cfg.type}"
-            if cfg.type == "sse":
+            if cfg.type != "stdio":
                 server_info += f", URL: {cfg.url}"
-            elif cfg.type == "stdio":
+            else:
                 server_info += f", Command: {cfg.command}"
             tool_call_timeout = float(os.environ.get("LLMPROC_TOOL_CALL_TIMEOUT", MCP_DEFAULT_TOOL_CALL_TIMEOUT))
             err_msg = MCP_ERROR_TOOL_CALL_TIMEOUT.format(
@@ -334,16 +427,125 @@ class MCPAggregator:
         descriptors: list[MCPServerTools],
         config: dict[str, Any] | None = None,
     ) -> list[Tool]:
-        """Load servers and return initialized :class:`Tool` objects."""
-        config = config or {}
-        await self.load_servers()
+        """Load servers and return initialized :class:`Tool` objects.
+
+        Servers with a catalog in :attr:`catalog_cache` are not contacted;
+        their tools are built from the cached catalog, which is revalidated in
+        the background (see :meth:`add_tools_listener`). Lazy servers (see
+        :meth:`is_lazy`) are not contacted until their first tool call if their
+        tools are cached or all declare an ``input_schema``.
+        """
+        self._descriptors = descriptors
+        self._tool_config = config or {}
+
+        explicit = self._seed_explicit_schemas(descriptors)
+        cached = self._seed_cached_catalogs(skip=explicit)
+        seeded = explicit + cached
+        pending = [name for name in self.servers if name not in seeded]
+        unresolved = [name for name in pending if self.is_lazy(name)]
+        if unresolved:
+            logger.info("No cached or explicit tool schemas for lazy MCP servers %s; connecting now", unresolved)
+        if not seeded or pending:
+            await self.load_servers(pending if seeded else None)
+            if self.catalog_cache is not None:
+                for name in pending:
+                    self.catalog_cache.store(self.servers[name], self.loader.get_server_tools(name) or [])
+
+        lazy_cached = [name for name in cached if self.is_lazy(name)]
+        self._revalidate_on_connect.update(lazy_cached)
+        eager_cached = [name for name in cached if name not in lazy_cached]
+        if eager_cached:
+            self._revalidation = self._run_in_background(self._revalidate_catalogs(eager_cached))
+
+        servers = dict.fromkeys(desc.server for desc in descriptors)
+        self._server_tool_objs = {name: self._create_server_tools(name) for name in servers}
+        return [tool for name in servers for tool in self._server_tool_objs[name]]
+
+    def _result_cache_policy(self, server_name: str, tool_name: str) -> tuple[bool, float | None]:
+        """Return whether ``tool_name``'s results are cached and their TTL."""
+        for desc in self._descriptors:
+            if desc.server == server_name:
+                cacheable, ttl = desc.result_cache_policy(tool_name)
+                if cacheable:
+                    return True, ttl
+        return False, None
+
+    def _seed_explicit_schemas(self, descriptors: list[MCPServerTools]) -> list[str]:
+        """Seed lazy servers whose selected tools all declare an ``input_schema``."""
+        seeded = []
+        for desc in descriptors:
+            configs = desc.explicit_tools()
+            if configs is None or desc.server not in self.servers or not self.is_lazy(desc.server):
+                continue
+            tools = [
+                MCPTool(name=cfg.name, description=cfg.description, inputSchema=cfg.input_schema) for cfg in configs
+            ]
+            self.loader.seed(desc.server, tools)
+            seeded.append(desc.server)
+        return seeded
+
+    def _seed_cached_catalogs(self, skip: list[str] = ()) -> list[str]:
+        """Seed the loader from :attr:`catalog_cache` and return the seeded servers."""
+        if self.catalog_cache is None:
+            return []
+        seeded = []
+        for name, settings in self.servers.items():
+            if name in skip:
+                continue
+            tools = self.catalog_cache.load(settings)
+            if tools is not None:
+                self.loader.seed(name, tools)
+                seeded.append(name)
+        if seeded:
+            logger.debug("Registered cached tool catalogs for MCP servers: %s", seeded)
+        return seeded
+
+    async def _revalidate_catalogs(self, server_names: list[str]) -> None:
+        await asyncio.gather(*(self._revalidate_catalog(name) for name in server_names))
+
+    async def _revalidate_catalog(self, server_name: str) -> None:
+        """Refresh a cached catalog and publish the server's tools if it changed."""
+        cached = self.loader.get_server_tools(server_name) or []
+        try:
+            await self.load_servers(specific_servers=[server_name])
+        except Exception as exc:  # noqa: BLE001 – keep serving the cached catalog
+            logger.warning("Could not revalidate cached tools of MCP server '%s': %s", server_name, exc)
+            return
+        tools = self.loader.get_server_tools(server_name) or []
+        if same_catalog(cached, tools):
+            return
+        logger.info("Tool list of MCP server '%s' changed since it was cached", server_name)
+        if self.catalog_cache is not None:
+            self.catalog_cache.store(self.servers[server_name], tools)
+        old = self._server_tool_objs.get(server_name, [])
+        new = self._server_tool_objs[server_name] = self._create_server_tools(server_name)
+        for ref in list(self._tools_listeners):
+            listener = ref()
+            if listener is None:
+                self._tools_listeners.remove(ref)
+            else:
+                listener(old, new)
 
+    def add_tools_listener(self, listener: Callable[[list[Tool], list[Tool]], None]) -> None:
+        """Call ``listener(old_tools, new_tools)`` when a server's tools are rebuilt.
+
+        Bound methods are held weakly so listening does not keep their owner alive.
+        """
+        ref = weakref.WeakMethod(listener) if inspect.ismethod(listener) else (lambda: listener)
+        if any(existing() == listener for existing in self._tools_listeners):
+            return
+        self._tools_listeners.append(ref)
+
+    def _create_server_tools(self, server_name: str) -> list[Tool]:
+        """Return :class:`Tool` objects for ``server_name``'s loaded tools."""
         regs: list[Tool] = []
-        for desc in descriptors:
+        for desc in self._descriptors:
+            if desc.server != server_name:
+                continue
             for nt in self.loader.get_namespaced_tools().values():
                 if nt.server_name != desc.server or not self._is_allowed(desc, nt.original_name):
                     continue
-                regs.append(self._create_tool(nt, desc, config))
+                regs.append(self._create_tool(nt, desc, self._tool_config))
         return regs
 
     @staticmethod
@@ -365,6 +567,7 @@ class MCPAggregator:
         override_desc = cfg.description if cfg is not None else None
         param_desc = cfg.param_descriptions if cfg is not None else None
         public_name = cfg.alias if cfg is not None else namespaced_tool_name
+        parallel_safe = cfg.parallel_safe if cfg is not None else False
 
         existing_desc: dict[str, str] = {}
         for pname, prop in (nt.tool.inputSchema or {}).get("properties", {}).items():
@@ -378,6 +581,7 @@ class MCPAggregator:
             access=access_level,
             description=override_desc or nt.tool.description,
             param_descriptions=existing_desc or None,
+            parallel_safe=parallel_safe,
             raw_schema={
                 "name": namespaced_tool_name,
                 "description": nt.tool.description,
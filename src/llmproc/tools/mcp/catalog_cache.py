@@ -0,0 +1,83 @@
+"""On-disk cache of MCP server tool catalogs.
+
+Listing tools requires starting every configured server before a process can
+start. :class:`ToolCatalogCache` stores each server's ``list_tools`` result in
+a JSON file named after a hash of the server settings, so later starts can
+register tools from disk and refresh the catalog in the background. Settings
+are hashed rather than stored because ``env`` often holds credentials.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+
+from mcp.types import Tool as MCPTool
+
+from .server_registry import MCPServerSettings
+from .session_pool import session_key
+
+logger = logging.getLogger(__name__)
+
+CATALOG_CACHE_FORMAT = 1
+
+
+class ToolCatalogCache:
+    """Store and load server tool catalogs under ``directory``."""
+
+    def __init__(self, directory: Path | str) -> None:
+        self.directory = Path(directory).expanduser()
+
+    @classmethod
+    def from_env(cls) -> ToolCatalogCache | None:
+        """Return a cache in ``LLMPROC_MCP_CATALOG_CACHE_DIR``, or ``None`` if unset."""
+        directory = os.environ.get("LLMPROC_MCP_CATALOG_CACHE_DIR")
+        return cls(directory) if directory else None
+
+    def path_for(self, settings: MCPServerSettings) -> Path | None:
+        """Return the cache file for ``settings``, or ``None`` if they cannot be cached."""
+        key = session_key(settings)
+        if key is None:
+            return None
+        return self.directory / f"{hashlib.sha256(key.encode()).hexdigest()}.json"
+
+    def load(self, settings: MCPServerSettings) -> list[MCPTool] | None:
+        """Return the cached tools for ``settings``, or ``None`` on a miss."""
+        path = self.path_for(settings)
+        if path is None or not path.exists():
+            return None
+        try:
+            data = json.loads(path.read_text())
+            if data.get("format") != CATALOG_CACHE_FORMAT:
+                return None
+            return [MCPTool.model_validate(tool) for tool in data["tools"]]
+        except Exception as exc:  # noqa: BLE001 – a bad cache file is a miss
+            logger.warning("Ignoring unreadable MCP tool catalog cache %s: %s", path, exc)
+            return None
+
+    def store(self, settings: MCPServerSettings, tools: list[MCPTool]) -> None:
+        """Write the tools for ``settings``, replacing any cached copy."""
+        path = self.path_for(settings)
+        if path is None:
+            return
+        data = {
+            "format": CATALOG_CACHE_FORMAT,
+            "tools": [tool.model_dump(mode="json", exclude_none=True) for tool in tools],
+        }
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # Write to a temporary file first so readers never see a partial catalog
+            with tempfile.NamedTemporaryFile("w", dir=self.directory, suffix=".tmp", delete=False) as f:
+                json.dump(data, f)
+            os.replace(f.name, path)
+        except OSError as exc:
+            logger.warning("Could not write MCP tool catalog cache %s: %s", path, exc)
+
+
+def same_catalog(first: list[MCPTool], second: list[MCPTool]) -> bool:
+    """Return True if two tool lists describe the same tools."""
+    return [t.model_dump(mode="json") for t in first] == [t.model_dump(mode="json") for t in second]
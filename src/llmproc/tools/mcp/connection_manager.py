@@ -6,35 +6,74 @@ import asyncio
 import atexit
 import logging
 import os
-from collections.abc import AsyncGenerator
+import time
+from collections.abc import AsyncGenerator, Callable
 from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
 
 from mcp.client.session import ClientSession
 from mcp.client.sse import sse_client
 from mcp.client.stdio import StdioServerParameters, get_default_environment, stdio_client
+from mcp.client.streamable_http import streamablehttp_client
+from mcp.types import ServerNotification, ToolListChangedNotification
 
+from .constants import MCP_STREAMABLE_HTTP_TYPES
 from .exceptions import MCPConnectionsDisabledError
+from .http_pool import MCPHttpPool, mcp_http
 from .persistent import _PersistentClient
 from .server_registry import MCPServerSettings
+from .session_pool import MCPSessionPool, SessionLease, mcp_sessions, session_key
 
 logger = logging.getLogger(__name__)
 
 
+@dataclass(slots=True)
+class ServerConnectStats:
+    """Persistent connection attempts to one MCP server."""
+
+    connects: int = 0
+    failures: int = 0
+    last_connect_ms: float | None = None
+    last_error: str | None = None
+
+
 class ConnectionManager:
-    """Handle persistent and transient MCP client connections."""
+    """Handle persistent and transient MCP client connections.
 
-    def __init__(self, servers: dict[str, MCPServerSettings]) -> None:
+    Persistent sessions to servers with a concrete command or URL are leased
+    from ``session_pool`` and shared with other managers on the same event
+    loop; pass ``session_pool=None`` to give this manager its own sessions.
+    SSE and streamable HTTP sessions send their requests through the
+    keep-alive connections of ``http_pool``.
+    """
+
+    def __init__(
+        self,
+        servers: dict[str, MCPServerSettings],
+        session_pool: MCPSessionPool | None = mcp_sessions,
+        http_pool: MCPHttpPool = mcp_http,
+    ) -> None:
         self.servers = servers
+        self.session_pool = session_pool
+        self.http_pool = http_pool
         self.transient = os.getenv("LLMPROC_MCP_TRANSIENT", "false").lower() in {
             "1",
             "true",
             "yes",
         }
         self._client_cms: dict[str, _PersistentClient] = {}
+        self._leases: dict[str, SessionLease] = {}
         self._loop: asyncio.AbstractEventLoop | None = None
+        # Whether this manager holds ``http_pool``'s transport open
+        self._holds_http = False
+        self._tool_list_listeners: list[Callable[[str], None]] = []
+        # Connect latency and failures per server name
+        self.server_stats: dict[str, ServerConnectStats] = {}
 
         def _close_all() -> None:  # pragma: no cover - teardown helper
-            if self.transient or not self._client_cms:
+            if self.transient or not (self._client_cms or self._leases):
                 return
             loop = self._loop
             if loop is None or loop.is_closed():
@@ -54,12 +93,47 @@ class ConnectionManager:
 
         atexit.register(_close_all)
 
+    def add_tool_list_listener(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener(server_name)`` when a server reports ``tools/list_changed``."""
+        self._tool_list_listeners.append(listener)
+
+    def _notify_tool_list_changed(self, server_name: str) -> None:
+        logger.debug("MCP server '%s' reported a tool list change", server_name)
+        for listener in self._tool_list_listeners:
+            listener(server_name)
+
+    def _message_handler(self, server_name: str) -> Callable[[Any], Any]:
+        """Return a session message handler that forwards tool list changes."""
+
+        async def _handle(message: Any) -> None:
+            if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+                self._notify_tool_list_changed(server_name)
+
+        return _handle
+
+    def _hold_http_pool(self) -> None:
+        """Keep pooled HTTP connections open until :meth:`close_clients`."""
+        if not self._holds_http:
+            self.http_pool.acquire()
+            self._holds_http = True
+
     @asynccontextmanager
-    async def get_client(self, server_name: str) -> AsyncGenerator[ClientSession, None]:
-        """Yield a transient client connection to ``server_name``."""
+    async def get_client(
+        self,
+        server_name: str,
+        message_handler: Callable[[Any], Any] | None = None,
+    ) -> AsyncGenerator[ClientSession, None]:
+        """Yield a transient client connection to ``server_name``.
+
+        Args:
+            server_name: Name of the server to connect to.
+            message_handler: Handler for server notifications; defaults to one
+                forwarding tool list changes to this manager's listeners.
+        """
         if server_name not in self.servers:
             raise ValueError(f"Server '{server_name}' not found in registry")
         config = self.servers[server_name]
+        message_handler = message_handler or self._message_handler(server_name)
         if config.type == "stdio":
             if not config.command or not config.args:
                 raise ValueError(f"Command and args required for stdio type: {server_name}")
@@ -69,40 +143,121 @@ class ConnectionManager:
                 env={**get_default_environment(), **(config.env or {})},
             )
             async with stdio_client(params) as (read_stream, write_stream):
-                session = ClientSession(read_stream, write_stream)
+                session = ClientSession(read_stream, write_stream, message_handler=message_handler)
                 async with session:
                     await session.initialize()
                     yield session
         elif config.type == "sse":
             if not config.url:
                 raise ValueError(f"URL required for SSE type: {server_name}")
-            async with sse_client(config.url) as (read_stream, write_stream):
-                session = ClientSession(read_stream, write_stream)
+            self._hold_http_pool()
+            async with sse_client(
+                config.url,
+                headers=config.headers,
+                httpx_client_factory=self.http_pool.client_factory,
+            ) as (read_stream, write_stream):
+                session = ClientSession(read_stream, write_stream, message_handler=message_handler)
+                async with session:
+                    await session.initialize()
+                    yield session
+        elif config.type in MCP_STREAMABLE_HTTP_TYPES:
+            if not config.url:
+                raise ValueError(f"URL required for streamable HTTP type: {server_name}")
+            self._hold_http_pool()
+            async with streamablehttp_client(
+                config.url,
+                headers=config.headers,
+                httpx_client_factory=self.http_pool.client_factory,
+            ) as (read_stream, write_stream, _):
+                session = ClientSession(read_stream, write_stream, message_handler=message_handler)
                 async with session:
                     await session.initialize()
                     yield session
         else:
             raise ValueError(f"Unsupported type: {config.type}")
 
-    async def get_persistent_client(self, server_name: str) -> ClientSession:
-        """Return a persistent client connection to ``server_name``."""
+    async def get_persistent_client(
+        self,
+        server_name: str,
+        connect: Callable[..., Any] | None = None,
+    ) -> ClientSession:
+        """Return a persistent client connection to ``server_name``.
+
+        Args:
+            server_name: Name of the server to connect to.
+            connect: Replacement for :meth:`get_client` used to open the session.
+        """
         if self.transient:
             raise MCPConnectionsDisabledError("Persistent MCP connections disabled; use get_client")
+        lease = self._leases.get(server_name)
+        if lease is not None and lease.alive:
+            return lease.session
         if server_name in self._client_cms:
             return await self._client_cms[server_name].start()
 
-        cm = self.get_client(server_name)
-        client = _PersistentClient(cm)
-        self._client_cms[server_name] = client
+        connect = connect or self.get_client
         if self._loop is None:
             self._loop = asyncio.get_running_loop()
-        return await client.start()
+        stats = self.server_stats.setdefault(server_name, ServerConnectStats())
+        started = time.monotonic()
+        try:
+            session = await self._open_persistent_client(server_name, connect, lease)
+        except Exception as exc:
+            stats.failures += 1
+            stats.last_error = str(exc) or type(exc).__name__
+            logger.warning("Failed to connect to MCP server '%s': %s", server_name, stats.last_error)
+            raise
+        stats.connects += 1
+        stats.last_connect_ms = (time.monotonic() - started) * 1000
+        logger.debug("Connected to MCP server '%s' in %.0f ms", server_name, stats.last_connect_ms)
+        return session
+
+    async def _open_persistent_client(
+        self,
+        server_name: str,
+        connect: Callable[..., Any],
+        stale_lease: SessionLease | None,
+    ) -> ClientSession:
+        key = session_key(self.servers[server_name]) if self.session_pool is not None else None
+        if key is None:
+            client = _PersistentClient(connect(server_name))
+            self._client_cms[server_name] = client
+            try:
+                return await client.start()
+            except BaseException:
+                if self._client_cms.get(server_name) is client:
+                    del self._client_cms[server_name]
+                raise
+
+        if stale_lease is not None:
+            # The shared session went away (e.g. the server exited); lease a new one
+            self._leases.pop(server_name, None)
+            await stale_lease.release()
+        lease = await self.session_pool.lease(
+            key,
+            lambda handler: connect(server_name, message_handler=handler),
+            on_tool_list_changed=partial(self._notify_tool_list_changed, server_name),
+        )
+        current = self._leases.get(server_name)
+        if current is not None and current.alive:
+            # A concurrent call leased the session first
+            await lease.release()
+            return current.session
+        self._leases[server_name] = lease
+        return lease.session
 
     async def close_clients(self, client_timeout: float = 1.0) -> None:  # pragma: no cover - API
-        """Close all persistent clients."""
+        """Close all persistent clients and release pooled sessions and connections."""
+        if self._holds_http:
+            self._holds_http = False
+            await self.http_pool.release()
         if self.transient:
             return
 
+        for server, lease in list(self._leases.items()):
+            self._leases.pop(server, None)
+            await lease.release()
+
         for server, client in list(self._client_cms.items()):
             try:
                 await asyncio.wait_for(client.close(), timeout=client_timeout)
@@ -10,6 +10,21 @@ MCP_TOOL_SEPARATOR = "__"
 MCP_DEFAULT_TOOL_FETCH_TIMEOUT = 30.0
 MCP_DEFAULT_TOOL_CALL_TIMEOUT = 30.0
 
+# Tool catalog caching (seconds; ``None`` keeps the catalog until invalidated)
+MCP_DEFAULT_TOOL_CACHE_TTL = None
+
+# Request timeout of pooled HTTP clients for remote servers (seconds)
+MCP_DEFAULT_HTTP_TIMEOUT = 30.0
+
+# Transport names accepted for streamable HTTP servers
+MCP_STREAMABLE_HTTP_TYPES = frozenset({"streamable-http", "http"})
+
+# Seconds a pooled server session nobody leases is kept open
+MCP_DEFAULT_SESSION_IDLE_TIMEOUT = 60.0
+
+# Byte budget of the in-memory result cache for ``cacheable`` tools
+MCP_DEFAULT_RESULT_CACHE_BYTES = 16 * 1024 * 1024
+
 # Log message constants
 MCP_LOG_RETRY_FETCH = "Timeout fetching tools from MCP server '{server}' (attempt {attempt} of {max_attempts})"
 
@@ -0,0 +1,148 @@
+"""Shared HTTP connection pool for remote MCP transports.
+
+The MCP SDK opens a new ``httpx.AsyncClient`` for every SSE or streamable
+HTTP session and closes it with the session, so transient connections
+(``LLMPROC_MCP_TRANSIENT``) paid a TCP and TLS handshake on every tool call.
+:class:`MCPHttpPool` keeps one keep-alive transport per event loop and hands
+the SDK clients that share it. The transport is closed once no connection
+manager holds it and no client using it is open. HTTP/2 is used when the
+optional ``h2`` package is installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import weakref
+from dataclasses import dataclass
+
+import httpx
+
+from .constants import MCP_DEFAULT_HTTP_TIMEOUT
+
+DEFAULT_HTTP_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20, keepalive_expiry=30.0)
+
+
+@dataclass(slots=True)
+class HttpPoolMetrics:
+    """Snapshot of :class:`MCPHttpPool` usage."""
+
+    transports: int = 0
+    holders: int = 0
+    clients: int = 0
+    transport_opens: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class _LoopTransport:
+    transport: httpx.AsyncHTTPTransport
+    holders: int = 0
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Transport view that returns its hold to the pool when a client closes."""
+
+    def __init__(self, pool: MCPHttpPool, entry: _LoopTransport) -> None:
+        self._pool = pool
+        self._entry = entry
+        self._closed = False
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._entry.transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        if not self._closed:
+            self._closed = True
+            await self._pool._drop(self._entry)
+
+
+class MCPHttpPool:
+    """Hand out ``httpx`` clients backed by one connection pool per event loop.
+
+    Each open client holds the loop's transport, and so does every
+    :class:`ConnectionManager` between its first remote connection and
+    ``close_clients()``, so connections stay warm across transient sessions.
+    """
+
+    def __init__(self, limits: httpx.Limits | None = None, http2: bool | None = None) -> None:
+        """Create a pool.
+
+        Args:
+            limits: Connection limits and keep-alive expiry for each loop's pool.
+            http2: Negotiate HTTP/2; defaults to whether ``h2`` is installed.
+        """
+        self.limits = limits or DEFAULT_HTTP_LIMITS
+        self.http2 = importlib.util.find_spec("h2") is not None if http2 is None else http2
+        self._entries: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopTransport] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._clients = 0
+        self._transport_opens = 0
+
+    def _entry(self) -> _LoopTransport:
+        """Return the running loop's transport entry, opening it on first use."""
+        loop = asyncio.get_running_loop()
+        entry = self._entries.get(loop)
+        if entry is None:
+            entry = _LoopTransport(httpx.AsyncHTTPTransport(limits=self.limits, http2=self.http2))
+            self._entries[loop] = entry
+            self._transport_opens += 1
+        return entry
+
+    async def _drop(self, entry: _LoopTransport) -> None:
+        """Release one hold on ``entry`` and close its transport after the last."""
+        entry.holders -= 1
+        if entry.holders > 0:
+            return
+        for loop, current in list(self._entries.items()):
+            if current is entry:
+                del self._entries[loop]
+        await entry.transport.aclose()
+
+    def acquire(self) -> None:
+        """Hold the running loop's transport open until :meth:`release`."""
+        self._entry().holders += 1
+
+    async def release(self) -> None:
+        """Drop a hold taken with :meth:`acquire` on the running loop."""
+        entry = self._entries.get(asyncio.get_running_loop())
+        if entry is not None:
+            await self._drop(entry)
+
+    def client_factory(
+        self,
+        headers: dict[str, str] | None = None,
+        timeout: httpx.Timeout | None = None,
+        auth: httpx.Auth | None = None,
+    ) -> httpx.AsyncClient:
+        """Return a client on the shared pool; matches the SDK's ``httpx_client_factory``."""
+        entry = self._entry()
+        entry.holders += 1
+        self._clients += 1
+        return httpx.AsyncClient(
+            transport=_SharedTransport(self, entry),
+            headers=headers,
+            timeout=timeout or httpx.Timeout(MCP_DEFAULT_HTTP_TIMEOUT),
+            auth=auth,
+            follow_redirects=True,
+        )
+
+    async def aclose(self) -> None:
+        """Close the running loop's pooled connections regardless of holders."""
+        entry = self._entries.pop(asyncio.get_running_loop(), None)
+        if entry is not None:
+            await entry.transport.aclose()
+
+    def metrics(self) -> HttpPoolMetrics:
+        """Return current pool usage."""
+        entries = list(self._entries.values())
+        return HttpPoolMetrics(
+            transports=len(entries),
+            holders=sum(entry.holders for entry in entries),
+            clients=self._clients,
+            transport_opens=self._transport_opens,
+        )
+
+
+# Process-wide pool used by ``ConnectionManager``
+mcp_http = MCPHttpPool()
@@ -21,8 +21,17 @@ class _PersistentClient:
     async def start(self) -> ClientSession:
         if self._task is None:
             self._task = asyncio.create_task(self._runner())
-        await self._start.wait()
-        assert self.session is not None
+        if not self._start.is_set():
+            started = asyncio.ensure_future(self._start.wait())
+            try:
+                # Surface connection errors instead of waiting for a session forever
+                await asyncio.wait({started, self._task}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                started.cancel()
+            if not self._start.is_set():
+                self._task.result()
+        if self.session is None:
+            raise RuntimeError("MCP client session is closed")
         return self.session
 
     async def _runner(self) -> None:
@@ -0,0 +1,153 @@
+"""In-memory cache of MCP tool results.
+
+Lookup tools (documentation search, schema fetch) return the same result for
+the same arguments, yet agents and their forks call them over and over.
+:class:`ToolResultCache` keeps successful results of tools marked
+``cacheable`` keyed by server, tool and canonical JSON arguments, evicts the
+least recently used entries beyond a byte budget, and lets concurrent
+identical calls wait for the one already in flight.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+
+from mcp.types import CallToolResult
+
+from .constants import MCP_DEFAULT_RESULT_CACHE_BYTES
+
+logger = logging.getLogger(__name__)
+
+ResultKey = tuple[str, str, str]
+
+
+@dataclass(slots=True)
+class ToolResultCacheMetrics:
+    """Snapshot of :class:`ToolResultCache` usage."""
+
+    entries: int = 0
+    bytes: int = 0
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+@dataclass(slots=True)
+class _Entry:
+    result: CallToolResult
+    size: int
+    expires: float | None
+
+
+class ToolResultCache:
+    """LRU cache of tool results bounded by their serialized size."""
+
+    def __init__(self, max_bytes: int | None = None) -> None:
+        """Create a cache.
+
+        Args:
+            max_bytes: Byte budget for cached results. Defaults to
+                ``LLMPROC_MCP_RESULT_CACHE_BYTES``.
+        """
+        if max_bytes is None:
+            env_bytes = os.environ.get("LLMPROC_MCP_RESULT_CACHE_BYTES")
+            max_bytes = int(env_bytes) if env_bytes else MCP_DEFAULT_RESULT_CACHE_BYTES
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[ResultKey, _Entry] = OrderedDict()
+        self._pending: dict[ResultKey, asyncio.Task] = {}
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    @staticmethod
+    def key(server_name: str, tool_name: str, arguments: dict | None) -> ResultKey | None:
+        """Return the cache key for a call, or ``None`` if the arguments are not JSON."""
+        try:
+            args = json.dumps(arguments or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+        except (TypeError, ValueError):
+            return None
+        return server_name, tool_name, args
+
+    async def get_or_call(
+        self,
+        key: ResultKey,
+        call: Callable[[], Awaitable[CallToolResult]],
+        ttl: float | None = None,
+    ) -> CallToolResult:
+        """Return the cached result for ``key`` or ``await call()`` and cache it.
+
+        Error results are returned but not cached. ``ttl`` is the number of
+        seconds a result stays valid; ``None`` keeps it until evicted.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.expires is not None and entry.expires <= time.monotonic():
+            self._remove(key)
+            entry = None
+        if entry is not None:
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return _copy(entry.result)
+
+        task = self._pending.get(key)
+        if task is None:
+            self._misses += 1
+            task = asyncio.ensure_future(call())
+            self._pending[key] = task
+            task.add_done_callback(lambda done: self._finish(key, done, ttl))
+        else:
+            self._hits += 1
+        # Shielded so one cancelled caller does not fail the others waiting on the call
+        return _copy(await asyncio.shield(task))
+
+    def _finish(self, key: ResultKey, task: asyncio.Task, ttl: float | None) -> None:
+        self._pending.pop(key, None)
+        if task.cancelled() or task.exception() is not None:
+            return
+        result = task.result()
+        if not result.isError:
+            self._store(key, result, ttl)
+
+    def _store(self, key: ResultKey, result: CallToolResult, ttl: float | None) -> None:
+        size = len(result.model_dump_json()) + sum(len(part) for part in key)
+        if size > self.max_bytes:
+            logger.debug("Not caching %s result of %d bytes", key[:2], size)
+            return
+        if key in self._entries:
+            self._remove(key)
+        expires = time.monotonic() + ttl if ttl is not None else None
+        self._entries[key] = _Entry(result, size, expires)
+        self._bytes += size
+        while self._bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self._evictions += 1
+
+    def _remove(self, key: ResultKey) -> None:
+        self._bytes -= self._entries.pop(key).size
+
+    def clear(self) -> None:
+        """Drop every cached result."""
+        self._entries.clear()
+        self._bytes = 0
+
+    def metrics(self) -> ToolResultCacheMetrics:
+        """Return current cache usage."""
+        return ToolResultCacheMetrics(
+            entries=len(self._entries),
+            bytes=self._bytes,
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+        )
+
+
+def _copy(result: CallToolResult) -> CallToolResult:
+    """Return ``result`` with its own content list so callers cannot alter the cache."""
+    return result.model_copy(update={"content": list(result.content)})
@@ -8,12 +8,15 @@ from pydantic import BaseModel
 class MCPServerSettings(BaseModel):
     """Configuration settings for an individual MCP server."""
 
-    type: str = "stdio"  # "stdio" or "sse"
+    type: str = "stdio"  # "stdio", "sse" or "streamable-http"
     command: str | None = None
     args: list[str] | None = None
     url: str | None = None
+    headers: dict[str, str] | None = None
     env: dict | None = None
     description: str | None = None
+    # Connect on the first tool call instead of at start-up; ``None`` uses LLMPROC_MCP_LAZY
+    lazy: bool | None = None
 
     @property
     def transport(self) -> str:
@@ -0,0 +1,291 @@
+"""Shared, reference-counted MCP server sessions.
+
+Every aggregator used to start its own connection to each server, so forking
+or spawning children of programs that use the same stdio servers launched a
+server process and an ``initialize`` handshake per child. :class:`MCPSessionPool`
+hands out one session per (event loop, server settings). Concurrent tool calls
+are multiplexed on that session by MCP request ids, and a session nobody
+leases is closed after an idle timeout.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import hashlib
+import json
+import logging
+import os
+import time
+import weakref
+from collections.abc import AsyncGenerator, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from mcp.client.session import ClientSession
+from mcp.types import ServerNotification, ToolListChangedNotification
+
+from .constants import MCP_DEFAULT_SESSION_IDLE_TIMEOUT
+from .persistent import _PersistentClient
+from .server_registry import MCPServerSettings
+
+logger = logging.getLogger(__name__)
+
+# ``connect(message_handler)`` opens a session context for one server
+SessionConnector = Callable[[Callable[[Any], Any]], AsyncGenerator[ClientSession, None]]
+
+
+def session_key(settings: MCPServerSettings) -> str | None:
+    """Return the pool key for ``settings``, or ``None`` if they cannot be shared.
+
+    Settings without a command (stdio) or URL (remote transports) do not name
+    a concrete server and are never pooled.
+    """
+    if settings.type == "stdio" and not settings.command:
+        return None
+    if settings.type != "stdio" and not settings.url:
+        return None
+    return json.dumps(settings.model_dump(exclude={"description", "lazy"}), sort_keys=True, default=str)
+
+
+@dataclass(slots=True)
+class SessionPoolMetrics:
+    """Snapshot of :class:`MCPSessionPool` usage."""
+
+    sessions: int = 0
+    leased: int = 0
+    idle: int = 0
+    leases: int = 0
+    reuses: int = 0
+    connects: int = 0
+    idle_closes: int = 0
+
+
+@dataclass(slots=True, eq=False)
+class _PooledSession:
+    key: str
+    loop: weakref.ref
+    client: _PersistentClient | None = None
+    refs: int = 0
+    idle_since: float | None = None
+    idle_task: asyncio.Task | None = None
+    listeners: dict[int, Callable[[], None]] = field(default_factory=dict)
+
+    @property
+    def label(self) -> str:
+        # The key holds env and headers, which often carry credentials
+        return hashlib.sha256(self.key.encode()).hexdigest()[:12]
+
+    def alive(self) -> bool:
+        task = self.client._task if self.client is not None else None
+        return task is not None and not task.done()
+
+    async def dispatch(self, message: Any) -> None:
+        if isinstance(message, ServerNotification) and isinstance(message.root, ToolListChangedNotification):
+            for listener in list(self.listeners.values()):
+                listener()
+
+
+class SessionLease:
+    """A reference to a pooled session, returned by :meth:`MCPSessionPool.lease`."""
+
+    __slots__ = ("_pool", "_entry", "_token", "released")
+
+    def __init__(self, pool: MCPSessionPool, entry: _PooledSession, token: int) -> None:
+        self._pool = pool
+        self._entry = entry
+        self._token = token
+        self.released = False
+
+    @property
+    def alive(self) -> bool:
+        """Whether the lease is held and its session is still open."""
+        return not self.released and self._entry.alive()
+
+    @property
+    def session(self) -> ClientSession:
+        """The shared client session."""
+        session = self._entry.client.session if self._entry.client is not None else None
+        if session is None:
+            raise RuntimeError("MCP session is closed")
+        return session
+
+    async def release(self) -> None:
+        """Drop this reference; the session is closed once it has been idle long enough."""
+        if self.released:
+            return
+        self.released = True
+        await self._pool._release(self._entry, self._token)
+
+
+class MCPSessionPool:
+    """Hand out shared MCP sessions and close them by reference count.
+
+    Sessions are only shared on the event loop that opened them, since the
+    underlying streams belong to that loop.
+    """
+
+    def __init__(self, idle_timeout: float | None = None) -> None:
+        """Create a pool.
+
+        Args:
+            idle_timeout: Seconds an unleased session is kept open. Defaults to
+                ``LLMPROC_MCP_SESSION_IDLE_TIMEOUT``; ``0`` closes sessions as
+                soon as the last lease is released.
+        """
+        self._idle_timeout = idle_timeout
+        self._sessions: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, _PooledSession]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._pending: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, asyncio.Future]] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._tokens = 0
+        self._leases = 0
+        self._reuses = 0
+        self._connects = 0
+        self._idle_closes = 0
+        atexit.register(self._close_all_at_exit)
+
+    @property
+    def idle_timeout(self) -> float:
+        """Seconds an unleased session is kept open."""
+        if self._idle_timeout is not None:
+            return self._idle_timeout
+        env_timeout = os.environ.get("LLMPROC_MCP_SESSION_IDLE_TIMEOUT")
+        return float(env_timeout) if env_timeout else MCP_DEFAULT_SESSION_IDLE_TIMEOUT
+
+    async def lease(
+        self,
+        key: str,
+        connect: SessionConnector,
+        on_tool_list_changed: Callable[[], None] | None = None,
+    ) -> SessionLease:
+        """Return a lease on the session for ``key``, connecting on first use.
+
+        Args:
+            key: Pool key from :func:`session_key`.
+            connect: Opens the session; called with the message handler to use.
+            on_tool_list_changed: Called when the server reports
+                ``tools/list_changed`` while this lease is held.
+        """
+        loop = asyncio.get_running_loop()
+        sessions = self._sessions.setdefault(loop, {})
+        pending = self._pending.setdefault(loop, {})
+        while True:
+            entry = sessions.get(key)
+            if entry is not None and not entry.alive():
+                logger.debug("Discarding closed MCP session %s", entry.label)
+                del sessions[key]
+                entry = None
+            if entry is not None:
+                self._reuses += 1
+                break
+            waiter = pending.get(key)
+            if waiter is not None:
+                # Another task is connecting; share its session (or retry if it failed)
+                await asyncio.shield(waiter)
+                continue
+            waiter = pending[key] = loop.create_future()
+            try:
+                entry = await self._connect(key, connect, loop)
+            finally:
+                del pending[key]
+                waiter.set_result(None)
+            sessions[key] = entry
+            break
+
+        self._tokens += 1
+        self._leases += 1
+        entry.refs += 1
+        entry.idle_since = None
+        if entry.idle_task is not None:
+            entry.idle_task.cancel()
+            entry.idle_task = None
+        if on_tool_list_changed is not None:
+            entry.listeners[self._tokens] = on_tool_list_changed
+        return SessionLease(self, entry, self._tokens)
+
+    async def _connect(self, key: str, connect: SessionConnector, loop: asyncio.AbstractEventLoop) -> _PooledSession:
+        entry = _PooledSession(key, weakref.ref(loop))
+        entry.client = _PersistentClient(connect(entry.dispatch))
+        try:
+            await entry.client.start()
+        except BaseException:
+            # Let a connection that completes after a cancellation exit at once
+            entry.client._stop.set()
+            raise
+        self._connects += 1
+        return entry
+
+    async def _release(self, entry: _PooledSession, token: int) -> None:
+        entry.listeners.pop(token, None)
+        entry.refs -= 1
+        if entry.refs > 0:
+            return
+        entry.idle_since = time.monotonic()
+        timeout = self.idle_timeout
+        if timeout <= 0:
+            await self._close(entry)
+        else:
+            entry.idle_task = asyncio.create_task(self._close_when_idle(entry, timeout))
+
+    async def _close_when_idle(self, entry: _PooledSession, timeout: float) -> None:
+        await asyncio.sleep(timeout)
+        if entry.refs == 0:
+            entry.idle_task = None
+            self._idle_closes += 1
+            await self._close(entry)
+
+    async def _close(self, entry: _PooledSession, timeout: float = 1.0) -> None:
+        loop = entry.loop()
+        sessions = self._sessions.get(loop) if loop is not None else None
+        if sessions is not None and sessions.get(entry.key) is entry:
+            del sessions[entry.key]
+        if entry.client is None:
+            return
+        try:
+            await entry.client.close(timeout=timeout)
+        except Exception as exc:  # noqa: BLE001 – best-effort
+            logger.warning("Error while closing MCP session %s: %s", entry.label, exc)
+
+    async def _close_entries(self, entries: list[_PooledSession]) -> None:
+        for entry in entries:
+            await self._close(entry, timeout=0.5)
+
+    async def close_idle(self) -> None:
+        """Close every session on the running loop that has no lease."""
+        sessions = self._sessions.get(asyncio.get_running_loop(), {})
+        for entry in [e for e in sessions.values() if e.refs == 0]:
+            if entry.idle_task is not None:
+                entry.idle_task.cancel()
+                entry.idle_task = None
+            await self._close(entry)
+
+    def metrics(self) -> SessionPoolMetrics:
+        """Return current session counts and cumulative lease counters."""
+        entries = [entry for sessions in self._sessions.values() for entry in sessions.values()]
+        leased = sum(1 for entry in entries if entry.refs > 0)
+        return SessionPoolMetrics(
+            sessions=len(entries),
+            leased=leased,
+            idle=len(entries) - leased,
+            leases=self._leases,
+            reuses=self._reuses,
+            connects=self._connects,
+            idle_closes=self._idle_closes,
+        )
+
+    def _close_all_at_exit(self) -> None:  # pragma: no cover - teardown helper
+        for loop, sessions in list(self._sessions.items()):
+            if not sessions or loop.is_closed() or loop.is_running():
+                continue
+
+            try:
+                loop.run_until_complete(asyncio.wait_for(self._close_entries(list(sessions.values())), timeout=2))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("Failed to close pooled MCP sessions: %s", exc)
+
+
+# Process-wide pool used by ``ConnectionManager``
+mcp_sessions = MCPSessionPool()
@@ -5,6 +5,7 @@ from __future__ import annotations
 import asyncio
 import logging
 import os
+import time
 from asyncio import gather
 from collections.abc import AsyncGenerator, Awaitable, Callable
 
@@ -32,6 +33,7 @@ class ToolLoader:
         separator: str = "__",
         client_factory: Callable[[str], AsyncGenerator[ClientSession, None]] | None = None,
         persistent_client_factory: Callable[[str], Awaitable[ClientSession]] | None = None,
+        cache_ttl: float | None = None,
     ) -> None:
         self.servers = servers
         self.connection_manager = connection_manager
@@ -40,6 +42,24 @@ class ToolLoader:
         self.separator = separator
         self.tool_filter = tool_filter or {}
         self._namespaced_tools: dict[str, NamespacedTool] = {}
+        # Unfiltered ``list_tools`` result of each loaded server
+        self._server_tools: dict[str, list[MCPTool]] = {}
+        self.cache_ttl = cache_ttl
+        self._loaded_at: dict[str, float] = {}
+
+    def is_fresh(self, server_name: str) -> bool:
+        """Return True if the cached tool list for ``server_name`` can be reused."""
+        loaded_at = self._loaded_at.get(server_name)
+        if loaded_at is None:
+            return False
+        return self.cache_ttl is None or time.monotonic() - loaded_at < self.cache_ttl
+
+    def invalidate(self, server_name: str | None = None) -> None:
+        """Mark the cached tool list of ``server_name`` (or all servers) as stale."""
+        if server_name is None:
+            self._loaded_at.clear()
+        else:
+            self._loaded_at.pop(server_name, None)
 
     async def _load_server_tools(self, server_name: str) -> tuple[str, list[MCPTool]]:
         timeout = float(os.environ.get("LLMPROC_TOOL_FETCH_TIMEOUT", MCP_DEFAULT_TOOL_FETCH_TIMEOUT))
@@ -86,30 +106,40 @@ class ToolLoader:
             logger.debug("No servers to load")
             return
 
-        if specific_servers:
-            for name in list(self._namespaced_tools.keys()):
-                nt = self._namespaced_tools[name]
-                if nt.server_name in specific_servers:
-                    del self._namespaced_tools[name]
-        else:
-            self._namespaced_tools.clear()
-
         results = await gather(*(self._load_server_tools(name) for name in servers_to_load))
 
+        if not specific_servers:
+            self._namespaced_tools.clear()
+        loaded_at = time.monotonic()
         for server_name, tools in results:
-            for tool in tools:
-                original_name = tool.name
-                if not self._should_include_tool(server_name, original_name):
-                    continue
-
-                namespaced_name = f"{server_name}{self.separator}{original_name}"
-                namespaced_tool = tool.model_copy(update={"name": namespaced_name})
-                namespaced_tool.description = f"[{server_name}] {tool.description or ''}"
-                self._namespaced_tools[namespaced_name] = NamespacedTool(
-                    tool=namespaced_tool,
-                    server_name=server_name,
-                    original_name=original_name,
-                )
+            self._set_server_tools(server_name, tools, loaded_at)
+
+    def seed(self, server_name: str, tools: list[MCPTool]) -> None:
+        """Use ``tools`` as ``server_name``'s catalog without contacting the server."""
+        self._set_server_tools(server_name, tools, time.monotonic())
+
+    def get_server_tools(self, server_name: str) -> list[MCPTool] | None:
+        """Return the unfiltered tool list last loaded for ``server_name``."""
+        return self._server_tools.get(server_name)
+
+    def _set_server_tools(self, server_name: str, tools: list[MCPTool], loaded_at: float) -> None:
+        for name in [n for n, nt in self._namespaced_tools.items() if nt.server_name == server_name]:
+            del self._namespaced_tools[name]
+        self._server_tools[server_name] = tools
+        self._loaded_at[server_name] = loaded_at
+        for tool in tools:
+            original_name = tool.name
+            if not self._should_include_tool(server_name, original_name):
+                continue
+
+            namespaced_name = f"{server_name}{self.separator}{original_name}"
+            namespaced_tool = tool.model_copy(update={"name": namespaced_name})
+            namespaced_tool.description = f"[{server_name}] {tool.description or ''}"
+            self._namespaced_tools[namespaced_name] = NamespacedTool(
+                tool=namespaced_tool,
+                server_name=server_name,
+                original_name=original_name,
+            )
 
     def list_tools(self) -> ListToolsResult:
         tools = [nt.tool for nt in self._namespaced_tools.values()]
@@ -43,6 +43,9 @@ class ToolManager:
         # Create registry for tool execution
         self.runtime_registry = ToolRegistry()  # For actual tool execution
 
+        # Schemas of (registry, registry version) computed by get_tool_schemas
+        self._schema_memo: tuple[ToolRegistry, int, list[dict[str, Any]]] | None = None
+
         # Runtime context for tool execution
         self.runtime_context = {}
 
@@ -52,6 +55,10 @@ class ToolManager:
         # MCP aggregator for external tool servers
         self.mcp_aggregator = None
 
+        # Owner of a shared aggregator (e.g. a process template); when set,
+        # closing releases this manager's use instead of closing the clients
+        self.mcp_owner = None
+
     def _register_callable(self, func: Callable) -> str:
         """Create Tool from a callable and register it."""
         if (
@@ -152,6 +159,7 @@ class ToolManager:
             for tool in await self.mcp_aggregator.initialize(mcp_descriptors, config=config):
                 self.runtime_registry.register_tool_obj(tool)
                 processed_tool_names.append(tool.schema.get("name") or tool.meta.name)
+            self.mcp_aggregator.add_tools_listener(self.replace_mcp_tools)
 
         # Register provider-hosted server tools
         self._register_server_tools(config or {})
@@ -160,6 +168,44 @@ class ToolManager:
         logger.info(f"ToolManager: Registered tools: {names}")
         return self
 
+    def replace_mcp_tools(self, old: list[Tool], new: list[Tool]) -> None:
+        """Swap MCP tools rebuilt by the aggregator (e.g. after a catalog refresh)."""
+        self.runtime_registry.replace_tools(old, new)
+        logger.info("ToolManager: Updated MCP tools: %s", [tool.meta.name or tool.schema.get("name") for tool in new])
+
+    def rebind_tools(self, tools: list) -> None:
+        """Replace registered tools with the same-named ``tools``.
+
+        Used when a process swaps in copies of its plugins, so the tools a
+        plugin provides call the copy rather than the instance they were first
+        bound to. Names that are not registered are ignored.
+        """
+        staged = ToolManager()
+        for tool in tools:
+            if isinstance(tool, Tool):
+                staged._register_tool_obj(tool)
+            else:
+                staged._register_callable(tool)
+        registered = set(self.runtime_registry.get_tool_names())
+        names = [name for name in staged.registered_tools if name in registered]
+        self.runtime_registry.replace_tools(
+            [self.runtime_registry.get_tool(name) for name in names],
+            [staged.runtime_registry.get_tool(name) for name in names],
+        )
+
+    async def close_mcp_clients(self) -> None:
+        """Close MCP client connections used by this manager.
+
+        A shared aggregator is only released; its owner closes the clients
+        once no manager uses them any more.
+        """
+        if self.mcp_aggregator is None:
+            return
+        if self.mcp_owner is not None:
+            await self.mcp_owner.release(self)
+        else:
+            await self.mcp_aggregator.close_clients()
+
     def set_runtime_context(self, context: RuntimeContext):
         """Set the runtime context for tool execution.
 
@@ -243,18 +289,29 @@ class ToolManager:
             logger.error(f"Error in tool manager for '{name}': {e}", exc_info=True)
             return ToolResult.from_error(f"Error: {e}")
 
+    def is_parallel_safe(self, name: str) -> bool:
+        """Return True if ``name`` may run concurrently with other tool calls."""
+        try:
+            return self.runtime_registry.get_tool(name).meta.parallel_safe
+        except ValueError:
+            return False
+
     # Tool schema management methods
 
     def get_tool_schemas(self) -> list[dict[str, Any]]:
         """Get tool schemas for all enabled tools.
 
         This method returns schemas for registered tools using their configured
-        names.
+        names. The list is computed once per registry version and shared
+        between calls, so it must be treated as read-only.
 
         Returns:
             List of tool schemas (dictionaries)
         """
-        # Get all schemas from the registry (registered tools only)
-        schemas = self.runtime_registry.get_definitions()
-        # Remove any duplicate schema names and return
-        return check_for_duplicate_schema_names(schemas)
+        registry = self.runtime_registry
+        memo = self._schema_memo
+        if memo is None or memo[0] is not registry or memo[1] != registry.version:
+            # Get all schemas from the registry and remove duplicate names
+            schemas = check_for_duplicate_schema_names(registry.get_definitions())
+            memo = self._schema_memo = (registry, registry.version, schemas)
+        return memo[2]
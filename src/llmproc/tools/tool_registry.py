@@ -39,6 +39,8 @@ class ToolRegistry:
         """Initialize an empty tool registry."""
         # Map of tool name -> Tool object
         self._tools: dict[str, Tool] = {}
+        # Incremented on every registration so callers can memoize schemas
+        self.version = 0
 
     def register_tool_obj(self, tool: Tool) -> bool:
         """Register a :class:`Tool` object directly.
@@ -60,9 +62,28 @@ class ToolRegistry:
         # Ensure schema name matches the registry key
         tool.schema["name"] = name
         self._tools[name] = tool
+        self.version += 1
         logger.debug("Registered tool: %s", name)
         return True
 
+    def replace_tools(self, old: list[Tool], new: list[Tool]) -> None:
+        """Unregister the ``old`` tool objects and register the ``new`` ones."""
+        old_ids = {id(tool) for tool in old}
+        for name in [name for name, tool in self._tools.items() if id(tool) in old_ids]:
+            del self._tools[name]
+        self.version += 1
+        for tool in new:
+            self.register_tool_obj(tool)
+
+    def copy(self) -> "ToolRegistry":
+        """Return a new registry that shares this registry's ``Tool`` objects.
+
+        Registering tools on the copy does not affect the original.
+        """
+        clone = ToolRegistry()
+        clone._tools = dict(self._tools)
+        return clone
+
     def get_handler(self, name: str) -> ToolHandler:
         """Get a handler by tool name."""
         return self.get_tool(name).handler
@@ -0,0 +1,85 @@
+"""Ordered, optionally concurrent dispatch of tool calls within one assistant turn."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any, Generic, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class ToolCallScheduler(Generic[T]):
+    """Dispatch tool calls concurrently when allowed while keeping their order.
+
+    Calls to tools marked ``parallel_safe`` start immediately as background
+    tasks, bounded by ``max_concurrency``. Any other call first waits for the
+    calls submitted before it and commits their results, then runs inline.
+    Results are always committed in submission order, so executors record
+    ``tool_result`` blocks exactly as serial execution would.
+
+    With ``max_concurrency`` of 1 (the default) every call runs inline.
+    """
+
+    def __init__(self, tool_manager: Any = None, max_concurrency: int = 1) -> None:
+        self.tool_manager = tool_manager
+        self.max_concurrency = max_concurrency
+        self._semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        self._pending: list[tuple[asyncio.Task[T], Callable[[T], None]]] = []
+
+    @classmethod
+    def for_process(cls, process: Any) -> ToolCallScheduler:
+        """Create a scheduler using ``process.max_parallel_tools``."""
+        limit = getattr(process, "max_parallel_tools", 1)
+        if not isinstance(limit, int) or isinstance(limit, bool):
+            limit = 1
+        return cls(getattr(process, "tool_manager", None), limit)
+
+    def is_parallel(self, tool_name: str) -> bool:
+        """Return True if a call to ``tool_name`` may run concurrently."""
+        if self.max_concurrency <= 1 or self.tool_manager is None:
+            return False
+        return self.tool_manager.is_parallel_safe(tool_name)
+
+    async def _limited(self, call: Callable[[], Awaitable[T]]) -> T:
+        async with self._semaphore:
+            return await call()
+
+    async def submit(self, tool_name: str, call: Callable[[], Awaitable[T]], commit: Callable[[T], None]) -> None:
+        """Run ``call`` and pass its result to ``commit`` in submission order.
+
+        Args:
+            tool_name: Name of the tool, used to decide whether it may run concurrently.
+            call: Zero-argument coroutine function executing the tool.
+            commit: Callback recording the result.
+        """
+        if self.is_parallel(tool_name):
+            logger.debug("Dispatching tool '%s' concurrently", tool_name)
+            self._pending.append((asyncio.create_task(self._limited(call)), commit))
+            return
+
+        await self.flush()
+        commit(await call())
+
+    async def flush(self) -> None:
+        """Wait for all concurrent calls and commit their results in order."""
+        pending, self._pending = self._pending, []
+        if not pending:
+            return
+        try:
+            results = await asyncio.gather(*(task for task, _ in pending))
+        except BaseException:
+            for task, _ in pending:
+                task.cancel()
+            raise
+        for (_, commit), result in zip(pending, results, strict=True):
+            commit(result)
+
+    def cancel(self) -> None:
+        """Cancel calls that have not been committed."""
+        pending, self._pending = self._pending, []
+        for task, _ in pending:
+            task.cancel()
@@ -17,7 +17,7 @@ def _from_str(name: str) -> Callable:
 
 def _from_config(cfg: ToolConfig) -> Callable:
     func = _from_str(cfg.name)
-    if cfg.description is not None or cfg.param_descriptions is not None or cfg.alias is not None:
+    if cfg.description is not None or cfg.param_descriptions is not None or cfg.alias is not None or cfg.parallel_safe:
         meta = get_tool_meta(func)
         if cfg.description is not None:
             meta.description = cfg.description
@@ -27,6 +27,8 @@ def _from_config(cfg: ToolConfig) -> Callable:
             meta.param_descriptions = existing
         if cfg.alias is not None:
             meta.name = cfg.alias
+        if cfg.parallel_safe:
+            meta.parallel_safe = True
         attach_meta(func, meta)
     return func
 
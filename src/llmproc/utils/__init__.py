@@ -1,5 +1,5 @@
 """LLMProc utility modules."""
 
-from llmproc.utils.background import AsyncBackgroundIterator
+from llmproc.utils.background import AsyncBackgroundIterator, StreamMetrics
 
-__all__: list[str] = ["AsyncBackgroundIterator"]
+__all__: list[str] = ["AsyncBackgroundIterator", "StreamMetrics"]
@@ -4,21 +4,63 @@ from __future__ import annotations
 
 import asyncio
 import inspect
+import logging
+import os
+import time
 from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
 from typing import Any, Generic, TypeVar
 
+logger = logging.getLogger(__name__)
+
 T = TypeVar("T")
 
+# Items buffered ahead of the consumer before the producer waits
+DEFAULT_MAX_QUEUE_SIZE = int(os.getenv("LLMPROC_STREAM_QUEUE_SIZE", "64"))
+
+
+@dataclass(slots=True)
+class StreamMetrics:
+    """Queue depth and latency statistics for an :class:`AsyncBackgroundIterator`.
+
+    Latency is measured from the moment the producer receives an item until
+    the consumer takes it from the queue.
+    """
+
+    items: int = 0
+    max_queue_depth: int = 0
+    total_latency: float = 0.0
+    max_latency: float = 0.0
+
+    @property
+    def mean_latency(self) -> float:
+        """Return the average per-item latency in seconds."""
+        return self.total_latency / self.items if self.items else 0.0
+
 
 class AsyncBackgroundIterator(AsyncIterator[T], Generic[T]):
-    """Run an async iterable in the background and yield its items."""
+    """Run an async iterable in the background and yield its items.
 
-    def __init__(self, agen: AsyncIterable[T], on_item: Callable[[T], None] | None = None):
-        self._queue: asyncio.Queue[Any] = asyncio.Queue()
+    Items are buffered in a queue holding at most ``max_queue_size`` items
+    (``0`` for unbounded); when it is full the producer waits, so a slow
+    consumer applies backpressure to the source instead of buffering the
+    whole stream. ``on_item`` runs as soon as an item is produced, before it
+    is queued. Items are traced with ``logger.debug`` and statistics are
+    collected in :attr:`metrics`.
+    """
+
+    def __init__(
+        self,
+        agen: AsyncIterable[T],
+        on_item: Callable[[T], Any] | None = None,
+        max_queue_size: int = DEFAULT_MAX_QUEUE_SIZE,
+    ):
+        self._queue: asyncio.Queue[tuple[float, Any]] = asyncio.Queue(maxsize=max_queue_size)
         self._agen = agen
         self._on_item = on_item
         self._task: asyncio.Task[Any] | None = None
         self._closed = False
+        self.metrics = StreamMetrics()
 
     async def __aenter__(self) -> AsyncBackgroundIterator[T]:
         """Start background task and return the iterator."""
@@ -29,22 +71,32 @@ class AsyncBackgroundIterator(AsyncIterator[T], Generic[T]):
         """Terminate the background task on exit."""
         await self.aclose()
 
+    async def _put(self, item: Any) -> None:
+        await self._queue.put((time.perf_counter(), item))
+        depth = self._queue.qsize()
+        if depth > self.metrics.max_queue_depth:
+            self.metrics.max_queue_depth = depth
+
     async def _run(self) -> None:
+        trace = logger.isEnabledFor(logging.DEBUG)
         try:
             async for item in self._agen:
-                print(item, flush=True)
+                if trace:
+                    logger.debug("Stream item: %r", item)
                 if self._on_item is not None:
                     try:
                         result = self._on_item(item)
                         if inspect.iscoroutine(result):
                             await result
-                    except Exception:  # pragma: no cover - swallow callback errors
-                        pass
-                await self._queue.put(item)
+                    except Exception:  # noqa: BLE001 - callback errors must not break the stream
+                        logger.warning("Stream item callback failed", exc_info=True)
+                await self._put(item)
+        except asyncio.CancelledError:
+            # Cancelled by aclose(): nobody reads the queue any more and it may be full
+            raise
         except Exception as e:  # pragma: no cover - pass through errors
-            await self._queue.put(e)
-        finally:
-            await self._queue.put(StopAsyncIteration)
+            await self._put(e)
+        await self._put(StopAsyncIteration)
 
     def __aiter__(self) -> AsyncBackgroundIterator[T]:
         """Return the iterator itself."""
@@ -52,12 +104,26 @@ class AsyncBackgroundIterator(AsyncIterator[T], Generic[T]):
 
     async def __anext__(self) -> T:
         """Yield the next item from the background task."""
-        item = await self._queue.get()
+        produced_at, item = await self._queue.get()
         if isinstance(item, Exception):
             raise item
         if item is StopAsyncIteration:
             self._closed = True
+            metrics = self.metrics
+            logger.debug(
+                "Stream finished: %d items, max queue depth %d, mean latency %.6fs, max latency %.6fs",
+                metrics.items,
+                metrics.max_queue_depth,
+                metrics.mean_latency,
+                metrics.max_latency,
+            )
             raise StopAsyncIteration
+        latency = time.perf_counter() - produced_at
+        metrics = self.metrics
+        metrics.items += 1
+        metrics.total_latency += latency
+        if latency > metrics.max_latency:
+            metrics.max_latency = latency
         return item
 
     async def aclose(self) -> None:
@@ -64,10 +64,22 @@ def pytest_addoption(parser):
         default=False,
         help="Run tests that call external APIs (marked with llm_api)",
     )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="Run timing benchmarks (marked with benchmark)",
+    )
 
 
 def pytest_collection_modifyitems(config, items):
     """Modify test collection to skip tests based on markers."""
+    if not config.getoption("--run-benchmarks"):
+        skip_benchmark = pytest.mark.skip(reason="use --run-benchmarks to run benchmarks")
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
+
     if config.getoption("--run-api-tests"):
         # Do not skip tests marked with llm_api
         return
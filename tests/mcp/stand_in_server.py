@@ -0,0 +1,74 @@
+"""Local MCP server reachable over SSE or streamable HTTP, for transport tests.
+
+The server runs in a subprocess: hosting it on a thread of the test process
+adds tens of milliseconds of GIL contention to every request, which would
+swamp the transport differences the tests measure.
+"""
+
+import socket
+import subprocess
+import sys
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from mcp.server.fastmcp import FastMCP
+
+
+def build_server() -> FastMCP:
+    """Return a FastMCP server with a couple of trivial tools."""
+    server = FastMCP("stand-in", log_level="WARNING")
+
+    @server.tool()
+    def echo(text: str) -> str:
+        """Return ``text`` unchanged."""
+        return text
+
+    @server.tool()
+    def add(a: int, b: int) -> int:
+        """Add two integers."""
+        return a + b
+
+    return server
+
+
+@contextmanager
+def serve(transport: str) -> Iterator[str]:
+    """Run the stand-in server in a subprocess and yield its endpoint URL.
+
+    Args:
+        transport: ``"sse"`` or ``"streamable-http"``
+    """
+    proc = subprocess.Popen(
+        [sys.executable, __file__, transport],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    try:
+        port, path = proc.stdout.readline().split()
+        yield f"http://127.0.0.1:{port}{path}"
+    finally:
+        proc.terminate()
+        proc.wait(timeout=5)
+
+
+def _main(transport: str) -> None:
+    import uvicorn
+
+    server = build_server()
+    if transport == "sse":
+        app, path = server.sse_app(), server.settings.sse_path
+    else:
+        # The app is mounted at the path; the trailing slash avoids a redirect per request
+        app, path = server.streamable_http_app(), server.settings.streamable_http_path + "/"
+
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(("127.0.0.1", 0))
+    sock.listen()
+    # Connections queue in the backlog until uvicorn starts accepting them
+    print(sock.getsockname()[1], path, flush=True)
+    uvicorn.Server(uvicorn.Config(app, log_level="warning")).run(sockets=[sock])
+
+
+if __name__ == "__main__":
+    _main(sys.argv[1])
@@ -0,0 +1,145 @@
+"""Tests for the on-disk MCP tool catalog cache."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.types import ListToolsResult, Tool
+
+from llmproc.config.mcp import MCPServerTools
+from llmproc.tools.mcp import MCPAggregator, MCPServerSettings
+from llmproc.tools.mcp.catalog_cache import ToolCatalogCache
+from llmproc.tools.tool_registry import ToolRegistry
+
+SETTINGS = MCPServerSettings(type="stdio", command="fake-server", env={"TOKEN": "secret"})
+
+
+class SlowClient:
+    """Session whose ``list_tools`` is slow, like a freshly spawned server."""
+
+    def __init__(self, tools, delay=0.0):
+        self.tools = tools
+        self.delay = delay
+        self.list_tools_calls = 0
+
+    async def list_tools(self):
+        self.list_tools_calls += 1
+        await asyncio.sleep(self.delay)
+        return ListToolsResult(tools=self.tools)
+
+
+class FakeAggregator(MCPAggregator):
+    def __init__(self, client, cache):
+        super().__init__({"srv": SETTINGS}, catalog_cache=cache)
+        self.connection_manager.session_pool = None
+        self.client = client
+
+    def get_client(self, server_name, **kwargs):
+        @asynccontextmanager
+        async def _ctx():
+            yield self.client
+
+        return _ctx()
+
+
+def _tool(name, description=""):
+    return Tool(name=name, description=description, inputSchema={"type": "object", "properties": {}})
+
+
+def test_catalog_round_trip_and_key(tmp_path):
+    cache = ToolCatalogCache(tmp_path)
+    cache.store(SETTINGS, [_tool("a", "first")])
+
+    loaded = cache.load(SETTINGS.model_copy(update={"description": "renamed"}))
+    assert [(t.name, t.description) for t in loaded] == [("a", "first")]
+    assert cache.load(SETTINGS.model_copy(update={"env": {"TOKEN": "other"}})) is None
+    assert cache.path_for(MCPServerSettings()) is None
+    assert "secret" not in next(tmp_path.glob("*.json")).read_text()
+
+
+def test_unreadable_catalog_is_a_miss(tmp_path):
+    cache = ToolCatalogCache(tmp_path)
+    cache.path_for(SETTINGS).write_text("{not json")
+    assert cache.load(SETTINGS) is None
+
+
+def test_cache_directory_from_environment(monkeypatch, tmp_path):
+    monkeypatch.delenv("LLMPROC_MCP_CATALOG_CACHE_DIR", raising=False)
+    assert ToolCatalogCache.from_env() is None
+    monkeypatch.setenv("LLMPROC_MCP_CATALOG_CACHE_DIR", str(tmp_path))
+    assert FakeAggregator(SlowClient([]), None).filter_servers(["srv"]).catalog_cache.directory == tmp_path
+
+
+@pytest.mark.asyncio
+async def test_cold_start_lists_tools_and_writes_cache(tmp_path):
+    cache = ToolCatalogCache(tmp_path)
+    client = SlowClient([_tool("a")])
+    aggregator = FakeAggregator(client, cache)
+
+    tools = await aggregator.initialize([MCPServerTools(server="srv")])
+    assert [t.meta.name for t in tools] == ["srv__a"]
+    assert client.list_tools_calls == 1
+    assert aggregator._revalidation is None
+    assert [t.name for t in cache.load(SETTINGS)] == ["a"]
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_warm_start_does_not_wait_for_server(tmp_path):
+    """Benchmark: a cached start returns before a slow ``list_tools`` would."""
+    cache = ToolCatalogCache(tmp_path)
+    cache.store(SETTINGS, [_tool("a")])
+    client = SlowClient([_tool("a")], delay=0.5)
+    aggregator = FakeAggregator(client, cache)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    tools = await aggregator.initialize([MCPServerTools(server="srv")])
+    assert loop.time() - start < 0.25
+    assert [t.meta.name for t in tools] == ["srv__a"]
+
+    listener_calls = []
+    aggregator.add_tools_listener(lambda old, new: listener_calls.append((old, new)))
+    await aggregator._revalidation
+    assert client.list_tools_calls == 1
+    assert listener_calls == []
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_revalidation_updates_cache_and_registries(tmp_path):
+    cache = ToolCatalogCache(tmp_path)
+    cache.store(SETTINGS, [_tool("a")])
+    client = SlowClient([_tool("a"), _tool("b")])
+    aggregator = FakeAggregator(client, cache)
+
+    registry = ToolRegistry()
+    for tool in await aggregator.initialize([MCPServerTools(server="srv")]):
+        registry.register_tool_obj(tool)
+    aggregator.add_tools_listener(registry.replace_tools)
+    version = registry.version
+
+    await aggregator._revalidation
+    assert registry.get_tool_names() == ["srv__a", "srv__b"]
+    assert registry.version > version
+    assert [t.name for t in cache.load(SETTINGS)] == ["a", "b"]
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_failed_revalidation_keeps_cached_tools(tmp_path):
+    cache = ToolCatalogCache(tmp_path)
+    cache.store(SETTINGS, [_tool("a")])
+    client = SlowClient([])
+
+    async def _fail():
+        raise ConnectionError("server exited")
+
+    client.list_tools = _fail
+    aggregator = FakeAggregator(client, cache)
+    await aggregator.initialize([MCPServerTools(server="srv")])
+    await aggregator._revalidation
+
+    assert list(aggregator.loader.get_namespaced_tools()) == ["srv__a"]
+    assert [t.name for t in cache.load(SETTINGS)] == ["a"]
+    await aggregator.close_clients()
@@ -0,0 +1,154 @@
+"""Tests for lazily connected MCP servers."""
+
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.types import CallToolResult, ListToolsResult, TextContent, Tool
+
+from llmproc.config.mcp import MCPServerTools
+from llmproc.config.tool import ToolConfig
+from llmproc.tools.mcp import MCPAggregator, MCPServerSettings
+from llmproc.tools.mcp.catalog_cache import ToolCatalogCache
+
+SCHEMA = {"type": "object", "properties": {"q": {"type": "string"}}}
+
+
+class FakeSession:
+    def __init__(self, server):
+        self.server = server
+        self.list_tools_calls = 0
+
+    async def list_tools(self):
+        self.list_tools_calls += 1
+        return ListToolsResult(tools=[Tool(name="search", inputSchema=SCHEMA)])
+
+    async def call_tool(self, name, arguments=None):
+        return CallToolResult(isError=False, content=[TextContent(type="text", text=f"{self.server}:{name}")])
+
+
+class LazyAggregator(MCPAggregator):
+    def __init__(self, names, lazy=True, **kwargs):
+        servers = {name: MCPServerSettings(command=f"{name}-server", lazy=lazy) for name in names}
+        super().__init__(servers, **kwargs)
+        self.connection_manager.session_pool = None
+        self.connects = Counter()
+        self.sessions = {name: FakeSession(name) for name in names}
+        self.failing = set()
+
+    def get_client(self, server_name, **kwargs):
+        @asynccontextmanager
+        async def _ctx():
+            self.connects[server_name] += 1
+            if server_name in self.failing:
+                raise ConnectionError(f"{server_name} did not start")
+            yield self.sessions[server_name]
+
+        return _ctx()
+
+
+def _explicit(server):
+    return MCPServerTools(server=server, tools=[ToolConfig(name="search", description="Search", input_schema=SCHEMA)])
+
+
+@pytest.fixture(autouse=True)
+def _no_env(monkeypatch):
+    monkeypatch.delenv("LLMPROC_MCP_LAZY", raising=False)
+    monkeypatch.delenv("LLMPROC_MCP_CATALOG_CACHE_DIR", raising=False)
+
+
+def test_explicit_tools_require_every_schema():
+    assert _explicit("s").explicit_tools()[0].input_schema == SCHEMA
+    assert MCPServerTools(server="s").explicit_tools() is None
+    mixed = MCPServerTools(server="s", tools=[ToolConfig(name="a", input_schema=SCHEMA), "b"])
+    assert mixed.explicit_tools() is None
+    from_dict = MCPServerTools(server="s", tools={"search": {"input_schema": SCHEMA}})
+    assert from_dict.explicit_tools()[0].input_schema == SCHEMA
+
+
+def test_lazy_setting_overrides_environment(monkeypatch):
+    monkeypatch.setenv("LLMPROC_MCP_LAZY", "true")
+    aggregator = LazyAggregator(["a"], lazy=None)
+    assert aggregator.is_lazy("a")
+    aggregator.servers["a"].lazy = False
+    assert not aggregator.is_lazy("a")
+
+
+@pytest.mark.asyncio
+async def test_only_called_servers_connect():
+    """Benchmark: five lazy servers, one used, one connection."""
+    names = [f"s{i}" for i in range(5)]
+    aggregator = LazyAggregator(names)
+
+    tools = await aggregator.initialize([_explicit(name) for name in names])
+    assert [t.schema["name"] for t in tools] == [f"{name}__search" for name in names]
+    assert tools[0].schema["input_schema"]["properties"]["q"] == {"type": "string"}
+    assert sum(aggregator.connects.values()) == 0
+
+    for _ in range(3):
+        result = await aggregator.call_tool_resolved("s2", "search", {"q": "x"})
+        assert result.content[0].text == "s2:search"
+    assert aggregator.connects == Counter({"s2": 1})
+    assert aggregator.sessions["s2"].list_tools_calls == 0
+
+    stats = aggregator.server_stats
+    assert list(stats) == ["s2"]
+    assert stats["s2"].connects == 1 and stats["s2"].last_connect_ms >= 0
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_connect_failures_are_reported_per_server():
+    aggregator = LazyAggregator(["up", "down"])
+    aggregator.failing.add("down")
+    await aggregator.initialize([_explicit("up"), _explicit("down")])
+
+    result = await aggregator.call_tool_resolved("down", "search", {})
+    assert result.isError
+    assert "down did not start" in result.content[0].text
+    assert not (await aggregator.call_tool_resolved("up", "search", {})).isError
+
+    aggregator.failing.clear()
+    assert not (await aggregator.call_tool_resolved("down", "search", {})).isError
+
+    down, up = aggregator.server_stats["down"], aggregator.server_stats["up"]
+    assert (down.connects, down.failures, down.last_error) == (1, 1, "down did not start")
+    assert (up.connects, up.failures) == (1, 0)
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_cached_catalog_revalidated_after_first_call(tmp_path):
+    cache = ToolCatalogCache(tmp_path)
+    aggregator = LazyAggregator(["s"], catalog_cache=cache)
+    cache.store(aggregator.servers["s"], [Tool(name="search", inputSchema=SCHEMA)])
+
+    tools = await aggregator.initialize([MCPServerTools(server="s")])
+    assert [t.meta.name for t in tools] == ["s__search"]
+    assert aggregator.connects["s"] == 0
+    assert aggregator._revalidation is None
+
+    await aggregator.call_tool_resolved("s", "search", {})
+    for task in list(aggregator._background):
+        await task
+    assert aggregator.connects["s"] == 1
+    assert aggregator.sessions["s"].list_tools_calls == 1
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_lazy_server_without_schemas_connects_at_start():
+    aggregator = LazyAggregator(["s"])
+    tools = await aggregator.initialize([MCPServerTools(server="s")])
+    assert [t.meta.name for t in tools] == ["s__search"]
+    assert aggregator.connects["s"] == 1
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_explicit_schemas_ignored_for_eager_servers():
+    aggregator = LazyAggregator(["s"], lazy=False)
+    await aggregator.initialize([_explicit("s")])
+    assert aggregator.connects["s"] == 1
+    assert aggregator.sessions["s"].list_tools_calls == 1
+    await aggregator.close_clients()
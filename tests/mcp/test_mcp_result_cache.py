@@ -0,0 +1,161 @@
+"""Tests for caching results of idempotent MCP tools."""
+
+import asyncio
+from collections import Counter
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.types import CallToolResult, ListToolsResult, TextContent, Tool
+
+from llmproc.config.mcp import MCPServerTools
+from llmproc.config.tool import ToolConfig
+from llmproc.tools.mcp import MCPAggregator, MCPServerSettings
+from llmproc.tools.mcp import result_cache as result_cache_module
+from llmproc.tools.mcp.result_cache import ToolResultCache
+
+SCHEMA = {"type": "object", "properties": {"q": {"type": "string"}}}
+
+
+def _text(text, is_error=False):
+    return CallToolResult(isError=is_error, content=[TextContent(type="text", text=text)])
+
+
+class CountingSession:
+    def __init__(self, delay=0.0):
+        self.calls = Counter()
+        self.delay = delay
+        self.fail = False
+
+    async def list_tools(self):
+        return ListToolsResult(tools=[Tool(name=name, inputSchema=SCHEMA) for name in ("lookup", "write")])
+
+    async def call_tool(self, name, arguments=None):
+        self.calls[name] += 1
+        await asyncio.sleep(self.delay)
+        return _text(f"{name}:{arguments}", is_error=self.fail)
+
+
+class CountingAggregator(MCPAggregator):
+    def __init__(self, session, **kwargs):
+        super().__init__({"docs": MCPServerSettings(command="docs-server")}, **kwargs)
+        self.connection_manager.session_pool = None
+        self.session = session
+
+    def get_client(self, server_name, **kwargs):
+        @asynccontextmanager
+        async def _ctx():
+            yield self.session
+
+        return _ctx()
+
+
+def _descriptor(**tool_options):
+    return MCPServerTools(server="docs", tools=[ToolConfig(name="lookup", **tool_options), "write"])
+
+
+def test_key_is_canonical_json():
+    assert ToolResultCache.key("s", "t", {"b": 1, "a": [1, 2]}) == ToolResultCache.key("s", "t", {"a": [1, 2], "b": 1})
+    assert ToolResultCache.key("s", "t", None) == ToolResultCache.key("s", "t", {})
+    assert ToolResultCache.key("s", "t", {"x": object()}) is None
+
+
+def test_policy_from_yaml_style_config():
+    desc = MCPServerTools(server="docs", tools={"lookup": {"cacheable": True, "cache_ttl": 5}, "write": "write"})
+    assert desc.result_cache_policy("lookup") == (True, 5)
+    assert desc.result_cache_policy("write") == (False, None)
+    assert MCPServerTools(server="docs", cacheable=True, cache_ttl=9).result_cache_policy("any") == (True, 9)
+
+
+@pytest.mark.asyncio
+async def test_lru_eviction_by_bytes():
+    cache = ToolResultCache(max_bytes=1000)
+
+    async def _call(text):
+        return _text(text)
+
+    for name in ("a", "b", "c"):
+        await cache.get_or_call(("s", name, "{}"), lambda name=name: _call(name * 200))
+    await cache.get_or_call(("s", "a", "{}"), lambda: _call("unused"))  # touch "a"
+    await cache.get_or_call(("s", "d", "{}"), lambda: _call("d" * 200))
+
+    metrics = cache.metrics()
+    assert metrics.bytes <= 1000 and metrics.evictions == 1
+    assert (metrics.hits, metrics.misses) == (1, 4)
+    result = await cache.get_or_call(("s", "b", "{}"), lambda: _call("refetched"))
+    assert result.content[0].text == "refetched"
+
+    await cache.get_or_call(("s", "big", "{}"), lambda: _call("x" * 2000))
+    assert ("s", "big", "{}") not in cache._entries
+
+
+@pytest.mark.asyncio
+async def test_entries_expire_after_ttl(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(result_cache_module.time, "monotonic", lambda: now[0])
+    cache = ToolResultCache()
+    calls = []
+
+    async def _call():
+        calls.append(1)
+        return _text(str(len(calls)))
+
+    key = ("s", "t", "{}")
+    assert (await cache.get_or_call(key, _call, ttl=10)).content[0].text == "1"
+    now[0] += 5
+    assert (await cache.get_or_call(key, _call, ttl=10)).content[0].text == "1"
+    now[0] += 10
+    assert (await cache.get_or_call(key, _call, ttl=10)).content[0].text == "2"
+
+
+@pytest.mark.asyncio
+async def test_only_cacheable_tools_are_cached():
+    session = CountingSession()
+    aggregator = CountingAggregator(session)
+    await aggregator.initialize([_descriptor(cacheable=True)])
+
+    for _ in range(3):
+        await aggregator.call_tool_resolved("docs", "lookup", {"q": "x"})
+        await aggregator.call_tool_resolved("docs", "write", {"q": "x"})
+    await aggregator.call_tool_resolved("docs", "lookup", {"q": "y"})
+
+    assert session.calls == Counter({"lookup": 2, "write": 3})
+    metrics = aggregator.result_cache.metrics()
+    assert (metrics.hits, metrics.misses, metrics.entries) == (2, 2, 2)
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_error_results_are_not_cached():
+    session = CountingSession()
+    aggregator = CountingAggregator(session)
+    await aggregator.initialize([_descriptor(cacheable=True)])
+
+    session.fail = True
+    assert (await aggregator.call_tool_resolved("docs", "lookup", {})).isError
+    session.fail = False
+    assert not (await aggregator.call_tool_resolved("docs", "lookup", {})).isError
+    assert session.calls["lookup"] == 2
+    await aggregator.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_forked_fan_out_shares_one_lookup():
+    """Benchmark: ten concurrent identical lookups reach the server once."""
+    session = CountingSession(delay=0.05)
+    parent = CountingAggregator(session)
+    child = parent.filter_servers(["docs"])
+    child.get_client = parent.get_client
+    child.connection_manager.session_pool = None
+    assert child.result_cache is parent.result_cache
+
+    await parent.initialize([_descriptor(cacheable=True)])
+    await child.initialize([_descriptor(cacheable=True)])
+
+    results = await asyncio.gather(
+        *(agg.call_tool_resolved("docs", "lookup", {"q": "x"}) for agg in [parent, child] * 5)
+    )
+    assert {r.content[0].text for r in results} == {"lookup:{'q': 'x'}"}
+    assert session.calls["lookup"] == 1
+    assert parent.result_cache.metrics().hits == 9
+    await parent.close_clients()
+    await child.close_clients()
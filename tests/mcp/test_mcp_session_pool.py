@@ -0,0 +1,233 @@
+"""Tests for the shared MCP session pool."""
+
+import asyncio
+import hashlib
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.types import (
+    CallToolResult,
+    ListToolsResult,
+    ServerNotification,
+    TextContent,
+    Tool,
+    ToolListChangedNotification,
+)
+
+from llmproc.tools.mcp import MCPAggregator, MCPServerSettings
+from llmproc.tools.mcp.connection_manager import ConnectionManager
+from llmproc.tools.mcp.session_pool import MCPSessionPool, session_key
+
+SETTINGS = MCPServerSettings(type="stdio", command="fake-server", args=["--stdio"])
+
+
+class FakeSession:
+    """Session that tracks how many calls are in flight at once."""
+
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def list_tools(self):
+        return ListToolsResult(tools=[Tool(name="echo", inputSchema={})])
+
+    async def call_tool(self, name, arguments=None):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return CallToolResult(isError=False, content=[TextContent(type="text", text=str(arguments))])
+
+
+class FakeServer:
+    """Stand-in for launching a server; counts connections."""
+
+    def __init__(self, delay=0.0, fail=False, fail_close=False):
+        self.delay = delay
+        self.fail = fail
+        self.fail_close = fail_close
+        self.connects = 0
+        self.closed = 0
+        self.handlers = []
+
+    def connect(self, server_name, message_handler=None):
+        @asynccontextmanager
+        async def _ctx():
+            self.connects += 1
+            self.handlers.append(message_handler)
+            await asyncio.sleep(self.delay)
+            if self.fail:
+                raise ConnectionError("server exited")
+            try:
+                yield FakeSession()
+            finally:
+                self.closed += 1
+                if self.fail_close:
+                    raise RuntimeError("server crashed")
+
+        return _ctx()
+
+
+def _manager(pool, server, settings=SETTINGS):
+    manager = ConnectionManager({"srv": settings}, session_pool=pool)
+    manager.get_client = server.connect
+    return manager
+
+
+def _tool_list_changed():
+    return ServerNotification(ToolListChangedNotification(method="notifications/tools/list_changed"))
+
+
+def test_session_key_ignores_description_and_skips_unresolved_settings():
+    assert session_key(SETTINGS) == session_key(SETTINGS.model_copy(update={"description": "other"}))
+    assert session_key(SETTINGS) != session_key(SETTINGS.model_copy(update={"env": {"A": "1"}}))
+    assert session_key(MCPServerSettings()) is None
+    assert session_key(MCPServerSettings(type="sse")) is None
+
+
+@pytest.mark.asyncio
+async def test_managers_share_one_session():
+    pool = MCPSessionPool(idle_timeout=0)
+    server = FakeServer()
+    managers = [_manager(pool, server) for _ in range(10)]
+
+    sessions = [await m.get_persistent_client("srv") for m in managers]
+    assert all(s is sessions[0] for s in sessions)
+    assert await managers[0].get_persistent_client("srv") is sessions[0]
+
+    metrics = pool.metrics()
+    assert (server.connects, metrics.sessions, metrics.leased) == (1, 1, 1)
+    assert (metrics.leases, metrics.reuses) == (10, 9)
+
+    for manager in managers[:-1]:
+        await manager.close_clients()
+    assert server.closed == 0
+    await managers[-1].close_clients()
+    assert server.closed == 1
+    assert pool.metrics().sessions == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_first_leases_connect_once():
+    pool = MCPSessionPool(idle_timeout=0)
+    server = FakeServer(delay=0.01)
+    managers = [_manager(pool, server) for _ in range(5)]
+
+    sessions = await asyncio.gather(*(m.get_persistent_client("srv") for m in managers))
+    assert server.connects == 1
+    assert len({id(s) for s in sessions}) == 1
+    for manager in managers:
+        await manager.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_idle_session_closed_after_timeout():
+    pool = MCPSessionPool(idle_timeout=0.05)
+    server = FakeServer()
+    manager = _manager(pool, server)
+
+    first = await manager.get_persistent_client("srv")
+    await manager.close_clients()
+    assert pool.metrics().idle == 1
+
+    # Leased again before the timeout: the idle session is reused
+    assert await manager.get_persistent_client("srv") is first
+    await manager.close_clients()
+    await asyncio.sleep(0.1)
+
+    metrics = pool.metrics()
+    assert (server.connects, server.closed) == (1, 1)
+    assert (metrics.sessions, metrics.idle_closes) == (0, 1)
+
+
+@pytest.mark.asyncio
+async def test_idle_timeout_from_environment(monkeypatch):
+    monkeypatch.setenv("LLMPROC_MCP_SESSION_IDLE_TIMEOUT", "2.5")
+    assert MCPSessionPool().idle_timeout == 2.5
+    assert MCPSessionPool(idle_timeout=0).idle_timeout == 0
+
+
+@pytest.mark.asyncio
+async def test_close_errors_do_not_log_server_secrets(caplog):
+    settings = SETTINGS.model_copy(update={"env": {"API_TOKEN": "sk-secret"}})
+    pool = MCPSessionPool(idle_timeout=0)
+    manager = _manager(pool, FakeServer(fail_close=True), settings)
+
+    await manager.get_persistent_client("srv")
+    with caplog.at_level("DEBUG", logger="llmproc.tools.mcp.session_pool"):
+        await manager.close_clients()
+
+    assert "server crashed" in caplog.text
+    assert "sk-secret" not in caplog.text
+    assert hashlib.sha256(session_key(settings).encode()).hexdigest()[:12] in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_is_raised_and_retried():
+    pool = MCPSessionPool(idle_timeout=0)
+    server = FakeServer(fail=True)
+    manager = _manager(pool, server)
+
+    with pytest.raises(ConnectionError):
+        await asyncio.wait_for(manager.get_persistent_client("srv"), timeout=1)
+    server.fail = False
+    await manager.get_persistent_client("srv")
+    assert server.connects == 2
+    await manager.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_tool_list_changes_reach_every_lease_holder():
+    pool = MCPSessionPool(idle_timeout=0)
+    server = FakeServer()
+    first, second = _manager(pool, server), _manager(pool, server)
+    seen = []
+    first.add_tool_list_listener(lambda name: seen.append(("first", name)))
+    second.add_tool_list_listener(lambda name: seen.append(("second", name)))
+
+    await first.get_persistent_client("srv")
+    await second.get_persistent_client("srv")
+    await server.handlers[0](_tool_list_changed())
+    assert seen == [("first", "srv"), ("second", "srv")]
+
+    await first.close_clients()
+    await server.handlers[0](_tool_list_changed())
+    assert seen[-1] == ("second", "srv")
+    await second.close_clients()
+
+
+@pytest.mark.asyncio
+async def test_aggregators_multiplex_calls_on_shared_session():
+    """Benchmark: 10 aggregators x 5 calls start one server and overlap calls."""
+    pool = MCPSessionPool(idle_timeout=0)
+    server = FakeServer()
+
+    class PooledAggregator(MCPAggregator):
+        def get_client(self, server_name, **kwargs):
+            return server.connect(server_name, **kwargs)
+
+    aggregators = [PooledAggregator({"srv": SETTINGS}) for _ in range(10)]
+    for aggregator in aggregators:
+        aggregator.connection_manager.session_pool = pool
+
+    results = await asyncio.gather(
+        *(agg.call_tool_resolved("srv", "echo", {"i": i}) for agg in aggregators for i in range(5))
+    )
+    assert not any(r.isError for r in results)
+    assert server.connects == 1
+
+    session = await aggregators[0]._get_or_create_client("srv")
+    assert session.max_in_flight > 1
+    for aggregator in aggregators:
+        await aggregator.close_clients()
+    assert server.closed == 1
+
+
+@pytest.mark.asyncio
+async def test_unpooled_manager_keeps_its_own_session():
+    server = FakeServer()
+    first, second = _manager(None, server), _manager(None, server)
+    assert await first.get_persistent_client("srv") is not await second.get_persistent_client("srv")
+    assert server.connects == 2
+    await first.close_clients()
+    await second.close_clients()
@@ -0,0 +1,91 @@
+"""Tests for the streamable HTTP MCP transport and the shared HTTP pool."""
+
+import importlib.util
+
+import pytest
+
+from llmproc.tools.mcp import MCPAggregator, MCPServerSettings
+from llmproc.tools.mcp.http_pool import MCPHttpPool
+from llmproc.tools.mcp.session_pool import MCPSessionPool
+from tests.mcp.stand_in_server import serve
+
+
+@pytest.fixture(scope="module")
+def streamable_url():
+    with serve("streamable-http") as url:
+        yield url
+
+
+@pytest.fixture(scope="module")
+def sse_url():
+    with serve("sse") as url:
+        yield url
+
+
+def _aggregator(transport, url, http_pool):
+    aggregator = MCPAggregator({"remote": MCPServerSettings(type=transport, url=url)})
+    aggregator.connection_manager.session_pool = MCPSessionPool(idle_timeout=0)
+    aggregator.connection_manager.http_pool = http_pool
+    return aggregator
+
+
+async def _call_add(aggregator, calls):
+    for i in range(calls):
+        result = await aggregator.call_tool_resolved("remote", "add", {"a": i, "b": 1})
+        assert not result.isError
+        assert result.content[0].text == str(i + 1)
+
+
+@pytest.mark.asyncio
+async def test_transport_closed_after_last_holder():
+    pool = MCPHttpPool(http2=False)
+    async with pool.client_factory(headers={"X-Test": "1"}) as client:
+        assert client.headers["X-Test"] == "1"
+        assert pool.metrics().holders == 1
+    assert pool.metrics().transports == 0
+
+    pool.acquire()
+    async with pool.client_factory():
+        pass
+    async with pool.client_factory():
+        pass
+    metrics = pool.metrics()
+    assert (metrics.transports, metrics.holders, metrics.clients, metrics.transport_opens) == (1, 1, 3, 2)
+    await pool.release()
+    assert pool.metrics().transports == 0
+
+
+def test_http2_follows_h2_availability():
+    assert MCPHttpPool().http2 == (importlib.util.find_spec("h2") is not None)
+    assert MCPHttpPool(http2=False).http2 is False
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("transport", ["streamable-http", "sse"])
+async def test_remote_server_lists_and_calls_tools(transport, request):
+    url = request.getfixturevalue("streamable_url" if transport == "streamable-http" else "sse_url")
+    pool = MCPHttpPool(http2=False)
+    aggregator = _aggregator(transport, url, pool)
+    tools = await aggregator.list_tools()
+    assert sorted(t.name for t in tools.tools) == ["remote__add", "remote__echo"]
+
+    result = await aggregator.call_tool_resolved("remote", "echo", {"text": "hi"})
+    assert result.content[0].text == "hi"
+    await _call_add(aggregator, 3)
+    assert pool.metrics().clients == 1
+    await aggregator.close_clients()
+    assert pool.metrics().transports == 0
+
+
+@pytest.mark.asyncio
+async def test_transient_sessions_share_one_transport(streamable_url, monkeypatch):
+    monkeypatch.setenv("LLMPROC_MCP_TRANSIENT", "true")
+    pool = MCPHttpPool(http2=False)
+    aggregator = _aggregator("streamable-http", streamable_url, pool)
+    await _call_add(aggregator, 5)
+
+    metrics = pool.metrics()
+    # One client per session (a tool listing and five calls), all on one transport
+    assert (metrics.clients, metrics.transport_opens, metrics.transports) == (6, 1, 1)
+    await aggregator.close_clients()
+    assert pool.metrics().transports == 0
@@ -0,0 +1,119 @@
+"""Tests for the cached MCP tool catalog used by ``call_tool_resolved``."""
+
+import asyncio
+from contextlib import asynccontextmanager
+
+import pytest
+from mcp.types import (
+    CallToolResult,
+    ListToolsResult,
+    ServerNotification,
+    TextContent,
+    Tool,
+    ToolListChangedNotification,
+)
+
+from llmproc.tools.mcp import MCPAggregator, MCPServerSettings
+
+
+class CountingClient:
+    """Fake MCP session that counts RPCs."""
+
+    def __init__(self, tools):
+        self.tools = tools
+        self.list_tools_calls = 0
+        self.call_tool_calls = 0
+
+    async def list_tools(self):
+        self.list_tools_calls += 1
+        return ListToolsResult(tools=self.tools)
+
+    async def call_tool(self, name, arguments=None):
+        self.call_tool_calls += 1
+        return CallToolResult(isError=False, content=[TextContent(type="text", text=f"{name} ok")])
+
+
+class CountingAggregator(MCPAggregator):
+    def __init__(self, clients, **kwargs):
+        servers = {name: MCPServerSettings() for name in clients}
+        super().__init__(servers, **kwargs)
+        self.clients = clients
+
+    def get_client(self, server_name):
+        @asynccontextmanager
+        async def _ctx():
+            yield self.clients[server_name]
+
+        return _ctx()
+
+
+@pytest.fixture(autouse=True)
+def _no_env_ttl(monkeypatch):
+    monkeypatch.delenv("LLMPROC_MCP_TOOL_CACHE_TTL", raising=False)
+
+
+def test_repeated_calls_do_not_relist_tools():
+    """Benchmark: N tool calls cost N call_tool RPCs and a single list_tools."""
+    client = CountingClient([Tool(name="a", inputSchema={})])
+    aggregator = CountingAggregator({"s1": client})
+
+    async def _run():
+        await aggregator.load_servers()
+        for _ in range(50):
+            result = await aggregator.call_tool_resolved("s1", "a", {})
+            assert not result.isError
+
+    asyncio.run(_run())
+    assert client.call_tool_calls == 50
+    assert client.list_tools_calls == 1
+
+
+def test_ttl_expiry_refreshes_catalog():
+    client = CountingClient([Tool(name="a", inputSchema={})])
+    aggregator = CountingAggregator({"s1": client}, tool_cache_ttl=0)
+
+    async def _run():
+        for _ in range(3):
+            await aggregator.call_tool_resolved("s1", "a", {})
+
+    asyncio.run(_run())
+    assert client.list_tools_calls == 3
+
+
+def test_ttl_from_environment(monkeypatch):
+    monkeypatch.setenv("LLMPROC_MCP_TOOL_CACHE_TTL", "12.5")
+    aggregator = CountingAggregator({"s1": CountingClient([])})
+    assert aggregator.tool_cache_ttl == 12.5
+    assert aggregator.filter_servers(["s1"]).loader.cache_ttl == 12.5
+
+
+def test_tool_list_changed_notification_invalidates():
+    client = CountingClient([Tool(name="a", inputSchema={})])
+    aggregator = CountingAggregator({"s1": client})
+
+    async def _run():
+        await aggregator.call_tool_resolved("s1", "a", {})
+        handler = aggregator.connection_manager._message_handler("s1")
+        await handler(ServerNotification(ToolListChangedNotification(method="notifications/tools/list_changed")))
+        assert not aggregator.loader.is_fresh("s1")
+        await aggregator.call_tool_resolved("s1", "a", {})
+        await aggregator.call_tool_resolved("s1", "a", {})
+
+    asyncio.run(_run())
+    assert client.list_tools_calls == 2
+
+
+def test_unknown_tool_triggers_single_refresh():
+    client = CountingClient([Tool(name="a", inputSchema={})])
+    aggregator = CountingAggregator({"s1": client})
+
+    async def _run():
+        await aggregator.load_servers()
+        client.tools = client.tools + [Tool(name="b", inputSchema={})]
+        result = await aggregator.call_tool_resolved("s1", "b", {})
+        assert not result.isError
+        assert "s1__b" in aggregator.loader.get_namespaced_tools()
+        await aggregator.call_tool_resolved("s1", "b", {})
+
+    asyncio.run(_run())
+    assert client.list_tools_calls == 2
@@ -0,0 +1,174 @@
+"""Tests for the Anthropic Message Batches execution mode."""
+
+import asyncio
+import gc
+import itertools
+import weakref
+from types import SimpleNamespace as Ns
+from unittest.mock import patch
+
+import pytest
+
+from llmproc.common.results import RunResult
+from llmproc.program import LLMProgram
+from llmproc.providers.anthropic_batch import AnthropicBatchProcessExecutor, MessageBatcher, MessageBatchError
+
+MODEL = "claude-sonnet-4-20250514"
+
+
+def double(x: int) -> int:
+    """Double a number.
+
+    Args:
+        x: The number to double
+    """
+    return x * 2
+
+
+class FakeBatchServer:
+    """In-memory stand-in for ``client.messages.batches``.
+
+    A batch ends after ``polls`` status checks. Each request is answered by
+    ``respond(params)``, which returns a message or an error result type.
+    """
+
+    def __init__(self, respond, polls=2):
+        self.respond = respond
+        self.polls = polls
+        self.batches = {}
+        self.ids = itertools.count()
+
+    @property
+    def messages(self):
+        return Ns(batches=self)
+
+    @property
+    def beta(self):
+        return Ns(messages=Ns(batches=self))
+
+    async def create(self, requests, betas=None):
+        batch_id = f"msgbatch_{next(self.ids)}"
+        self.batches[batch_id] = {"requests": requests, "polls": self.polls, "betas": betas}
+        return Ns(id=batch_id, processing_status="in_progress")
+
+    async def retrieve(self, batch_id, betas=None):
+        batch = self.batches[batch_id]
+        batch["polls"] -= 1
+        return Ns(id=batch_id, processing_status="ended" if batch["polls"] <= 0 else "in_progress")
+
+    async def results(self, batch_id, betas=None):
+        async def entries():
+            for request in self.batches[batch_id]["requests"]:
+                outcome = self.respond(request["params"])
+                if isinstance(outcome, str):
+                    yield Ns(custom_id=request["custom_id"], result=Ns(type=outcome))
+                else:
+                    yield Ns(custom_id=request["custom_id"], result=Ns(type="succeeded", message=outcome))
+
+        return entries()
+
+
+def _message(*content, stop_reason="end_turn"):
+    return Ns(
+        type="message",
+        id="msg",
+        content=list(content),
+        stop_reason=stop_reason,
+        usage=Ns(input_tokens=1_000, output_tokens=100),
+    )
+
+
+def respond(params):
+    last = params["messages"][-1]["content"]
+    results = [block for block in last if block.get("type") == "tool_result"]
+    if results:
+        return _message(Ns(type="text", text=f"answer {results[0]['content']}"))
+    prompt = last[-1]["text"]
+    if prompt == "bad":
+        return "errored"
+    return _message(
+        Ns(type="tool_use", id="toolu_1", name="double", input={"x": int(prompt)}),
+        stop_reason="tool_use",
+    )
+
+
+@pytest.fixture
+def program():
+    program = LLMProgram(model_name=MODEL, provider="anthropic", system_prompt="test")
+    program.register_tools([double])
+    return program
+
+
+@pytest.mark.asyncio
+async def test_tool_loops_resume_from_batch_results(program):
+    server = FakeBatchServer(respond)
+    batcher = MessageBatcher(server, flush_interval=0.01, poll_interval=0)
+    executor = AnthropicBatchProcessExecutor(batcher)
+
+    with patch("llmproc.program_exec.get_provider_client", return_value=server):
+        results = [r async for r in program.run_batch(["1", "2", "3", "4"], concurrency=4, executor=executor)]
+
+    assert {r.prompt: r.response for r in results} == {str(n): f"answer {2 * n}" for n in range(1, 5)}
+    # every process's first turn went into one batch, and every second turn into another
+    assert [len(batch["requests"]) for batch in server.batches.values()] == [4, 4]
+    assert all("stream" not in request["params"] for request in server.batches["msgbatch_0"]["requests"])
+
+    run_result = results[0].run_result
+    assert run_result.api_call_count == 2
+    assert all(info["batch"] for info in run_result.api_call_infos)
+
+
+@pytest.mark.asyncio
+async def test_errored_request_fails_only_its_prompt(program):
+    server = FakeBatchServer(respond, polls=1)
+    executor = AnthropicBatchProcessExecutor(MessageBatcher(server, flush_interval=0.01, poll_interval=0))
+
+    with patch("llmproc.program_exec.get_provider_client", return_value=server):
+        results = {r.prompt: r async for r in program.run_batch(["5", "bad"], concurrency=2, executor=executor)}
+
+    assert isinstance(results["bad"].error, MessageBatchError)
+    assert results["bad"].error.result_type == "errored"
+    assert results["5"].response == "answer 10"
+
+
+@pytest.mark.asyncio
+async def test_batches_split_at_max_size():
+    server = FakeBatchServer(lambda params: _message(Ns(type="text", text="ok")), polls=0)
+    batcher = MessageBatcher(server, max_batch_size=2, flush_interval=60, poll_interval=0)
+
+    messages = await asyncio.gather(*(batcher.create({"messages": []}) for _ in range(4)))
+
+    assert len(messages) == 4
+    assert [len(batch["requests"]) for batch in server.batches.values()] == [2, 2]
+
+
+@pytest.mark.asyncio
+async def test_beta_headers_forwarded_as_batch_betas():
+    server = FakeBatchServer(lambda params: _message(Ns(type="text", text="ok")), polls=0)
+    batcher = MessageBatcher(server, flush_interval=0.01, poll_interval=0)
+    beta = {"extra_headers": {"anthropic-beta": "token-efficient-tools-2025-02-19, extended-cache-ttl-2025-04-11"}}
+
+    await asyncio.gather(batcher.create({"messages": []}), batcher.create({"messages": [], **beta}))
+
+    by_betas = {tuple(batch["betas"] or ()): batch for batch in server.batches.values()}
+    assert set(by_betas) == {(), ("extended-cache-ttl-2025-04-11", "token-efficient-tools-2025-02-19")}
+    assert all("extra_headers" not in r["params"] for b in by_betas.values() for r in b["requests"])
+
+
+def test_shared_batcher_does_not_outlive_client():
+    server = FakeBatchServer(respond)
+    batcher = MessageBatcher.for_client(server)
+    assert MessageBatcher.for_client(server) is batcher
+    batcher_ref = weakref.ref(batcher)
+    del server, batcher
+    gc.collect()
+    assert batcher_ref() is None
+
+
+def test_usd_cost_applies_batch_pricing():
+    usage = {"input_tokens": 1_000_000, "output_tokens": 100_000}
+    regular = RunResult().add_api_call({"model": MODEL, "usage": usage})
+    batched = RunResult().add_api_call({"model": MODEL, "usage": usage, "batch": True})
+
+    assert regular.usd_cost == pytest.approx(3.0 + 1.5)
+    assert batched.usd_cost == pytest.approx(regular.usd_cost / 2)
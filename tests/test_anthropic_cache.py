@@ -0,0 +1,118 @@
+"""Tests for the Anthropic cache breakpoint planner."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from llmproc.providers.anthropic_cache import CACHE_TURN_HISTORY, MAX_CACHE_BREAKPOINTS, CacheBreakpointPlanner
+from llmproc.providers.anthropic_utils import prepare_api_request
+
+MODEL = "claude-sonnet-4-20250514"
+
+
+def _marked(items):
+    """Return indexes of messages (or blocks) carrying a breakpoint."""
+    marked = []
+    for i, item in enumerate(items):
+        blocks = item.get("content") if "role" in item else [item]
+        if any(isinstance(b, dict) and "cache_control" in b for b in blocks):
+            marked.append(i)
+    return marked
+
+
+def _conversation(turns):
+    messages = [{"role": "user", "content": [{"type": "text", "text": "start"}]}]
+    for i in range(turns):
+        messages.append({"role": "assistant", "content": [{"type": "text", "text": f"a{i}"}]})
+        messages.append({"role": "user", "content": [{"type": "tool_result", "tool_use_id": str(i), "content": "ok"}]})
+    return messages
+
+
+BIG_TOOLS = [{"name": f"tool{i}", "description": "x" * 500, "input_schema": {}} for i in range(10)]
+BIG_SYSTEM = [{"type": "text", "text": "s" * 8000}]
+
+
+def test_tools_and_system_get_breakpoints():
+    """Large tool lists and system prompts carry their own breakpoints."""
+    planner = CacheBreakpointPlanner(ttl="5m")
+    messages, system, tools = planner.apply(_conversation(3), BIG_SYSTEM, BIG_TOOLS, MODEL)
+
+    assert tools[-1]["cache_control"] == {"type": "ephemeral"}
+    assert system[-1]["cache_control"] == {"type": "ephemeral"}
+    assert len(_marked(messages)) == MAX_CACHE_BREAKPOINTS - 2
+    assert "cache_control" not in BIG_TOOLS[-1] and "cache_control" not in BIG_SYSTEM[-1]
+
+
+def test_short_prefixes_are_not_marked():
+    """Prefixes below the minimum cacheable length leave slots for messages."""
+    planner = CacheBreakpointPlanner(ttl="5m", step=2)
+    tools = [{"name": "calc", "description": "calculator"}]
+    system = [{"type": "text", "text": "short"}]
+    messages, out_system, out_tools = planner.apply(_conversation(10), system, tools, MODEL)
+
+    assert out_tools is tools and out_system is system
+    assert len(_marked(messages)) == MAX_CACHE_BREAKPOINTS
+
+
+def test_conversation_anchor_moves_in_steps():
+    """The anchor stays put for ``step`` messages instead of moving every turn."""
+    planner = CacheBreakpointPlanner(ttl="5m", step=8)
+    anchors = []
+    for turns in range(1, 12):
+        messages, _, _ = planner.apply(_conversation(turns), BIG_SYSTEM, BIG_TOOLS, MODEL)
+        last = len(messages) - 1
+        assert last in _marked(messages)
+        anchors.append(max(i for i in _marked(messages) if i != last))
+
+    assert anchors == [0, 0, 0, 0, 8, 8, 8, 8, 16, 16, 16]
+
+
+def test_one_hour_ttl():
+    """The 1h TTL is set on every breakpoint and enables the beta header."""
+    process = SimpleNamespace(
+        state=[{"role": "user", "content": "Hello"}],
+        enriched_system_prompt="s" * 8000,
+        tools=[],
+        model_name=MODEL,
+        api_params={},
+        provider="anthropic",
+        cache_planner=CacheBreakpointPlanner(ttl="1h"),
+    )
+    request = prepare_api_request(process)
+
+    assert request["system"][0]["cache_control"] == {"type": "ephemeral", "ttl": "1h"}
+    assert request["messages"][0]["content"][0]["cache_control"] == {"type": "ephemeral", "ttl": "1h"}
+    assert "extended-cache-ttl" in request["extra_headers"]["anthropic-beta"]
+
+
+def test_invalid_ttl(monkeypatch):
+    """Unknown TTLs are rejected, including from the environment."""
+    with pytest.raises(ValueError):
+        CacheBreakpointPlanner(ttl="10m")
+    monkeypatch.setenv("LLMPROC_CACHE_TTL", "2h")
+    with pytest.raises(ValueError):
+        CacheBreakpointPlanner()
+
+
+def test_record_usage():
+    """Cache reads and writes are recorded per turn."""
+    planner = CacheBreakpointPlanner(ttl="5m")
+    planner.apply(_conversation(2), BIG_SYSTEM, BIG_TOOLS, MODEL)
+    planner.record(SimpleNamespace(cache_read_input_tokens=0, cache_creation_input_tokens=3000, input_tokens=20))
+    planner.record({"cache_read_input_tokens": 3000, "cache_creation_input_tokens": 100, "input_tokens": 20})
+
+    assert [turn.cache_read_tokens for turn in planner.turns] == [0, 3000]
+    assert planner.turns[0].breakpoints == MAX_CACHE_BREAKPOINTS
+    assert planner.hit_ratio == pytest.approx(3000 / 6140)
+
+
+def test_turn_history_is_bounded():
+    """Only recent turns are kept; the hit ratio covers every turn."""
+    planner = CacheBreakpointPlanner(ttl="5m")
+    planner.record({"cache_read_input_tokens": 0, "cache_creation_input_tokens": 0, "input_tokens": 1000})
+    for _ in range(CACHE_TURN_HISTORY):
+        planner.record({"cache_read_input_tokens": 1000, "cache_creation_input_tokens": 0, "input_tokens": 0})
+
+    assert len(planner.turns) == CACHE_TURN_HISTORY
+    assert planner.turns[0].cache_read_tokens == 1000
+    assert planner.hit_ratio == pytest.approx(CACHE_TURN_HISTORY / (CACHE_TURN_HISTORY + 1))
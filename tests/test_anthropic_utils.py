@@ -4,9 +4,9 @@ import copy
 from unittest.mock import MagicMock, patch
 
 import pytest
+from llmproc.providers.anthropic_cache import CacheBreakpointPlanner
 from llmproc.providers.anthropic_utils import (
     add_token_efficient_header_if_needed,
-    apply_cache_control,
     format_state_to_api_messages,
     format_system_prompt,
     is_cacheable_content,
@@ -64,7 +64,7 @@ class TestMessageFormatting:
         formatted = format_state_to_api_messages(state)
 
         # Apply cache
-        cached_messages, _, _ = apply_cache_control(formatted, [])
+        cached_messages, _, _ = CacheBreakpointPlanner(ttl="5m").apply(formatted, [], None)
 
         # Verify caching
         assert len(cached_messages) == 2
@@ -73,7 +73,7 @@ class TestMessageFormatting:
         assert isinstance(last_message["content"], list)
         assert last_message["content"][0].get("cache_control") == {"type": "ephemeral"}
 
-        # Check first message has cache too (as per our 3 message caching policy)
+        # Check first message has cache too (the conversation anchor)
         assert cached_messages[0]["content"][0].get("cache_control") == {"type": "ephemeral"}
 
         # Verify content is properly formatted
@@ -102,11 +102,11 @@ class TestAPIFormatting:
 
     def test_format_and_cache_system_prompt(self):
         """Test formatting system prompt and applying cache."""
-        system = "Hello, I am Claude"
+        system = "Hello, I am Claude. " * 300
         formatted = format_system_prompt(system)
 
         # Apply cache
-        _, cached_system, _ = apply_cache_control([], formatted)
+        _, cached_system, _ = CacheBreakpointPlanner(ttl="5m").apply([], formatted, None)
 
         assert isinstance(cached_system, list)
         assert len(cached_system) == 1
@@ -216,3 +216,101 @@ class TestMiscUtils:
 
         # Test fallback
         assert get_context_window_size("unknown-model", window_sizes) == 100000
+
+
+class TestFormattedMessageCache:
+    """Tests for incremental request building."""
+
+    @staticmethod
+    def _legacy_request_messages(state):
+        """Build messages the way prepare_api_request did before the cache."""
+        from llmproc.providers.anthropic_cache import CacheBreakpointPlanner
+
+        messages = copy.deepcopy(format_state_to_api_messages(state))
+        cached, _, _ = CacheBreakpointPlanner(ttl="5m").apply(messages, [], [])
+        return cached
+
+    @staticmethod
+    def _process(state):
+        from types import SimpleNamespace
+
+        return SimpleNamespace(
+            state=state,
+            enriched_system_prompt="sys",
+            tools=[],
+            model_name="claude-3-5-sonnet",
+            api_params={},
+            provider="anthropic",
+        )
+
+    def test_payload_matches_full_rebuild(self):
+        """Incremental formatting yields the same payload as a full rebuild."""
+        state = [{"role": "user", "content": "Hello"}]
+        process = self._process(state)
+        for i in range(6):
+            state.append({"role": "assistant", "content": [{"type": "text", "text": f"a{i}"}]})
+            state.append({"role": "user", "content": {"type": "tool_result", "tool_use_id": f"t{i}", "content": "ok"}})
+            request = prepare_api_request(process)
+            assert request["messages"] == self._legacy_request_messages(state)
+
+    def test_request_does_not_mutate_cache(self):
+        """Cache control markers are not leaked into reused messages."""
+        state = [{"role": "user", "content": "one"}]
+        process = self._process(state)
+        prepare_api_request(process)
+        for i in range(4):
+            state.append({"role": "user", "content": f"msg {i}"})
+        prepare_api_request(process)
+        request = prepare_api_request(process, add_cache=False)
+        assert not any("cache_control" in m["content"][0] for m in request["messages"])
+        assert "cache_control" not in state[0]["content"]
+
+    def test_truncation_and_in_place_edit_are_detected(self):
+        """GOTO-style truncation and edited messages are reformatted."""
+        state = [{"role": "user", "content": f"m{i}"} for i in range(5)]
+        process = self._process(state)
+        prepare_api_request(process)
+
+        process.state = state[:2] + [{"role": "user", "content": "new"}]
+        request = prepare_api_request(process)
+        assert [m["content"][0]["text"] for m in request["messages"]] == ["m0", "m1", "new"]
+
+        process.state[0]["content"] = [{"type": "text", "text": "edited"}]
+        request = prepare_api_request(process)
+        assert request["messages"][0]["content"][0]["text"] == "edited"
+
+    def test_system_prompt_is_formatted_once(self):
+        """The system prompt is only reformatted after it is replaced."""
+        from llmproc.providers import anthropic_utils
+
+        process = self._process([{"role": "user", "content": "Hello"}])
+        with patch.object(anthropic_utils, "format_system_prompt", wraps=anthropic_utils.format_system_prompt) as fmt:
+            for _ in range(3):
+                assert prepare_api_request(process)["system"] == "sys"
+            calls = fmt.call_count
+            process.enriched_system_prompt = "new sys"
+            assert prepare_api_request(process)["system"] == "new sys"
+
+        assert calls == 2
+        assert fmt.call_count == 4
+
+    def test_per_turn_formatting_cost_is_flat(self):
+        """Benchmark: each turn converts only the messages appended since the last turn."""
+        from llmproc.providers import anthropic_utils
+
+        state = []
+        process = self._process(state)
+        big_result = "x" * 10_000
+        with patch.object(
+            anthropic_utils, "format_api_message", wraps=anthropic_utils.format_api_message
+        ) as formatter:
+            per_turn = []
+            for turn in range(200):
+                state.append({"role": "assistant", "content": [{"type": "text", "text": f"turn {turn}"}]})
+                state.append({"role": "user", "content": {"type": "tool_result", "tool_use_id": str(turn), "content": big_result}})
+                before = formatter.call_count
+                prepare_api_request(process)
+                per_turn.append(formatter.call_count - before)
+
+        assert len(process.state) == 400
+        assert set(per_turn) == {2}
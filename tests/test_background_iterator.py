@@ -0,0 +1,67 @@
+"""Tests for the background streaming iterator."""
+
+import asyncio
+import logging
+
+import pytest
+
+from llmproc.utils.background import AsyncBackgroundIterator
+
+
+async def _produce(n: int, produced: list[int]):
+    for i in range(n):
+        produced.append(i)
+        yield i
+
+
+@pytest.mark.asyncio
+async def test_items_not_printed(capsys):
+    seen = []
+    async with AsyncBackgroundIterator(_produce(5, []), on_item=seen.append) as items:
+        result = [item async for item in items]
+
+    assert result == [0, 1, 2, 3, 4]
+    assert seen == result
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.asyncio
+async def test_bounded_queue_applies_backpressure():
+    produced: list[int] = []
+    async with AsyncBackgroundIterator(_produce(100, produced), max_queue_size=4) as items:
+        await asyncio.sleep(0.01)  # let the producer run ahead of a slow consumer
+        assert len(produced) <= 5
+        result = [item async for item in items]
+
+    assert result == list(range(100))
+    assert items.metrics.items == 100
+    assert items.metrics.max_queue_depth == 4
+    assert items.metrics.max_latency >= items.metrics.mean_latency > 0
+
+
+@pytest.mark.asyncio
+async def test_debug_tracing_and_errors(caplog):
+    async def failing():
+        yield "first"
+        raise RuntimeError("boom")
+
+    caplog.set_level(logging.DEBUG, logger="llmproc.utils.background")
+    async with AsyncBackgroundIterator(failing()) as items:
+        assert await items.__anext__() == "first"
+        with pytest.raises(RuntimeError, match="boom"):
+            await items.__anext__()
+
+    assert "Stream item: 'first'" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_breaking_out_with_full_queue_closes():
+    produced: list[int] = []
+    async with asyncio.timeout(5):  # closing used to hang on the full queue
+        async with AsyncBackgroundIterator(_produce(100, produced), max_queue_size=4) as items:
+            async for _ in items:
+                await asyncio.sleep(0.01)  # let the producer fill the queue
+                break
+
+    assert items._task.done()
+    assert len(produced) < 100
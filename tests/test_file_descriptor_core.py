@@ -5,11 +5,13 @@ core functionality of the file descriptor system.
 """
 
 import re
+import time
 from unittest.mock import MagicMock, Mock, patch
 
 import pytest
 from llmproc.common.results import ToolResult
 from llmproc.plugins.file_descriptor import FileDescriptorManager
+from llmproc.plugins.file_descriptor.paginator import calculate_total_pages, index_lines
 
 # File descriptor XML tag constants - defined here since they're internal
 FD_RESULT_OPENING_TAG = "<fd_result"
@@ -194,6 +196,41 @@ def test_fd_offset_limit():
     assert "Line 5" not in result_offset
 
 
+def test_index_lines_ignores_trailing_newline():
+    """Test line indexing with interior and trailing newlines."""
+    assert index_lines("") == ([0], 1)
+    assert index_lines("a\nbc\n\nd\n") == ([0, 2, 5, 6], 4)
+
+
+def test_total_pages_matches_line_aware_pagination():
+    """Test that only the page count is stored on the FD."""
+    manager = FileDescriptorManager(default_page_size=25)
+    content = "\n".join(f"Line {i:02d} has some text" for i in range(10))
+    fd_id = re.search(r'fd="([^"]+)"', manager.create_fd_content(content)).group(1)
+    entry = manager.file_descriptors[fd_id]
+
+    lines = entry["lines"]
+    assert entry["total_pages"] == calculate_total_pages(content, lines, 25) == 5
+    assert "page_starts" not in entry
+
+
+def test_large_fd_pagination_is_fast():
+    """Benchmark: creating and reading a multi-megabyte FD stays well under a second."""
+    manager = FileDescriptorManager()
+    content = "\n".join(f"{i:08d} " + "x" * (i % 97) for i in range(100_000))
+
+    start = time.perf_counter()
+    fd_id = re.search(r'fd="([^"]+)"', manager.create_fd_content(content)).group(1)
+    pages = manager.file_descriptors[fd_id]["total_pages"]
+    manager.read_fd_content(fd_id, mode="page", start=pages // 2)
+    manager.read_fd_content(fd_id, mode="line", start=50_000, count=10)
+    result = manager.read_fd_content(fd_id, mode="char", start=len(content) - 20, count=10)
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1.0
+    assert 'lines="100000-100000"' in result
+
+
 # =============================================================================
 # Advanced Positioning and Formatting Tests
 # =============================================================================
@@ -0,0 +1,115 @@
+"""Tests for the disk-backed file descriptor storage tier."""
+
+import re
+from array import array
+
+import pytest
+
+from llmproc.config.schema import FileDescriptorPluginConfig
+from llmproc.plugins.file_descriptor import FileDescriptorManager, FileDescriptorPlugin
+from llmproc.plugins.file_descriptor.storage import SpilledContent
+
+SAMPLES = {
+    "ascii": "\n".join(f"line {i}: " + "x" * (i % 37) for i in range(400)),
+    "latin1": "\n".join(f"café {i} naïve" for i in range(300)) + "\n",
+    "bmp": "\n".join(f"行 {i} — данные" for i in range(300)),
+    "astral": "\n".join(f"emoji {i} 🚀🎉" for i in range(300)),
+}
+
+
+def _fd_id(xml: str) -> str:
+    return re.search(r'fd="([^"]+)"', xml).group(1)
+
+
+def _reads(manager: FileDescriptorManager, fd_id: str, length: int) -> list[str]:
+    total_pages = manager.file_descriptors[fd_id]["total_pages"]
+    total_lines = manager.file_descriptors[fd_id]["total_lines"]
+    results = [manager.read_fd_content(fd_id, read_all=True)]
+    results += [manager.read_fd_content(fd_id, start=p) for p in range(1, total_pages + 1)]
+    results.append(manager.read_fd_content(fd_id, start=1, count=total_pages))
+    results += [manager.read_fd_content(fd_id, mode="line", start=s, count=7) for s in range(1, total_lines + 1, 13)]
+    results += [manager.read_fd_content(fd_id, mode="char", start=s, count=301) for s in range(0, length, 487)]
+    return results
+
+
+@pytest.mark.parametrize("kind", SAMPLES)
+def test_spilled_reads_match_in_memory(kind, tmp_path):
+    content = SAMPLES[kind]
+    memory = FileDescriptorManager(default_page_size=500)
+    disk = FileDescriptorManager(default_page_size=500, spill_threshold_chars=1000)
+
+    memory_id = _fd_id(memory.create_fd_content(content))
+    disk_xml = disk.create_fd_content(content)
+    disk_id = _fd_id(disk_xml)
+
+    entry = disk.file_descriptors[disk_id]
+    assert isinstance(entry["content"], SpilledContent)
+    assert isinstance(entry["lines"], array)
+    assert disk_xml == memory.create_fd_content(content).replace("fd:2", "fd:1")
+    assert _reads(disk, disk_id, len(content)) == _reads(memory, memory_id, len(content))
+
+    memory.write_fd_to_file_content(memory_id, str(tmp_path / "memory.txt"))
+    disk.write_fd_to_file_content(disk_id, str(tmp_path / "disk.txt"))
+    assert (tmp_path / "disk.txt").read_bytes() == (tmp_path / "memory.txt").read_bytes()
+    disk.close()
+
+
+def test_extract_to_new_fd_from_spilled_content():
+    manager = FileDescriptorManager(default_page_size=500, spill_threshold_chars=1000)
+    fd_id = _fd_id(manager.create_fd_content(SAMPLES["bmp"]))
+    result = manager.read_fd_content(fd_id, mode="line", start=10, count=100, extract_to_new_fd=True)
+    new_id = re.search(r'new_fd="([^"]+)"', result).group(1)
+    assert manager.read_fd_content(new_id, read_all=True).count("данные") == 100
+    manager.close()
+
+
+def test_large_references_are_spilled():
+    manager = FileDescriptorManager(enable_references=True, spill_threshold_chars=100)
+    body = "\n".join(f"row {i}" for i in range(100))
+    manager.process_references(f'<ref id="table">{body}</ref>')
+
+    assert manager.spill_store.is_spilled("ref:table")
+    assert body in manager.read_fd_content("ref:table", read_all=True)
+
+    first = manager.spill_store._spilled["ref:table"].path
+    manager.process_references('<ref id="table">short</ref>')
+    assert not first.exists()
+    assert not manager.spill_store.is_spilled("ref:table")
+    manager.close()
+
+
+def test_lru_cap_spills_least_recently_used():
+    content = "y" * 10_000
+    manager = FileDescriptorManager(max_resident_bytes=25_000)
+    fd1 = _fd_id(manager.create_fd_content(content))
+    fd2 = _fd_id(manager.create_fd_content(content))
+    manager.read_fd_content(fd1)  # fd1 is now the most recently used
+    fd3 = _fd_id(manager.create_fd_content(content))
+
+    store = manager.spill_store
+    assert store.is_spilled(fd2)
+    assert not store.is_spilled(fd1)
+    assert not store.is_spilled(fd3)
+    assert store.resident_bytes <= 25_000
+    assert manager.read_fd_content(fd2, read_all=True) == manager.read_fd_content(fd1, read_all=True).replace(fd1, fd2)
+    manager.close()
+
+
+def test_close_removes_spill_files():
+    plugin = FileDescriptorPlugin(FileDescriptorPluginConfig(default_page_size=500, spill_threshold_chars=1000))
+    manager = plugin.fd_manager
+    fd_id = _fd_id(manager.create_fd_content(SAMPLES["ascii"]))
+    path = manager.file_descriptors[fd_id]["content"].path
+    spill_dir = path.parent
+    assert path.exists()
+
+    plugin.process_close()
+    assert not path.exists()
+    assert not spill_dir.exists()
+
+
+def test_spilling_disabled_by_default():
+    manager = FileDescriptorManager(default_page_size=500)
+    fd_id = _fd_id(manager.create_fd_content(SAMPLES["ascii"]))
+    assert isinstance(manager.file_descriptors[fd_id]["content"], str)
+    assert not manager.spill_store.enabled
@@ -1,7 +1,10 @@
 """Tests for Gemini token counting functionality."""
 
+import asyncio
 import os
-from unittest.mock import MagicMock
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 from llmproc.program import LLMProgram
@@ -35,7 +38,7 @@ async def test_gemini_token_counting_api(provider, model_name):
     process = await program.start()
 
     # Get initial token count (just system prompt)
-    initial_tokens = await process.count_tokens()
+    initial_tokens = await process.count_tokens(exact=True)
     assert "input_tokens" in initial_tokens
     assert "context_window" in initial_tokens
     assert "percentage" in initial_tokens
@@ -46,12 +49,12 @@ async def test_gemini_token_counting_api(provider, model_name):
 
     # Add a message and check token count increases
     await process.run("Hello, how are you?")
-    after_message_tokens = await process.count_tokens()
+    after_message_tokens = await process.count_tokens(exact=True)
     assert after_message_tokens["input_tokens"] > initial_tokens["input_tokens"]
 
     # Add a longer message and verify token count increases further
     await process.run("Can you explain how token counting works in Gemini models? I want to understand the mechanism.")
-    final_tokens = await process.count_tokens()
+    final_tokens = await process.count_tokens(exact=True)
     assert final_tokens["input_tokens"] > after_message_tokens["input_tokens"]
 
 
@@ -137,3 +140,55 @@ async def test_gemini_token_counting_fallback():
     assert token_info["context_window"] > 0
     assert "percentage" in token_info
     assert "remaining_tokens" in token_info
+
+
+def _count_process(client):
+    return SimpleNamespace(
+        model_name="gemini-2.0-flash",
+        state=[{"role": "user", "content": "Hello"}],
+        enriched_system_prompt="You are a helpful assistant.",
+        client=client,
+    )
+
+
+async def test_gemini_token_counting_keeps_loop_responsive():
+    """A synchronous count_tokens call must not block other tasks on the loop."""
+    from llmproc.providers.gemini_process_executor import GeminiProcessExecutor
+
+    def slow_count(**kwargs):
+        time.sleep(0.2)
+        return MagicMock(total_tokens=7, cached_content_token_count=0)
+
+    client = MagicMock()
+    client.models.count_tokens.side_effect = slow_count
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    tick_task = asyncio.create_task(ticker())
+    token_info = await GeminiProcessExecutor().count_tokens(_count_process(client))
+    tick_task.cancel()
+
+    assert token_info["input_tokens"] == 7
+    assert ticks >= 5
+
+
+async def test_gemini_token_counting_prefers_async_client():
+    """The ``aio`` surface is used when the client provides it."""
+    from llmproc.providers.gemini_process_executor import GeminiProcessExecutor
+
+    client = MagicMock()
+    client.aio.models.count_tokens = AsyncMock(return_value=MagicMock(total_tokens=11, cached_content_token_count=0))
+
+    token_info = await GeminiProcessExecutor().count_tokens(_count_process(client))
+
+    assert token_info["input_tokens"] == 11
+    assert client.aio.models.count_tokens.await_args.kwargs["config"] == {
+        "system_instruction": "You are a helpful assistant."
+    }
+    client.models.count_tokens.assert_not_called()
@@ -6,7 +6,7 @@ import asyncio
 
 import pytest
 
-from llmproc.common.results import ToolResult
+from llmproc.common.results import RunResult, ToolResult
 from llmproc.llm_process import LLMProcess
 from llmproc.program import LLMProgram
 from llmproc.providers.openai_process_executor import OpenAIProcessExecutor
@@ -112,12 +112,20 @@ class TestOpenAIProcessExecutor:
         executor = OpenAIProcessExecutor()
 
         # Test the run method with exception
-        with pytest.raises(Exception) as excinfo:
+        with (
+            patch.object(RunResult, "add_api_call", autospec=True, side_effect=RunResult.add_api_call) as add_call,
+            pytest.raises(Exception) as excinfo,
+        ):
             result = await executor.run(process, "Test input")
 
         # Check error message
         assert "API error" in str(excinfo.value)
 
+        # The failed call is recorded with its error message
+        run_result = add_call.call_args.args[0]
+        assert run_result.api_call_infos[-1]["error"] == "API error"
+        assert run_result.stop_reason == "error"
+
         # Test passes if the exception was properly handled and re-raised
 
     @pytest.mark.asyncio
@@ -0,0 +1,126 @@
+"""Tests for cached tiktoken encoders and memoized OpenAI token counting."""
+
+import logging
+from types import SimpleNamespace
+
+import pytest
+
+from llmproc.providers import openai_utils
+from llmproc.providers.openai_process_executor import OpenAIProcessExecutor
+from llmproc.providers.openai_utils import get_encoding, num_tokens_from_message_batches, num_tokens_from_messages
+
+
+class FakeEncoding:
+    """One token per whitespace-separated word; records encoded texts."""
+
+    name = "fake"
+
+    def __init__(self):
+        self.encoded = []
+        self.batches = 0
+
+    def encode(self, text, disallowed_special=()):
+        self.encoded.append(text)
+        return text.split()
+
+    def encode_batch(self, texts, disallowed_special=()):
+        self.batches += 1
+        return [self.encode(text) for text in texts]
+
+
+@pytest.fixture
+def encoding(monkeypatch):
+    fake = FakeEncoding()
+    calls = []
+
+    def encoding_for_model(model):
+        calls.append(model)
+        if model == "mystery-model":
+            raise KeyError(model)
+        return fake
+
+    monkeypatch.setattr(openai_utils.tiktoken, "encoding_for_model", encoding_for_model)
+    monkeypatch.setattr(openai_utils.tiktoken, "get_encoding", lambda name: fake)
+    get_encoding.cache_clear()
+    openai_utils._message_token_memo.clear()
+    fake.calls = calls
+    yield fake
+    get_encoding.cache_clear()
+    openai_utils._message_token_memo.clear()
+
+
+def _history(n):
+    return [{"role": "user" if i % 2 == 0 else "assistant", "content": f"message number {i}"} for i in range(n)]
+
+
+def test_encoder_loaded_once_per_model(encoding):
+    for _ in range(5):
+        num_tokens_from_messages(_history(2), model="gpt-4o")
+    assert encoding.calls == ["gpt-4o"]
+
+
+def test_unknown_model_warns_instead_of_printing(encoding, capsys, caplog):
+    with caplog.at_level(logging.WARNING):
+        num_tokens_from_messages(_history(1), model="mystery-model")
+        num_tokens_from_messages(_history(1), model="mystery-model")
+    assert capsys.readouterr().out == ""
+    assert sum("mystery-model" in record.message for record in caplog.records) == 1
+
+
+def test_only_new_messages_are_encoded(encoding):
+    history = _history(20)
+    first = num_tokens_from_messages(history, model="gpt-4o")
+    # role + 3 content words + 3 per message, plus reply priming
+    assert first == 20 * (1 + 3 + 3) + 3
+
+    encoding.encoded.clear()
+    history.append({"role": "user", "content": "one more"})
+    assert num_tokens_from_messages(history, model="gpt-4o") == first + 1 + 2 + 3
+    assert encoding.encoded == ["user", "one more"]
+
+    history[0] = {"role": "user", "content": "edited"}
+    encoding.encoded.clear()
+    num_tokens_from_messages(history, model="gpt-4o")
+    assert encoding.encoded == ["user", "edited"]
+
+
+def test_non_string_fields_are_counted(encoding):
+    message = {"role": "assistant", "content": None, "tool_calls": [{"id": "call_1"}]}
+    assert num_tokens_from_messages([message], model="gpt-4o") > 3
+
+
+@pytest.mark.asyncio
+async def test_batch_counts_processes_sharing_history(encoding):
+    shared = _history(30)
+    processes = [
+        SimpleNamespace(model_name="gpt-4o", enriched_system_prompt="be brief", state=[*shared, extra])
+        for extra in ({"role": "user", "content": "left"}, {"role": "user", "content": "right"})
+    ]
+
+    results = await OpenAIProcessExecutor().count_tokens_batch(processes)
+
+    assert encoding.batches == 1
+    assert len(encoding.encoded) == 2 * (1 + 30 + 2)
+    assert results[0]["input_tokens"] == results[1]["input_tokens"]
+    assert results == [await OpenAIProcessExecutor().count_tokens(process) for process in processes]
+    assert num_tokens_from_message_batches([], model="gpt-4o") == []
+
+
+def test_in_place_edits_are_recounted(encoding):
+    history = _history(3)
+    first = num_tokens_from_messages(history, model="gpt-4o")
+
+    history[1]["content"] = "a much longer reply than before"
+    encoding.encoded.clear()
+    assert num_tokens_from_messages(history, model="gpt-4o") == first + 3
+    assert encoding.encoded == ["assistant", "a much longer reply than before"]
+
+
+def test_memo_does_not_keep_message_text(encoding):
+    output = "tool output " * 1000
+    num_tokens_from_messages([{"role": "tool", "content": output}], model="gpt-4o")
+
+    assert len(openai_utils._message_token_memo) == 1
+    assert all(
+        isinstance(part, str | int) and part != output for key in openai_utils._message_token_memo for part in key
+    )
@@ -0,0 +1,198 @@
+"""Tests for concurrent execution of parallel-safe tool calls."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from llmproc.common.metadata import get_tool_meta
+from llmproc.common.results import RunResult, ToolResult
+from llmproc.config.schema import LLMProgramConfig
+from llmproc.config.tool import ToolConfig
+from llmproc.plugin.plugin_event_runner import PluginEventRunner
+from llmproc.providers.anthropic_process_executor import AnthropicProcessExecutor, IterationState
+from llmproc.providers.openai_process_executor import OpenAIProcessExecutor
+from llmproc.tools.function_tools import register_tool
+from llmproc.tools.tool_scheduler import ToolCallScheduler
+
+DELAY = 0.05
+
+
+class _ToolUse(SimpleNamespace):
+    def __init__(self, name: str, tool_id: str):
+        super().__init__(type="tool_use", name=name, input={}, id=tool_id)
+
+
+async def _blocks(items):
+    for item in items:
+        yield item
+
+
+def _make_process(max_parallel_tools: int, parallel_safe: set[str], log: list):
+    proc = MagicMock()
+    proc.max_parallel_tools = max_parallel_tools
+    proc.tool_manager = SimpleNamespace(is_parallel_safe=lambda name: name in parallel_safe)
+    proc.trigger_event = AsyncMock()
+    proc._submit_to_loop = lambda coro: asyncio.get_running_loop().create_task(coro)
+    proc.plugins = PluginEventRunner(proc._submit_to_loop, [])
+    proc.in_flight = 0
+    proc.max_in_flight = 0
+
+    async def call_tool(name, args):
+        proc.in_flight += 1
+        proc.max_in_flight = max(proc.max_in_flight, proc.in_flight)
+        log.append(f"start:{name}")
+        await asyncio.sleep(DELAY)
+        log.append(f"end:{name}")
+        proc.in_flight -= 1
+        if name == "stop":
+            return ToolResult(content="stop", abort_execution=True)
+        return ToolResult.from_success(f"{name} done")
+
+    proc.call_tool = call_tool
+    return proc
+
+
+async def _stream(proc, names):
+    state = IterationState()
+    blocks = [_ToolUse(name, f"id{i}") for i, name in enumerate(names)]
+    await AnthropicProcessExecutor()._stream_blocks(proc, _blocks(blocks), RunResult(), state)
+    return state
+
+
+@pytest.mark.asyncio
+async def test_parallel_safe_tools_run_concurrently_in_order():
+    log: list[str] = []
+    proc = _make_process(4, {"a", "b", "c"}, log)
+
+    start = asyncio.get_running_loop().time()
+    state = await _stream(proc, ["a", "b", "c"])
+    elapsed = asyncio.get_running_loop().time() - start
+
+    assert proc.max_in_flight == 3
+    assert elapsed < 3 * DELAY
+    assert [r["tool_use_id"] for r in state.tool_results_prefix] == ["id0", "id1", "id2"]
+    assert [r["content"] for r in state.tool_results_prefix] == ["a done", "b done", "c done"]
+
+
+@pytest.mark.asyncio
+async def test_concurrency_limit_is_respected():
+    proc = _make_process(2, {"a", "b", "c", "d"}, [])
+    state = await _stream(proc, ["a", "b", "c", "d"])
+    assert proc.max_in_flight == 2
+    assert len(state.tool_results_prefix) == 4
+
+
+@pytest.mark.asyncio
+async def test_default_runs_tools_serially():
+    proc = _make_process(1, {"a", "b"}, [])
+    state = await _stream(proc, ["a", "b"])
+    assert proc.max_in_flight == 1
+    assert [r["tool_use_id"] for r in state.tool_results_prefix] == ["id0", "id1"]
+
+
+@pytest.mark.asyncio
+async def test_unsafe_tool_waits_for_earlier_calls():
+    log: list[str] = []
+    proc = _make_process(4, {"a", "b"}, log)
+    state = await _stream(proc, ["a", "b", "serial", "a"])
+
+    serial_start = log.index("start:serial")
+    assert {"end:a", "end:b"} <= set(log[:serial_start])
+    assert log[serial_start + 1] == "end:serial"
+    assert [r["tool_use_id"] for r in state.tool_results_prefix] == ["id0", "id1", "id2", "id3"]
+
+
+@pytest.mark.asyncio
+async def test_abort_from_parallel_tool_is_recorded():
+    proc = _make_process(4, {"a", "stop"}, [])
+    state = await _stream(proc, ["a", "stop"])
+    assert state.execution_aborted
+    assert len(state.tool_results_prefix) == 2
+
+
+@pytest.mark.asyncio
+async def test_scheduler_cancels_pending_calls_on_error():
+    cancelled = asyncio.Event()
+
+    async def slow():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def fail():
+        raise RuntimeError("boom")
+
+    scheduler = ToolCallScheduler(SimpleNamespace(is_parallel_safe=lambda name: True), 4)
+    committed = []
+    await scheduler.submit("slow", slow, committed.append)
+    await scheduler.submit("fail", fail, committed.append)
+    with pytest.raises(RuntimeError):
+        await scheduler.flush()
+    await asyncio.wait_for(cancelled.wait(), 1)
+    assert committed == []
+
+
+@pytest.mark.asyncio
+async def test_openai_executor_commits_tool_messages_in_order(monkeypatch):
+    proc = _make_process(4, {"a", "b"}, [])
+    proc.state = []
+    proc.tools = []
+    proc.api_params = {}
+    proc.model_name = "gpt-4o"
+    proc.enriched_system_prompt = None
+
+    calls = [
+        SimpleNamespace(id=f"call{i}", type="function", function=SimpleNamespace(name=name, arguments="{}"))
+        for i, name in enumerate(["a", "b"])
+    ]
+    responses = iter(
+        [
+            SimpleNamespace(
+                choices=[
+                    SimpleNamespace(message=SimpleNamespace(content="", tool_calls=calls), finish_reason="tool_calls")
+                ]
+            ),
+            SimpleNamespace(
+                choices=[
+                    SimpleNamespace(message=SimpleNamespace(content="done", tool_calls=None), finish_reason="stop")
+                ]
+            ),
+        ]
+    )
+
+    async def fake_call(client, kind, params):
+        return next(responses)
+
+    monkeypatch.setattr("llmproc.providers.openai_process_executor.call_with_retry", fake_call)
+    await OpenAIProcessExecutor().run(proc, "go")
+
+    assert proc.max_in_flight == 2
+    tool_messages = [m for m in proc.state if m["role"] == "tool"]
+    assert [m["tool_call_id"] for m in tool_messages] == ["call0", "call1"]
+    assert [m["content"] for m in tool_messages] == ["a done", "b done"]
+
+
+def test_parallel_safe_flag_from_register_tool():
+    @register_tool(parallel_safe=True)
+    async def lookup(key: str) -> str:
+        """Look up a key."""
+        return key
+
+    assert get_tool_meta(lookup).parallel_safe is True
+
+
+def test_parallel_safe_flag_from_tool_config():
+    cfg = ToolConfig(name="search", parallel_safe=True)
+    assert cfg.parallel_safe is True
+    assert "parallel_safe=True" in repr(cfg)
+
+
+def test_max_parallel_tools_config():
+    config = LLMProgramConfig(model={"name": "m", "provider": "anthropic", "max_parallel_tools": 3})
+    assert config.model.max_parallel_tools == 3
+    with pytest.raises(ValueError):
+        LLMProgramConfig(model={"name": "m", "provider": "anthropic", "max_parallel_tools": 0})
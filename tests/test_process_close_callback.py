@@ -0,0 +1,34 @@
+"""Tests for the PROCESS_CLOSE callback event."""
+
+import pytest
+
+from llmproc.plugin.events import CallbackEvent
+from tests.conftest import create_test_llmprocess_directly
+
+
+@pytest.mark.asyncio
+async def test_aclose_triggers_sync_and_async_process_close():
+    closed = []
+
+    class SyncPlugin:
+        def process_close(self, *, process):
+            closed.append(("sync", process))
+
+    class AsyncPlugin:
+        async def process_close(self):
+            closed.append(("async", None))
+
+    class Failing:
+        def process_close(self):
+            raise RuntimeError("boom")
+
+    class LegacyClose:
+        def close(self):
+            closed.append(("legacy", None))
+
+    process = create_test_llmprocess_directly()
+    process.add_plugins(SyncPlugin(), Failing(), AsyncPlugin(), LegacyClose())
+    await process.aclose()
+
+    assert closed == [("sync", process), ("async", None)]
+    assert CallbackEvent.PROCESS_CLOSE.value == "process_close"
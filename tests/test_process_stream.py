@@ -0,0 +1,205 @@
+"""Tests for token-level streaming with LLMProcess.stream()."""
+
+import asyncio
+from types import SimpleNamespace as Ns
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from llmproc.common.stream_events import (
+    InputJsonDelta,
+    RunEnd,
+    StreamCollector,
+    TextDelta,
+    ThinkingDelta,
+    ToolResultEvent,
+    ToolUseStart,
+    TurnEnd,
+    TurnStart,
+)
+from llmproc.program import LLMProgram
+from llmproc.tools.builtin import calculator
+
+CHUNK_DELAY = 0.05
+
+
+async def _chunks(items, delay=0.0):
+    for item in items:
+        await asyncio.sleep(delay)
+        yield item
+
+
+def _anthropic_tool_turn():
+    return [
+        Ns(type="message_start", message=Ns(model="claude", id="msg_1", usage=Ns(input_tokens=12, output_tokens=1))),
+        Ns(type="content_block_start", content_block=Ns(type="thinking", thinking="", signature="")),
+        Ns(type="content_block_delta", delta=Ns(type="thinking_delta", thinking="Need math.")),
+        Ns(type="content_block_delta", delta=Ns(type="signature_delta", signature="sig")),
+        Ns(type="content_block_start", content_block=Ns(type="tool_use", id="tu_1", name="calculator")),
+        Ns(type="content_block_delta", delta=Ns(type="input_json_delta", partial_json='{"expression": ')),
+        Ns(type="content_block_delta", delta=Ns(type="input_json_delta", partial_json='"6*7"}')),
+        Ns(type="message_delta", delta=Ns(stop_reason="tool_use"), usage=Ns(output_tokens=9)),
+    ]
+
+
+def _anthropic_text_turn(delay=0.0):
+    return _chunks(
+        [
+            Ns(type="message_start", message=Ns(model="claude", id="msg_2", usage=Ns(input_tokens=30))),
+            Ns(type="content_block_start", content_block=Ns(type="text", text="")),
+            Ns(type="content_block_delta", delta=Ns(type="text_delta", text="The answer ")),
+            Ns(type="content_block_delta", delta=Ns(type="text_delta", text="is 42.")),
+            Ns(type="message_delta", delta=Ns(stop_reason="end_turn"), usage=Ns(output_tokens=5)),
+        ],
+        delay,
+    )
+
+
+async def _start(client, provider="anthropic", model="claude-3-5-sonnet-20241022"):
+    program = LLMProgram(model_name=model, provider=provider, system_prompt="test", tools=[calculator])
+    with patch("llmproc.program_exec.get_provider_client", return_value=client):
+        return await program.start()
+
+
+@pytest.mark.asyncio
+async def test_anthropic_stream_yields_typed_deltas():
+    client = MagicMock()
+    client.messages.create = AsyncMock(side_effect=[_chunks(_anthropic_tool_turn()), _anthropic_text_turn()])
+    process = await _start(client)
+    blocks = []
+    process.add_plugins(Ns(api_stream_block=lambda block: blocks.append(getattr(block, "type", None))))
+
+    events = [event async for event in process.stream("What is 6*7?")]
+
+    assert [type(e) for e in events] == [
+        TurnStart,
+        ThinkingDelta,
+        ToolUseStart,
+        InputJsonDelta,
+        InputJsonDelta,
+        ToolResultEvent,
+        TurnEnd,
+        TurnStart,
+        TextDelta,
+        TextDelta,
+        TurnEnd,
+        RunEnd,
+    ]
+    assert events[2] == ToolUseStart(id="tu_1", name="calculator", index=1)
+    assert events[5].result.content == "42"
+    assert "".join(e.text for e in events if e.type == "text_delta") == "The answer is 42."
+    assert blocks == ["thinking", "tool_use", None, "text", None]
+
+    run_result = events[-1].run_result
+    assert run_result.api_call_count == 2
+    assert run_result.api_call_infos[0]["usage"].input_tokens == 12
+    assert run_result.api_call_infos[0]["usage"].output_tokens == 9
+    assert process.get_last_message() == "The answer is 42."
+    replayed = client.messages.create.await_args_list[1].kwargs["messages"][1]["content"][0]
+    assert replayed == {"type": "thinking", "thinking": "Need math.", "signature": "sig"}
+    assert all(call.kwargs["stream"] for call in client.messages.create.await_args_list)
+    assert process._stream_queue is None
+    assert process.get_plugin(StreamCollector) is None
+
+
+@pytest.mark.asyncio
+async def test_first_token_arrives_before_stream_completes():
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value=_anthropic_text_turn(CHUNK_DELAY))
+    process = await _start(client)
+
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    first_token = None
+    async for event in process.stream("Hi"):
+        if event.type == "text_delta" and first_token is None:
+            first_token = loop.time() - start
+    total = loop.time() - start
+
+    assert first_token < total - CHUNK_DELAY
+
+
+@pytest.mark.asyncio
+async def test_closing_stream_cancels_run():
+    client = MagicMock()
+    client.messages.create = AsyncMock(side_effect=[_anthropic_text_turn(CHUNK_DELAY), _anthropic_text_turn()])
+    process = await _start(client)
+
+    stream = process.stream("Hi")
+    async for event in stream:
+        if event.type == "text_delta":
+            break
+    await stream.aclose()
+
+    assert process._stream_queue is None
+    events = [event async for event in process.stream("Again")]
+    assert events[-1].type == "run_end"
+
+
+@pytest.mark.asyncio
+async def test_run_without_stream_keeps_non_streaming_call(monkeypatch):
+    monkeypatch.delenv("LLMPROC_USE_STREAMING", raising=False)
+    client = MagicMock()
+    client.messages.create = AsyncMock(
+        return_value=Ns(content=[Ns(type="text", text="hi")], stop_reason="end_turn", id="m", usage=Ns())
+    )
+    process = await _start(client)
+    await process.run("Hi")
+    assert "stream" not in client.messages.create.await_args.kwargs
+
+
+@pytest.mark.asyncio
+async def test_openai_chat_stream_assembles_response():
+    def chunk(content=None, tool_calls=None, finish=None, usage=None):
+        choices = [] if usage else [Ns(delta=Ns(content=content, tool_calls=tool_calls), finish_reason=finish)]
+        return Ns(id="c1", model="gpt-4o", choices=choices, usage=usage)
+
+    def call_delta(id=None, name=None, args=None):
+        return Ns(index=0, id=id, function=Ns(name=name, arguments=args))
+
+    tool_turn = [
+        chunk(tool_calls=[call_delta(id="call_1", name="calculator", args="")]),
+        chunk(tool_calls=[call_delta(args='{"expression":')]),
+        chunk(tool_calls=[call_delta(args=' "2+2"}')]),
+        chunk(finish="tool_calls"),
+        chunk(usage=Ns(prompt_tokens=5, completion_tokens=3)),
+    ]
+    text_turn = [chunk(content="Four"), chunk(content="."), chunk(finish="stop")]
+    client = MagicMock()
+    client.chat.completions.create = AsyncMock(side_effect=[_chunks(tool_turn), _chunks(text_turn)])
+    process = await _start(client, provider="openai", model="gpt-4o")
+
+    events = [event async for event in process.stream("2+2?")]
+
+    assert events[1] == ToolUseStart(id="call_1", name="calculator", index=1)
+    assert "".join(e.partial_json for e in events if e.type == "input_json_delta") == '{"expression": "2+2"}'
+    assert next(e for e in events if e.type == "tool_result").result.content == "4"
+    assert [e.text for e in events if e.type == "text_delta"] == ["Four", "."]
+    assert events[-1].run_result.api_call_infos[0]["usage"].prompt_tokens == 5
+    assert process.state[1]["tool_calls"][0]["function"]["arguments"] == '{"expression": "2+2"}'
+    assert process.get_last_message() == "Four."
+    assert client.chat.completions.create.await_args.kwargs["stream_options"] == {"include_usage": True}
+
+
+@pytest.mark.asyncio
+async def test_gemini_stream_forwards_parts():
+    def chunk(*parts):
+        return Ns(candidates=[Ns(content=Ns(parts=list(parts)))], usage_metadata=None)
+
+    client = MagicMock()
+    client.aio.models.generate_content_stream = AsyncMock(
+        return_value=_chunks(
+            [
+                chunk(Ns(text="Thinking", thought=True, function_call=None)),
+                chunk(Ns(text="Hello ", thought=False, function_call=None)),
+                chunk(Ns(text="there", thought=None, function_call=None)),
+            ]
+        )
+    )
+    process = await _start(client, provider="gemini", model="gemini-2.0-flash")
+
+    events = [event async for event in process.stream("Hi")]
+
+    assert [type(e) for e in events] == [TurnStart, ThinkingDelta, TextDelta, TextDelta, TurnEnd, RunEnd]
+    assert process.get_last_message() == "Hello there"
+    client.aio.models.generate_content.assert_not_called()
@@ -0,0 +1,137 @@
+"""Tests for the per-program process template used by create_process."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from llmproc.config.mcp import MCPServerTools
+from llmproc.program import LLMProgram
+from llmproc.providers.client_registry import provider_clients
+from llmproc.tools.builtin import calculator, read_file
+from llmproc.tools.mcp import MCPAggregator
+
+MCP_STARTUP = 0.02
+
+
+async def _slow_initialize(self, descriptors, config=None):
+    """Stand-in for MCP server start-up and tool listing."""
+    await asyncio.sleep(MCP_STARTUP)
+    return []
+
+
+@pytest.fixture
+def mocked_startup():
+    with (
+        patch(
+            "llmproc.program_exec.get_provider_client", side_effect=lambda *a, **k: MagicMock(close=AsyncMock())
+        ) as get_client,
+        patch.object(MCPAggregator, "initialize", _slow_initialize),
+        patch.object(MCPAggregator, "close_clients", new_callable=AsyncMock) as close_clients,
+    ):
+        yield get_client, close_clients
+
+
+def echo(text: str) -> str:
+    """Return ``text`` unchanged."""
+    return text
+
+
+def _program() -> LLMProgram:
+    return LLMProgram(
+        model_name="claude-3-5-sonnet-20241022",
+        provider="anthropic",
+        system_prompt="You are a test assistant.",
+        mcp_servers={"calc": {"type": "stdio", "command": "calc", "args": ["serve"]}},
+        tools=[calculator, read_file, MCPServerTools("calc")],
+    )
+
+
+@pytest.mark.asyncio
+async def test_forks_are_stamped_from_template(mocked_startup):
+    get_client, _ = mocked_startup
+    program = _program()
+    root = await program.start()
+    children = [await root._fork_process() for _ in range(3)]
+
+    assert get_client.call_count == 1
+    for child in children:
+        assert child.client is root.client
+        assert child.tool_manager is not root.tool_manager
+        assert child.tool_manager.mcp_aggregator is root.tool_manager.mcp_aggregator
+        assert child.tool_manager.registered_tools == root.tool_manager.registered_tools
+        assert child.tool_manager.runtime_context["process"] is child
+        assert child.api_params is not root.api_params
+
+
+@pytest.mark.asyncio
+async def test_template_invalidated_when_program_changes(mocked_startup):
+    program = _program()
+    await program.start()
+    template = vars(program)["_process_template"]
+    await program.start()
+    assert vars(program)["_process_template"] is template
+
+    program.register_tools([echo])
+    process = await program.start()
+    assert vars(program)["_process_template"] is not template
+    assert "echo" in process.tool_manager.registered_tools
+
+    template = vars(program)["_process_template"]
+    program.system_prompt = "Changed"
+    process = await program.start()
+    assert vars(program)["_process_template"] is not template
+    assert process.base_system_prompt == "Changed"
+
+
+@pytest.mark.asyncio
+async def test_shared_mcp_clients_closed_by_last_process(mocked_startup):
+    _, close_clients = mocked_startup
+    program = _program()
+    root = await program.start()
+    child = await root._fork_process()
+
+    await root.aclose()
+    close_clients.assert_not_awaited()
+    await root.aclose()
+    close_clients.assert_not_awaited()
+
+    await child.aclose()
+    close_clients.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_repeated_aclose_keeps_child_client_open(mocked_startup):
+    program = _program()
+    root = await program.start()
+    child = await root._fork_process()
+    assert provider_clients.refcount(child.client) == 2
+
+    await root.aclose()
+    await root.aclose()
+    assert provider_clients.refcount(child.client) == 1
+    child.client.close.assert_not_awaited()
+
+    await child.aclose()
+    child.client.close.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_fork_of_ten_skips_startup(mocked_startup):
+    """Forks made from the template skip MCP start-up and share one client."""
+    get_client, _ = mocked_startup
+    program = _program()
+    with patch.object(MCPAggregator, "initialize", autospec=True, side_effect=_slow_initialize) as initialize:
+        root = await program.start()
+        for _ in range(10):
+            vars(program).pop("_process_template")  # force the full creation path
+            await root._fork_process()
+        assert initialize.call_count == 11
+
+        await program.start()  # make sure the template exists
+        initialize.reset_mock()
+        children = [await root._fork_process() for _ in range(10)]
+        assert initialize.call_count == 0
+
+    assert get_client.call_count == 1
+    assert all(child.client is root.client for child in children)
@@ -12,8 +12,8 @@ import pytest
 
 from llmproc import LLMProgram
 from llmproc.common.results import RunResult
+from llmproc.providers.anthropic_cache import CacheBreakpointPlanner
 from llmproc.providers.anthropic_utils import (
-    apply_cache_control,
     format_state_to_api_messages,
     format_system_prompt,
     is_cacheable_content,
@@ -238,33 +238,30 @@ def test_format_system_prompt():
     assert "cache_control" not in list_result[0]
 
 
-def test_apply_cache_control():
-    """Test apply_cache_control function."""
+def test_cache_planner_marks_copies():
+    """Test CacheBreakpointPlanner.apply marks copies of its inputs."""
     # Arrange
     messages = [
         {"role": "user", "content": [{"type": "text", "text": "Hello"}]},
         {"role": "assistant", "content": [{"type": "text", "text": "Hi there!"}]},
         {"role": "user", "content": [{"type": "text", "text": "How are you?"}]},
     ]
-    system = [{"type": "text", "text": "You are a helpful assistant."}]
+    system = [{"type": "text", "text": "You are a helpful assistant. " * 200}]
     tools = [{"name": "calculator", "description": "A calculator tool"}]
 
     # Act
-    from llmproc.providers.anthropic_utils import apply_cache_control
-
-    cached_messages, cached_system, cached_tools = apply_cache_control(messages, system, tools)
+    cached_messages, cached_system, cached_tools = CacheBreakpointPlanner(ttl="5m").apply(messages, system, tools)
 
     # Assert
     # Verify system prompt has cache control
-    assert "cache_control" in cached_system[0]
     assert cached_system[0]["cache_control"] == {"type": "ephemeral"}
 
-    # Verify last 3 messages have cache control
+    # Verify the last message and the anchor at the start have cache control
     assert "cache_control" in cached_messages[0]["content"][0]
-    assert "cache_control" in cached_messages[1]["content"][0]
+    assert "cache_control" not in cached_messages[1]["content"][0]
     assert "cache_control" in cached_messages[2]["content"][0]
 
-    # Verify tools don't have cache control
+    # Verify tools below the minimum cacheable length don't have cache control
     assert "cache_control" not in cached_tools[0]
 
     # Verify original messages/system are not modified
@@ -0,0 +1,98 @@
+"""Tests for shared, reference-counted provider clients."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from llmproc.program import LLMProgram
+from llmproc.providers import get_provider_client
+from llmproc.providers.client_registry import ProviderClientRegistry
+
+
+def _factory():
+    return MagicMock(side_effect=lambda *a, **k: MagicMock(close=AsyncMock()))
+
+
+@pytest.mark.asyncio
+async def test_clients_shared_per_key(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key-a")
+    registry = ProviderClientRegistry()
+    factory = _factory()
+
+    first = registry.acquire("anthropic", factory=factory)
+    assert registry.acquire("anthropic", factory=factory) is first
+    assert registry.acquire("anthropic", connection_pool={"max_connections": 5}, factory=factory) is not first
+
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "key-b")
+    assert registry.acquire("anthropic", factory=factory) is not first
+    assert factory.call_count == 3
+    assert registry.refcount(first) == 2
+
+
+def test_clients_not_shared_outside_event_loop():
+    registry = ProviderClientRegistry()
+    factory = _factory()
+    assert registry.acquire("anthropic", factory=factory) is not registry.acquire("anthropic", factory=factory)
+    assert registry.refcount(factory.side_effect()) == 0
+
+
+@pytest.mark.asyncio
+async def test_client_closed_by_last_release():
+    registry = ProviderClientRegistry()
+    factory = _factory()
+    client = registry.acquire("openai", factory=factory)
+    assert registry.retain(client)
+
+    await registry.release(client)
+    client.close.assert_not_awaited()
+    await registry.release(client)
+    client.close.assert_awaited_once()
+
+    assert not registry.retain(client)
+    assert registry.acquire("openai", factory=factory) is not client
+
+
+def test_connection_pool_limits_applied(monkeypatch):
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "test-key")
+    client = get_provider_client(
+        "anthropic", connection_pool={"max_connections": 8, "max_keepalive_connections": 4, "keepalive_expiry": 30}
+    )
+    pool = client._client._transport._pool
+    assert pool._max_connections == 8
+    assert pool._max_keepalive_connections == 4
+    assert pool._keepalive_expiry == 30
+
+
+def test_connection_pool_loaded_from_config():
+    program = LLMProgram.from_dict(
+        {
+            "model": {
+                "name": "claude-3-5-sonnet-20241022",
+                "provider": "anthropic",
+                "connection_pool": {"max_connections": 16},
+            },
+            "prompt": {"system": "test"},
+        }
+    )
+    assert program.connection_pool == {"max_connections": 16}
+    program.set_connection_pool(max_keepalive_connections=2)
+    assert program.connection_pool == {"max_keepalive_connections": 2}
+
+
+@pytest.mark.asyncio
+async def test_forked_children_reuse_root_client():
+    client = MagicMock(close=AsyncMock())
+    with patch("llmproc.program_exec.get_provider_client", return_value=client) as factory:
+        program = LLMProgram(model_name="claude-3-5-sonnet-20241022", provider="anthropic", system_prompt="test")
+        root = await program.start()
+        children = [await root._fork_process() for _ in range(3)]
+        spawned = await program.start()
+
+    assert factory.call_count == 1
+    assert all(child.client is root.client for child in [*children, spawned])
+
+    for process in [root, *children]:
+        await process.aclose()
+    client.close.assert_not_awaited()
+    await spawned.aclose()
+    client.close.assert_awaited_once()
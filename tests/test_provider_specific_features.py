@@ -13,8 +13,8 @@ from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from llmproc.providers.anthropic_process_executor import AnthropicProcessExecutor
+from llmproc.providers.anthropic_cache import CacheBreakpointPlanner
 from llmproc.providers.anthropic_utils import (
-    apply_cache_control,
     format_system_prompt,
     prepare_api_request,
 )
@@ -147,13 +147,13 @@ class TestProviderSpecificUnitTests:
     def test_system_prompt_format_and_cache(self):
         """Test formatting system prompt and applying cache."""
         # Arrange
-        system_prompt = "You are a helpful assistant."
+        system_prompt = "You are a helpful assistant. " * 200
 
         # Format the system prompt
         formatted = format_system_prompt(system_prompt)
 
         # Apply cache
-        _, cached_system, _ = apply_cache_control([], formatted)
+        _, cached_system, _ = CacheBreakpointPlanner(ttl="5m").apply([], formatted, None)
 
         # Assert - Check system prompt with cache
         assert isinstance(cached_system, list)
@@ -1,12 +1,13 @@
 """Tests for the providers module."""
 
 import os
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import pytest
 
 from llmproc.providers import get_provider_client
 from llmproc.providers.constants import PROVIDER_GEMINI, PROVIDER_GEMINI_VERTEX
+from llmproc.providers.rate_limit import observe_response
 
 
 @pytest.fixture
@@ -32,7 +33,8 @@ def test_get_openai_provider(mock_openai, mock_env):
 
     client = get_provider_client("openai")
 
-    mock_openai.assert_called_once_with(api_key="test-openai-key")
+    mock_openai.assert_called_once_with(api_key="test-openai-key", http_client=ANY)
+    assert mock_openai.call_args.kwargs["http_client"].event_hooks["response"] == [observe_response]
     assert client == mock_client
 
 
@@ -58,7 +60,8 @@ def test_get_anthropic_provider(mock_anthropic, mock_env):
 
     client = get_provider_client("anthropic")
 
-    mock_anthropic.assert_called_once_with(api_key="test-anthropic-key")
+    mock_anthropic.assert_called_once_with(api_key="test-anthropic-key", http_client=ANY)
+    assert mock_anthropic.call_args.kwargs["http_client"].event_hooks["response"] == [observe_response]
     assert client == mock_client
 
 
@@ -77,7 +80,7 @@ def test_get_anthropic_provider_haiku(mock_anthropic, mock_env):
 
     client = get_provider_client("anthropic")
 
-    mock_anthropic.assert_called_once_with(api_key="test-anthropic-key")
+    mock_anthropic.assert_called_once_with(api_key="test-anthropic-key", http_client=ANY)
     assert client == mock_client
 
 
@@ -93,7 +96,7 @@ def test_get_anthropic_provider_with_params(mock_anthropic, mock_env):
         region="europe-west4",
     )
 
-    mock_anthropic.assert_called_once_with(api_key="test-anthropic-key")
+    mock_anthropic.assert_called_once_with(api_key="test-anthropic-key", http_client=ANY)
     assert client == mock_client
 
 
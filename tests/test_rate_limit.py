@@ -0,0 +1,179 @@
+"""Tests for the shared client-side rate limiter."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
+import openai
+import pytest
+
+from llmproc.providers.openai_utils import call_with_retry
+from llmproc.providers.providers import get_provider_client
+from llmproc.providers.rate_limit import (
+    RateLimiter,
+    configure_rate_limit,
+    get_rate_limiter,
+    rate_limited,
+    reset_rate_limiters,
+    retry_after_seconds,
+)
+from llmproc.providers.utils import async_retry
+
+MODEL = "test-model"
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture(autouse=True)
+def fresh_limiters(monkeypatch):
+    for name in ("LLMPROC_RATE_LIMIT", "LLMPROC_RATE_LIMIT_RPM", "LLMPROC_RATE_LIMIT_TPM"):
+        monkeypatch.delenv(name, raising=False)
+    reset_rate_limiters()
+    yield
+    reset_rate_limiters()
+
+
+def _process(**extra):
+    return SimpleNamespace(provider="anthropic", model_name=MODEL, **extra)
+
+
+def test_buckets_space_requests_and_tokens():
+    clock = FakeClock()
+    limiter = RateLimiter(rpm=2, tpm=1200, clock=clock)
+
+    assert limiter.reserve(100) == 0
+    assert limiter.reserve(100) == 0
+    assert limiter.reserve(100) == pytest.approx(30)  # third request waits for half a minute
+
+    limiter = RateLimiter(tpm=1200, clock=clock)
+    assert limiter.reserve(1000) == 0
+    assert limiter.reserve(600) == pytest.approx(20)  # 400 tokens short at 20 tokens/s
+
+
+def test_unknown_limits_admit_everything():
+    limiter = RateLimiter()
+    assert all(limiter.reserve(10**6) == 0 for _ in range(1000))
+
+
+def test_limits_learned_from_headers():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.observe_headers(
+        {
+            "anthropic-ratelimit-requests-limit": "50",
+            "anthropic-ratelimit-requests-remaining": "0",
+            "anthropic-ratelimit-input-tokens-limit": "40000",
+            "anthropic-ratelimit-input-tokens-remaining": "39000",
+        }
+    )
+    assert limiter.limits_tokens
+    assert limiter.reserve(1000) == pytest.approx(60 / 50)
+
+    limiter.observe_headers({"x-ratelimit-limit-requests": "100", "x-ratelimit-remaining-tokens": "10"})
+    assert limiter.requests.capacity == 100
+    assert limiter.tokens.level <= 10
+
+
+def test_retry_after_parsing():
+    assert retry_after_seconds({"retry-after": "3"}) == 3
+    assert retry_after_seconds({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+    assert retry_after_seconds({"retry-after": "Wed, 21 Oct 2015 07:28:00 GMT"}) == 0
+    assert retry_after_seconds({"retry-after": "soon"}) is None
+    assert retry_after_seconds(None) is None
+
+
+def test_one_limiter_per_model_for_all_processes(monkeypatch):
+    monkeypatch.setenv("LLMPROC_RATE_LIMIT_RPM", "10")
+    limiter = get_rate_limiter("anthropic", MODEL)
+    assert limiter is get_rate_limiter("anthropic", MODEL)
+    assert limiter is not get_rate_limiter("anthropic", "other-model")
+    assert limiter.requests.capacity == 10
+    assert configure_rate_limit("anthropic", MODEL, tpm=5000) is limiter
+    assert limiter.limits_tokens
+
+
+@pytest.mark.asyncio
+async def test_admission_charges_estimated_prompt_tokens():
+    limiter = configure_rate_limit("anthropic", MODEL, tpm=6000)
+    ledger = SimpleNamespace(count=lambda process: 4000)
+
+    async with rate_limited(_process(token_ledger=ledger)):
+        pass
+
+    assert limiter.tokens.level == pytest.approx(2000, abs=1)
+
+
+@pytest.mark.asyncio
+async def test_rate_limited_is_noop_when_disabled(monkeypatch):
+    monkeypatch.setenv("LLMPROC_RATE_LIMIT", "false")
+    limiter = configure_rate_limit("anthropic", MODEL, rpm=1)
+    for _ in range(3):
+        async with rate_limited(_process()):
+            pass
+    assert limiter.requests.level == 1
+
+
+@pytest.mark.asyncio
+async def test_headers_and_retry_after_from_sdk_responses(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock(side_effect=sleeps.append))
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        headers = {"x-ratelimit-limit-requests": "1000", "x-ratelimit-remaining-requests": "998"}
+        if calls == 1:
+            error = {"error": {"type": "rate_limit_error", "message": "slow down"}}
+            return httpx.Response(429, json=error, headers={**headers, "retry-after": "7"})
+        completion = {
+            "id": "chatcmpl-1",
+            "object": "chat.completion",
+            "created": 0,
+            "model": MODEL,
+            "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "hi"}}],
+        }
+        return httpx.Response(200, json=completion, headers=headers)
+
+    class MockHttpxClient(openai.DefaultAsyncHttpxClient):
+        def __init__(self, **kwargs):
+            super().__init__(transport=httpx.MockTransport(handler), **kwargs)
+
+    monkeypatch.setattr(openai, "DefaultAsyncHttpxClient", MockHttpxClient)
+    monkeypatch.setenv("OPENAI_API_KEY", "test")
+    client = get_provider_client("openai").with_options(max_retries=0)
+    limiter = get_rate_limiter("openai", MODEL)
+
+    async with rate_limited(SimpleNamespace(provider="openai", model_name=MODEL)):
+        response = await call_with_retry(client, "chat", {"model": MODEL, "messages": []})
+
+    assert response.choices[0].message.content == "hi"
+    assert calls == 2
+    assert limiter.requests.capacity == 1000
+    assert sleeps[0] >= 7  # retry-after is honoured by the backoff
+    assert limiter._paused_until > limiter._clock()  # and holds back every caller of the model
+
+
+@pytest.mark.asyncio
+async def test_backoff_is_jittered(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr(asyncio, "sleep", AsyncMock(side_effect=sleeps.append))
+    monkeypatch.setenv("LLMPROC_RETRY_INITIAL_WAIT", "8")
+    monkeypatch.setenv("LLMPROC_RETRY_MAX_ATTEMPTS", "2")
+
+    async def fail():
+        raise ConnectionError("down")
+
+    for _ in range(20):
+        with pytest.raises(ConnectionError):
+            await async_retry(fail, (ConnectionError,), "test", SimpleNamespace(warning=lambda *_: None))
+
+    assert all(4 <= delay <= 8 for delay in sleeps)
+    assert len(set(sleeps)) > 1
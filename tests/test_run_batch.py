@@ -0,0 +1,214 @@
+"""Tests for LLMProgram.run_batch and the process pool."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from llmproc.process_pool import ProcessPool
+from llmproc.program import LLMProgram
+
+API_LATENCY = 0.01
+
+
+def _client(fail_on=None):
+    in_flight = 0
+    peak = 0
+
+    async def create(**request):
+        nonlocal in_flight, peak
+        prompt = request["messages"][-1]["content"][-1]["text"]
+        in_flight += 1
+        peak = max(peak, in_flight)
+        try:
+            await asyncio.sleep(API_LATENCY)
+        finally:
+            in_flight -= 1
+        if prompt == fail_on:
+            raise RuntimeError("boom")
+        return SimpleNamespace(
+            content=[SimpleNamespace(type="text", text=f"echo {prompt}")],
+            stop_reason="end_turn",
+            usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+        )
+
+    client = MagicMock(close=AsyncMock())
+    client.messages.create = AsyncMock(side_effect=create)
+    client.peak = lambda: peak
+    return client
+
+
+@pytest.fixture
+def program(monkeypatch):
+    monkeypatch.delenv("LLMPROC_USE_STREAMING", raising=False)
+    return LLMProgram(model_name="claude-3-5-sonnet-20241022", provider="anthropic", system_prompt="test")
+
+
+@pytest.mark.asyncio
+async def test_results_stream_back_with_bounded_pool(program):
+    client = _client()
+    prompts = [f"p{i}" for i in range(40)]
+    with (
+        patch("llmproc.program_exec.get_provider_client", return_value=client) as factory,
+        patch.object(ProcessPool, "release", autospec=True, side_effect=ProcessPool.release) as release,
+    ):
+        results = [item async for item in program.run_batch(iter(prompts), concurrency=5)]
+
+    assert sorted(r.index for r in results) == list(range(40))
+    assert all(r.ok and r.response == f"echo {r.prompt}" for r in results)
+    assert client.peak() == 5
+    assert factory.call_count == 1
+    assert release.call_count == 40
+    assert len({id(call.args[1]) for call in release.call_args_list}) == 5
+    assert client.close.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_prompt_is_reported_and_process_replaced(program):
+    client = _client(fail_on="p3")
+    with patch("llmproc.program_exec.get_provider_client", return_value=client):
+        results = {r.index: r async for r in program.run_batch([f"p{i}" for i in range(8)], concurrency=2)}
+
+    assert not results[3].ok and str(results[3].error) == "boom"
+    assert results[3].run_result is None
+    assert all(results[i].ok for i in range(8) if i != 3)
+
+
+@pytest.mark.asyncio
+async def test_closing_iterator_cancels_in_flight_prompts(program):
+    client = _client()
+    with patch("llmproc.program_exec.get_provider_client", return_value=client):
+        batch = program.run_batch([f"p{i}" for i in range(100)], concurrency=4)
+        async for _ in batch:
+            break
+        await batch.aclose()
+
+    assert client.messages.create.await_count < 100
+    assert client.close.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_large_batch_starts_only_concurrency_processes(program):
+    prompts = [f"p{i}" for i in range(200)]
+    client = _client()
+    with (
+        patch("llmproc.program_exec.get_provider_client", return_value=client) as factory,
+        patch.object(LLMProgram, "start", autospec=True, side_effect=LLMProgram.start) as start,
+    ):
+        results = [r async for r in program.run_batch(prompts, concurrency=20)]
+
+    assert len(results) == len(prompts) and all(r.ok for r in results)
+    assert start.call_count == 20
+    assert factory.call_count == 1
+    assert client.peak() == 20
+    assert client.messages.create.await_count == len(prompts)
+
+
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_run_batch_throughput_benchmark(program):
+    """Report prompts/sec for run_batch vs. start() + run() per prompt."""
+    prompts = [f"p{i}" for i in range(200)]
+    semaphore = asyncio.Semaphore(20)
+
+    async def one(prompt):
+        async with semaphore:
+            process = await program.start()
+            await process.run(prompt)
+            await process.aclose()
+
+    with patch("llmproc.program_exec.get_provider_client", return_value=_client()):
+        start = time.perf_counter()
+        await asyncio.gather(*(one(p) for p in prompts))
+        naive = time.perf_counter() - start
+
+        start = time.perf_counter()
+        async for _ in program.run_batch(prompts, concurrency=20):
+            pass
+        pooled = time.perf_counter() - start
+
+    print(
+        f"\n{len(prompts)} prompts, concurrency 20: start()/run() {len(prompts) / naive:.0f} prompts/s, "
+        f"run_batch {len(prompts) / pooled:.0f} prompts/s"
+    )
+
+
+class PromptLog:
+    """Plugin that remembers every prompt its process has seen."""
+
+    instances = []
+
+    def __init__(self):
+        self.prompts = []
+        self.closed = False
+        PromptLog.instances.append(self)
+
+    def fork(self):
+        return PromptLog()
+
+    def hook_user_input(self, user_input, process):
+        self.prompts.append(user_input)
+
+    def process_close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_plugin_state_does_not_leak_between_prompts(program):
+    PromptLog.instances = []
+    template = PromptLog()
+    program.add_plugins(template)
+    client = _client()
+    with patch("llmproc.program_exec.get_provider_client", return_value=client):
+        results = [r async for r in program.run_batch([f"p{i}" for i in range(6)], concurrency=2)]
+
+    assert all(r.ok for r in results)
+    used = [plugin for plugin in PromptLog.instances if plugin.prompts]
+    assert len(used) == 6
+    assert all(len(plugin.prompts) == 1 and plugin.closed for plugin in used)
+    assert template.prompts == [] and not template.closed
+
+
+def big_output() -> str:
+    """Return a result too large to inline."""
+    return "x" * 500
+
+
+def _fd_client(reads):
+    async def create(**request):
+        last = request["messages"][-1]["content"]
+        result = next((b for b in last if isinstance(b, dict) and b.get("type") == "tool_result"), None)
+        if result is None:
+            block = SimpleNamespace(type="tool_use", id="big", name="big_output", input={})
+        elif result["tool_use_id"] == "big":
+            block = SimpleNamespace(type="tool_use", id="read", name="read_fd", input={"fd": "fd:1"})
+        else:
+            reads.append(str(result["content"]))
+            block = SimpleNamespace(type="text", text="done")
+        return SimpleNamespace(
+            content=[block],
+            stop_reason="tool_use" if block.type == "tool_use" else "end_turn",
+            usage=SimpleNamespace(input_tokens=10, output_tokens=2),
+        )
+
+    client = MagicMock(close=AsyncMock())
+    client.messages.create = AsyncMock(side_effect=create)
+    return client
+
+
+@pytest.mark.asyncio
+async def test_pooled_processes_read_their_own_file_descriptors(program):
+    from llmproc.config.schema import FileDescriptorPluginConfig
+    from llmproc.plugins.file_descriptor import FileDescriptorPlugin
+
+    program.register_tools([big_output])
+    program.add_plugins(FileDescriptorPlugin(FileDescriptorPluginConfig(max_direct_output_chars=100)))
+    reads = []
+    with patch("llmproc.program_exec.get_provider_client", return_value=_fd_client(reads)):
+        results = [r async for r in program.run_batch([f"p{i}" for i in range(4)], concurrency=2)]
+
+    assert all(r.ok and r.response == "done" for r in results)
+    assert len(reads) == 4
+    assert all("x" * 100 in read and "not found" not in read for read in reads)
@@ -1,8 +1,16 @@
-"""Tests for the RunResult.usd_cost property."""
+"""Tests for RunResult cost totals and per-call telemetry."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
 
 import pytest
 
-from llmproc.common.results import RunResult
+from llmproc.common.results import ApiCallRecord, RunResult, ToolResult
+from llmproc.common.token_ledger import TokenLedger
+from llmproc.plugin.plugin_event_runner import PluginEventRunner
+from llmproc.providers import anthropic_process_executor
+from llmproc.providers.anthropic_process_executor import AnthropicProcessExecutor
 
 
 def test_usd_cost_basic_calculation():
@@ -23,3 +31,87 @@ def test_usd_cost_ignores_unknown_models():
     result = RunResult()
     result.add_api_call({"model": "unknown-model", "usage": {"input_tokens": 10}})
     assert result.usd_cost == 0.0
+
+
+def test_usd_cost_is_a_running_total():
+    """Cost is accumulated as calls are recorded, not rescanned on access."""
+    result = RunResult()
+    for _ in range(3):
+        result.add_api_call({"model": "claude-sonnet-4", "usage": {"input_tokens": 1000}})
+    result.api_call_infos.clear()
+    assert result.usd_cost == pytest.approx(3 * 1000 * 3.0 / 1_000_000)
+
+
+def test_api_calls_are_compact_records():
+    """Calls are stored as slotted records that still read like dictionaries."""
+    result = RunResult()
+    result.add_api_call({"model": "claude-sonnet-4", "usage": {"input_tokens": 5}, "id": "msg_1", "latency_ms": 12})
+
+    record = result.api_call_infos[0]
+    assert isinstance(record, ApiCallRecord)
+    assert not hasattr(record, "__dict__")
+    assert record["model"] == "claude-sonnet-4"
+    assert record.get("latency_ms") == 12
+    assert record.get("missing") is None
+    assert dict(record)["id"] == "msg_1"
+
+
+def test_failed_call_keeps_its_error():
+    """An error recorded as an API call keeps its message and costs nothing."""
+    result = RunResult()
+    result.add_api_call({"type": "error", "error": "rate limited"})
+
+    record = result.api_call_infos[0]
+    assert record["error"] == "rate limited"
+    assert dict(record)["error"] == "rate limited"
+    assert result.usd_cost == 0
+
+
+def test_raw_payloads_are_capped():
+    """Only the most recent calls keep their raw request and response."""
+    result = RunResult(raw_call_limit=2)
+    for i in range(5):
+        result.add_api_call({"model": "m", "usage": {}, "request": {"messages": [i]}, "response": i})
+
+    assert [info["response"] for info in result.api_call_infos] == [None, None, None, 3, 4]
+    assert result.api_call_infos[0]["request"] is None
+    assert result.api_call_count == 5
+
+
+@pytest.mark.parametrize(("value", "expected"), [("0", 0), ("all", None), ("-1", None), ("abc", 1), ("", 1)])
+def test_raw_call_limit_from_environment(monkeypatch, value, expected):
+    """LLMPROC_RAW_API_CALLS sets how many raw payloads a run keeps."""
+    monkeypatch.setenv("LLMPROC_RAW_API_CALLS", value)
+    assert RunResult().raw_call_limit == expected
+
+
+@pytest.mark.asyncio
+async def test_latency_excludes_tool_execution(monkeypatch):
+    """The latency of a call stops at the end of its stream, not after its tools."""
+    monkeypatch.setenv("LLMPROC_DISABLE_AUTOMATIC_CACHING", "true")
+    clock = SimpleNamespace(now=100.0)
+    monkeypatch.setattr(anthropic_process_executor, "time", SimpleNamespace(monotonic=lambda: clock.now))
+
+    async def blocks():
+        clock.now += 0.25
+        yield SimpleNamespace(type="tool_use", name="slow", input={}, id="t1")
+        clock.now += 0.25
+        yield SimpleNamespace(type="message", content=[], stop_reason="tool_use", id="msg_1", usage={})
+
+    async def call_tool(name, args):
+        await asyncio.sleep(0.01)  # let the stream finish while the tool runs
+        clock.now += 30.0
+        return ToolResult.from_success("done")
+
+    process = MagicMock(state=[], token_ledger=TokenLedger(), max_parallel_tools=1)
+    process.trigger_event = AsyncMock()
+    process.call_tool = call_tool
+    process._submit_to_loop = lambda coro: asyncio.get_running_loop().create_task(coro)
+    process.plugins = PluginEventRunner(process._submit_to_loop, [])
+    executor = AnthropicProcessExecutor()
+    executor._prepare_request = AsyncMock(return_value={})
+    executor._send_request = AsyncMock(return_value=blocks())
+
+    result = await executor.run(process, "hi", max_iterations=1)
+
+    assert result.api_call_infos[0]["latency_ms"] == 500
@@ -0,0 +1,94 @@
+"""Tests for the local incremental token ledger."""
+
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from llmproc.common.token_ledger import (
+    TokenLedger,
+    estimate_message_tokens,
+    estimate_tokens,
+    usage_prompt_tokens,
+)
+from llmproc.program import LLMProgram
+
+
+async def _start(client):
+    program = LLMProgram(model_name="claude-3-5-sonnet-20241022", provider="anthropic", system_prompt="test")
+    with patch("llmproc.program_exec.get_provider_client", return_value=client):
+        return await program.start()
+
+
+def _response(text, input_tokens, cache_read=0):
+    usage = SimpleNamespace(
+        input_tokens=input_tokens,
+        output_tokens=5,
+        cache_creation_input_tokens=0,
+        cache_read_input_tokens=cache_read,
+    )
+    return SimpleNamespace(content=[SimpleNamespace(type="text", text=text)], stop_reason="end_turn", usage=usage)
+
+
+@pytest.mark.asyncio
+async def test_count_seeded_from_usage_without_api_call(monkeypatch):
+    monkeypatch.delenv("LLMPROC_USE_STREAMING", raising=False)
+    client = MagicMock()
+    client.messages.create = AsyncMock(return_value=_response("Hello there!", 100, cache_read=50))
+    client.messages.count_tokens = AsyncMock(return_value=SimpleNamespace(input_tokens=999))
+    process = await _start(client)
+
+    await process.run("Hi")
+    info = await process.count_tokens()
+
+    reply = estimate_message_tokens(process.state[-1])
+    assert info["input_tokens"] == 150 + reply
+    assert info["context_window"] == 200000
+    assert info["remaining_tokens"] == 200000 - 150 - reply
+    client.messages.count_tokens.assert_not_awaited()
+
+    assert (await process.count_tokens(exact=True))["input_tokens"] == 999
+    client.messages.count_tokens.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_count_estimates_before_first_call_and_after_reset():
+    process = await _start(MagicMock())
+    expected = estimate_tokens("test")
+    assert (await process.count_tokens())["input_tokens"] == expected
+
+    process.state.append({"role": "user", "content": "x" * 40})
+    assert (await process.count_tokens())["input_tokens"] == expected + 10 + 4
+
+    process.reset_state()
+    assert (await process.count_tokens())["input_tokens"] == expected
+
+
+def test_only_new_messages_are_estimated():
+    estimator = MagicMock(side_effect=estimate_message_tokens)
+    ledger = TokenLedger(estimator=estimator)
+    process = SimpleNamespace(
+        state=[{"role": "user", "content": "hello"}], enriched_system_prompt=None, base_system_prompt="", tools=[]
+    )
+    ledger.record_usage(ledger.checkpoint(process.state), {"input_tokens": 1000})
+
+    for i in range(10):
+        process.state.append({"role": "assistant", "content": f"reply {i}"})
+        ledger.count(process)
+    assert estimator.call_count == 10
+
+    assert ledger.count(process) == ledger.count(process)
+    assert estimator.call_count == 10
+
+    process.state = process.state[:3]  # truncated history invalidates the seed
+    ledger.count(process)
+    assert estimator.call_count == 13
+
+
+def test_usage_prompt_tokens_per_provider():
+    assert usage_prompt_tokens(SimpleNamespace(input_tokens=10, cache_read_input_tokens=90)) == 100
+    assert usage_prompt_tokens(SimpleNamespace(prompt_tokens=42, completion_tokens=7)) == 42
+    assert usage_prompt_tokens(SimpleNamespace(prompt_token_count=17)) == 17
+    assert usage_prompt_tokens({"input_tokens": 3}) == 3
+    assert usage_prompt_tokens(MagicMock()) is None
+    assert usage_prompt_tokens(None) is None
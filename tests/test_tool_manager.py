@@ -87,6 +87,26 @@ def test_get_tool_schemas():
     assert "expression" in calculator_schema_result["input_schema"]["properties"]
 
 
+def test_get_tool_schemas_is_memoized_per_registration():
+    """Schemas are reused between calls and rebuilt when a tool is registered."""
+    manager = ToolManager()
+    asyncio.run(manager.register_tools([calculator], {}))
+
+    schemas = manager.get_tool_schemas()
+    with patch.object(manager.runtime_registry, "get_definitions") as get_definitions:
+        assert manager.get_tool_schemas() is schemas
+        get_definitions.assert_not_called()
+
+    asyncio.run(manager.register_tools([read_file], {}))
+    updated = manager.get_tool_schemas()
+    assert updated is not schemas
+    assert {s["name"] for s in updated} == {"calculator", "read_file"}
+
+    # Replacing the registry (as process templates do) also invalidates the memo
+    manager.runtime_registry = ToolRegistry()
+    assert manager.get_tool_schemas() == []
+
+
 @pytest.mark.asyncio
 async def test_call_tool():
     """Test calling a tool through the manager."""
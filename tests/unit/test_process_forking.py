@@ -1,6 +1,13 @@
+import copy
+import json
+import pickle
+import tracemalloc
+
 import pytest
 
 from llmproc.process_forking import ProcessForkingMixin
+from llmproc.process_snapshot import FrozenMessage, freeze_state
+from llmproc.providers.anthropic_utils import format_api_message
 from tests.conftest import create_test_llmprocess_directly
 
 
@@ -15,3 +22,87 @@ async def test_create_snapshot():
     snapshot = process._create_snapshot()
     assert snapshot.state == process.state
     assert snapshot.state is not process.state
+
+
+def _history(total_bytes: int, messages: int = 500) -> list[dict]:
+    chunk = "x" * (total_bytes // messages)
+    return [
+        {"role": "user" if i % 2 == 0 else "assistant", "content": [{"type": "text", "text": chunk + str(i)}]}
+        for i in range(messages)
+    ]
+
+
+@pytest.mark.asyncio
+async def test_snapshot_shares_frozen_messages():
+    process = create_test_llmprocess_directly()
+    process.state.extend(_history(10_000))
+
+    first, second = create_test_llmprocess_directly(), create_test_llmprocess_directly()
+    first._apply_snapshot(process._create_snapshot())
+    second._apply_snapshot(process._create_snapshot())
+
+    assert all(a is b for a, b in zip(first.state, second.state, strict=True))
+    assert first.state == process.state
+    assert isinstance(first.state[0], FrozenMessage)
+    with pytest.raises(TypeError):
+        first.state[0]["content"] = "changed"
+
+    # Appends and GOTO-style truncation stay private to each process
+    first.state.append({"role": "user", "content": "child only"})
+    first.state[-1]["content"] = "still mutable"
+    process.state = process.state[:10]
+    assert len(first.state) == 501
+    assert first.get_state()[-1] == {"role": "user", "content": "still mutable"}
+
+
+@pytest.mark.asyncio
+async def test_parent_messages_stay_mutable_after_fork():
+    process = create_test_llmprocess_directly()
+    process.state.extend([{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}])
+
+    child = create_test_llmprocess_directly()
+    child._apply_snapshot(process._create_snapshot())
+
+    process.state[0]["content"] = "edited"
+    process.state[1]["tool_call_id"] = "call_1"
+    assert type(process.state[0]) is dict
+    assert child.state == [{"role": "user", "content": "hi"}, {"role": "assistant", "content": "hello"}]
+
+    # A later fork sees the edits and still reuses the untouched frozen messages
+    later = create_test_llmprocess_directly()
+    process.state.append({"role": "user", "content": "more"})
+    later._apply_snapshot(process._create_snapshot())
+    assert later.state[:2] == process.state[:2]
+    assert later.state[0] is not child.state[0]
+    assert later.state[1] is not child.state[1]
+    assert later.state[2] is process._create_snapshot().state[2]
+
+
+def test_frozen_message_copies_are_mutable():
+    frozen = freeze_state([{"role": "user", "content": [{"type": "text", "text": "hi"}]}])[0]
+    assert frozen == {"role": "user", "content": [{"type": "text", "text": "hi"}]}
+    assert json.loads(json.dumps(frozen)) == frozen
+    assert pickle.loads(pickle.dumps(frozen)) == frozen
+
+    deep = copy.deepcopy(frozen)
+    deep["content"][0]["cache_control"] = {"type": "ephemeral"}
+    assert type(deep) is dict and "cache_control" not in frozen["content"][0]
+    assert format_api_message(frozen) == {"role": "user", "content": [{"type": "text", "text": "hi"}]}
+
+
+@pytest.mark.asyncio
+async def test_fork_of_large_history_is_cheap():
+    """Snapshotting 5 MB of history for 10 children allocates only pointers."""
+    process = create_test_llmprocess_directly()
+    process.state.extend(_history(5_000_000))
+
+    children = [create_test_llmprocess_directly() for _ in range(10)]
+
+    tracemalloc.start()
+    for child in children:
+        child._apply_snapshot(process._create_snapshot())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    assert peak < 500_000  # versus > 50 MB for ten deep copies
+    assert all(child.state[-1] is children[0].state[-1] for child in children)
@@ -1,10 +1,13 @@
 """Unit tests for trigger_event callback dispatch."""
 
 from typing import Any
+from unittest.mock import patch
 
 import pytest
 
 from llmproc.plugin.events import CallbackEvent
+from llmproc.plugin.plugin_event_runner import PluginEventRunner
+from llmproc.plugin.plugin_utils import has_plugin_method
 from tests.conftest import create_test_llmprocess_directly
 
 EVENT_PARAMS = [
@@ -109,3 +112,59 @@ async def test_trigger_event_process_injection(event, kwargs):
 
     assert len(cb_without.calls) == 1
     assert cb_without.calls[0] == event.value
+
+
+@pytest.mark.asyncio
+async def test_dispatch_table_follows_add_and_remove():
+    """Plugins added or removed after an event has fired are picked up."""
+    runner = PluginEventRunner(lambda coro: coro)
+    process = object()
+    first = CallbackWithoutProcess()
+    await runner.run_event("tool_start", process, tool_name="calc", tool_args={})
+
+    runner.add(first)
+    await runner.run_event("tool_start", process, tool_name="calc", tool_args={})
+    second = CallbackWithoutProcess()
+    runner.add(second)
+    runner.remove(first)
+    await runner.run_event("tool_start", process, tool_name="calc", tool_args={})
+
+    assert first.calls == ["tool_start"]
+    assert second.calls == ["tool_start"]
+
+
+class StreamCounter:
+    """Plugin subscribed to a single frequent event."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    def api_stream_block(self, block, *, process):
+        self.count += 1
+
+
+class TurnCounter:
+    """Plugin subscribed to turn starts only."""
+
+    def __init__(self) -> None:
+        self.count = 0
+
+    async def turn_start(self, run_result):
+        self.count += 1
+
+
+@pytest.mark.asyncio
+async def test_dispatch_table_inspects_plugins_once_per_event():
+    """20 plugins x 1000 events look each plugin up once per event name."""
+    plugins = [StreamCounter() if i % 2 else TurnCounter() for i in range(20)]
+    runner = PluginEventRunner(lambda coro: coro, plugins)
+    process = object()
+    events = ["api_stream_block", "turn_start", "run_end"] * 500
+
+    with patch("llmproc.plugin.plugin_runner.has_plugin_method", wraps=has_plugin_method) as lookups:
+        for event in events:
+            await runner.run_event(event, process, block=None, run_result=None)
+
+    assert all(p.count == 500 for p in plugins)
+    assert lookups.call_count == 3 * len(plugins)
+    assert runner._subscribers("run_end") == ()